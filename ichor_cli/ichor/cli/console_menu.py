@@ -1,7 +1,8 @@
+import importlib
 from typing import Iterable, List
 
 from consolemenu import ConsoleMenu as OriginalConsoleMenu
-from consolemenu.items import MenuItem
+from consolemenu.items import MenuItem, SubmenuItem
 from consolemenu.screen import Screen as OriginalScreen
 from ichor.cli.completers.tab_completer import DoNothingCompleter
 from ichor.cli.menu_options import MenuOptions
@@ -142,6 +143,56 @@ class ConsoleMenu(OriginalConsoleMenu):
         return prologue_txt
 
 
+class LazySubmenuItem(SubmenuItem):
+    """A `SubmenuItem` which only imports (and therefore builds) its submenu the first time
+    that the submenu is needed, i.e. when the item is selected by the user. The submenu modules
+    import a lot of ichor (and other libraries such as pandas, matplotlib, etc.), so importing
+    all of them when the main menu is started up is slow.
+
+    :param text: The text shown for this menu item, typically the submenu title
+    :param submenu_module: The module in which the submenu is defined,
+        e.g. `"ichor.cli.main_menu_submenus.tools_menu.tools_menu"`
+    :param submenu_name: The name of the `ConsoleMenu` instance in the module, e.g. `"tools_menu"`
+    :param menu: The menu to which this item belongs
+    """
+
+    def __init__(
+        self,
+        text: str,
+        submenu_module: str,
+        submenu_name: str,
+        menu: ConsoleMenu = None,
+        should_exit=False,
+        menu_char=None,
+    ):
+
+        # do not call SubmenuItem.__init__ because it sets the parent of the submenu (so would import it)
+        MenuItem.__init__(
+            self, text=text, menu=menu, should_exit=should_exit, menu_char=menu_char
+        )
+
+        self.submenu_module = submenu_module
+        self.submenu_name = submenu_name
+        self.submenu = None
+
+    def set_menu(self, menu: ConsoleMenu):
+        """Sets the menu of this item. The parent of the submenu is only set if the
+        submenu has already been imported, otherwise it is set in `get_submenu`."""
+        self.menu = menu
+        if self.submenu is not None:
+            self.submenu.parent = menu
+
+    def get_submenu(self) -> ConsoleMenu:
+        """Imports the submenu the first time it is needed and returns it."""
+
+        if self.submenu is None:
+            module = importlib.import_module(self.submenu_module)
+            self.submenu = getattr(module, self.submenu_name)
+            self.submenu.parent = self.menu
+
+        return self.submenu
+
+
 def add_items_to_menu(menu: ConsoleMenu, items: Iterable[MenuItem]):
     """Adds a list of `MenuItem` instances to a `ConsoleMenu` instance."""
 
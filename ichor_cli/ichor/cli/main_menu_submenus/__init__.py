@@ -1,25 +1,60 @@
-from ichor.cli.main_menu_submenus.analysis_menu.analysis_menu import (
-    ANALYSIS_MENU_DESCRIPTION,
+"""Descriptions of the submenus of the main menu. These are defined here (and not in the
+modules containing the submenus) so that the main menu can show the titles of all submenus
+without having to import them. The submenus themselves are only imported and built
+when they are selected for the first time, see `LazySubmenuItem`."""
+
+from ichor.cli.menu_description import MenuDescription
+
+INITIAL_STRUCTURE_MENU_DESCRIPTION = MenuDescription(
+    "Initial Structure Menu",
+    subtitle="This menu is designed for generating your initial xyz file for building ML models.\n",
+)
+
+TRAJECTORY_CREATION_MENU_DESCRIPTION = MenuDescription(
+    "Trajectory Creation Menu",
+    subtitle="Use this menu to create a sample pool of conformers with molecular dynamics or metadynamics.",
+)
+
+TRAJECTORY_MENU_DESCRIPTION = MenuDescription(
+    "Trajectory Menu", subtitle="Use this to interact with ichor's Trajectory class.\n"
+)
+
+SAMPLING_MENU_DESCRIPTION = MenuDescription(
+    "Sampling Menu",
+    subtitle="Use this menu to perform diversity sampling on a trajectory.\n",
+)
+
+POINTS_DIRECTORY_MENU_DESCRIPTION = MenuDescription(
+    "PointsDirectory Menu",
+    subtitle="Use this to interact with ichor's PointsDirectory class.\n",
 )
-from ichor.cli.main_menu_submenus.initial_structure_menu.initial_structure_menu import (
-    INITIAL_STRUCTURE_MENU_DESCRIPTION,
+
+SUBMIT_CSVS_MENU_DESCRIPTION = MenuDescription(
+    "Database Processing Menu",
+    subtitle="Use this menu to get things from a database.\n",
 )
-from ichor.cli.main_menu_submenus.points_directory_menu.points_directory_menu import (
-    POINTS_DIRECTORY_MENU_DESCRIPTION,
+
+TRAINING_MENU_DESCRIPTION = MenuDescription(
+    "Training Menu",
+    subtitle="Use this menu to prepare datasets, train and analyse GPR models.\n",
 )
-from ichor.cli.main_menu_submenus.tools_menu.tools_menu import TOOLS_MENU_DESCRIPTION
-from ichor.cli.main_menu_submenus.trajectory_creation_menu.trajectory_creation_menu import (
-    TRAJECTORY_CREATION_MENU_DESCRIPTION,
+
+ANALYSIS_MENU_DESCRIPTION = MenuDescription(
+    "Analysis Menu", subtitle="Use this to do analysis of data with ichor."
 )
-from ichor.cli.main_menu_submenus.trajectory_menu.trajectory_menu import (
-    TRAJECTORY_MENU_DESCRIPTION,
+
+TOOLS_MENU_DESCRIPTION = MenuDescription(
+    "Tools Menu", subtitle="Use this to run quick useful ichor functions."
 )
 
 __all__ = [
     "INITIAL_STRUCTURE_MENU_DESCRIPTION",
-    "ANALYSIS_MENU_DESCRIPTION",
     "TRAJECTORY_CREATION_MENU_DESCRIPTION",
+    "TRAJECTORY_MENU_DESCRIPTION",
+    "SAMPLING_MENU_DESCRIPTION",
     "POINTS_DIRECTORY_MENU_DESCRIPTION",
+    "SUBMIT_CSVS_MENU_DESCRIPTION",
+    "TRAINING_MENU_DESCRIPTION",
+    "ANALYSIS_MENU_DESCRIPTION",
     "TOOLS_MENU_DESCRIPTION",
-    "TRAJECTORY_MENU_DESCRIPTION",
 ]
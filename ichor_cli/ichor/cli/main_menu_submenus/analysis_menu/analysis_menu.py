@@ -2,7 +2,7 @@ from dataclasses import dataclass
 
 from consolemenu.items import FunctionItem
 from ichor.cli.console_menu import add_items_to_menu, ConsoleMenu
-from ichor.cli.menu_description import MenuDescription
+from ichor.cli.main_menu_submenus import ANALYSIS_MENU_DESCRIPTION
 
 from ichor.cli.menu_options import MenuOptions
 from ichor.cli.useful_functions import (
@@ -15,9 +15,6 @@ from ichor.core.common.str import get_digits
 from ichor.core.files import Trajectory, XYZ
 from ichor.hpc.main.trajectory import submit_center_trajectory_on_atom
 
-ANALYSIS_MENU_DESCRIPTION = MenuDescription(
-    "Analysis Menu", subtitle="Use this to do analysis of data with ichor."
-)
 analysis_menu = ConsoleMenu(
     title=ANALYSIS_MENU_DESCRIPTION.title,
     subtitle=ANALYSIS_MENU_DESCRIPTION.subtitle,
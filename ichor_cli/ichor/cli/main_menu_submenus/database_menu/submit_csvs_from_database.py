@@ -7,7 +7,7 @@ import ichor.cli.global_menu_variables
 import ichor.hpc.global_variables
 from consolemenu.items import FunctionItem
 from ichor.cli.console_menu import add_items_to_menu, ConsoleMenu
-from ichor.cli.menu_description import MenuDescription
+from ichor.cli.main_menu_submenus import SUBMIT_CSVS_MENU_DESCRIPTION
 from ichor.cli.menu_options import MenuOptions
 from ichor.cli.useful_functions import (
     user_input_bool,
@@ -25,10 +25,6 @@ from ichor.core.database.query_database import (
 from ichor.hpc.main import submit_make_csvs_from_database
 from ichor.hpc.main.database import AVAILABLE_DATABASE_FORMATS
 
-SUBMIT_CSVS_MENU_DESCRIPTION = MenuDescription(
-    "Database Processing Menu",
-    subtitle="Use this menu to get things from a database.\n",
-)
 
 # TODO: possibly make this be read from a file
 SUBMIT_CSVS_MENU_DEFAULTS = {
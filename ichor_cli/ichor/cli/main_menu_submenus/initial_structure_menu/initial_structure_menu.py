@@ -2,20 +2,15 @@ from dataclasses import dataclass
 
 from consolemenu.items import SubmenuItem
 from ichor.cli.console_menu import add_items_to_menu, ConsoleMenu
+from ichor.cli.main_menu_submenus import INITIAL_STRUCTURE_MENU_DESCRIPTION
 from ichor.cli.main_menu_submenus.initial_structure_menu.initial_structure_submenus import (
     file_conversion_menu,
     FILE_CONVERSION_MENU_DESCRIPTION,
     optimisation_menu,
     OPTIMISATION_MENU_DESCRIPTION,
 )
-from ichor.cli.menu_description import MenuDescription
 from ichor.cli.menu_options import MenuOptions
 
-INITIAL_STRUCTURE_MENU_DESCRIPTION = MenuDescription(
-    "Initial Structure Menu",
-    subtitle="This menu is designed for generating your initial xyz file for building ML models.\n",
-)
-
 
 @dataclass
 class InitialStructureMenuOptions(MenuOptions):
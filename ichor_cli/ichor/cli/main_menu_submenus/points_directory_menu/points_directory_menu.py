@@ -6,6 +6,7 @@ import ichor.cli.global_menu_variables
 import ichor.hpc.global_variables
 from consolemenu.items import FunctionItem, SubmenuItem
 from ichor.cli.console_menu import add_items_to_menu, ConsoleMenu
+from ichor.cli.main_menu_submenus import POINTS_DIRECTORY_MENU_DESCRIPTION
 from ichor.cli.main_menu_submenus.points_directory_menu.points_directory_submenus import (
     submit_aimall_menu,
     SUBMIT_AIMALL_MENU_DESCRIPTION,
@@ -14,16 +15,10 @@ from ichor.cli.main_menu_submenus.points_directory_menu.points_directory_submenu
     submit_gaussian_menu,
     SUBMIT_GAUSSIAN_MENU_DESCRIPTION,
 )
-from ichor.cli.menu_description import MenuDescription
 from ichor.cli.menu_options import MenuOptions
 from ichor.cli.useful_functions import user_input_path
 from ichor.core.files import PointsDirectory, PointsDirectoryParent
 
-POINTS_DIRECTORY_MENU_DESCRIPTION = MenuDescription(
-    "PointsDirectory Menu",
-    subtitle="Use this to interact with ichor's PointsDirectory class.\n",
-)
-
 
 # dataclass used to store values for PointsDirectoryMenu
 @dataclass
@@ -5,21 +5,15 @@ from typing import Union
 import ichor.cli.global_menu_variables
 from consolemenu.items import FunctionItem, SubmenuItem
 from ichor.cli.console_menu import add_items_to_menu, ConsoleMenu
+from ichor.cli.main_menu_submenus import SAMPLING_MENU_DESCRIPTION
 from ichor.cli.main_menu_submenus.sampling_menu.sampling_submenus import (
     submit_diversity_menu,
     SUBMIT_DIVERSITY_MENU_DESCRIPTION,
 )
-from ichor.cli.menu_description import MenuDescription
 from ichor.cli.menu_options import MenuOptions
 from ichor.cli.useful_functions.user_input import user_input_path
 
 
-SAMPLING_MENU_DESCRIPTION = MenuDescription(
-    "Sampling Menu",
-    subtitle="Use this menu to perform diversity sampling on a trajectory.\n",
-)
-
-
 @dataclass
 class SamplingMenuOptions(MenuOptions):
     selected_trajectory_path: Path = (
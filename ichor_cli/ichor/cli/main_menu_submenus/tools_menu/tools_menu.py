@@ -5,15 +5,13 @@ from typing import Union
 import ichor.cli.global_menu_variables
 from consolemenu.items import FunctionItem
 from ichor.cli.console_menu import add_items_to_menu, ConsoleMenu
-from ichor.cli.menu_description import MenuDescription
+from ichor.cli.main_menu_submenus import TOOLS_MENU_DESCRIPTION
 from ichor.cli.menu_options import MenuOptions
 from ichor.cli.useful_functions import user_input_path
 from ichor.core.files import PointsDirectory, PointsDirectoryParent
-from ichor.hpc.main import submit_check_points_directory_for_missing_files
-
-
-TOOLS_MENU_DESCRIPTION = MenuDescription(
-    "Tools Menu", subtitle="Use this to run quick useful ichor functions."
+from ichor.hpc.main import (
+    resubmit_points_from_report,
+    submit_check_points_directory_for_missing_files,
 )
 
 
@@ -67,6 +65,30 @@ class ToolsMenuFunctions:
         pd_path = ichor.cli.global_menu_variables.SELECTED_POINTS_DIRECTORY_PATH
         submit_check_points_directory_for_missing_files(pd_path)
 
+    @staticmethod
+    def check_gaussian_and_aimall_report():
+        """Checks the Gaussian and AIMAll files of the selected PointsDirectory
+        or PointsDirectoryParent and writes the points with problems to a report."""
+
+        from ichor.core.processing import (
+            check_points_directory,
+            write_missing_data_report,
+        )
+
+        pd_path = Path(ichor.cli.global_menu_variables.SELECTED_POINTS_DIRECTORY_PATH)
+        report = check_points_directory(pd_path)
+        report_path = write_missing_data_report(
+            report, f"{pd_path.with_suffix('').name}_missing_data.json"
+        )
+        print(f"{len(report)} point(s) with problems written to {report_path}.")
+
+    @staticmethod
+    def resubmit_from_report():
+        """Resubmits the points in a missing data report to Gaussian and AIMAll."""
+
+        report_path = user_input_path("Enter path to missing data report: ")
+        resubmit_points_from_report(report_path)
+
 
 tools_menu = ConsoleMenu(
     this_menu_options=tools_menu_options,
@@ -89,6 +111,14 @@ tools_menu_items = [
         "Submit check PointDirectory to compute.",
         ToolsMenuFunctions.submit_check_gaussian_and_aimall,
     ),
+    FunctionItem(
+        "Check PointDirectory now and write report of points with problems.",
+        ToolsMenuFunctions.check_gaussian_and_aimall_report,
+    ),
+    FunctionItem(
+        "Resubmit points from report to Gaussian and AIMAll.",
+        ToolsMenuFunctions.resubmit_from_report,
+    ),
 ]
 
 add_items_to_menu(tools_menu, tools_menu_items)
@@ -2,6 +2,8 @@ from dataclasses import dataclass
 
 from consolemenu.items import SubmenuItem
 from ichor.cli.console_menu import add_items_to_menu, ConsoleMenu
+
+from ichor.cli.main_menu_submenus import TRAINING_MENU_DESCRIPTION
 from ichor.cli.main_menu_submenus.training_menu.training_submenus.data_preparation_menu import (
     submit_data_prep_menu,
     SUBMIT_DATA_PREP_MENU_DESCRIPTION,
@@ -10,17 +12,9 @@ from ichor.cli.main_menu_submenus.training_menu.training_submenus.training_model
     submit_training_menu,
     SUBMIT_TRAINING_MENU_DESCRIPTION,
 )
-
-from ichor.cli.menu_description import MenuDescription
 from ichor.cli.menu_options import MenuOptions
 
 
-TRAINING_MENU_DESCRIPTION = MenuDescription(
-    "Training Menu",
-    subtitle="Use this menu to prepare datasets, train and analyse GPR models.\n",
-)
-
-
 @dataclass
 class TrainingMenuOptions(MenuOptions):
     pass
@@ -5,6 +5,7 @@ from typing import Union
 import ichor.cli.global_menu_variables
 from consolemenu.items import FunctionItem, SubmenuItem
 from ichor.cli.console_menu import add_items_to_menu, ConsoleMenu
+from ichor.cli.main_menu_submenus import TRAJECTORY_CREATION_MENU_DESCRIPTION
 from ichor.cli.main_menu_submenus.trajectory_creation_menu.trajectory_creation_submenus import (
     amber_menu,
     AMBER_MENU_DESCRIPTION,
@@ -13,15 +14,9 @@ from ichor.cli.main_menu_submenus.trajectory_creation_menu.trajectory_creation_s
     metadynamics_menu,
     METADYNAMICS_MENU_DESCRIPTION,
 )
-from ichor.cli.menu_description import MenuDescription
 from ichor.cli.menu_options import MenuOptions
 from ichor.cli.useful_functions import user_input_path
 
-TRAJECTORY_CREATION_MENU_DESCRIPTION = MenuDescription(
-    "Trajectory Creation Menu",
-    subtitle="Use this menu to create a sample pool of conformers with molecular dynamics or metadynamics.",
-)
-
 
 @dataclass
 class TrajectoryCreationMenuOptions(MenuOptions):
@@ -5,7 +5,7 @@ from typing import Union
 import ichor.cli.global_menu_variables
 from consolemenu.items import FunctionItem
 from ichor.cli.console_menu import add_items_to_menu, ConsoleMenu
-from ichor.cli.menu_description import MenuDescription
+from ichor.cli.main_menu_submenus import TRAJECTORY_MENU_DESCRIPTION
 from ichor.cli.menu_options import MenuOptions
 from ichor.cli.useful_functions.user_input import (
     user_input_bool,
@@ -14,10 +14,6 @@ from ichor.cli.useful_functions.user_input import (
 )
 from ichor.core.files import Trajectory
 
-TRAJECTORY_MENU_DESCRIPTION = MenuDescription(
-    "Trajectory Menu", subtitle="Use this to interact with ichor's Trajectory class.\n"
-)
-
 
 @dataclass
 class TrajectoryMenuOptions(MenuOptions):
@@ -0,0 +1,19 @@
+from ichor.core.active_learning.candidate_selection import (
+    combine_scores,
+    expected_improvement,
+    sample_pool_features,
+    score_sample_pool,
+    select_diverse_points,
+    select_points,
+    write_selected_points,
+)
+
+__all__ = [
+    "combine_scores",
+    "expected_improvement",
+    "sample_pool_features",
+    "score_sample_pool",
+    "select_diverse_points",
+    "select_points",
+    "write_selected_points",
+]
@@ -0,0 +1,366 @@
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+from ichor.core.atoms import ListOfAtoms
+from ichor.core.calculators.alignment import calculate_rmsd
+from ichor.core.calculators.features import calculate_alf_features
+from ichor.core.common.int import count_digits
+from ichor.core.common.io import mkdir
+
+# the maximum number of elements of the train x test covariance matrix chunks
+_max_chunk_elements = 2**24
+
+acquisition_functions = ("variance", "expected_improvement")
+reductions = ("sum", "max")
+
+
+def sample_pool_features(
+    sample_pool: ListOfAtoms, models: Iterable["Model"]  # noqa F821
+) -> Dict[str, np.ndarray]:
+    """Calculates the features of every atom that has a model for all geometries of the sample pool.
+    The features are calculated once, with the atomic local frames from the model files, and are
+    shared by all models (e.g. iqa and multipole moment models) of an atom.
+
+    :param sample_pool: The geometries from which to select points, e.g. a `Trajectory`
+    :param models: The models (e.g. a `Models` instance) for which to calculate features
+    :return: A dictionary of atom names and arrays of shape n_geometries x n_features
+    """
+
+    alf_dict = {model.atom_name: model.alf for model in models}
+    atom_names = [
+        atom_name for atom_name in sample_pool.atom_names if atom_name in alf_dict
+    ]
+
+    return sample_pool.features_by_atom(
+        calculate_alf_features, alf_dict, atom_names=atom_names
+    )
+
+
+def _iter_chunk_variances(
+    model: "Model",  # noqa F821
+    lower_cholesky: np.ndarray,
+    x_test: np.ndarray,
+    chunk_size: Optional[int] = None,
+) -> Iterator[Tuple[slice, np.ndarray, np.ndarray]]:
+    """Calculates the (normalised) variance of the predictions of the test points in chunks, so that
+    the train x test covariance matrix of all test points is never formed.
+
+    :param model: The model for which to calculate the variance
+    :param lower_cholesky: The Cholesky decomposition of the covariance matrix of the model's training points
+    :param x_test: Array of shape n_points x n_features containing the test point features
+    :param chunk_size: The number of test points done at once, by default it is chosen to keep
+        the memory use of each chunk bounded
+    :return: Yields the slice of the test points in the chunk, the train x test covariance matrix
+        of the chunk and the variances of the chunk
+    """
+
+    from scipy.linalg import solve_triangular
+
+    if chunk_size is None:
+        chunk_size = max(1, _max_chunk_elements // lower_cholesky.shape[0])
+
+    for start in range(0, x_test.shape[0], chunk_size):
+        chunk = slice(start, start + chunk_size)
+        # shape ntrain x nchunk
+        train_test_covar = model.r(x_test[chunk])
+        # temporary matrix, see Rasmussen Williams page 19 algo. 2.1
+        v = solve_triangular(
+            lower_cholesky, train_test_covar, lower=True, check_finite=False
+        )
+        # the diagonal of v.T @ v
+        yield chunk, train_test_covar, np.clip(
+            1.0 - np.einsum("ij,ij->j", v, v), 0.0, None
+        )
+
+
+def expected_improvement(
+    model: "Model", x_test: np.ndarray, chunk_size: Optional[int] = None  # noqa F821
+) -> np.ndarray:
+    r"""Calculates the expected improvement for global fit (Lam, 2008) of the test points
+
+    .. math::
+
+        EI(x) = (\hat{y}(x) - y(x_{nearest}))^2 + \tau^2 s^2(x)
+
+    where :math:`x_{nearest}` is the training point with the largest covariance with the test point,
+    :math:`s^2(x)` is the (normalised) variance of the prediction and :math:`\tau^2` is
+    the maximum likelihood estimate of the process variance. The first term is large where the prediction
+    changes quickly, the second term is large where there are no training points.
+
+    The Cholesky decomposition of the covariance matrix is only calculated once and
+    the test points are done in chunks.
+
+    :param model: The model for which to calculate the expected improvement
+    :param x_test: Array of shape n_points x n_features containing the test point features
+    :param chunk_size: The number of test points done at once, by default it is chosen to keep
+        the memory use of each chunk bounded
+    :return: Array of shape n_points containing the expected improvement of every point
+    """
+
+    from scipy.linalg import solve_triangular
+
+    x_test = np.atleast_2d(x_test)
+
+    lower_cholesky = model.lower_cholesky
+    y = model.y.flatten()
+    weights = model.weights.flatten()
+
+    # maximum likelihood estimate of the process variance, (y - mu)^T R^-1 (y - mu) / ntrain
+    y_minus_mean = solve_triangular(
+        lower_cholesky,
+        y - model.mean.value(model.x).flatten(),
+        lower=True,
+        check_finite=False,
+    )
+    process_variance = np.dot(y_minus_mean, y_minus_mean) / len(y)
+
+    improvements = np.empty(x_test.shape[0])
+
+    for chunk, train_test_covar, variances in _iter_chunk_variances(
+        model, lower_cholesky, x_test, chunk_size
+    ):
+        predictions = (
+            model.mean.value(x_test[chunk]).flatten() + train_test_covar.T @ weights
+        )
+        nearest_y = y[np.argmax(train_test_covar, axis=0)]
+
+        improvements[chunk] = (
+            predictions - nearest_y
+        ) ** 2 + process_variance * variances
+
+    return improvements
+
+
+def score_sample_pool(
+    models: Iterable["Model"],  # noqa F821
+    features: Dict[str, np.ndarray],
+    acquisition: str = "variance",
+    chunk_size: Optional[int] = None,
+) -> Dict[str, Dict[str, np.ndarray]]:
+    """Calculates the acquisition function of every model for all points in the sample pool.
+
+    :param models: The models (e.g. a `Models` instance) to use
+    :param features: The features of the sample pool, see `sample_pool_features`
+    :param acquisition: "variance" (the variance of the predictions) or "expected_improvement"
+        (see `expected_improvement`), defaults to "variance"
+    :param chunk_size: The number of points done at once, optional
+    :return: A dictionary of {atom_name: {property: array of shape n_points}}
+    """
+
+    if acquisition not in acquisition_functions:
+        raise ValueError(
+            f"Unknown acquisition function '{acquisition}', choose from {acquisition_functions}."
+        )
+
+    scores = {}
+
+    for model in models:
+        if model.atom_name not in features:
+            continue
+        atom_features = features[model.atom_name]
+        if acquisition == "variance":
+            model_scores = np.concatenate(
+                [
+                    variances
+                    for _, _, variances in _iter_chunk_variances(
+                        model,
+                        model.lower_cholesky,
+                        np.atleast_2d(atom_features),
+                        chunk_size,
+                    )
+                ]
+            )
+        else:
+            model_scores = expected_improvement(model, atom_features, chunk_size)
+        scores.setdefault(model.atom_name, {})[model.prop] = model_scores
+
+    return scores
+
+
+def combine_scores(
+    scores: Dict[str, Dict[str, np.ndarray]], reduction: str = "sum"
+) -> np.ndarray:
+    """Combines the scores of all models into one score per point. The scores of each model are divided
+    by their maximum first, so that models for properties with different units can be compared.
+
+    :param scores: The scores of every model, see `score_sample_pool`
+    :param reduction: "sum" adds the scores of all models, "max" takes the largest score, defaults to "sum"
+    :return: Array of shape n_points
+    """
+
+    if reduction not in reductions:
+        raise ValueError(f"Unknown reduction '{reduction}', choose from {reductions}.")
+
+    all_scores = np.array(
+        [
+            prop_scores
+            for atom_scores in scores.values()
+            for prop_scores in atom_scores.values()
+        ]
+    )
+    if all_scores.size == 0:
+        raise ValueError("There are no scores to combine.")
+
+    max_scores = all_scores.max(axis=1, keepdims=True)
+    all_scores = all_scores / np.where(max_scores > 0.0, max_scores, 1.0)
+
+    if reduction == "sum":
+        return all_scores.sum(axis=0)
+    return all_scores.max(axis=0)
+
+
+def select_diverse_points(
+    scores: np.ndarray,
+    npoints: int,
+    coordinates: Optional[np.ndarray] = None,
+    min_rmsd: float = 0.0,
+    max_candidates: Optional[int] = None,
+) -> np.ndarray:
+    """Selects the points with the largest scores. If `min_rmsd` is given, points are taken in order of
+    their scores and a point is skipped if its RMSD to an already selected point is smaller than `min_rmsd`,
+    so that the selected points are not all in the same region.
+
+    :param scores: Array of shape n_points containing the score of every point
+    :param npoints: The number of points to select
+    :param coordinates: Array of shape n_points x n_atoms x 3 (or a callable that returns the coordinates
+        of the given indices), only needed if `min_rmsd` is given
+    :param min_rmsd: The minimum RMSD between selected points, defaults to 0.0 (no diversity filtering)
+    :param max_candidates: The number of highest scoring points considered for diversity filtering,
+        defaults to 10 x `npoints`. Fewer than `npoints` points are returned if they are not diverse enough.
+    :return: The indices of the selected points, in decreasing order of their scores
+    """
+
+    scores = np.asarray(scores)
+    npoints = min(npoints, len(scores))
+
+    if npoints <= 0:
+        return np.empty(0, dtype=int)
+
+    if min_rmsd <= 0.0:
+        # only the top points need to be sorted
+        top = np.argpartition(-scores, npoints - 1)[:npoints]
+        return top[np.argsort(-scores[top], kind="stable")]
+
+    if coordinates is None:
+        raise ValueError("The coordinates are needed to select points by RMSD.")
+
+    ncandidates = min(len(scores), max_candidates or 10 * npoints)
+    candidates = np.argpartition(-scores, ncandidates - 1)[:ncandidates]
+    candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+    candidate_coordinates = (
+        coordinates(candidates) if callable(coordinates) else coordinates[candidates]
+    )
+
+    available = np.ones(ncandidates, dtype=bool)
+    selected = []
+
+    for i in range(ncandidates):
+        if not available[i]:
+            continue
+        selected.append(i)
+        if len(selected) == npoints:
+            break
+
+        # remove the remaining candidates which are too close to the selected point
+        remaining = np.flatnonzero(available[i + 1 :]) + i + 1
+        if len(remaining) > 0:
+            rmsd = calculate_rmsd(
+                candidate_coordinates[i], candidate_coordinates[remaining]
+            )
+            available[remaining[rmsd < min_rmsd]] = False
+
+    return candidates[selected]
+
+
+def select_points(
+    sample_pool: ListOfAtoms,
+    models: Iterable["Model"],  # noqa F821
+    npoints: int,
+    acquisition: str = "variance",
+    reduction: str = "sum",
+    min_rmsd: float = 0.0,
+    max_candidates: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Selects the points of a sample pool which should be added to the training set next.
+
+    The sample pool is featurised once, the acquisition function of every model is calculated for all
+    points (see `score_sample_pool`), the scores are combined into one score per point (see `combine_scores`)
+    and the highest scoring points are selected (see `select_diverse_points`).
+
+    :param sample_pool: The geometries from which to select points, e.g. a `Trajectory`
+    :param models: The models (e.g. a `Models` instance) to use
+    :param npoints: The number of points to select
+    :param acquisition: "variance" or "expected_improvement", defaults to "variance"
+    :param reduction: How the scores of different models are combined, "sum" or "max", defaults to "sum"
+    :param min_rmsd: The minimum RMSD between selected points, defaults to 0.0 (no diversity filtering)
+    :param max_candidates: The number of highest scoring points considered for diversity filtering, optional
+    :param chunk_size: The number of points for which the acquisition function is calculated at once, optional
+    :return: A tuple of the indices of the selected points and the combined scores of all points
+    """
+
+    models = list(models)
+    features = sample_pool_features(sample_pool, models)
+    scores = combine_scores(
+        score_sample_pool(models, features, acquisition, chunk_size), reduction
+    )
+
+    def coordinates(indices):
+        return np.array([sample_pool[int(i)].coordinates for i in indices])
+
+    selected = select_diverse_points(
+        scores, npoints, coordinates, min_rmsd, max_candidates
+    )
+
+    return selected, scores
+
+
+def write_selected_points(
+    sample_pool: ListOfAtoms,
+    indices: Union[np.ndarray, List[int]],
+    system_name: str,
+    parent_dir: Optional[Path] = None,
+    nthreads: int = 8,
+) -> Path:
+    """Writes the selected geometries of the sample pool to a new PointsDirectory-like directory
+    named e.g. WATER_SELECTED.pointsdir, so that the training set (WATER.pointsdir) is not overwritten.
+    Each point is named after its index in the sample pool, e.g. WATER01234, so that it can be traced back
+    to the sample pool.
+
+    :param sample_pool: The geometries from which the points were selected
+    :param indices: The indices of the selected points, see `select_points`
+    :param system_name: The name of the system, which is used in the names of the directory and points
+    :param parent_dir: The directory in which to make the PointsDirectory, defaults to the current directory
+    :param nthreads: The number of threads used to write the files, defaults to 8
+    :raises FileExistsError: If the directory already exists and is not empty
+    :return: The path to the written PointsDirectory
+    """
+
+    from ichor.core.files import PointsDirectory
+    from ichor.core.files.xyz.write_points import write_point_directories
+
+    system_name = system_name.upper()
+    root_path = Path(f"{system_name}_SELECTED").with_suffix(PointsDirectory._suffix)
+    if parent_dir is not None:
+        root_path = Path(parent_dir) / root_path
+
+    if root_path.is_dir() and any(root_path.iterdir()):
+        raise FileExistsError(
+            f"'{root_path.absolute()}' already exists and is not empty, the selected points are not written."
+        )
+    mkdir(root_path)
+
+    indices = [int(i) for i in indices]
+    ndigits = max(4, count_digits(len(sample_pool)))
+    write_point_directories(
+        root_path,
+        [f"{system_name}{str(i).zfill(ndigits)}" for i in indices],
+        sample_pool[0].types_extended if len(indices) > 0 else [],
+        np.array([sample_pool[i].coordinates for i in indices]).reshape(
+            len(indices), -1, 3
+        ),
+        nthreads=nthreads,
+    )
+
+    return root_path
@@ -1,13 +1,13 @@
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Optional, Union
 
 import numpy as np
 import pandas as pd
 from ichor.core.common.constants import ha_to_kj_mol
-from ichor.core.common.io import get_files_of_type
+from ichor.core.common.io import get_files_of_type, tail
 from ichor.core.common.np import dict_of_list_to_dict_of_array
 from ichor.core.files import WFN
-from ichor.core.models import Models
+from ichor.core.models import Model
 
 
 def read_fflux(fflux_file: Path) -> Dict[str, np.ndarray]:
@@ -31,38 +31,144 @@ def read_fflux(fflux_file: Path) -> Dict[str, np.ndarray]:
     return dict_of_list_to_dict_of_array(data)
 
 
+def read_last_fflux_record(fflux_file: Path) -> Dict[str, float]:
+    """Reads only the last timestep of a FFLUX file, by reading the end of the file
+    instead of the whole file.
+
+    :param fflux_file: Path to the FFLUX file
+    :raises ValueError: If the FFLUX file does not contain any timesteps
+    :return: A dictionary containing the timestep, e_iqa, e_vdw and e_coul of the last timestep
+    """
+
+    # the last line can be empty or only partially written if the simulation is still running
+    for line in reversed(tail(fflux_file, lines=3).splitlines()):
+        record = line.split()
+        try:
+            # record = timestep e_iqa e_vdw e_coul
+            return {
+                "timestep": int(record[0]),
+                "e_iqa": float(record[1]),
+                "e_vdw": float(record[2]),
+                "e_coul": float(record[3]),
+            }
+        except (IndexError, ValueError):
+            continue
+
+    raise ValueError(f"Could not find a timestep in the FFLUX file '{fflux_file}'.")
+
+
 def read_wfn_energy(wfn_file: Path) -> float:
-    return WFN(wfn_file).energy
+    """Reads the total energy from the last lines of a .wfn file, without reading the rest of the file."""
+    for line in reversed(tail(wfn_file, lines=5).splitlines()):
+        if "TOTAL ENERGY" in line:
+            # parse with -ve numbers because gaussian/orca have slightly different lines here
+            return float(line.split()[-4])
+    # fall back to reading the whole file
+    return WFN(wfn_file).total_energy
+
+
+def read_model_ntrain(model_file: Path) -> int:
+    """Reads the number of training points from the header of a model file, without
+    reading the training data and weights.
+
+    :param model_file: Path to the .model file
+    :raises ValueError: If the number of training points is not in the header
+    """
+    with open(model_file, "r") as f:
+        for line in f:
+            if "number_of_training_points" in line:
+                return int(line.split()[1])
+            if "[training_data]" in line:
+                break
+
+    raise ValueError(f"Could not find number_of_training_points in '{model_file}'.")
+
+
+def read_models_ntrain(models_directory: Path) -> int:
+    """Returns the maximum number of training points of the models in a directory
+    (the same as `Models.ntrain`), by reading the headers of the model files only."""
+    model_files = get_files_of_type(Model.get_filetype(), models_directory)
+    if len(model_files) == 0:
+        raise FileNotFoundError(f"There are no model files in '{models_directory}'.")
+    return max(read_model_ntrain(model_file) for model_file in model_files)
+
+
+def dlpoly_directory_energies(directory: Path) -> Dict[str, Union[str, float]]:
+    """Collects the number of training points of the models, the last FFLUX energy and the
+    Gaussian energy (from the first .wfn file, NaN if there are no .wfn files) of one DL POLY directory.
+
+    :param directory: A DL POLY directory containing a model_krig directory, FFLUX file and optionally a .wfn file
+    """
+
+    directory = Path(directory)
+    wfn_files = get_files_of_type(WFN.get_filetype(), directory)
+
+    return {
+        "directory": directory.name,
+        "ntrain": read_models_ntrain(directory / "model_krig"),
+        "fflux": read_last_fflux_record(directory / "FFLUX")["e_iqa"],
+        "gaussian": read_wfn_energy(wfn_files[0]) if len(wfn_files) > 0 else np.nan,
+    }
+
+
+def collect_dlpoly_energies(
+    dlpoly_directory: Path, ncores: Optional[int] = None
+) -> pd.DataFrame:
+    """Collects the energies of every DL POLY directory (a directory containing a FFLUX file) in
+    `dlpoly_directory`, see `dlpoly_directory_energies`. The directories are done in parallel with
+    a process pool.
+
+    :param dlpoly_directory: The directory containing the DL POLY directories, e.g. one for each number of training points
+    :param ncores: The number of processes to use, defaults to the number of cores. If 1, no process pool is made.
+    :return: A DataFrame with the columns directory, ntrain, fflux and gaussian, sorted by ntrain
+    """
+
+    import concurrent.futures
+    import multiprocessing
+
+    directories: List[Path] = sorted(
+        d
+        for d in Path(dlpoly_directory).iterdir()
+        if d.is_dir() and (d / "FFLUX").exists()
+    )
+
+    if ncores is None:
+        ncores = multiprocessing.cpu_count()
+    ncores = max(1, min(ncores, len(directories)))
+
+    if ncores == 1:
+        results = [dlpoly_directory_energies(d) for d in directories]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=ncores) as executor:
+            results = list(executor.map(dlpoly_directory_energies, directories))
+
+    df = pd.DataFrame(results, columns=["directory", "ntrain", "fflux", "gaussian"])
+    df.sort_values("ntrain", inplace=True, kind="stable")
+    df.reset_index(drop=True, inplace=True)
+
+    return df
 
 
 def get_dlpoly_energies(
     optimum_energy: float,
     dlpoly_directory: Path,
     output: Path = Path("dlpoly-energies.xlsx"),
-):
+    ncores: Optional[int] = None,
+) -> pd.DataFrame:
+    """Writes the number of training points, the final FFLUX energy and the Gaussian energy of every
+    DL POLY directory, see `collect_dlpoly_energies`.
 
-    data = {
-        "ntrain": [],
-        "fflux": [],
-        "gaussian": [],
-    }
-    for d in dlpoly_directory.iterdir():
-        if d.is_dir() and (d / "FFLUX").exists():
-            data["ntrain"] += [Models(d / "model_krig").ntrain]
-            data["fflux"] += [read_fflux(d / "FFLUX")["e_iqa"][-1]]
-            wfn_files = get_files_of_type(WFN.get_filetype(), d)
-            if len(wfn_files) > 0:
-                data["gaussian"] += [read_wfn_energy(wfn_files[0])]
-            else:
-                data["gaussian"] += [np.NaN]
+    :param optimum_energy: If given, the absolute differences of the energies to this energy (in Hartree) are also written
+    :param dlpoly_directory: The directory containing the DL POLY directories
+    :param output: The file to write, an excel file (.xlsx), or a .csv or .parquet file
+    :param ncores: The number of processes used to read the directories, defaults to the number of cores
+    :return: The written DataFrame
+    """
 
-    data = dict_of_list_to_dict_of_array(data)
+    df = collect_dlpoly_energies(dlpoly_directory, ncores).drop(columns="directory")
 
-    if np.isnan(data["gaussian"]).all():
-        del data["gaussian"]
-
-    df = pd.DataFrame(data)
-    df.sort_values("ntrain", inplace=True)
+    if df["gaussian"].isna().all():
+        df.drop(columns="gaussian", inplace=True)
 
     if optimum_energy is not None:
         df["fflux_diff / Ha"] = np.abs(df["fflux"] - optimum_energy)
@@ -71,4 +177,12 @@ def get_dlpoly_energies(
             df["gaussian_diff / Ha"] = np.abs(df["gaussian"] - optimum_energy)
             df["gaussian_diff / kJ/mol"] = df["gaussian_diff / Ha"] * ha_to_kj_mol
 
-    df.to_excel(output, index=False)
+    output = Path(output)
+    if output.suffix == ".parquet":
+        df.to_parquet(output, index=False)
+    elif output.suffix == ".csv":
+        df.to_csv(output, index=False)
+    else:
+        df.to_excel(output, index=False)
+
+    return df
@@ -2,7 +2,6 @@ from typing import List
 
 import numpy as np
 from ichor.core.common.constants import bohr2ang
-from matplotlib import pyplot as plt
 
 # TODO: return an axes which can be customized by user
 # try:
@@ -27,21 +26,63 @@ from matplotlib import pyplot as plt
 #     warnings.warn("Could not import scienceplots. Will not use scienceplots styles.")
 
 
+def calculate_mae_forces(
+    predicted_forces_array: np.ndarray,
+    true_forces_array: np.ndarray,
+    chunk_ntimesteps: int = 10_000,
+) -> np.ndarray:
+    """Calculates the MAE of the predicted forces vs the true forces for every atom and
+    every cartesian direction. The absolute errors are summed chunk by chunk, so that the arrays can
+    be memory mapped (e.g. from `DlPolyIQAForces(use_cache=True)`) and do not need to fit in memory.
+
+    :param predicted_forces_array: Predicted forces array of shape ntimesteps x natoms x 3.
+    :param true_forces_array:  True forces array of shape ntimesteps x natoms x 3
+    :param chunk_ntimesteps: The number of timesteps to compute the errors for at a time
+    :return: Array of shape natoms x 3 containing the MAE (in the units of the forces)
+    """
+
+    if predicted_forces_array.shape != true_forces_array.shape:
+        raise ValueError(
+            f"The predicted forces shape {predicted_forces_array.shape} "
+            f"does not match the true forces shape {true_forces_array.shape}."
+        )
+
+    ntimesteps = true_forces_array.shape[0]
+    sum_abs_diff = np.zeros(true_forces_array.shape[1:])
+
+    for i in range(0, ntimesteps, chunk_ntimesteps):
+        sum_abs_diff += np.sum(
+            np.abs(
+                predicted_forces_array[i : i + chunk_ntimesteps]
+                - true_forces_array[i : i + chunk_ntimesteps]
+            ),
+            axis=0,
+        )
+
+    return sum_abs_diff / ntimesteps
+
+
 def mae_forces(
     predicted_forces_array: np.ndarray,
     true_forces_array: np.ndarray,
     atom_names: List,
     output_name="output.png",
+    chunk_ntimesteps: int = 10_000,
 ):
     """Plots a matshow in matplotlib of the MAE of the predicted forces array vs
     the true forces array
 
     :param predicted_forces_array: Predicted forces array of shape ntimesteps x natoms x 3.
     :param true_forces_array:  True forces array of shape ntimesteps x natoms x 3
+    :param chunk_ntimesteps: The number of timesteps to compute the errors for at a time,
+        see `calculate_mae_forces`
     """
 
-    diff = np.abs(predicted_forces_array - true_forces_array)
-    mae_diff = np.sum(diff, axis=0) / diff.shape[0]
+    from matplotlib import pyplot as plt
+
+    mae_diff = calculate_mae_forces(
+        predicted_forces_array, true_forces_array, chunk_ntimesteps
+    )
 
     # convert to kcal mol-1 ang-1
     conversion_factor = 627.5 / bohr2ang
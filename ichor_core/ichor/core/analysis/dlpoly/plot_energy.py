@@ -3,11 +3,8 @@ import math
 from string import ascii_uppercase
 from typing import List, Union
 
-import matplotlib
-
 import numpy as np
 from ichor.core.files.dl_poly import DlPolyFFLUX, FFLUXDirectory
-from matplotlib import pyplot as plt
 
 ascii_uppercase = list(ascii_uppercase)
 
@@ -147,6 +144,9 @@ def plot_total_energy(
 
     nplots = len(fflux_files)
 
+    import matplotlib
+    from matplotlib import pyplot as plt
+
     fig, axes = plt.subplots(1, nplots, figsize=(WIDTH, HEIGHT), sharey=True)
 
     idx_where_energy_diff_less_than = [
@@ -259,6 +259,8 @@ def plot_total_energy_from_array(
     :param referece: reference Gaussain energy
     """
 
+    from matplotlib import pyplot as plt
+
     fig, ax = plt.subplots(figsize=(9, 9))
 
     total_eng = data
@@ -300,6 +302,8 @@ def plot_differences(
     elif isinstance(data, FFLUXDirectory):
         fflux_file = data.fflux_file
 
+    from matplotlib import pyplot as plt
+
     fig, ax = plt.subplots(figsize=(9, 9))
 
     idx = fflux_file.first_index_where_delta_less_than()
@@ -1,4 +1,3 @@
-import random
 from pathlib import Path
 
 # TODO: return an axes which can be customized by user
@@ -25,12 +24,11 @@ from pathlib import Path
 
 
 from string import ascii_uppercase
-from typing import List, Union
+from typing import List, Optional, Union
 
 import numpy as np
 from ichor.core.files import PointsDirectory, Trajectory
-from ichor.core.files.dl_poly import DlPolyFFLUX, DlPolyHistory
-from matplotlib import pyplot as plt
+from ichor.core.files.dl_poly import DlPolyFFLUX, DlPolyHistory, DlPolyHistoryIndex
 
 ascii_uppercase = list(ascii_uppercase)
 
@@ -45,10 +43,12 @@ def r2_score(true, predicted):
 
 
 def get_random_geometries_from_fflux_simulation(
-    history: Union[DlPolyHistory, Path, str],
+    history: Union[DlPolyHistory, DlPolyHistoryIndex, Path, str],
     k: int = 1000,
     fflux_file: Union[DlPolyFFLUX, Path, str] = None,
-):
+    seed: Optional[int] = None,
+    chunk_nframes: int = 1000,
+) -> Trajectory:
     """Gets random geometries from fflux simulation, so that the true energy from Gaussian
     can be computed from the geometries.
     This function writes out several files.
@@ -58,6 +58,11 @@ def get_random_geometries_from_fflux_simulation(
     total energy associated with the random geometries. If not give, the user can use
     the .txt file and obtain the energies from the FFLUX file themselves.
 
+    The HISTORY file is not read in, only the byte offsets of the timesteps are found (see `DlPolyHistoryIndex`)
+    and the random geometries are read and written to the trajectory in chunks, in the order in which they
+    are in the HISTORY file. The energies are looked up by the timestep numbers of the random geometries,
+    so they are correct even if some timesteps are missing from the HISTORY file.
+
     :param history: A HISTORY file or path to HISTORY file containing FFLUX geometries
     :param k: How many geometries to get from the HISTORY, defaults to 1000
     :param fflux_file: A FFLUX file where to get the total predicted energies
@@ -65,40 +70,44 @@ def get_random_geometries_from_fflux_simulation(
         If given, this will write out a .npy file containing predicted
         total energies array. If not given, it will not write out the
         np array.
+    :param seed: The seed used to choose the random geometries, defaults to None
+    :param chunk_nframes: The number of geometries which are read in at a time
+    :return: The trajectory containing the random geometries (which is not read in)
     """
 
-    if isinstance(history, (Path, str)):
-        history = DlPolyHistory(history)
+    if isinstance(history, DlPolyHistory):
+        history = history.history_index
+    elif isinstance(history, (Path, str)):
+        history = DlPolyHistoryIndex(history)
 
-    random_indices = random.sample(range(len(history)), k=1000)
+    k = min(k, len(history))
+    rng = np.random.default_rng(seed)
+    # sorted so that the HISTORY file is read from start to end
+    random_indices = np.sort(rng.choice(len(history), size=k, replace=False))
 
     # grabbing random geometries from the history file should be fine
     # even if data is missing due to binary data in HISTORY file, it will still grab random geometries
-    new_trajetory = Trajectory(f"{k}_random_geometries_from_fflux_simulation.xyz")
-    with open(f"{k}_random_indices_from_trajectory.txt", "w") as writef:
-        for r in random_indices:
-            writef.write(f"{r}\n")
-            new_trajetory.append(history[r])
-
-    new_trajetory.write()
+    trajectory_path = Path(f"{k}_random_geometries_from_fflux_simulation.xyz")
+    history.write_to_trajectory(
+        trajectory_path, chunk_nframes=chunk_nframes, indices=random_indices
+    )
+    np.savetxt(f"{k}_random_indices_from_trajectory.txt", random_indices, fmt="%d")
 
     if fflux_file:
         if isinstance(fflux_file, (Path, str)):
             fflux_file = DlPolyFFLUX(fflux_file)
 
-        # this will not work if there is missing data in the HISTORY file because
-        # it will grab the energy for a timestep that might not correspond to the geometry in the HISTORY file
-        # need to actually grab the true timestep to index the fflux file correctly
-        random_timestep_indices = []
-        for r in random_indices:
-            random_timestep_indices.append(history[r].ntimestep)
-
-        total_energies = fflux_file.total_energy[random_timestep_indices]
+        # use the timestep numbers to find the energies, because the index of a geometry
+        # is not the same as its timestep if there is missing data in the HISTORY file
+        random_timesteps = history.existing_timesteps[random_indices]
+        total_energies = fflux_file.total_energy_at_timesteps(random_timesteps)
 
         np.save(
             f"{k}_total_predicted_energies_from_simulation_hartree.npy", total_energies
         )
 
+    return Trajectory(trajectory_path)
+
 
 def plot_true_vs_predicted_from_arrays(
     predicted_energies_array_hartree: np.ndarray,
@@ -180,6 +189,8 @@ def plot_true_vs_predicted_from_arrays(
     if absolute_diff:
         diff = np.abs(diff)
 
+    from matplotlib import pyplot as plt
+
     fig, axes = plt.subplots(1, nsystems, figsize=(WIDTH, HEIGHT), sharey="col")
     # c is the array of differences, cmap is for the cmap to use
     if not isinstance(axes, np.ndarray):
@@ -353,6 +364,8 @@ def plot_true_vs_predicted_from_arrays_one_system(
     if absolute_diff:
         diff = np.abs(diff)
 
+    from matplotlib import pyplot as plt
+
     fig, ax = plt.subplots(figsize=(8, 6))
 
     # only set y label on first axes
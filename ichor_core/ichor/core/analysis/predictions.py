@@ -1,85 +1,362 @@
-from typing import List, Optional, Tuple
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
-from ichor.core.atoms import ListOfAtoms
+from ichor.core.atoms import ALF, Atom, Atoms, ListOfAtoms
+from ichor.core.calculators import (
+    calculate_alf_cahn_ingold_prelog,
+    calculate_alf_features_from_coordinates,
+    calculate_c_matrices_from_coordinates,
+)
+from ichor.core.common.constants import multipole_names
+from ichor.core.common.str import get_characters
 from ichor.core.files import PointsDirectory
 from ichor.core.models import Models
+from ichor.core.multipoles import rotate_spherical_multipole
+
+ValidationSet = Union[PointsDirectory, ListOfAtoms, Path, str]
+
+
+def _multipole_rank(type_: str) -> Optional[int]:
+    """Returns the rank of a multipole moment name (e.g. 2 for q21c) or None if the type is not a multipole moment."""
+    return int(type_[1]) if type_ in multipole_names else None
+
+
+def _global_columns(types: List[str]) -> List[str]:
+    """Returns the global properties which are needed to calculate the local properties `types`.
+    Multipole moments are rotated one rank at a time, so all components of the ranks in `types` are needed."""
+    ranks = {_multipole_rank(type_) for type_ in types} - {None}
+    columns = [type_ for type_ in types if _multipole_rank(type_) is None]
+    columns += [name for name in multipole_names if int(name[1]) in ranks]
+    return columns
+
+
+def _int_sections(columns: List[str]) -> List[str]:
+    """Returns the sections of the .int files which contain the given columns, see `Int.project`."""
+    sections = set()
+    for column in columns:
+        if column == "q00":
+            sections.add("basin_integration")
+        elif column in multipole_names:
+            sections.add("multipoles")
+        else:
+            sections.add("iqa_energy_components")
+    return list(sections)
+
+
+def _load_points_directory(
+    points_directory: PointsDirectory, atoms: List[str], columns: List[str]
+) -> Tuple[List[str], np.ndarray, Dict[str, Dict[str, np.ndarray]]]:
+    """Reads in the coordinates and the global properties `columns` of `atoms` from a `PointsDirectory`.
+    Only the sections of the .int files containing the properties are read in (see `IntDirectory.project`)."""
+
+    sections = _int_sections(columns)
+
+    coordinates = []
+    values = {atom: {column: [] for column in columns} for atom in atoms}
+
+    for point in points_directory:
+        point_atoms = point.atoms
+        coordinates.append(point_atoms.coordinates)
+        if not columns:
+            continue
+        ints = point.ints.project(*sections)
+        for atom in atoms:
+            int_file = ints[atom]
+            for column in columns:
+                if column in multipole_names:
+                    value = int_file.global_spherical_multipoles[column]
+                else:
+                    value = getattr(int_file, column)
+                values[atom][column].append(value)
+
+    atom_names = points_directory[0].atoms.atom_names if len(points_directory) else []
+
+    return (
+        atom_names,
+        np.array(coordinates, dtype=float).reshape(len(coordinates), -1, 3),
+        {
+            atom: {
+                column: np.array(v, dtype=float) for column, v in atom_values.items()
+            }
+            for atom, atom_values in values.items()
+        },
+    )
+
+
+def _read_sqlite_columns(db_path: Path, columns: List[str]) -> pd.DataFrame:
+    """Reads only the coordinates and the given columns of the `Dataset` table for all points and atoms."""
+
+    from ichor.core.database.sql.add_to_database import AtomNames, Dataset
+    from ichor.core.database.sql.query_database import create_sqlite_db_connection
+    from sqlalchemy import select
+
+    conn = create_sqlite_db_connection(db_path)
+
+    stmt = (
+        select(
+            Dataset.point_id.label("id"),
+            AtomNames.name.label("atom_name"),
+            Dataset.x,
+            Dataset.y,
+            Dataset.z,
+            *(getattr(Dataset, column) for column in columns),
+        )
+        .join(AtomNames, Dataset.atom_id == AtomNames.id)
+        .order_by(Dataset.point_id, AtomNames.id)
+    )
+
+    try:
+        return pd.read_sql(stmt, conn)
+    finally:
+        conn.close()
+
+
+def _load_database(
+    db_path: Path, db_type: str, atoms: List[str], columns: List[str]
+) -> Tuple[List[str], np.ndarray, Dict[str, Dict[str, np.ndarray]]]:
+    """Reads in the coordinates and the global properties `columns` of `atoms` from a SQLite or JSON database.
+    Points which do not contain all atoms are skipped."""
+
+    from ichor.core.database.query_database import check_supported_db_types
+
+    check_supported_db_types(db_type)
+
+    if db_type == "sqlite":
+        df = _read_sqlite_columns(db_path, columns)
+    else:
+        from ichor.core.database.json import get_json_db_info
+
+        _, _, df = get_json_db_info(db_path)
+        df = df[["id", "atom_name", "x", "y", "z", *columns]]
+
+    # the atoms are in the same order in every point
+    atom_names = list(dict.fromkeys(df["atom_name"]))
+
+    # one row per point, with a (column, atom_name) multi-index for the columns
+    wide = df.set_index(["id", "atom_name"]).unstack("atom_name")
+    wide = wide.loc[:, (slice(None), atom_names)]
+    wide = wide[wide[["x", "y", "z"]].notna().all(axis=1)]
+
+    coordinates = np.stack(
+        [wide[axis][atom_names].to_numpy(dtype=float) for axis in ("x", "y", "z")],
+        axis=-1,
+    )
+
+    return (
+        atom_names,
+        coordinates,
+        {
+            atom: {
+                column: wide[column][atom].to_numpy(dtype=float) for column in columns
+            }
+            for atom in atoms
+        },
+    )
+
+
+def _load_validation_set(
+    validation_set: ValidationSet,
+    atoms: List[str],
+    types: List[str],
+    db_type: Optional[str] = None,
+) -> Tuple[List[str], np.ndarray, Dict[str, Dict[str, np.ndarray]]]:
+    """Reads in the coordinates of all points and the global properties needed to calculate the true values
+    of `types` for `atoms`. The validation set can be a `PointsDirectory`, a `ListOfAtoms` (then only the
+    coordinates are available), or the path to a PointsDirectory, SQLite database (.db) or JSON database directory.
+
+    :return: A tuple of the atom names of the system, an array of coordinates of shape
+        n_points x n_atoms x 3 and a dictionary of {atom_name: {global_property: array of shape n_points}}
+    """
+
+    columns = _global_columns(types)
+
+    if isinstance(validation_set, PointsDirectory):
+        return _load_points_directory(validation_set, atoms, columns)
+
+    if isinstance(validation_set, ListOfAtoms):
+        if columns:
+            raise TypeError(
+                f"'{validation_set.__class__.__name__}' does not contain the true values of {types}."
+            )
+        return validation_set.atom_names, validation_set.coordinates, {}
+
+    path = Path(validation_set)
+
+    if db_type is None:
+        if PointsDirectory.check_path(path):
+            return _load_points_directory(PointsDirectory(path), atoms, columns)
+        db_type = "sqlite" if path.is_file() else "json"
+
+    return _load_database(path, db_type, atoms, columns)
+
+
+def _default_alf(atom_names: List[str], coordinates: np.ndarray) -> Dict[str, ALF]:
+    """Calculates the atomic local frame of every atom from the first geometry."""
+    first_geometry = Atoms(
+        [
+            Atom(get_characters(atom_name), *xyz)
+            for atom_name, xyz in zip(atom_names, coordinates[0])
+        ]
+    )
+    return first_geometry.alf_dict(calculate_alf_cahn_ingold_prelog)
+
+
+def _true_values(
+    atom_names: List[str],
+    coordinates: np.ndarray,
+    global_properties: Dict[str, Dict[str, np.ndarray]],
+    alf: Dict[str, ALF],
+    atoms: List[str],
+    types: List[str],
+) -> pd.DataFrame:
+    """Calculates the true (local) values of `types` from the global properties. The multipole moments
+    of each rank are rotated into the atomic local frame for all points at once."""
+
+    true = {}
+    for atom in atoms:
+        atom_properties = global_properties[atom]
+        ranks = {_multipole_rank(type_) for type_ in types} - {None, 0}
+        local_multipoles = {}
+        if ranks:
+            C = calculate_c_matrices_from_coordinates(coordinates, alf[atom])
+            for rank in ranks:
+                names = [name for name in multipole_names if int(name[1]) == rank]
+                rotated = rotate_spherical_multipole(
+                    np.stack([atom_properties[name] for name in names], axis=-1),
+                    C,
+                    rank,
+                )
+                local_multipoles.update(zip(names, rotated.T))
+
+        true[atom] = {
+            type_: local_multipoles.get(type_, atom_properties.get(type_))
+            for type_ in types
+        }
+
+    return pd.DataFrame(true)
+
+
+def _predicted_values(
+    models: Models,
+    coordinates: np.ndarray,
+    atoms: List[str],
+    types: List[str],
+) -> pd.DataFrame:
+    """Predicts `types` of `atoms` for all geometries. The features of every atom are only calculated
+    once and are used for all of the atom's models."""
+
+    predicted = {}
+    for atom in atoms:
+        atom_models = [model for model in models[atom] if model.type in types]
+        if not atom_models:
+            continue
+        features = calculate_alf_features_from_coordinates(
+            coordinates, atom_models[0].alf
+        )
+        predicted[atom] = {model.type: model.predict(features) for model in atom_models}
+
+    return pd.DataFrame(predicted)
 
 
 def get_predicted(
     models: Models,
-    points: ListOfAtoms,
+    points: ValidationSet,
     atoms: Optional[List[str]] = None,
     types: Optional[List[str]] = None,
+    db_type: Optional[str] = None,
 ) -> pd.DataFrame:
     """
     Returns the predicted values for a given ListOfAtoms given Models
 
     :param models: the models to use for predicting the values of points
-    :param points: a ListOfAtoms containing geometries to predict
+    :param points: a ListOfAtoms or PointsDirectory containing geometries to predict, or the
+        path to a PointsDirectory, SQLite or JSON database
     :param atoms: optional list of atoms to predict the values of points for, defaults to all atoms in models
     :param types: optional list of property types, such as iqa, q00, etc.
         to predict the values of points for, defaults to all types in models
-    :return: predictions of points given models as a ModelsResult
+    :param db_type: The type of database ("sqlite" or "json") if `points` is a path to a database,
+        by default it is determined from the path
+    :return: predictions of points given models as a DataFrame with atoms as columns and types as rows
     """
     if atoms is None:
         atoms = models.atom_names
     if types is None:
         types = models.types
 
-    predicted = {}
-    for atom in atoms:
-        predicted[atom] = {}
-        for type_ in types:
-            predicted[atom][type_] = models[atom][type_].predict(points).array()
+    _, coordinates, _ = _load_validation_set(points, atoms, [], db_type)
 
-    return pd.DataFrame(predicted)
+    return _predicted_values(models, coordinates, atoms, types)
 
 
 def get_true(
-    validation_set: PointsDirectory, atoms: List[str], types: List[str]
+    validation_set: ValidationSet,
+    atoms: List[str],
+    types: List[str],
+    alf: Optional[Dict[str, ALF]] = None,
+    db_type: Optional[str] = None,
 ) -> pd.DataFrame:
     """
-    Returns the true values for a given PointsDirectory as a ModelsResult
+    Returns the true values for a given PointsDirectory. Only the properties which are needed are read in.
 
-    :param validation_set: the PointsDirectory containing the true values
+    :param validation_set: the PointsDirectory containing the true values, or the path to a
+        PointsDirectory, SQLite or JSON database
     :param atoms: List of atoms to get the true values for
     :param types: List of property types, such as iqa, q00, etc. to get the true values for
-    :return: ModelsResult containing the true values requested from the validation set
+    :param alf: optional dictionary of atom names and the atomic local frames used to rotate the multipole
+        moments, defaults to the Cahn-Ingold-Prelog ALF of the first point
+    :param db_type: The type of database ("sqlite" or "json") if `validation_set` is a path to a database,
+        by default it is determined from the path
+    :return: DataFrame with atoms as columns and types as rows containing the true values requested from the validation set
     """
-    true = {}
-    for atom in atoms:
-        true[atom] = {}
-        for type_ in types:
-            true[atom][type_] = np.array(getattr(validation_set[atom], type_))
 
-    return pd.DataFrame(true)
+    atom_names, coordinates, global_properties = _load_validation_set(
+        validation_set, atoms, types, db_type
+    )
+    if alf is None:
+        alf = _default_alf(atom_names, coordinates)
+
+    return _true_values(atom_names, coordinates, global_properties, alf, atoms, types)
 
 
 def get_true_predicted(
     models: Models,
-    validation_set: PointsDirectory,
+    validation_set: ValidationSet,
     atoms: Optional[List[str]] = None,
     types: Optional[List[str]] = None,
+    db_type: Optional[str] = None,
 ) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """
     Returns the true and predicted values of the given model and
         validation set for each of the specified atoms and types
 
+    The validation set is read in once (only the coordinates and the properties in `types`), the features of
+    every atom are calculated once for all points and the multipole moments are rotated into the atomic local
+    frames of the models.
+
     :param models: models to use for the predictions
-    :param validation_set: validation set containing geometry data and true values
+    :param validation_set: validation set containing geometry data and true values, a PointsDirectory or the
+        path to a PointsDirectory, SQLite or JSON database
     :param atoms: optional list of atoms to predict, defaults to all atoms found in model_location
     :param types: optional list of types to predict, such as iqa, q00, etc.
         Defaults to all types found in model_location
-    :return: ModelsResult for true and predicted values from the models and validation set provided
+    :param db_type: The type of database ("sqlite" or "json") if `validation_set` is a path to a database,
+        by default it is determined from the path
+    :return: DataFrames for true and predicted values from the models and validation set provided
     """
     if atoms is None:
         atoms = models.atom_names
     if types is None:
         types = models.types
 
-    true = get_true(validation_set, atoms, types)
-    predicted = get_predicted(models, validation_set, atoms, types)
+    atom_names, coordinates, global_properties = _load_validation_set(
+        validation_set, atoms, types, db_type
+    )
+
+    true = _true_values(
+        atom_names, coordinates, global_properties, models.alf_dict, atoms, types
+    )
+    predicted = _predicted_values(models, coordinates, atoms, types)
 
     return true, predicted
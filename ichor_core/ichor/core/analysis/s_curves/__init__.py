@@ -1,4 +1,23 @@
 from ichor.core.analysis.s_curves.compact_s_curves import calculate_compact_s_curves
+from ichor.core.analysis.s_curves.percentile_s_curves import (
+    iter_s_curves,
+    percentile_grid,
+    plot_s_curves,
+    s_curve_errors,
+    SCurve,
+    write_s_curves,
+    write_s_curves_to_excel,
+)
 from ichor.core.analysis.s_curves.s_curves import calculate_s_curves
 
-__all__ = ["calculate_compact_s_curves", "calculate_s_curves"]
+__all__ = [
+    "calculate_compact_s_curves",
+    "calculate_s_curves",
+    "iter_s_curves",
+    "percentile_grid",
+    "plot_s_curves",
+    "s_curve_errors",
+    "SCurve",
+    "write_s_curves",
+    "write_s_curves_to_excel",
+]
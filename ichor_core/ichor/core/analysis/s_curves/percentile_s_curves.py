@@ -0,0 +1,475 @@
+from itertools import groupby
+from pathlib import Path
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Union
+
+import numpy as np
+import pandas as pd
+from ichor.core.common.constants import ha_to_kj_mol
+from ichor.core.common.excel import num2col
+from ichor.core.common.sorting import ignore_alpha
+from natsort import natsorted
+
+# the name used for the S-curve of the summed errors of all atoms
+total_name = "Total"
+
+excel_suffixes = (".xlsx",)
+csv_suffixes = (".csv",)
+parquet_suffixes = (".parquet",)
+plot_suffixes = (".png", ".svg", ".pdf")
+
+
+class SCurve(NamedTuple):
+    """The S-curve of one property of one atom, the absolute prediction errors at a fixed grid of percentiles.
+
+    :param type_: The property, e.g. iqa, q00
+    :param atom: The atom name, or `total_name` for the summed errors of all atoms
+    :param percentiles: Array of percentiles (between 0 and 100)
+    :param errors: Array containing the absolute prediction error at every percentile
+    :param npoints: The number of points of the validation set
+    :param rmse: The root mean squared error of all points
+    :param mae: The mean absolute error of all points
+    """
+
+    type_: str
+    atom: str
+    percentiles: np.ndarray
+    errors: np.ndarray
+    npoints: int
+    rmse: float
+    mae: float
+
+
+def percentile_grid(npercentiles: int = 200) -> np.ndarray:
+    """Returns an evenly spaced grid of percentiles which ends at 100%, e.g. [0.5, 1.0, ..., 100.0]
+
+    :param npercentiles: The number of percentiles in the grid
+    """
+    return np.linspace(100 / npercentiles, 100, npercentiles)
+
+
+def s_curve_errors(errors: np.ndarray, percentiles: np.ndarray) -> np.ndarray:
+    """Returns the absolute errors at the given percentiles. These are the same values as in the
+    S-curve made from all sorted errors, where the i-th smallest error (1-indexed) is at (100 * i / npoints)%,
+    but only the errors at the given percentiles are found (with `np.partition`) instead of sorting all errors.
+
+    :param errors: Array of shape n_points containing the prediction errors
+    :param percentiles: Array of percentiles (between 0 and 100)
+    :return: Array of the same shape as `percentiles`
+    """
+
+    errors = np.abs(np.asarray(errors, dtype=float))
+    npoints = len(errors)
+    if npoints == 0:
+        return np.full(len(percentiles), np.nan)
+
+    # the index of the smallest error which is at or above the percentile
+    indices = np.ceil(np.asarray(percentiles) * npoints / 100 - 1e-9).astype(int) - 1
+    indices = np.clip(indices, 0, npoints - 1)
+
+    return np.partition(errors, np.unique(indices))[indices]
+
+
+def _make_s_curve(
+    type_: str, atom: str, errors: np.ndarray, percentiles: np.ndarray
+) -> SCurve:
+    npoints = len(errors)
+    return SCurve(
+        type_,
+        atom,
+        percentiles,
+        s_curve_errors(errors, percentiles),
+        npoints,
+        float(np.sqrt(np.mean(errors**2))) if npoints else np.nan,
+        float(np.mean(errors)) if npoints else np.nan,
+    )
+
+
+def iter_s_curves(
+    true: pd.DataFrame,
+    predicted: pd.DataFrame,
+    percentiles: Optional[np.ndarray] = None,
+    total: bool = True,
+) -> Iterator[SCurve]:
+    """Yields the S-curves of every property and atom one at a time, so that they can be written out without
+    keeping all errors in memory. The properties are in sorted order and the atoms of a property are
+    yielded together, followed by the S-curve of the summed absolute errors of all atoms. IQA errors are in kJ mol-1.
+
+    :param true: The true values, as returned by `get_true_predicted` (atoms as columns, types as rows)
+    :param predicted: The predicted values, as returned by `get_true_predicted`
+    :param percentiles: The percentiles at which to calculate the errors, defaults to `percentile_grid()`.
+        The size of the S-curves only depends on the number of percentiles, not on the number of points.
+    :param total: Whether to also yield the S-curve of the summed errors of all atoms, default True
+    """
+
+    if percentiles is None:
+        percentiles = percentile_grid()
+    percentiles = np.asarray(percentiles, dtype=float)
+
+    atoms = natsorted(
+        [atom for atom in true.columns if atom in predicted.columns], key=ignore_alpha
+    )
+    types = sorted(type_ for type_ in true.index if type_ in predicted.index)
+
+    for type_ in types:
+        total_errors = None
+        for atom in atoms:
+            errors = np.abs(
+                np.asarray(true[atom][type_], dtype=float)
+                - np.asarray(predicted[atom][type_], dtype=float)
+            )
+            # iqa predictions are in Hartrees, convert to kJ mol-1
+            if type_ == "iqa":
+                errors *= ha_to_kj_mol
+            total_errors = errors if total_errors is None else total_errors + errors
+            yield _make_s_curve(type_, atom, errors, percentiles)
+        if total and total_errors is not None:
+            yield _make_s_curve(type_, total_name, total_errors, percentiles)
+
+
+def s_curves_to_dataframe(s_curves: Iterable[SCurve]) -> pd.DataFrame:
+    """Returns a long format DataFrame with the columns property, atom, percentile and error,
+    which has one row per percentile of every S-curve."""
+
+    s_curves = list(s_curves)
+    return pd.DataFrame(
+        {
+            "property": np.repeat(
+                [c.type_ for c in s_curves], [len(c.errors) for c in s_curves]
+            ),
+            "atom": np.repeat(
+                [c.atom for c in s_curves], [len(c.errors) for c in s_curves]
+            ),
+            "percentile": np.concatenate([c.percentiles for c in s_curves])
+            if s_curves
+            else [],
+            "error": np.concatenate([c.errors for c in s_curves]) if s_curves else [],
+        }
+    )
+
+
+def s_curves_summary(s_curves: Iterable[SCurve]) -> pd.DataFrame:
+    """Returns a DataFrame containing the number of points, RMSE and MAE of every S-curve."""
+    return pd.DataFrame(
+        [(c.type_, c.atom, c.npoints, c.rmse, c.mae) for c in s_curves],
+        columns=["property", "atom", "npoints", "rmse", "mae"],
+    )
+
+
+def _summarised(s_curves: Iterable[SCurve], summary: List[SCurve]) -> Iterator[SCurve]:
+    """Yields the S-curves and appends a copy of each S-curve without its errors to `summary`, so that
+    the summary can be made after the S-curves have been written without keeping them in memory."""
+    for s_curve in s_curves:
+        summary.append(s_curve._replace(percentiles=None, errors=None))
+        yield s_curve
+
+
+def _write_s_curves_to_csv(s_curves: Iterable[SCurve], output_name: Path):
+    """Appends the long format table (see `s_curves_to_dataframe`) of each S-curve to a .csv file."""
+    with open(output_name, "w", newline="") as f:
+        s_curves_to_dataframe([]).to_csv(f, index=False)
+        for s_curve in s_curves:
+            s_curves_to_dataframe([s_curve]).to_csv(f, header=False, index=False)
+
+
+def _write_s_curves_to_parquet(s_curves: Iterable[SCurve], output_name: Path):
+    """Writes the long format table (see `s_curves_to_dataframe`) of each S-curve as a row group of a .parquet file."""
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema(
+        [
+            ("property", pa.string()),
+            ("atom", pa.string()),
+            ("percentile", pa.float64()),
+            ("error", pa.float64()),
+        ]
+    )
+    with pq.ParquetWriter(output_name, schema) as writer:
+        for s_curve in s_curves:
+            writer.write_table(
+                pa.Table.from_pandas(
+                    s_curves_to_dataframe([s_curve]),
+                    schema=schema,
+                    preserve_index=False,
+                )
+            )
+
+
+def _accepted_kwargs(function, kwargs: dict) -> dict:
+    """Returns the key word arguments which are parameters of `function`."""
+
+    import inspect
+
+    parameters = inspect.signature(function).parameters
+    return {key: value for key, value in kwargs.items() if key in parameters}
+
+
+def write_s_curves_to_excel(
+    s_curves: Iterable[SCurve],
+    output_name: Union[str, Path] = "s-curves.xlsx",
+    x_axis_name: str = "Absolute Prediction Error",
+    x_log_scale: bool = True,
+    x_major_gridlines_visible: bool = True,
+    x_minor_gridlines_visible: bool = True,
+    x_axis_major_gridline_width: int = 0.75,
+    x_axis_major_gridline_color: str = "#F2F2F2",
+    y_axis_name: str = "%",
+    y_min: int = 0,
+    y_max: int = 100,
+    y_major_gridlines_visible: bool = True,
+    y_minor_gridlines_visible: bool = False,
+    y_axis_major_gridline_width: int = 0.75,
+    y_axis_major_gridline_color: str = "#BFBFBF",
+    show_legend: bool = False,
+    excel_style: int = 10,
+):
+    """
+    Writes S-curves to an excel file, with one sheet for every property. A sheet contains the RMSE and MAE
+    of every atom, the errors of all atoms at every percentile, a chart which overlaps the S-curves of all atoms
+    and a chart of the total S-curve. The workbook is written in xlsxwriter's `constant_memory` mode,
+    so rows are written out as soon as they are made.
+
+    :param s_curves: The S-curves to write, see `iter_s_curves`. The S-curves of a property must be consecutive.
+    :param output_name: The name of the excel file to be written out.
+    :param x_axis_name: The title to be used for x-axis in the S-curves plot.
+    :param x_log_scale: Whether to make x dimension log scaled. Default True.
+    :param x_major_gridlines_visible: Whether to show major gridlines along x. Default True.
+    :param x_minor_gridlines_visible: Whether to show minor gridlines along x. Default True.
+    :param x_axis_major_gridline_width: The width to use for the major gridlines. Default is 0.75.
+    :param x_axis_major_gridline_color: Color to use for gridlines. Default is "#F2F2F2".
+    :param y_axis_name: The title to be used for the y-axis in the S-curves plot.
+    :param y_min: The minimum percentage value to show.
+    :param y_max: The maximum percentage value to show.
+    :param y_major_gridlines_visible: Whether to show major gridlines along y. Default True.
+    :param y_minor_gridlines_visible: Whether to show minor gridlines along y. Default False.
+    :param y_axis_major_gridline_width: The width to use for the major gridlines. Default is 0.75.
+    :param y_axis_major_gridline_color: Color to use for gridlines. Default is "#BFBFBF".
+    :param show_legend: Whether to show legend on the plot. Default False.
+    :param excel_style: The style which excel uses for the plots.
+        Default is 10, which is the default style used by excel.
+    """
+
+    import xlsxwriter
+    from ichor.core.analysis.s_curves.s_curves import make_chart_settings
+
+    # use the key word arguments to construct the settings used for x and y axes
+    x_axis_settings, y_axis_settings = make_chart_settings(locals())
+
+    # rows of the statistics above the S-curve data
+    stats_rows = ("npoints", "rmse", "mae")
+    header_row = len(stats_rows) + 2
+    first_data_row = header_row + 1
+
+    with xlsxwriter.Workbook(str(output_name), {"constant_memory": True}) as workbook:
+        for type_, property_s_curves in groupby(s_curves, key=lambda c: c.type_):
+            property_s_curves = list(property_s_curves)
+            percentiles = property_s_curves[0].percentiles
+            last_data_row = first_data_row + len(percentiles) - 1
+
+            sheet = workbook.add_worksheet(type_)
+
+            # in constant memory mode, the rows have to be written in order
+            sheet.write_row(0, 1, [c.atom for c in property_s_curves])
+            for row, stat in enumerate(stats_rows, start=1):
+                sheet.write(row, 0, stat)
+                sheet.write_row(
+                    row,
+                    1,
+                    [
+                        getattr(c, stat) if np.isfinite(getattr(c, stat)) else ""
+                        for c in property_s_curves
+                    ],
+                )
+            sheet.write(header_row, 0, "%")
+            sheet.write_row(header_row, 1, [c.atom for c in property_s_curves])
+            for i, percentile in enumerate(percentiles):
+                sheet.write(first_data_row + i, 0, percentile)
+                sheet.write_row(
+                    first_data_row + i,
+                    1,
+                    [
+                        c.errors[i] if np.isfinite(c.errors[i]) else ""
+                        for c in property_s_curves
+                    ],
+                )
+
+            atomic_s_curve = workbook.add_chart(
+                {"type": "scatter", "subtype": "straight"}
+            )
+            total_s_curve = None
+
+            for col, s_curve in enumerate(property_s_curves, start=1):
+                series = {
+                    "name": s_curve.atom,
+                    # starting row idx, starting col idx, ending row idx, ending col idx
+                    "categories": [type_, first_data_row, col, last_data_row, col],
+                    "values": [type_, first_data_row, 0, last_data_row, 0],
+                    "line": {"width": 1.5},
+                }
+                if s_curve.atom == total_name:
+                    total_s_curve = workbook.add_chart(
+                        {"type": "scatter", "subtype": "straight"}
+                    )
+                    total_s_curve.add_series(series)
+                else:
+                    atomic_s_curve.add_series(series)
+
+            chart_col = num2col(len(property_s_curves) + 3)
+
+            # Configure graph with overlapping S-curves for all atoms
+            atomic_s_curve.set_x_axis(x_axis_settings)
+            atomic_s_curve.set_y_axis(y_axis_settings)
+            if show_legend:
+                atomic_s_curve.set_legend({"position": "right"})
+            else:
+                atomic_s_curve.set_legend({"position": "none"})
+            atomic_s_curve.set_style(excel_style)
+            atomic_s_curve.set_title({"name": "Individual Atom S-Curve"})
+            sheet.insert_chart(f"{chart_col}2", atomic_s_curve)
+
+            # Configure total prediction error S-curve
+            if total_s_curve is not None:
+                total_s_curve.set_x_axis(x_axis_settings)
+                total_s_curve.set_y_axis(y_axis_settings)
+                total_s_curve.set_legend({"position": "none"})
+                total_s_curve.set_style(excel_style)
+                total_s_curve.set_title({"name": "Total S-Curve"})
+                sheet.insert_chart(f"{chart_col}18", total_s_curve)
+
+
+def plot_s_curves(
+    s_curves: Iterable[SCurve],
+    output_name: Union[str, Path] = "s_curves.png",
+    x_axis_name: str = "Absolute Prediction Error",
+    y_axis_name: str = "%",
+    show_legend: bool = True,
+    dpi: int = 150,
+):
+    """Plots the S-curves with matplotlib, with one subplot for every property, and saves the figure.
+
+    :param s_curves: The S-curves to plot, see `iter_s_curves`. The S-curves of a property must be consecutive.
+    :param output_name: The name of the image, the format is taken from the suffix (e.g. .png, .svg, .pdf)
+    :param x_axis_name: The title to be used for the x-axes
+    :param y_axis_name: The title to be used for the y-axes
+    :param show_legend: Whether to show a legend of the atom names next to the subplots. Default True.
+    :param dpi: The resolution of the image. Default 150.
+    """
+
+    # a Figure is made directly instead of with pyplot, so no GUI backend is needed
+    # and the backend of the caller (e.g. a notebook) is not changed
+    from matplotlib.figure import Figure
+
+    grouped = [
+        (type_, list(property_s_curves))
+        for type_, property_s_curves in groupby(s_curves, key=lambda c: c.type_)
+    ]
+    nplots = max(1, len(grouped))
+    ncols = min(4, nplots)
+    nrows = int(np.ceil(nplots / ncols))
+
+    fig = Figure(figsize=(4 * ncols, 3 * nrows))
+    axes = fig.subplots(nrows, ncols, squeeze=False, sharey=True)
+
+    for ax, (type_, property_s_curves) in zip(axes.flat, grouped):
+        for s_curve in property_s_curves:
+            if s_curve.atom == total_name:
+                ax.plot(
+                    s_curve.errors,
+                    s_curve.percentiles,
+                    color="black",
+                    linestyle="--",
+                    label=s_curve.atom,
+                )
+            else:
+                ax.plot(s_curve.errors, s_curve.percentiles, label=s_curve.atom)
+        ax.set_xscale("log")
+        ax.set_title(type_)
+        ax.set_xlabel(x_axis_name)
+        ax.set_ylim(0, 100)
+        ax.grid(which="major", color="#DDDDDD")
+
+    for ax in axes[:, 0]:
+        ax.set_ylabel(y_axis_name)
+    # remove unused subplots
+    for ax in list(axes.flat)[len(grouped) :]:
+        ax.remove()
+
+    # the atoms are the same for every property, so one legend is made for the whole figure
+    if show_legend and grouped:
+        handles, labels = axes.flat[0].get_legend_handles_labels()
+        fig.legend(handles, labels, loc="center right", fontsize="small")
+        fig.tight_layout(rect=(0.0, 0.0, 0.9, 1.0))
+    else:
+        fig.tight_layout()
+    fig.savefig(output_name, dpi=dpi)
+
+
+def write_s_curves(
+    true: pd.DataFrame,
+    predicted: pd.DataFrame,
+    output_name: Union[str, Path] = "s-curves.xlsx",
+    percentiles: Optional[np.ndarray] = None,
+    **kwargs,
+) -> pd.DataFrame:
+    """Calculates the S-curves at a fixed grid of percentiles and writes them out. The S-curves are
+    written as they are calculated, so the errors of only one atom are in memory at a time.
+    The output format is taken from the suffix of `output_name`:
+
+    - .xlsx an excel file with charts, see `write_s_curves_to_excel`
+    - .csv or .parquet a long format table, see `s_curves_to_dataframe`, and a table of RMSE and MAE
+      of every S-curve, which is written to a file with `_summary` added to the name
+    - .png, .svg or .pdf a figure, see `plot_s_curves`
+
+    :param true: The true values, as returned by `get_true_predicted`
+    :param predicted: The predicted values, as returned by `get_true_predicted`
+    :param output_name: The name of the file to write
+    :param percentiles: The percentiles at which to calculate the errors, defaults to `percentile_grid()`
+    :param kwargs: Key word arguments passed to `write_s_curves_to_excel` or `plot_s_curves`. Only the
+        key word arguments of the function used for the output format are passed, e.g. the excel chart settings
+        are ignored when a figure is written.
+    :raises ValueError: If the suffix of `output_name` is not supported
+    :raises TypeError: If a key word argument is not a parameter of `write_s_curves_to_excel` or `plot_s_curves`
+    :return: A DataFrame containing the number of points, RMSE and MAE of every S-curve, see `s_curves_summary`
+    """
+
+    output_name = Path(output_name)
+    suffix = output_name.suffix.lower()
+
+    supported_suffixes = (
+        excel_suffixes + csv_suffixes + parquet_suffixes + plot_suffixes
+    )
+    if suffix not in supported_suffixes:
+        raise ValueError(
+            f"Cannot write S-curves to '{output_name}', supported formats are {supported_suffixes}."
+        )
+
+    unknown_kwargs = set(kwargs) - set(
+        _accepted_kwargs(write_s_curves_to_excel, kwargs)
+    ).union(_accepted_kwargs(plot_s_curves, kwargs))
+    if unknown_kwargs:
+        raise TypeError(
+            f"write_s_curves() got unexpected key word arguments {sorted(unknown_kwargs)}."
+        )
+
+    summary = []
+    s_curves = _summarised(iter_s_curves(true, predicted, percentiles), summary)
+
+    if suffix in excel_suffixes:
+        write_s_curves_to_excel(
+            s_curves, output_name, **_accepted_kwargs(write_s_curves_to_excel, kwargs)
+        )
+    elif suffix in plot_suffixes:
+        plot_s_curves(s_curves, output_name, **_accepted_kwargs(plot_s_curves, kwargs))
+    else:
+        summary_name = output_name.with_name(
+            f"{output_name.stem}_summary{output_name.suffix}"
+        )
+        if suffix in csv_suffixes:
+            _write_s_curves_to_csv(s_curves, output_name)
+            s_curves_summary(summary).to_csv(summary_name, index=False)
+        else:
+            _write_s_curves_to_parquet(s_curves, output_name)
+            s_curves_summary(summary).to_parquet(summary_name, index=False)
+
+    return s_curves_summary(summary)
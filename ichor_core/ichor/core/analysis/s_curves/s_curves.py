@@ -6,7 +6,6 @@ import pandas as pd
 from ichor.core.analysis.predictions import get_true_predicted
 from ichor.core.common.constants import ha_to_kj_mol
 from ichor.core.common.excel import num2col
-from ichor.core.files import PointsDirectory
 from ichor.core.models import Models
 
 
@@ -69,31 +68,47 @@ def calculate_s_curves(
     output_location: Path,
     atoms: Optional[List[str]] = None,
     types: Optional[List[str]] = None,
+    db_type: Optional[str] = None,
+    percentile_s_curves: bool = False,
     **kwargs,
 ):
     """
     Calculates S-curves used to check model prediction performance.
-    Writes the S-curves to an excel file.
+    Writes the S-curves to an excel file, see `write_to_excel`. If `percentile_s_curves` is True,
+    the S-curves are instead written at a fixed grid of percentiles to an excel file (or a .csv, .parquet
+    or image file, depending on the suffix of `output_location`), see `write_s_curves`.
 
     :param model_location: A directory containing model files ``.model``
-    :param validation_set_location: A directory containing validation or test set points.
-        These points should NOT be in the training set.
+    :param validation_set_location: A directory containing validation or test set points, or
+        a SQLite or JSON database of the points. These points should NOT be in the training set.
     :param atoms: A list of atom names, eg. O1, H2, C3, etc. for which to make S-curves.
         S-curves are made for all atoms in the system by default.
     :param types: A list of property types, such as iqa, q00, etc. for which to make S-curves.
         S-curves are made for all properties in the model files.
+    :param db_type: The type of database ("sqlite" or "json") if the validation set is a database,
+        by default it is determined from the path
+    :param percentile_s_curves: Whether to write the S-curves at a fixed grid of percentiles with
+        `write_s_curves` instead of writing every point with `write_to_excel`, defaults to False
     :param kwargs: Any key word arguments that can be passed into the write_to_excel function
-        to change how the S-curves excel file looks. See write_to_excel() method
+        to change how the S-curves excel file looks. See write_to_excel() method.
+        If `percentile_s_curves` is True, the key word arguments are passed to write_s_curves() instead,
+        e.g. the percentiles.
     """
 
     if model_location is None or validation_set_location is None:
         raise ValueError("Enter valid locations for models and validation sets.")
 
     model = Models(model_location)
-    validation_set = PointsDirectory(validation_set_location)
-    true, predicted = get_true_predicted(model, validation_set, atoms, types)
+    true, predicted = get_true_predicted(
+        model, validation_set_location, atoms, types, db_type
+    )
 
-    write_to_excel(true, predicted, output_location, **kwargs)
+    if percentile_s_curves:
+        from ichor.core.analysis.s_curves.percentile_s_curves import write_s_curves
+
+        write_s_curves(true, predicted, output_location, **kwargs)
+    else:
+        write_to_excel(true, predicted, output_location, **kwargs)
 
 
 def write_to_excel(
@@ -205,8 +220,8 @@ def write_to_excel(
                 writer.sheets[sheet_name].insert_chart("G2", s_curve)
 
             # also make a sheet with total errors for the whole system (for every property)
-            df = pd.DataFrame(error[type_])
-            df["Total"] = error[type_].reduce()
+            df = pd.DataFrame({atom: error[type_][atom] for atom in atom_names})
+            df["Total"] = df.sum(axis=1)
             df.sort_values("Total", inplace=True)
             ndata = len(df["Total"])
             df["%"] = percentile(ndata)
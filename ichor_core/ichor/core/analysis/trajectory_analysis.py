@@ -1,7 +1,6 @@
 from pathlib import Path
 from typing import List, Optional, Union
 
-import matplotlib.pyplot as plt
 import numpy as np
 from ichor.core.calculators import default_connectivity_calculator
 from ichor.core.common.pairwise import pairwise
@@ -45,29 +44,55 @@ class TrajectoryAnalysis(ReadFile):
     def _read_file(self):
         self.trajectory._read_file()
 
+    def _read_natoms(self) -> int:
+        """Reads the number of atoms from the header of the trajectory, so that it is known even if the
+        trajectory contains no frames. An .xyz file without any frames has no header, so 0 is returned."""
+
+        if isinstance(self.trajectory, DlPolyHistory):
+            return self.trajectory.history_index.number_of_atoms
+
+        with open(self.trajectory.path, "r") as f:
+            for line in f:
+                if line.strip():
+                    return int(line)
+        return 0
+
+    def _iter_coordinates(self, chunk_ntimesteps: int = 1000):
+        """Yields the coordinates of the trajectory in chunks of shape chunk_ntimesteps x natoms x 3.
+        HISTORY files are streamed, so that the geometries do not need to be read in as `Atoms` instances."""
+
+        if isinstance(self.trajectory, DlPolyHistory):
+            for frames in self.trajectory.iter_frames(chunk_ntimesteps):
+                yield frames.coordinates
+        elif len(self.trajectory) > 0:
+            yield self.trajectory.coordinates
+
     def _compute_distances_vectors(self):
         """
         Computes the distance between atoms for each timestep and stores.
         The diagonal is not needed because that contains 0.0 values, additionally
         only half of the distance matrix is needed because it is symmetric
         """
-        d = np.zeros(
-            (len(self.trajectory), self.trajectory.natoms, self.trajectory.natoms)
-        )
-
-        for i, t in enumerate(self.trajectory):
-            d[i] = Distance.euclidean_distance(t.coordinates, t.coordinates)
 
+        self._natoms = self._read_natoms()
         # indices of the upper triangular matrix but without the main diagonal
         # the main diagonal only has 0.0 in it because it is distance of atom from itself
         # only need to get these once because they remain the same
-        indices = np.triu_indices_from(d[0], k=1)
+        indices = np.triu_indices(self._natoms, k=1)
+
+        distances = []
 
-        # grab the upper triangular part as a vector
-        # store into a ntimesteps x ndistances matrix
-        d2 = np.array([tmp[indices] for tmp in d])
+        for coordinates in self._iter_coordinates():
+            # vectors between all pairs of atoms (in the upper triangle) for all timesteps
+            diff = coordinates[:, indices[0]] - coordinates[:, indices[1]]
+            # store into a ntimesteps x ndistances matrix
+            distances.append(np.linalg.norm(diff, axis=-1))
 
-        return d2
+        # the trajectory does not contain any frames
+        if not distances:
+            return np.empty((0, len(indices[0])))
+
+        return np.concatenate(distances)
 
     def delta_dirac(self, r0: float, r1: float) -> int:
         """
@@ -107,8 +132,8 @@ class TrajectoryAnalysis(ReadFile):
 
         r = self.r(nbins, max_dist)
 
-        natoms = self.trajectory.natoms
-        ntimesteps = len(self.trajectory)
+        natoms = self._natoms
+        ntimesteps = self.distances_vectors.shape[0]
 
         for pair in pairwise(r):
             distribution = self.delta_dirac(pair[0], pair[1])
@@ -135,6 +160,8 @@ class TrajectoryAnalysis(ReadFile):
 
         """
 
+        import matplotlib.pyplot as plt
+
         r = self.r(nbins, max_dist)
 
         if ax is None:
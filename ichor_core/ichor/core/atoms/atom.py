@@ -79,6 +79,9 @@ class Atom(VarReprMixin, Coordinates3D):
     def index(self, idx: int):
         """Sets the index of the atom (this is 1-indexed by default)."""
         self._index = idx
+        # the name of the atom changes, so the parent has to find atoms by name again
+        if self._parent is not None:
+            self._parent._reset_name_index()
 
     @property
     def parent(self) -> "ichor.core.atoms.Atoms":  # noqa F821
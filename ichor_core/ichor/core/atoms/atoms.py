@@ -17,10 +17,16 @@ class Atoms(list):
     of the Atoms instances will hold 6 instances of the Atom class.
     """
 
+    # maps atom names to their position in self, so that indexing by name does not
+    # have to go through all atoms. It is made when first needed and is reset
+    # whenever self is modified (see `_reset_name_index`)
+    _name_index: Optional[Dict[str, int]] = None
+
     def __init__(self, atoms: Optional[Sequence[Atom]] = None):
         super().__init__()
         self._centred = False
         self._counter = it.count(1)
+        self._name_index = None
         if atoms is not None:
             for atom in atoms:
                 self.add(atom)
@@ -36,9 +42,69 @@ class Atoms(list):
         """Appends an `Atom` instance to self."""
         atom.parent = self
         if atom._index is None:
-            atom.index = next(self._counter)
+            atom._index = next(self._counter)
+        if self._name_index is not None:
+            self._name_index.setdefault(atom.name, len(self))
         super().append(atom)
 
+    def _reset_name_index(self):
+        """Resets the map from atom names to positions, so that it is made again the
+        next time an atom is indexed by name. This needs to be called whenever
+        atoms are added/removed/reordered or when the name of an atom changes."""
+        self._name_index = None
+
+    def index_of(self, atom_name: str) -> int:
+        """Returns the position (0-indexed) of the atom with the given name in self.
+
+        :param atom_name: The name of the atom, e.g. C1
+        :raises KeyError: If there is no atom with the given name
+        """
+        if self._name_index is None:
+            name_index = {}
+            for i, atom in enumerate(self):
+                name_index.setdefault(atom.name, i)
+            self._name_index = name_index
+        try:
+            return self._name_index[atom_name.capitalize()]
+        except KeyError:
+            raise KeyError(f"Atom '{atom_name}' does not exist") from None
+
+    def extend(self, atoms):
+        self._reset_name_index()
+        super().extend(atoms)
+
+    def insert(self, i, atom: Atom):
+        self._reset_name_index()
+        super().insert(i, atom)
+
+    def pop(self, i=-1) -> Atom:
+        self._reset_name_index()
+        return super().pop(i)
+
+    def remove(self, atom: Atom):
+        self._reset_name_index()
+        super().remove(atom)
+
+    def clear(self):
+        self._reset_name_index()
+        super().clear()
+
+    def sort(self, *args, **kwargs):
+        self._reset_name_index()
+        super().sort(*args, **kwargs)
+
+    def reverse(self):
+        self._reset_name_index()
+        super().reverse()
+
+    def __setitem__(self, i, atom):
+        self._reset_name_index()
+        super().__setitem__(i, atom)
+
+    def __iadd__(self, atoms):
+        self._reset_name_index()
+        return super().__iadd__(atoms)
+
     def copy(self) -> "Atoms":
         """Creates a new atoms instance (different object) from the current `Atoms` instance."""
         new = Atoms()
@@ -274,16 +340,17 @@ class Atoms(list):
 
         return np.dot(V, W)
 
-    def rmsd(self, other: "Atoms"):
-        if not self._centred:
-            self.centre()
-        if not other._centred:
-            other.centre()
+    def rmsd(self, other: "Atoms", mass_weighted: bool = False) -> float:
+        """Returns the RMSD between self and other after aligning them with the Kabsch algorithm.
+        Neither geometry is modified.
 
-        R = self.kabsch(other)
+        :param other: The Atoms instance to compare to
+        :param mass_weighted: Whether to weight the atoms by their masses, defaults to False
+        """
+        from ichor.core.calculators.alignment import calculate_rmsd
 
-        other.rotate(R)
-        return self._rmsd(other)
+        masses = self.masses if mass_weighted else None
+        return float(calculate_rmsd(self.coordinates, other.coordinates, masses)[0])
 
     def rotate(self, R: np.ndarray):
         """Perform a rotation in 3D space with a matrix R. This rotates all atoms in the system the same amount.
@@ -312,14 +379,11 @@ class Atoms(list):
         In the second case, atoms["C1] will return the Atom instance corresponding to atom with name C1."""
 
         if isinstance(item, str):
-            for atom in self:
-                if item.capitalize() == atom.name:
-                    return atom
-            raise KeyError(f"Atom '{item}' does not exist")
+            return super().__getitem__(self.index_of(item))
         elif isinstance(item, (list, np.ndarray, tuple)):
             if len(item) <= 0:
                 return Atoms()
-            if isinstance(item[0], (int, np.int, str)):
+            if isinstance(item[0], (int, np.integer, str)):
                 return Atoms([self[i] for i in item])
             elif isinstance(item[0], bool):
                 return Atoms(list(compress(self, item)))
@@ -334,8 +398,10 @@ class Atoms(list):
             raise TypeError(
                 f"Index {i} has to be of type int. Currently index is type {type(i)}"
             )
-        else:
-            del self[i]
+        if isinstance(i, str):
+            i = self.index_of(i)
+        self._reset_name_index()
+        super().__delitem__(i)
 
     def __str__(self):
         return "\n".join(str(atom) for atom in self)
@@ -344,20 +410,12 @@ class Atoms(list):
         return f"{self.__class__.__name__}({', '.join(repr(atom) for atom in self)})"
 
     def __sub__(self, other):
-        for i, atom in enumerate(self):
-            for jatom in other:
-                if jatom == atom:
-                    del self[i]
+        """Removes the atoms which are in other (atoms are equal if they have the same name) from self."""
+        other_names = {atom.name for atom in other}
+        self[:] = [atom for atom in self if atom.name not in other_names]
         return self
 
     def __bool__(self):
         """Atoms instance evaluates as true if it contains
         Atom instances in it. If empty, the Atoms instance evaluates to False."""
         return bool(len(self))
-
-    def _rmsd(self, other: "Atoms") -> float:
-        dist = np.sum(
-            np.sum(np.power(jatom.coordinates - iatom.coordinates, 2))
-            for iatom, jatom in zip(self, other)
-        )
-        return np.sqrt(dist / len(self))
@@ -4,7 +4,44 @@ from typing import Callable, Dict, List, Optional, Union
 
 import numpy as np
 from ichor.core.atoms.atoms import ALF, Atoms
-from ichor.core.calculators import calculate_alf_features
+from ichor.core.calculators import (
+    calculate_alf_features,
+    calculate_alf_features_from_coordinates,
+)
+from ichor.core.calculators.features.alf_features_calculator import (
+    default_distance_unit,
+)
+from ichor.core.common.units import AtomicDistance
+
+
+def _write_csv(path: Path, features: np.ndarray, headings: List[str]):
+    import pandas as pd
+
+    pd.DataFrame(features, columns=headings).to_csv(path, index=None)
+
+
+def _write_npz(path: Path, features: np.ndarray, headings: List[str]):
+    np.savez(path, features=features, headings=np.array(headings))
+
+
+def _write_parquet(path: Path, features: np.ndarray, headings: List[str]):
+    import pandas as pd
+
+    pd.DataFrame(features, columns=headings).to_parquet(path, index=False)
+
+
+_features_file_writers = {
+    "csv": _write_csv,
+    "npz": _write_npz,
+    "parquet": _write_parquet,
+}
+
+
+def _write_features_file(
+    path: Path, features: np.ndarray, headings: List[str], file_format: str
+):
+    """Writes the features of one atom, this is a module level function so that it can be run in other processes."""
+    _features_file_writers[file_format](path, features, headings)
 
 
 class ListOfAtoms(list, ABC):
@@ -126,44 +163,149 @@ class ListOfAtoms(list, ABC):
 
         return headings
 
+    def _atom_names_subset(self, atom_names: Optional[Union[str, List[str]]]):
+        """Returns all atom names if `atom_names` is None, otherwise the given atom names as a list."""
+        if atom_names is None:
+            return self.atom_names
+        elif isinstance(atom_names, str):
+            return [atom_names]
+        return list(atom_names)
+
+    def _alf_features_by_atom(
+        self,
+        atom_names: List[str],
+        alf: Union[ALF, List[ALF], Dict[str, ALF]],
+        distance_unit: AtomicDistance = default_distance_unit,
+    ) -> Dict[str, np.ndarray]:
+        """Calculates the ALF features of the given atoms for all timesteps at once, the arguments are
+        the same as the arguments of `calculate_alf_features`."""
+
+        from ichor.core.calculators import get_atom_alf
+        from ichor.core.common.constants import bohr2ang
+
+        first_timestep = getattr(self[0], "atoms", self[0])
+        # the features are calculated from coordinates in Angstroms
+        unit_conversion = np.array(
+            [
+                bohr2ang if atom.units is AtomicDistance.Bohr else 1.0
+                for atom in first_timestep
+            ]
+        )
+        coordinates = self.coordinates * unit_conversion[:, np.newaxis]
+
+        return {
+            atom_name: calculate_alf_features_from_coordinates(
+                coordinates,
+                get_atom_alf(first_timestep[atom_name], alf),
+                distance_unit,
+            )
+            for atom_name in atom_names
+        }
+
+    def features_by_atom(
+        self,
+        feature_calculator: Callable[..., np.ndarray],
+        *args,
+        atom_names: Optional[List[str]] = None,
+        **kwargs,
+    ) -> Dict[str, np.ndarray]:
+        """Returns the features of every atom for all timesteps, e.g. {"O1": array, "H2": array}.
+
+        If the feature calculator is `calculate_alf_features`, the features of an atom are calculated for all
+        timesteps at once from the coordinates array, instead of one timestep at a time.
+
+        :param feature_calculator: Calculator function to be used to calculate features
+        :param atom_names: A list of atom names for which to calculate features.
+            If None, then the features of every atom in the system are calculated.
+        :param args: positional arguments to pass to calculator function
+        :param kwargs: key word arguments to be passed to the feature calculator function
+        :return: A dictionary of atom names and arrays of shape `n_timesteps` x `n_features`
+        """
+
+        atom_names = self._atom_names_subset(atom_names)
+
+        if feature_calculator is calculate_alf_features and isinstance(
+            getattr(self[0], "atoms", self[0]), Atoms
+        ):
+            return self._alf_features_by_atom(atom_names, *args, **kwargs)
+
+        return {
+            atom_name: self[atom_name].features(feature_calculator, *args, **kwargs)
+            for atom_name in atom_names
+        }
+
     def features_to_csv(
         self,
         feature_calculator: Callable[..., np.ndarray],
         *args,
         fname: Optional[Union[str, Path]] = None,
         atom_names: Optional[List[str]] = None,
+        file_format: str = "csv",
+        ncores: int = 1,
         **kwargs,
-    ):
+    ) -> List[Path]:
         """
         Writes csv files containing features for every atom in the system.
         Optionally a list can be passed in to get csv files for only a subset of atoms.
 
+        The features of all atoms are calculated first (see `features_by_atom`), after which the files of the
+        atoms are written by a pool of processes. Writing text files is slow, so a binary file format
+        (.npz or .parquet) can be written instead, which is a lot faster to write and to read in again.
+
         :param feature_calculator: Calculator function to be used to calculate features
         :param fname: A string to be appended to the default csv file names.
             A .csv file is written out for every atom with default name ``atom_name_features.csv``
             If an fname is given, the name becomes ``fname_atom_name_features.csv``
         :param atom_names: A list of atom names for which to write csv files.
             If None, then write out the features for every atom in the system.
+        :param file_format: The format of the files, one of "csv", "npz" or "parquet", defaults to "csv".
+            The .npz files contain a ``features`` array and a ``headings`` array.
+        :param ncores: The number of processes used to write the files, defaults to 1
         :param args: positional arguments to pass to calculator function
         :param kwargs: key word arguments to be passed to the feature calculator function
+        :return: A list of the written files
         """
-        import pandas as pd
+        import concurrent.futures
 
-        # whether to write csvs for all atoms or subset
-        if atom_names is None:
-            atom_names = self.atom_names
-        elif isinstance(atom_names, str):
-            atom_names = [atom_names]
+        if file_format not in _features_file_writers:
+            raise ValueError(
+                f"Unknown file format '{file_format}', use one of {list(_features_file_writers)}."
+            )
+
+        features = self.features_by_atom(
+            feature_calculator, *args, atom_names=atom_names, **kwargs
+        )
+        headings = self.get_headings()
 
-        for atom_name in atom_names:
-            atom_features = self[atom_name].features(
-                feature_calculator, *args, **kwargs
+        paths = [
+            Path(
+                f"{atom_name}_features.{file_format}"
+                if fname is None
+                else f"{fname}_{atom_name}_features.{file_format}"
             )
-            df = pd.DataFrame(atom_features, columns=self.get_headings())
-            if fname is None:
-                df.to_csv(f"{atom_name}_features.csv", index=None)
-            else:
-                df.to_csv(f"{fname}_{atom_name}_features.csv", index=None)
+            for atom_name in features
+        ]
+
+        if ncores > 1:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=ncores) as executor:
+                futures = [
+                    executor.submit(
+                        _write_features_file,
+                        path,
+                        atom_features,
+                        headings,
+                        file_format,
+                    )
+                    for path, atom_features in zip(paths, features.values())
+                ]
+                # raise any errors that happened in the processes
+                for future in futures:
+                    future.result()
+        else:
+            for path, atom_features in zip(paths, features.values()):
+                _write_features_file(path, atom_features, headings, file_format)
+
+        return paths
 
     def features_to_excel(
         self,
@@ -187,24 +329,14 @@ class ListOfAtoms(list, ABC):
         fname = Path(fname)
         fname = fname.with_suffix(".xlsx")
 
-        if isinstance(atom_names, str):
-            atom_names = [atom_names]
-        # whether to write excel sheets for all atoms or subset
-        if atom_names is None:
-            atom_names = self.atom_names
-
-        dataframes = {}
-
-        for atom_name in atom_names:
-            atom_features = self[atom_name].features(
-                feature_calculator, *args, **kwargs
-            )
-            df = pd.DataFrame(atom_features, columns=self.get_headings())
-            dataframes[atom_name] = df
+        features = self.features_by_atom(
+            feature_calculator, *args, atom_names=atom_names, **kwargs
+        )
+        headings = self.get_headings()
 
         with pd.ExcelWriter(fname) as workbook:
-            for atom_name, df in dataframes.items():
-                df.columns = self.get_headings()
+            for atom_name, atom_features in features.items():
+                df = pd.DataFrame(atom_features, columns=headings)
                 df.to_excel(workbook, sheet_name=atom_name)
 
     def center_geometries_on_atom_and_write_xyz(
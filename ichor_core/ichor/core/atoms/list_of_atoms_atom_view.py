@@ -15,18 +15,32 @@ class AtomView(ListOfAtoms):
     """
 
     def __init__(self, parent, atom):
+        # nothing is stored in the list, the atoms are looked up in the parent when they are accessed,
+        # so making an AtomView is O(1) and the view always reflects the current timesteps of the parent
         list.__init__(self)
         self._atom = atom
         # do not copy the self.__dict__ as some of the methods will not work in ListOfAtomsAtomView
         self._is_atom_view = True
         self._super = parent
 
-        # this usually iterates over Atoms instances that are stored instance and only adds the information for the
-        # specified atom. Thus AtomView is essentially a list of Atom instances for only one atom
+    def __len__(self):
+        return len(self._super)
+
+    def __iter__(self):
+        # this usually iterates over Atoms instances that are stored in the parent and only gets the specified atom.
         # also iterates over PointDirectory instances because PointsDirectory subclasses from ListofAtoms
-        for element in parent:
-            a = element[atom]
-            self.append(a)
+        # finding an atom by name does not go through all atoms (see `Atoms.index_of`)
+        return (element[self._atom] for element in self._super)
+
+    def __getitem__(self, item: Union[int, slice]):
+        if isinstance(item, slice):
+            return [
+                element[self._atom] for element in list.__getitem__(self._super, item)
+            ]
+        return list.__getitem__(self._super, item)[self._atom]
+
+    def __repr__(self):
+        return repr(list(self))
 
     @property
     def atom_name(self):
@@ -46,6 +60,13 @@ class AtomView(ListOfAtoms):
         """Returns the name of the atom, e.g. 'C1', 'H2', etc."""
         return self._super.natoms
 
+    @property
+    def coordinates(self) -> np.ndarray:
+        """Returns the coordinates of the atom in every timestep, shape ``n_timesteps`` x ``3``"""
+        if len(self) == 0:
+            return np.empty((0, 3))
+        return self._super.coordinates[:, self[0].i]
+
     @property
     def type(self):
         """Returns the types of atoms in the atom view.
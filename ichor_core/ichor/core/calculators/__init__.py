@@ -8,10 +8,21 @@ from ichor.core.calculators.alf import (
 from ichor.core.calculators.alf_features_to_coordinates_calculator import (
     alf_features_to_coordinates,
 )
-from ichor.core.calculators.c_matrix_calculator import calculate_c_matrix
+from ichor.core.calculators.alignment import (
+    align_coordinates,
+    calculate_rmsd,
+    calculate_rmsd_matrix,
+    centre_coordinates,
+    kabsch_rotations,
+)
+from ichor.core.calculators.c_matrix_calculator import (
+    calculate_c_matrices_from_coordinates,
+    calculate_c_matrix,
+)
 from ichor.core.calculators.connectivity import default_connectivity_calculator
 from ichor.core.calculators.features import (
     calculate_alf_features,
+    calculate_alf_features_from_coordinates,
     default_feature_calculator,
     feature_calculators,
 )
@@ -22,11 +33,16 @@ from ichor.core.calculators.geometry_calculator import (
     bonds,
     calculate_angle,
     calculate_bond,
+    calculate_bond_angles,
+    calculate_bond_lengths,
     calculate_dihedral,
+    calculate_dihedral_angles,
     calculate_internal_features,
     dihedral_names,
     dihedrals,
     get_internal_feature_indices,
+    internal_coordinate_indices,
+    internal_coordinate_indices_from_connectivity,
     internal_feature_names,
 )
 from ichor.core.calculators.spherical_to_cartesian_calculator import (
@@ -40,9 +56,16 @@ __all__ = [
     "default_alf_calculator",
     "get_atom_alf",
     "alf_features_to_coordinates",
+    "align_coordinates",
+    "calculate_rmsd",
+    "calculate_rmsd_matrix",
+    "centre_coordinates",
+    "kabsch_rotations",
+    "calculate_c_matrices_from_coordinates",
     "calculate_c_matrix",
     "default_connectivity_calculator",
     "calculate_alf_features",
+    "calculate_alf_features_from_coordinates",
     "default_feature_calculator",
     "feature_calculators",
     "angle_names",
@@ -51,11 +74,16 @@ __all__ = [
     "bonds",
     "calculate_angle",
     "calculate_bond",
+    "calculate_bond_angles",
+    "calculate_bond_lengths",
     "calculate_dihedral",
+    "calculate_dihedral_angles",
     "calculate_internal_features",
     "dihedral_names",
     "dihedrals",
     "get_internal_feature_indices",
+    "internal_coordinate_indices",
+    "internal_coordinate_indices_from_connectivity",
     "internal_feature_names",
     "spherical_to_cartesian",
 ]
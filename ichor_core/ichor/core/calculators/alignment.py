@@ -0,0 +1,244 @@
+from typing import Optional
+
+import numpy as np
+
+
+def _weights(natoms: int, masses: Optional[np.ndarray]) -> np.ndarray:
+    """Returns the weight of every atom, normalised so that the weights sum to 1."""
+    if masses is None:
+        return np.full(natoms, 1.0 / natoms)
+    masses = np.asarray(masses, dtype=float)
+    if masses.shape != (natoms,):
+        raise ValueError(
+            f"The number of masses ({masses.shape}) does not match the number of atoms ({natoms})."
+        )
+    return masses / masses.sum()
+
+
+def _as_frames(coordinates: np.ndarray) -> np.ndarray:
+    """Returns the coordinates as an array of shape n_frames x n_atoms x 3."""
+    coordinates = np.asarray(coordinates, dtype=float)
+    if coordinates.ndim == 2:
+        coordinates = coordinates[np.newaxis]
+    if coordinates.ndim != 3 or coordinates.shape[-1] != 3:
+        raise ValueError(
+            f"Coordinates must have shape n_frames x n_atoms x 3, not {coordinates.shape}."
+        )
+    return coordinates
+
+
+def centre_coordinates(
+    coordinates: np.ndarray, masses: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """Translates every geometry so that its centroid (or centre of mass if masses are given)
+    is at the origin. The given array is not modified.
+
+    :param coordinates: Array of shape n_frames x n_atoms x 3 (or n_atoms x 3 for one geometry)
+    :param masses: The mass of every atom, used to weight the atoms, optional
+    :return: The centred coordinates, an array of shape n_frames x n_atoms x 3
+    """
+    coordinates = _as_frames(coordinates)
+    weights = _weights(coordinates.shape[1], masses)
+    return coordinates - np.einsum("a,nak->nk", weights, coordinates)[:, np.newaxis]
+
+
+def _covariance_matrices(
+    reference: np.ndarray, coordinates: np.ndarray, weights: np.ndarray
+) -> np.ndarray:
+    """Returns the weighted covariance matrix between every pair of reference and coordinates
+    (both already centred), an array of shape n_reference x n_coordinates x 3 x 3.
+    The sum over atoms is done as one matrix multiplication."""
+
+    nref, natoms, _ = reference.shape
+    n = len(coordinates)
+    # (3 * n_reference) x n_atoms @ n_atoms x (3 * n_coordinates)
+    weighted_reference = (reference * weights[:, np.newaxis]).transpose(2, 0, 1)
+    H = weighted_reference.reshape(3 * nref, natoms) @ coordinates.transpose(
+        1, 2, 0
+    ).reshape(natoms, 3 * n)
+    return H.reshape(3, nref, 3, n).transpose(1, 3, 0, 2)
+
+
+def _rotations_from_covariance(H: np.ndarray) -> np.ndarray:
+    """Returns the Kabsch rotation matrices from covariance matrices of shape n x 3 x 3."""
+
+    V, _, W = np.linalg.svd(H)
+    # make sure that the rotations are proper rotations and not reflections
+    d = np.sign(np.linalg.det(V @ W))
+    V[:, :, -1] *= d[:, np.newaxis]
+
+    return V @ W
+
+
+def _rmsd_from_covariance(
+    H: np.ndarray, reference_norms: np.ndarray, norms: np.ndarray
+) -> np.ndarray:
+    """Returns the minimal RMSD from the covariance matrices, without calculating the rotations.
+
+    After the optimal rotation, the weighted mean squared deviation is |P|^2 + |Q|^2 - 2 * (s1 + s2 + d * s3),
+    where s1 >= s2 >= s3 are the singular values of the covariance matrix and d is the sign of its determinant
+    (d is -1 if only a reflection could align the geometries), the same as in `kabsch_rotations`.
+    The singular values of all covariance matrices are calculated at once.
+
+    :param H: Array of covariance matrices of shape ... x 3 x 3
+    :param reference_norms: The weighted squared norms of the reference geometries, broadcastable to ``H.shape[:-2]``
+    :param norms: The weighted squared norms of the geometries, broadcastable to ``H.shape[:-2]``
+    """
+
+    singular_values = np.linalg.svd(H, compute_uv=False)
+    singular_values[..., -1] *= np.sign(np.linalg.det(H))
+
+    msd = reference_norms + norms - 2.0 * singular_values.sum(axis=-1)
+    # rounding errors can make identical geometries slightly negative
+    return np.sqrt(np.maximum(msd, 0.0))
+
+
+def kabsch_rotations(
+    reference: np.ndarray,
+    coordinates: np.ndarray,
+    masses: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Calculates the rotation matrices which best align (in the least squares sense) every geometry onto the
+    reference geometry with the Kabsch algorithm. The singular value decompositions of all covariance
+    matrices are calculated at once.
+
+    The rotations are for geometries centred with `centre_coordinates`, a centred geometry is
+    aligned with `centred_coordinates @ R.T` (the same convention as `Atoms.rotate`).
+
+    :param reference: The reference geometry, array of shape n_atoms x 3
+    :param coordinates: Array of shape n_frames x n_atoms x 3 (or n_atoms x 3 for one geometry)
+    :param masses: The mass of every atom, used to weight the atoms, optional
+    :return: Array of rotation matrices of shape n_frames x 3 x 3
+    """
+
+    coordinates = _as_frames(coordinates)
+    reference = _as_frames(reference)
+    weights = _weights(coordinates.shape[1], masses)
+
+    H = _covariance_matrices(
+        centre_coordinates(reference, masses),
+        centre_coordinates(coordinates, masses),
+        weights,
+    )[0]
+
+    return _rotations_from_covariance(H)
+
+
+def align_coordinates(
+    reference: np.ndarray,
+    coordinates: np.ndarray,
+    masses: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Rotates and translates every geometry onto the reference geometry. The given arrays are not modified.
+
+    :param reference: The reference geometry, array of shape n_atoms x 3
+    :param coordinates: Array of shape n_frames x n_atoms x 3 (or n_atoms x 3 for one geometry)
+    :param masses: The mass of every atom, used to weight the atoms, optional
+    :return: The aligned coordinates, an array of shape n_frames x n_atoms x 3
+    """
+
+    reference = _as_frames(reference)
+    weights = _weights(reference.shape[1], masses)
+
+    R = kabsch_rotations(reference, coordinates, masses)
+    aligned = centre_coordinates(coordinates, masses) @ R.transpose(0, 2, 1)
+    return aligned + np.einsum("a,ak->k", weights, reference[0])
+
+
+def calculate_rmsd(
+    reference: np.ndarray,
+    coordinates: np.ndarray,
+    masses: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Calculates the RMSD between the reference geometry and every geometry after aligning them
+    with the Kabsch rotations (see `kabsch_rotations`).
+
+    :param reference: The reference geometry, array of shape n_atoms x 3
+    :param coordinates: Array of shape n_frames x n_atoms x 3 (or n_atoms x 3 for one geometry)
+    :param masses: The mass of every atom, the mass weighted RMSD is calculated if they are given, optional
+    :return: Array of shape n_frames containing the RMSD of every geometry
+    """
+
+    reference = centre_coordinates(reference, masses)
+    coordinates = centre_coordinates(coordinates, masses)
+    weights = _weights(coordinates.shape[1], masses)
+
+    R = _rotations_from_covariance(
+        _covariance_matrices(reference, coordinates, weights)[0]
+    )
+    # the deviations are calculated from the aligned coordinates, so (nearly) identical geometries
+    # do not lose precision like |P|^2 + |Q|^2 - 2 * (s1 + s2 + d * s3) in `_rmsd_from_covariance`
+    aligned = coordinates @ R.transpose(0, 2, 1)
+    return np.sqrt(np.einsum("a,nak->n", weights, (aligned - reference) ** 2))
+
+
+def calculate_rmsd_matrix(
+    coordinates: np.ndarray,
+    masses: Optional[np.ndarray] = None,
+    memory_budget: int = 2**26,
+    out: Optional[np.ndarray] = None,
+    nthreads: int = 8,
+) -> np.ndarray:
+    """Calculates the RMSD (after alignment) between every pair of geometries, e.g. for clustering geometries
+    or selecting diverse geometries.
+
+    The matrix is calculated in blocks of pairs of geometries by a pool of threads. The size of the blocks is
+    chosen so that the covariance matrices and temporary arrays of the blocks being calculated at the same time
+    fit into `memory_budget`.
+    Only the blocks on and above the diagonal are calculated, the matrix is symmetric. The RMSDs are
+    calculated from the singular values of the covariance matrices (see `_rmsd_from_covariance`), so
+    the RMSDs of nearly identical geometries are only accurate to about 1e-7 times the size of the geometries.
+
+    For large numbers of geometries, the matrix itself may not fit in memory. A `np.memmap` (or an array
+    with a smaller dtype such as `np.float32`) of shape n_frames x n_frames can be passed in as `out`.
+
+    :param coordinates: Array of shape n_frames x n_atoms x 3
+    :param masses: The mass of every atom, the mass weighted RMSD is calculated if they are given, optional
+    :param memory_budget: The approximate number of bytes used for intermediate arrays, defaults to 64MB
+    :param out: The array in which to write the matrix, optional
+    :param nthreads: The number of threads used to calculate blocks, defaults to 8
+    :return: Array of shape n_frames x n_frames of RMSDs
+    """
+
+    import concurrent.futures
+
+    coordinates = centre_coordinates(coordinates, masses)
+    n, natoms, _ = coordinates.shape
+    weights = _weights(natoms, masses)
+    norms = np.einsum("a,nak,nak->n", weights, coordinates, coordinates)
+
+    if out is None:
+        out = np.empty((n, n))
+    elif out.shape != (n, n):
+        raise ValueError(f"`out` must have shape {(n, n)}, not {out.shape}.")
+
+    # covariance matrices, the copies made by the singular value decompositions and their results
+    bytes_per_pair = (9 + 9 + 9 + 3) * np.dtype(float).itemsize
+    block_size = max(1, int(np.sqrt(memory_budget / nthreads / bytes_per_pair)))
+
+    def calculate_block(i: int, j: int):
+        block_i = slice(i, min(i + block_size, n))
+        block_j = slice(j, min(j + block_size, n))
+        H = _covariance_matrices(coordinates[block_i], coordinates[block_j], weights)
+        rmsd = _rmsd_from_covariance(
+            H, norms[block_i, np.newaxis], norms[np.newaxis, block_j]
+        )
+        # the blocks do not overlap, so the threads can write to out at the same time
+        out[block_i, block_j] = rmsd
+        if i != j:
+            out[block_j, block_i] = rmsd.T
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=nthreads) as executor:
+        futures = [
+            executor.submit(calculate_block, i, j)
+            for i in range(0, n, block_size)
+            for j in range(i, n, block_size)
+        ]
+        # raise any errors that happened in the threads
+        for future in futures:
+            future.result()
+
+    # the diagonal is exactly zero
+    np.fill_diagonal(out, 0.0)
+
+    return out
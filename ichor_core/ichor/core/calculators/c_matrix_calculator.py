@@ -86,3 +86,37 @@ def calculate_c_matrix(
         c_matrix[2, :] = row3
 
         return c_matrix
+
+
+def calculate_c_matrices_from_coordinates(
+    coordinates: np.ndarray,
+    alf: "ichor.core.atoms.ALF",  # noqa F821
+) -> np.ndarray:
+    """Calculates the C rotation matrices of one central atom for many geometries at once. The matrices
+    are the same as the ones calculated by `calculate_c_matrix`, but all geometries are done with array operations.
+
+    :param coordinates: Array of shape n_geometries x n_atoms x 3 containing the coordinates
+    :param alf: The atomic local frame (0-indexed) of the central atom
+    :return: Array of shape n_geometries x 3 x 3
+    """
+
+    coordinates = np.asarray(coordinates, dtype=float)
+
+    origin = coordinates[:, alf.origin_idx]
+    x_axis_diff = coordinates[:, alf.x_axis_idx] - origin
+
+    if coordinates.shape[1] > 2:
+        xy_plane_diff = coordinates[:, alf.xy_plane_idx] - origin
+    else:
+        # there is no xy-plane atom, so the same dummy atom as in `calculate_c_matrix` is used
+        xy_plane_diff = coordinates[:, alf.x_axis_idx] + 1.0
+
+    row1 = x_axis_diff / np.linalg.norm(x_axis_diff, axis=-1, keepdims=True)
+    sigma_fflux = -np.einsum("nk,nk->n", x_axis_diff, xy_plane_diff) / np.einsum(
+        "nk,nk->n", x_axis_diff, x_axis_diff
+    )
+    y_vec = sigma_fflux[:, np.newaxis] * x_axis_diff + xy_plane_diff
+    row2 = y_vec / np.linalg.norm(y_vec, axis=-1, keepdims=True)
+    row3 = np.cross(row1, row2)
+
+    return np.stack([row1, row2, row3], axis=1)
@@ -8,6 +8,9 @@ def connectivity_calculator_distance(
     Calculates the connectivity matrix (showing which atoms are bonded as 1 and those that are not bonded as 0.
     It uses the Van Der Waals radius an Atom (see `Atom` class) to determine if atoms should be bonded or not.
 
+    The distances between all atoms are calculated at once and compared to the sum of the radii of every pair
+    of atoms (broadcast to a len(atoms) x len(atoms) matrix).
+
     Args:
         :atoms: `Atoms` instance
 
@@ -22,16 +25,16 @@ def connectivity_calculator_distance(
     """
 
     atoms = atoms.to_angstroms()
-    natoms = atoms.natoms
-
-    connectivity = np.zeros((natoms, natoms), dtype=int)
+    coordinates = atoms.coordinates.reshape(-1, 3)
+    radii = np.array([atom.radius for atom in atoms])
 
-    for i, iatom in enumerate(atoms):
-        for j, jatom in enumerate(atoms):
-            if iatom != jatom:
-                max_dist = 1.25 * (iatom.radius + jatom.radius)
+    max_dist = 1.25 * (radii[:, np.newaxis] + radii[np.newaxis, :])
+    dist = np.linalg.norm(
+        coordinates[:, np.newaxis, :] - coordinates[np.newaxis, :, :], axis=-1
+    )
 
-                if iatom.dist(jatom) < max_dist:
-                    connectivity[i, j] = 1
+    connectivity = (dist < max_dist).astype(int)
+    # atoms are not bonded to themselves
+    np.fill_diagonal(connectivity, 0)
 
     return connectivity
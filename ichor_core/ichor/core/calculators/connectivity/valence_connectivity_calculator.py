@@ -25,14 +25,18 @@ def connectivity_calculator_valence(
     """
 
     connectivity = connectivity_calculator_distance(atoms)
-
-    for atom in atoms:
-        while sum(connectivity[atom.i]) > atom.valence:
-            connected_atoms = [i for i, c in enumerate(connectivity[atom.i]) if c == 1]
-            incorrect_atom_idx = connected_atoms[
-                np.argmax([atom.dist(atoms[i]) for i in connected_atoms])
+    coordinates = atoms.coordinates.reshape(-1, 3)
+
+    for i, atom in enumerate(atoms):
+        nexcess_bonds = connectivity[i].sum() - atom.valence
+        if nexcess_bonds > 0:
+            # the longest bonds are removed, a stable sort removes the first of equally long bonds first
+            bonded = np.flatnonzero(connectivity[i])
+            dist = np.linalg.norm(coordinates[bonded] - coordinates[i], axis=1)
+            incorrect_atoms_idx = bonded[
+                np.argsort(-dist, kind="stable")[:nexcess_bonds]
             ]
-            connectivity[atom.i, incorrect_atom_idx] = 0
-            connectivity[incorrect_atom_idx, atom.i] = 0
+            connectivity[i, incorrect_atoms_idx] = 0
+            connectivity[incorrect_atoms_idx, i] = 0
 
     return connectivity
@@ -2,7 +2,10 @@ from typing import Dict, List, Union
 
 import numpy as np
 from ichor.core.calculators.alf import get_atom_alf
-from ichor.core.calculators.c_matrix_calculator import calculate_c_matrix
+from ichor.core.calculators.c_matrix_calculator import (
+    calculate_c_matrices_from_coordinates,
+    calculate_c_matrix,
+)
 from ichor.core.common.constants import ang2bohr
 from ichor.core.common.units import AtomicDistance
 
@@ -127,3 +130,72 @@ def calculate_alf_features(
             i_feat += 1
 
     return feature_array
+
+
+def calculate_alf_features_from_coordinates(
+    coordinates: np.ndarray,
+    alf: "ichor.core.atoms.ALF",  # noqa F821
+    distance_unit: AtomicDistance = default_distance_unit,
+) -> np.ndarray:
+    """Calculates the features of one central atom for many geometries at once. The features are the
+    same as the ones calculated by `calculate_alf_features`, but all geometries are done with array operations.
+
+    :param coordinates: Array of shape n_geometries x n_atoms x 3 containing the coordinates in Angstroms
+    :param alf: The atomic local frame (0-indexed) of the central atom
+    :param distance_unit: The distance units to use for the calculated distances
+        which are part of the features. The default distance is Bohr.
+    :return: Array of shape n_geometries x n_features (3N-6 features, or 1 feature if there are 2 atoms)
+    """
+
+    coordinates = np.asarray(coordinates, dtype=float)
+    ngeometries, natoms, _ = coordinates.shape
+    if natoms < 2:
+        raise ValueError(
+            "The geometries need to have more than 1 atom in order to calculate features."
+        )
+
+    unit_conversion = 1.0 if distance_unit is AtomicDistance.Angstroms else ang2bohr
+
+    # vectors from the central atom to every atom
+    vectors = unit_conversion * (
+        coordinates - coordinates[:, alf.origin_idx, np.newaxis, :]
+    )
+    x_axis_vect = vectors[:, alf.x_axis_idx]
+    x_bond_norm = np.linalg.norm(x_axis_vect, axis=-1)
+
+    if natoms == 2:
+        return x_bond_norm[:, np.newaxis]
+
+    features = np.empty((ngeometries, 3 * natoms - 6))
+
+    xy_plane_vect = vectors[:, alf.xy_plane_idx]
+    xy_bond_norm = np.linalg.norm(xy_plane_vect, axis=-1)
+
+    features[:, 0] = x_bond_norm
+    features[:, 1] = xy_bond_norm
+    features[:, 2] = np.arccos(
+        np.einsum("nk,nk->n", x_axis_vect, xy_plane_vect) / (x_bond_norm * xy_bond_norm)
+    )
+
+    if natoms == 3:
+        return features
+
+    c_matrices = calculate_c_matrices_from_coordinates(coordinates, alf)
+
+    # the rest of the atoms (in the order in which they are in the geometry)
+    # are described by r, theta and phi
+    rest = [
+        i
+        for i in range(natoms)
+        if i not in (alf.origin_idx, alf.x_axis_idx, alf.xy_plane_idx)
+    ]
+    r_vect = vectors[:, rest]
+    r_vect_norm = np.linalg.norm(r_vect, axis=-1)
+    zeta = np.einsum("nij,naj->nai", c_matrices, r_vect)
+
+    features[:, 3::3] = r_vect_norm
+    # clipping is needed as zeta[2] / r can be slightly outside of [-1, 1]
+    features[:, 4::3] = np.arccos(np.clip(zeta[..., 2] / r_vect_norm, -1.0, 1.0))
+    features[:, 5::3] = np.arctan2(zeta[..., 1], zeta[..., 0])
+
+    return features
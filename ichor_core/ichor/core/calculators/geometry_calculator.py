@@ -1,4 +1,4 @@
-from typing import List, Tuple
+from typing import List, Tuple, Union
 
 import numpy as np
 from ichor.core.common.linalg import mag
@@ -17,8 +17,9 @@ def calculate_bond(atoms: "ichor.core.atoms.Atoms", i: int, j: int):  # noqa F82
 
 
 def calculate_bonds(atoms: "ichor.core.atoms.Atoms") -> np.ndarray:  # noqa F821
-    connected_atoms = get_connected_atoms(atoms)
-    return np.array([calculate_bond(atoms, i, j) for i, j in connected_atoms._bonds])
+    return calculate_bond_lengths(
+        atoms.coordinates, internal_coordinate_indices(atoms)[0]
+    )
 
 
 def calculate_angle(
@@ -37,9 +38,8 @@ def calculate_angle(
 
 
 def calculate_angles(atoms: "ichor.core.atoms.Atoms") -> np.ndarray:  # noqa F821
-    connected_atoms = get_connected_atoms(atoms)
-    return np.array(
-        [calculate_angle(atoms, i, j, k) for i, j, k in connected_atoms._angles]
+    return calculate_bond_angles(
+        atoms.coordinates, internal_coordinate_indices(atoms)[1]
     )
 
 
@@ -77,13 +77,141 @@ def calculate_dihedral(
 
 
 def calculate_dihedrals(atoms: "ichor.core.atoms.Atoms") -> np.ndarray:  # noqa F821
-    connected_atoms = get_connected_atoms(atoms)
-    return np.array(
-        [
-            calculate_dihedral(atoms, i, j, k, l)
-            for i, j, k, l in connected_atoms._dihedrals
-        ]
+    return calculate_dihedral_angles(
+        atoms.coordinates, internal_coordinate_indices(atoms)[2]
+    )
+
+
+def internal_coordinate_indices_from_connectivity(
+    connectivity: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Enumerates the bonds, angles and dihedrals (0-indexed) from a connectivity matrix with matrix operations.
+
+    Pairs of atoms (i < j) are bonded, 1-3 or 1-4 if they are connected by exactly one path of 1, 2 or 3 bonds
+    (the elements of the connectivity matrix to the power of 1, 2 or 3 count these paths). A 1-4 pair is only
+    a dihedral if the middle atoms of its path are 1-3 pairs of the end atoms. The order of the bonds, angles
+    and dihedrals is the same as the order of the pairs in the upper triangle of the matrix.
+    """
+
+    bonds = (np.asarray(connectivity) > 0).astype(int)
+    paths2 = bonds @ bonds
+    paths3 = paths2 @ bonds
+
+    is_bond = bonds == 1
+    is_angle = ~is_bond & (paths2 == 1)
+    is_dihedral = ~is_bond & ~is_angle & (paths3 == 1)
+
+    upper = np.triu(np.ones_like(is_bond), k=1)
+    bond_idx = np.argwhere(is_bond & upper)
+
+    # the middle atom of an angle is the only atom bonded to both end atoms
+    i, j = np.nonzero(is_angle & upper)
+    k = np.argmax(bonds[i] & bonds[j], axis=1)
+    angle_idx = np.stack([i, k, j], axis=1)
+
+    # k is bonded to i and is a 1-3 pair with j, l is bonded to j and is a 1-3 pair with i
+    i, j = np.nonzero(is_dihedral & upper)
+    k_candidates = bonds[i] & is_angle[j]
+    l_candidates = bonds[j] & is_angle[i]
+    # l must be bonded to k
+    l_candidates &= (k_candidates @ bonds) > 0
+    has_dihedral = l_candidates.any(axis=1)
+    i, j, k_candidates, l_candidates = (
+        i[has_dihedral],
+        j[has_dihedral],
+        k_candidates[has_dihedral],
+        l_candidates[has_dihedral],
+    )
+    l = np.argmax(l_candidates, axis=1)
+    k = np.argmax(k_candidates & bonds[l], axis=1)
+    dihedral_idx = np.stack([i, k, l, j], axis=1)
+
+    return (
+        bond_idx.reshape(-1, 2),
+        angle_idx.reshape(-1, 3),
+        dihedral_idx.reshape(-1, 4),
+    )
+
+
+def internal_coordinate_indices(
+    atoms: "ichor.core.atoms.Atoms",  # noqa F821
+    connectivity_calculator=None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Returns the indices (0-indexed) of the atoms in every bond, angle and dihedral of atoms. These only depend on
+    the connectivity, so they only need to be calculated once for a trajectory and can then be used with
+    `calculate_bond_lengths`, `calculate_bond_angles` and `calculate_dihedral_angles` for all timesteps.
+
+    :param atoms: instance of 'Atoms' to get the bonds, angles and dihedrals for
+    :param connectivity_calculator: function which calculates the connectivity, defaults to `default_connectivity_calculator`
+    :return: arrays of shape n_bonds x 2, n_angles x 3 and n_dihedrals x 4
+    """
+    from ichor.core.calculators.connectivity import default_connectivity_calculator
+
+    connectivity_calculator = connectivity_calculator or default_connectivity_calculator
+    return internal_coordinate_indices_from_connectivity(
+        atoms.connectivity(connectivity_calculator)
+    )
+
+
+def calculate_bond_lengths(coordinates: np.ndarray, bonds: np.ndarray) -> np.ndarray:
+    """
+    Calculates the bond lengths for one or many geometries at once.
+
+    :param coordinates: array of shape n_atoms x 3, or n_timesteps x n_atoms x 3
+    :param bonds: array of shape n_bonds x 2 containing the (0-indexed) atoms of every bond
+    :return: array of shape n_bonds, or n_timesteps x n_bonds
+    """
+    bonds = np.asarray(bonds, dtype=int).reshape(-1, 2)
+    d = coordinates[..., bonds[:, 1], :] - coordinates[..., bonds[:, 0], :]
+    return np.sqrt(np.einsum("...k,...k->...", d, d))
+
+
+def calculate_bond_angles(coordinates: np.ndarray, angles: np.ndarray) -> np.ndarray:
+    """
+    Calculates the angles (in degrees) i-j-k for one or many geometries at once.
+
+    :param coordinates: array of shape n_atoms x 3, or n_timesteps x n_atoms x 3
+    :param angles: array of shape n_angles x 3 containing the (0-indexed) atoms i, j, k of every angle
+    :return: array of shape n_angles, or n_timesteps x n_angles
+    """
+    angles = np.asarray(angles, dtype=int).reshape(-1, 3)
+    d1 = coordinates[..., angles[:, 1], :] - coordinates[..., angles[:, 0], :]
+    d2 = coordinates[..., angles[:, 1], :] - coordinates[..., angles[:, 2], :]
+    cos = np.einsum("...k,...k->...", d1, d2) / np.sqrt(
+        np.einsum("...k,...k->...", d1, d1) * np.einsum("...k,...k->...", d2, d2)
     )
+    return np.degrees(np.arccos(cos))
+
+
+def calculate_dihedral_angles(
+    coordinates: np.ndarray, dihedrals: np.ndarray
+) -> np.ndarray:
+    """
+    Calculates the dihedral angles (in degrees, from 0 to 360) i-j-k-l for one or many geometries at once.
+
+    :param coordinates: array of shape n_atoms x 3, or n_timesteps x n_atoms x 3
+    :param dihedrals: array of shape n_dihedrals x 4 containing the (0-indexed) atoms i, j, k, l of every dihedral
+    :return: array of shape n_dihedrals, or n_timesteps x n_dihedrals
+    """
+    dihedrals = np.asarray(dihedrals, dtype=int).reshape(-1, 4)
+    i, j, k, l = (coordinates[..., dihedrals[:, n], :] for n in range(4))
+    b1 = i - j
+    b2 = j - k
+    b3 = k - l
+
+    v1 = np.cross(b1, b2)
+    v2 = np.cross(b2, b3)
+
+    n1 = v1 / np.linalg.norm(v1, axis=-1, keepdims=True)
+    n2 = v2 / np.linalg.norm(v2, axis=-1, keepdims=True)
+
+    m1 = np.cross(n1, b2 / np.linalg.norm(b2, axis=-1, keepdims=True))
+
+    x = np.einsum("...k,...k->...", n1, n2)
+    y = np.einsum("...k,...k->...", m1, n2)
+
+    return (np.degrees(np.arctan2(y, x)) + 180) % 360
 
 
 def get_connected_atoms(
@@ -102,7 +230,8 @@ def bond_names(atoms: "ichor.core.atoms.Atoms") -> List[str]:  # noqa F821
     :param atoms: 'Atoms' instance to get the bond names
     :return: bond names of atoms as list of str
     """
-    return get_connected_atoms(atoms).bond_names()
+    names = atoms.atom_names
+    return [f"{names[i]}-{names[j]}" for i, j in internal_coordinate_indices(atoms)[0]]
 
 
 def angle_names(atoms: "ichor.core.atoms.Atoms") -> List[str]:  # noqa F821
@@ -112,7 +241,11 @@ def angle_names(atoms: "ichor.core.atoms.Atoms") -> List[str]:  # noqa F821
     :param atoms: 'Atoms' instance to get the angle names
     :return: angle names of atoms as list of str
     """
-    return get_connected_atoms(atoms).angle_names()
+    names = atoms.atom_names
+    return [
+        f"{names[i]}-{names[j]}-{names[k]}"
+        for i, j, k in internal_coordinate_indices(atoms)[1]
+    ]
 
 
 def dihedral_names(atoms: "ichor.core.atoms.Atoms") -> List[str]:  # noqa F821
@@ -122,7 +255,11 @@ def dihedral_names(atoms: "ichor.core.atoms.Atoms") -> List[str]:  # noqa F821
     :param atoms: 'Atoms' instance to get the dihedral names
     :return: dihedral names of atoms as list of str
     """
-    return get_connected_atoms(atoms).dihedral_names()
+    names = atoms.atom_names
+    return [
+        f"{names[i]}-{names[j]}-{names[k]}-{names[l]}"
+        for i, j, k, l in internal_coordinate_indices(atoms)[2]
+    ]
 
 
 def internal_feature_names(
@@ -138,33 +275,47 @@ def internal_feature_names(
 
 
 def calculate_internal_features(
-    atoms: "ichor.core.atoms.Atoms",  # noqa F821
+    atoms: Union["ichor.core.atoms.Atoms", "ichor.core.atoms.ListOfAtoms"],  # noqa F821
 ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     """
-    Calculates the bonds, angles and dihedrals for atoms
+    Calculates the bonds, angles and dihedrals for atoms. If a trajectory (`ListOfAtoms`) is given,
+    the bonds, angles and dihedrals are found from the first timestep and calculated for all timesteps at once.
 
-    :param atoms: instance of `Atoms` to calculate the bonds, angles and dihedrals for
-    :return: bonds, angles and dihedrals as a tuple of numpy arrays
+    :param atoms: instance of `Atoms` or `ListOfAtoms` (e.g. `Trajectory`) to calculate the bonds, angles and dihedrals for
+    :return: bonds, angles and dihedrals as a tuple of numpy arrays, each of shape n_timesteps x n_internal_coordinates
+        if a trajectory is given
     """
+    from ichor.core.atoms import Atoms
+
+    topology = atoms if isinstance(atoms, Atoms) else atoms[0]
+    bond_idx, angle_idx, dihedral_idx = internal_coordinate_indices(topology)
+    coordinates = atoms.coordinates
+
     return (
-        calculate_bonds(atoms),
-        calculate_angles(atoms),
-        calculate_dihedrals(atoms),
+        calculate_bond_lengths(coordinates, bond_idx),
+        calculate_bond_angles(coordinates, angle_idx),
+        calculate_dihedral_angles(coordinates, dihedral_idx),
     )
 
 
 def bonds(atoms: "ichor.core.atoms.Atoms") -> List[Tuple[int, int]]:  # noqa F821
-    return get_connected_atoms(atoms).bonds
+    return [(i + 1, j + 1) for i, j in internal_coordinate_indices(atoms)[0].tolist()]
 
 
 def angles(atoms: "ichor.core.atoms.Atoms") -> List[Tuple[int, int, int]]:  # noqa F821
-    return get_connected_atoms(atoms).angles
+    return [
+        (i + 1, j + 1, k + 1)
+        for i, j, k in internal_coordinate_indices(atoms)[1].tolist()
+    ]
 
 
 def dihedrals(
     atoms: "ichor.core.atoms.Atoms",  # noqa F821
 ) -> List[Tuple[int, int, int, int]]:
-    return get_connected_atoms(atoms).dihedrals
+    return [
+        (i + 1, j + 1, k + 1, l + 1)
+        for i, j, k, l in internal_coordinate_indices(atoms)[2].tolist()
+    ]
 
 
 def get_internal_feature_indices(
@@ -174,4 +325,9 @@ def get_internal_feature_indices(
     List[Tuple[int, int, int]],
     List[Tuple[int, int, int, int]],
 ]:
-    return bonds(atoms), angles(atoms), dihedrals(atoms)
+    bond_idx, angle_idx, dihedral_idx = internal_coordinate_indices(atoms)
+    return (
+        [(i + 1, j + 1) for i, j in bond_idx.tolist()],
+        [(i + 1, j + 1, k + 1) for i, j, k in angle_idx.tolist()],
+        [(i + 1, j + 1, k + 1, l + 1) for i, j, k, l in dihedral_idx.tolist()],
+    )
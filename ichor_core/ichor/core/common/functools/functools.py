@@ -1,15 +1,11 @@
+import inspect
 import threading
 from functools import wraps
 from time import time
+from typing import Any, Sequence
 
 from ichor.core.common.types.itypes import F, Scalar, T
 
-try:
-    import asyncio
-except (ImportError, SyntaxError):
-    asyncio = None
-from typing import Any, Sequence
-
 
 def buildermethod(func: F) -> F:
     """
@@ -60,13 +56,16 @@ class cached_property(object):
         if obj is None:
             return self
 
-        if asyncio and asyncio.iscoroutinefunction(self.func):
+        # asyncio is only imported if needed because it is slow to import
+        if inspect.iscoroutinefunction(self.func):
             return self._wrap_in_coroutine(obj)
 
         value = obj.__dict__[self.func.__name__] = self.func(obj)
         return value
 
     def _wrap_in_coroutine(self, obj):
+        import asyncio
+
         @wraps(obj)
         @asyncio.coroutine
         def wrapper():
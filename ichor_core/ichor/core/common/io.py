@@ -251,6 +251,34 @@ def tail(path: Path, lines: int = 20) -> str:
         )
 
 
+@convert_to_path
+def count_lines(path: Path, block_size: int = 2**24) -> int:
+    """Works in the same way as the unix `wc -l` command, but also counts the last line
+    if it does not end in a newline. The file is read in binary blocks, so this is fast
+    even for very large files.
+
+    :param path: the path of the file to count the lines of
+    :param block_size: number of bytes to read at a time, defaults to 16 MiB
+    :return: number of lines in the file
+    """
+    nlines = 0
+    last_block = b""
+
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            nlines += block.count(b"\n")
+            last_block = block
+
+    # the last line might not have a newline character at the end
+    if last_block and not last_block.endswith(b"\n"):
+        nlines += 1
+
+    return nlines
+
+
 @convert_to_path
 def last_line(path: Path) -> str:
     """Alias for `tail` for getting the last line of a file
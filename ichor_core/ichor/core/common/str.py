@@ -1,6 +1,6 @@
 """ Useful functions which are used to manipulate a str or return a str."""
 
-from typing import Iterable, List, Optional
+from typing import Iterable, Iterator, List, Optional
 
 
 def cleanup_str(str_in: str) -> str:
@@ -83,3 +83,57 @@ def in_sensitive(value: str, lst: List[str]) -> bool:
     :return: boolean based on whether value is in lst ignoring case
     """
     return value.lower() in [i.lower() for i in lst]
+
+
+def find_line(s: str, marker: str, start: int = 0, end: Optional[int] = None) -> int:
+    """
+    Finds the first line of s which contains marker
+    :param s: string to search, e.g. the contents of a file
+    :param marker: substring to search for, if it starts with a newline, it only matches at the start of a line
+    :param start: index of s from which to start searching
+    :param end: index of s at which to stop searching
+    :return: index of the first character of the line containing marker, or -1 if marker is not found
+    """
+    i = s.find(marker, start, len(s) if end is None else end)
+    if i == -1:
+        return -1
+    # marker can start with a newline to only match at the start of a line
+    return s.rfind("\n", 0, i + 1) + 1
+
+
+def iter_lines_from(
+    s: str, marker: str, start: int = 0, end: Optional[int] = None
+) -> Iterator[str]:
+    """
+    Iterates over the lines of s (with line endings kept, as when iterating over a file),
+    starting from the first line which contains marker. This is used to jump straight to a
+    section of a file which has been read into a string, without going through the lines before it.
+    If marker is not found, the iterator is empty, so calling `next` on it raises StopIteration
+    in the same way as reaching the end of a file.
+    :param s: string to search, e.g. the contents of a file
+    :param marker: substring to search for
+    :param start: index of s from which to start searching
+    :param end: index of s at which to stop iterating
+    :return: iterator over the lines of s, from the line containing marker up to end
+    """
+    end = len(s) if end is None else end
+    line_start = find_line(s, marker, start, end)
+    if line_start == -1:
+        return iter(())
+    return iter_lines(s, line_start, end)
+
+
+def iter_lines(s: str, start: int = 0, end: Optional[int] = None) -> Iterator[str]:
+    """
+    Lazily iterates over the lines of s[start:end] (with line endings kept, as when iterating over a file),
+    so that only the lines which are used are made
+    :param s: string to iterate over, e.g. the contents of a file
+    :param start: index of s from which to start iterating
+    :param end: index of s at which to stop iterating
+    :return: iterator over the lines of s[start:end]
+    """
+    end = len(s) if end is None else end
+    while start < end:
+        line_end = s.find("\n", start, end) + 1 or end
+        yield s[start:line_end]
+        start = line_end
@@ -2,6 +2,10 @@ from ichor.core.database.sql.add_to_database import (
     add_atom_names_to_database,
     add_point_to_database,
     create_database_session,
+    get_point_database_rows,
+    point_fingerprint,
+    point_key,
+    sync_points_to_database,
 )
 
 from ichor.core.database.sql.database import create_database
@@ -11,6 +15,10 @@ __all__ = [
     "add_atom_names_to_database",
     "add_point_to_database",
     "create_database_session",
+    "get_point_database_rows",
+    "point_fingerprint",
+    "point_key",
+    "sync_points_to_database",
     "create_database",
     "get_sqlite_db_information",
 ]
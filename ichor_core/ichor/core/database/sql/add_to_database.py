@@ -1,11 +1,18 @@
+import hashlib
+import os
 import warnings
 from datetime import datetime
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Optional, Tuple, Union
 
-from ichor.core.database.sql.database import AtomNames, Dataset, Points
+from ichor.core.database.sql.database import (
+    AtomNames,
+    Dataset,
+    PointFingerprints,
+    Points,
+)
 
-from sqlalchemy import create_engine, select
+from sqlalchemy import create_engine, delete, insert, select
 from sqlalchemy.orm import Session, sessionmaker
 
 
@@ -40,19 +47,63 @@ def add_atom_names_to_database(session: Session, atom_names: List[str], echo=Fal
     session.commit()
 
 
+# files directly inside a point directory which determine what is added to the database
+# (.sh files are left behind if AIMAll crashed, in which case the point is not added)
+_fingerprint_suffixes = {".wfn", ".gau", ".gaussianoutput", ".gjf", ".xyz", ".sh"}
+
+
+def point_fingerprint(point_path: Union[str, Path]) -> str:
+    """Returns a string made from the names, sizes and modification times of the files in a
+    point directory (and its ``_atomicfiles`` directory) that are read when adding the point to the
+    database. The fingerprint changes if any of these files are added, removed or modified.
+
+    :param point_path: Path to a PointDirectory
+    :return: A hash of the file information
+    """
+
+    entries = []
+    with os.scandir(point_path) as it:
+        for entry in it:
+            if entry.is_dir() and entry.name.endswith("_atomicfiles"):
+                with os.scandir(entry.path) as atomicfiles:
+                    for atomicfile in atomicfiles:
+                        stat = atomicfile.stat()
+                        entries.append(
+                            f"{entry.name}/{atomicfile.name}:{stat.st_size}:{stat.st_mtime_ns}"
+                        )
+            elif Path(entry.name).suffix in _fingerprint_suffixes:
+                stat = entry.stat()
+                entries.append(f"{entry.name}:{stat.st_size}:{stat.st_mtime_ns}")
+
+    return hashlib.sha1("\n".join(sorted(entries)).encode()).hexdigest()
+
+
+def point_key(point_path: Union[str, Path]) -> str:
+    """Returns the key by which the fingerprint of a point is stored in the database, which is
+    the name of the PointsDirectory followed by the name of the point directory, e.g.
+    ``WATER.pointsdir/WATER0001.pointdir``. The absolute path is not used, so the points are not added
+    again if the PointsDirectory is moved, copied or mounted somewhere else.
+
+    :param point_path: Path to a PointDirectory
+    :return: The key of the point
+    """
+    point_path = Path(point_path).absolute()
+    return f"{point_path.parent.name}/{point_path.name}"
+
+
 # TODO: make this more robust as some data might be absent. Check that .wfn exists before adding wfn data
 # TODO: check that gaussian out forces exist. Check that int file exists.
-def add_point_to_database(
-    session: Session,
+def get_point_database_rows(
     point: "ichor.core.files.PointDirectory",  # noqa F821
-    echo=False,
     print_missing_data=True,
-):
-    """Adds information from an instance of a PointDirectory to the database.
+) -> Optional[Tuple[dict, Dict[str, dict]]]:
+    """Reads the information from an instance of a PointDirectory which is added to the database.
 
-    :param database_path: Path to database
     :param point: A PointDirectory instance, containing Gaussian/AIMAll outputs that can be
         written to the database.
+    :param print_missing_data: Whether to print out any missing data, defaults to True
+    :return: None if the point should not be added to the database, otherwise a tuple of the row of the
+        points table and a dictionary of atom names and rows of the dataset table (without the ids)
 
     .. note:: Even if atomic data (.int file) is missing for a particular atom in the system,
         the information for the point will still be added to the database. This is because
@@ -70,7 +121,7 @@ def add_point_to_database(
                 f"{point.path.absolute()}: No atomicfiles directory (containing AIMAll .int) was found."
                 "Not added to db"
             )
-            return
+        return
 
     # check for .sh file in directory as AIMALL should delete it if it ran successfully
     # if .sh file is found then do not append this point to the database as it can cause problems
@@ -81,7 +132,7 @@ def add_point_to_database(
                 print(
                     f"{point.path.absolute()}: A '.sh' was found so AIMAll likely crashed. Not added to db."
                 )
-                return
+            return
 
     # check for any .mog files within atomicfiles directory.
     # These are intermediate data files that indicate AIMALL hasn't completed.
@@ -92,34 +143,34 @@ def add_point_to_database(
                 print(
                     f"{point.path.absolute()}: A '.mog' was found so AIMAll likely crashed. Not added to db."
                 )
-                return
+            return
+
+    # only read in the parts of the files which are added to the database,
+    # e.g. the molecular orbitals in the .wfn file are not parsed
+    if point.ints:
+        point.ints.project("basin_integration", "multipoles", "iqa_energy_components")
+    if point.wfn:
+        point.wfn.project("energy")
+    if point.gaussian_output:
+        point.gaussian_output.project("forces")
 
     ###############################
     # wfn information
     ###############################
 
-    # if wfn file exists
-    if point.wfn:
-        # ORM for points table
-        db_point = Points(
-            date_added=datetime.today().strftime("%Y-%m-%d %H:%M:%S"),
-            name=point.name_without_suffix,
-            wfn_energy=point.wfn.total_energy,
-        )
+    # row of the points table
+    point_row = dict(
+        date_added=datetime.today().strftime("%Y-%m-%d %H:%M:%S"),
+        name=point.name_without_suffix,
+        # wfn energy might not exist if Gaussian has not been ran yet (or wfn file does not exist.)
+        # add a None for wfn energy if wfn energy is not present
+        wfn_energy=point.wfn.total_energy if point.wfn else None,
+    )
     # if file does not exist, still add to database, but do not contain wfn information
-    else:
-        # ORM for points table
-        db_point = Points(
-            date_added=datetime.today().strftime("%Y-%m-%d %H:%M:%S"),
-            # wfn energy might not exist if Gaussian has not been ran yet (or wfn file does not exist.)
-            # add a None for wfn energy if wfn energy is not present
-            name=point.name_without_suffix,
-            wfn_energy=None,
+    if not point.wfn and print_missing_data:
+        print(
+            f"Point {point.path} does not contain a Gaussian wavefunction (.wfn) file."
         )
-        if print_missing_data:
-            print(
-                f"Point {point.path} does not contain a Gaussian wavefunction (.wfn) file."
-            )
 
     ###############################
     # gaussian output file check
@@ -129,19 +180,9 @@ def add_point_to_database(
         if print_missing_data:
             print(f"Point {point.path} does not contain a Gaussian output (.gau) file.")
 
-    ###############################
-    # _atomicfiles directory check
-    ###############################
-
-    # add database point to session. Need to do this before adding the dataset stuff
-    # because the id needs to be assigned to the point (because dataset contains foreign key point_id)
-    session.add(db_point)
-
-    # use this list later to bulk add all Dataset instances to database
-    # there are multiple Dataset instances because each single point (one row in points table)
-    # relates to multiple rows in the dataset table
-    # (because one point contains many atoms and each atom has information for it)
-    db_dataset_list = []
+    # there are multiple dataset rows for each single point (one row in points table)
+    # because one point contains many atoms and each atom has information for it
+    dataset_rows = {}
 
     # list that will add missing int files
     # (if _atomicfiles directory exists) but .int file for an atom does not.
@@ -150,18 +191,14 @@ def add_point_to_database(
     # add information to dataset table for each atom
     for atom_name in point.atom_names:
 
-        # make select statement to get atom name
-        atom_select_statement = select(AtomNames).where(AtomNames.name == atom_name)
-        # get the id of the atom from the atom_names table.
-        # use scalars instead of execute and return the first row (there should be one row as atom names are unique)
-        atom_id = session.scalars(atom_select_statement).first().id
-
         # get x, y, z coordinates of atom which can then be used to calculated features
         # based on the coordinates of the other atoms in the molecule
         atom_coordinates = point[atom_name].coordinates
-        x_coord = atom_coordinates[0]
-        y_coord = atom_coordinates[1]
-        z_coord = atom_coordinates[2]
+        atom_row = dict(
+            x=atom_coordinates[0],
+            y=atom_coordinates[1],
+            z=atom_coordinates[2],
+        )
 
         ###############################
         # .gau / gaussian output information
@@ -173,98 +210,49 @@ def add_point_to_database(
         if point.gaussian_output:
             if point.gaussian_output.global_forces:
                 atom_global_forces = point.gaussian_output.global_forces[atom_name]
-                atom_force_x = atom_global_forces[0]
-                atom_force_y = atom_global_forces[1]
-                atom_force_z = atom_global_forces[2]
+                atom_row["force_x"] = atom_global_forces[0]
+                atom_row["force_y"] = atom_global_forces[1]
+                atom_row["force_z"] = atom_global_forces[2]
 
             # in case that the force keyword was not used but gaussian out exists
             else:
-                atom_force_x, atom_force_y, atom_force_z = None, None, None
                 print(
                     f"Point {point.path} does not have forces in Gaussian output (.gau) file."
                 )
-        # in case that gaussian out does not exist in point directory
-        else:
-            atom_force_x, atom_force_y, atom_force_z = None, None, None
 
         ###############################
         # .int file information
         ###############################
-        if point.ints:
-            # add information from int file for the current atom
-            # get the INT instance representing the .int file for the atom
-            # use get here to get a default value of None if .int file is missing for some atom
-            atom_int_file = point.ints.get(atom_name, None)
-
-            # if .int file / INT instance exists, then data can be read in
-            if atom_int_file:
-
-                # do not display warning from .int file if iqa energy is not there
-                # iqa energy will not be in an existing .int file in -encomp setting is below 3
-                with warnings.catch_warnings():
-                    warnings.filterwarnings("ignore")
-                    atom_iqa_energy = atom_int_file.iqa
-
-                # integration error should always exist
-                atom_integration_error = atom_int_file.integration_error
-
-                # note that these are not rotated because the alf has not been chosen yet
-                # the user can choose an alf and rotate the global spherical multipoles as needed
-                global_multipole_moments = atom_int_file.global_spherical_multipoles
-
-                # add the Dataset object to list so it can be bulk written later
-                db_dataset_list.append(
-                    Dataset(
-                        point_id=db_point.id,
-                        atom_id=atom_id,
-                        x=x_coord,
-                        y=y_coord,
-                        z=z_coord,
-                        force_x=atom_force_x,
-                        force_y=atom_force_y,
-                        force_z=atom_force_z,
-                        iqa=atom_iqa_energy,
-                        integration_error=atom_integration_error,
-                        **global_multipole_moments,
-                    )
-                )
 
-            # if .int file for an atom does not exist then (but _atomicfiles directory exists)
-            # then just append the coordinates and any other read in information
-            else:
-                # add the Dataset object to list so it can be bulk written later
-                db_dataset_list.append(
-                    Dataset(
-                        point_id=db_point.id,
-                        atom_id=atom_id,
-                        x=x_coord,
-                        y=y_coord,
-                        z=z_coord,
-                        force_x=atom_force_x,
-                        force_y=atom_force_y,
-                        force_z=atom_force_z,
-                        # the .int file arguments will be None by default
-                        # as they can be nullable because of the dataset SQL table definition
-                    )
-                )
-                missing_int_files.append(atom_name)
+        # add information from int file for the current atom
+        # get the INT instance representing the .int file for the atom
+        # use get here to get a default value of None if .int file is missing for some atom
+        atom_int_file = point.ints.get(atom_name, None)
+
+        # if .int file / INT instance exists, then data can be read in
+        if atom_int_file:
+
+            # do not display warning from .int file if iqa energy is not there
+            # iqa energy will not be in an existing .int file in -encomp setting is below 3
+            with warnings.catch_warnings():
+                warnings.filterwarnings("ignore")
+                atom_row["iqa"] = atom_int_file.iqa
 
+            # integration error should always exist
+            atom_row["integration_error"] = atom_int_file.integration_error
+
+            # note that these are not rotated because the alf has not been chosen yet
+            # the user can choose an alf and rotate the global spherical multipoles as needed
+            atom_row.update(atom_int_file.global_spherical_multipoles)
+
+        # if .int file for an atom does not exist then (but _atomicfiles directory exists)
+        # then just add the coordinates and any other read in information
+        # the .int file columns will be None by default
+        # as they can be nullable because of the dataset SQL table definition
         else:
-            # add the Dataset object to list so it can be bulk written later
-            db_dataset_list.append(
-                Dataset(
-                    point_id=db_point.id,
-                    atom_id=atom_id,
-                    x=x_coord,
-                    y=y_coord,
-                    z=z_coord,
-                    force_x=atom_force_x,
-                    force_y=atom_force_y,
-                    force_z=atom_force_z,
-                    # the .int file arguments will be None by default
-                    # as they can be nullable because of the dataset SQL table definition
-                )
-            )
+            missing_int_files.append(atom_name)
+
+        dataset_rows[atom_name] = atom_row
 
     # if there are missing atoms, then print these out
     if len(missing_int_files) > 0:
@@ -274,7 +262,221 @@ def add_point_to_database(
                 f"Point {point.path} has missing .int files for atoms: {missing_int_files}."
             )
 
-    # bulk save the information for all atoms in the point
-    session.bulk_save_objects(db_dataset_list)
+    return point_row, dataset_rows
+
+
+def _insert_point_rows(
+    session: Session,
+    point_row: dict,
+    dataset_rows: Dict[str, dict],
+    atom_ids: Dict[str, int],
+) -> int:
+    """Inserts the rows of one point into the points and dataset tables and returns the id of the point."""
+
+    # the point needs to be inserted before the dataset rows
+    # because the dataset table contains the foreign key point_id
+    point_id = session.execute(insert(Points).values(**point_row)).inserted_primary_key[
+        0
+    ]
+    # all rows need to have the same columns, the missing data is None (NULL)
+    columns = {column for atom_row in dataset_rows.values() for column in atom_row}
+    session.execute(
+        insert(Dataset),
+        [
+            dict(
+                point_id=point_id,
+                atom_id=atom_ids[atom_name],
+                **{column: atom_row.get(column) for column in columns},
+            )
+            for atom_name, atom_row in dataset_rows.items()
+        ],
+    )
+
+    return point_id
+
+
+def _get_atom_ids(session: Session) -> Dict[str, int]:
+    """Returns a dictionary of atom names and their ids in the atom_names table."""
+    return dict(session.execute(select(AtomNames.name, AtomNames.id)).all())
+
+
+def add_point_to_database(
+    session: Session,
+    point: "ichor.core.files.PointDirectory",  # noqa F821
+    echo=False,
+    print_missing_data=True,
+) -> bool:
+    """Adds information from an instance of a PointDirectory to the database.
+
+    :param database_path: Path to database
+    :param point: A PointDirectory instance, containing Gaussian/AIMAll outputs that can be
+        written to the database.
+    :return: Whether the point was added to the database
+
+    .. note:: Even if atomic data (.int file) is missing for a particular atom in the system,
+        the information for the point will still be added to the database. This is because
+        the rest the point can still be used in the training set for the other atoms.
+    """
+
+    rows = get_point_database_rows(point, print_missing_data=print_missing_data)
+    if rows is None:
+        return False
+
+    _insert_point_rows(session, *rows, _get_atom_ids(session))
     # commit to database
     session.commit()
+
+    return True
+
+
+def _get_point_database_rows_from_path(
+    point_path: Path, print_missing_data: bool
+) -> Optional[Tuple[dict, Dict[str, dict]]]:
+    """Used to read points in other processes (PointDirectory instances are not passed between processes)."""
+
+    from ichor.core.files import PointDirectory
+
+    return get_point_database_rows(
+        PointDirectory(point_path), print_missing_data=print_missing_data
+    )
+
+
+def _delete_points(session: Session, point_ids: List[int]):
+    """Deletes the rows of points (and their fingerprints) from the database."""
+    session.execute(
+        delete(PointFingerprints).where(PointFingerprints.point_id.in_(point_ids))
+    )
+    session.execute(delete(Dataset).where(Dataset.point_id.in_(point_ids)))
+    session.execute(delete(Points).where(Points.id.in_(point_ids)))
+
+
+def sync_points_to_database(
+    session: Session,
+    points: List["ichor.core.files.PointDirectory"],  # noqa F821
+    ncores: int = 1,
+    print_missing_data=True,
+    chunk_size: int = 500,
+) -> Tuple[int, int, int]:
+    """Adds new points and points whose files have changed to the database, the other
+    points are not read again. A fingerprint of the files of every point (see `point_fingerprint`)
+    is stored in the database, and a point is added again if its fingerprint is different.
+    The rows of a changed point are replaced, so points are not duplicated in the database.
+
+    The fingerprints are stored by the names of the PointsDirectory and the point directory
+    (see `point_key`), so a PointsDirectory can be moved or copied without adding its points again.
+    Points which are already in the database but do not have a fingerprint (i.e. they were added with
+    `add_point_to_database`) are replaced by name once. If a point that is in the database
+    can no longer be read (e.g. AIMAll has been rerun and crashed), its rows are removed.
+
+    :param session: Session of the database, the database must contain the point_fingerprints table
+    :param points: A list of PointDirectory instances, e.g. a PointsDirectory
+    :param ncores: The number of processes used to read the files of the points, defaults to 1
+    :param print_missing_data: Whether to print out any missing data, defaults to True
+    :param chunk_size: The number of points that are read before they are committed to the database
+    :return: A tuple of the number of points that were added or replaced, the number of points
+        that were already up to date and the number of new or changed points that could not be added
+        (e.g. AIMAll did not finish), which are read again the next time. The rows of
+        changed points which could not be added are removed from the database.
+    """
+    import concurrent.futures
+
+    from ichor.core.common.itertools import chunker
+
+    # key of point directory: (point id, fingerprint)
+    stored_fingerprints = {
+        key: (point_id, fingerprint)
+        for key, point_id, fingerprint in session.execute(
+            select(
+                PointFingerprints.key,
+                PointFingerprints.point_id,
+                PointFingerprints.fingerprint,
+            )
+        )
+    }
+    # names of points that were added without a fingerprint
+    names_without_fingerprint = set(
+        session.scalars(
+            select(Points.name)
+            .distinct()
+            .where(Points.id.not_in(select(PointFingerprints.point_id)))
+        )
+    )
+
+    points_to_add = []
+    for point in points:
+        point_path = str(Path(point.path).absolute())
+        key = point_key(point_path)
+        fingerprint = point_fingerprint(point_path)
+        if stored_fingerprints.get(key, (None, None))[1] != fingerprint:
+            points_to_add.append(
+                (point.name_without_suffix, key, point_path, fingerprint)
+            )
+
+    atom_ids = _get_atom_ids(session)
+
+    nadded, nfailed = 0, 0
+    executor = (
+        concurrent.futures.ProcessPoolExecutor(max_workers=ncores)
+        if ncores > 1
+        else None
+    )
+    try:
+        for chunk in chunker(points_to_add, chunk_size):
+            paths = [point_path for _, _, point_path, _ in chunk]
+            print_missing = [print_missing_data] * len(chunk)
+            if executor is not None:
+                all_rows = executor.map(
+                    _get_point_database_rows_from_path, paths, print_missing
+                )
+            else:
+                all_rows = map(_get_point_database_rows_from_path, paths, print_missing)
+
+            for (name, key, point_path, fingerprint), rows in zip(chunk, all_rows):
+                # the point could not be added, so the fingerprint is not stored
+                # and the point is read again next time
+                if rows is None:
+                    # the files of a point in the database have changed and can no longer be read,
+                    # so the old rows are out of date
+                    if key in stored_fingerprints:
+                        _delete_points(session, [stored_fingerprints.pop(key)[0]])
+                    nfailed += 1
+                    continue
+
+                # atom names which are not in the database yet (e.g. another system is added)
+                new_atom_names = [
+                    atom_name for atom_name in rows[1] if atom_name not in atom_ids
+                ]
+                if new_atom_names:
+                    add_atom_names_to_database(session, new_atom_names)
+                    atom_ids = _get_atom_ids(session)
+
+                # remove the old rows of a point that has changed
+                old_point_ids = []
+                if key in stored_fingerprints:
+                    old_point_ids.append(stored_fingerprints.pop(key)[0])
+                if name in names_without_fingerprint:
+                    old_point_ids.extend(
+                        session.scalars(
+                            select(Points.id)
+                            .where(Points.name == name)
+                            .where(Points.id.not_in(select(PointFingerprints.point_id)))
+                        )
+                    )
+                    names_without_fingerprint.remove(name)
+                if old_point_ids:
+                    _delete_points(session, old_point_ids)
+
+                point_id = _insert_point_rows(session, *rows, atom_ids)
+                session.execute(
+                    insert(PointFingerprints).values(
+                        point_id=point_id, key=key, fingerprint=fingerprint
+                    )
+                )
+                nadded += 1
+
+            session.commit()
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return nadded, len(points) - len(points_to_add), nfailed
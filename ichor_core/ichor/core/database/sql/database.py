@@ -44,6 +44,22 @@ class Points(Base):
     )
 
 
+class PointFingerprints(Base):
+    """Records the sizes and modification times of the output files of every point
+    added to the database, so that only new or changed points are added when the database
+    is synced with a PointsDirectory again."""
+
+    __tablename__ = "point_fingerprints"
+
+    id = Column(Integer, primary_key=True)
+    point_id = Column(Integer, ForeignKey("points.id", ondelete="CASCADE"))
+    # name of the PointsDirectory and name of the point directory (see `point_key`). The names of points in
+    # different PointsDirectory-ies written to the same database can be the same, but the absolute path is
+    # not used so that a PointsDirectory can be moved or copied without all points being added again
+    key = Column(String, unique=True, nullable=False)
+    fingerprint = Column(String, nullable=False)
+
+
 class Dataset(Base):
 
     __tablename__ = "dataset"
@@ -110,8 +126,9 @@ class Dataset(Base):
 
 def create_database(database_path: Union[str, Path], echo=False):
     """Creates empty database in which important information from a PointsDirectory instance can be stored.
+    If the database already exists, only the tables which are not in the database are made.
 
-    :param database_path: A string or Path to a (non-existing) database on disk.
+    :param database_path: A string or Path to a database on disk.
     """
 
     database_path = str(Path(database_path).absolute())
@@ -11,6 +11,7 @@ from ichor.core.files.dl_poly import (
     DlPolyFFLUX,
     DlPolyField,
     DlPolyHistory,
+    DlPolyHistoryIndex,
     DlPolyIQAEnergies,
     DlPolyIQAForces,
     FFLUXDirectory,
@@ -55,6 +56,7 @@ __all__ = [
     "OrcaOutput",
     "Trajectory",
     "DlPolyHistory",
+    "DlPolyHistoryIndex",
     "DlPolyField",
     "DlPolyConfig",
     "DlPolyControl",
@@ -1,3 +1,4 @@
+import io
 from enum import Enum
 from pathlib import Path
 from typing import Dict, List, Union
@@ -12,7 +13,7 @@ from ichor.core.common.constants import (
     spherical_quadrupole_labels,
 )
 from ichor.core.common.io import relpath
-from ichor.core.common.str import get_digits
+from ichor.core.common.str import get_digits, iter_lines_from
 from ichor.core.common.types import Coordinates3D
 from ichor.core.common.types.version import Version
 from ichor.core.files.file import FileContents, ReadFile
@@ -59,6 +60,23 @@ class Int(ReadFile, HasData):
 
     _filetype = ".int"
 
+    _sections = {
+        "paths": (
+            "current_directory",
+            "inp_file_path",
+            "wfn_file_path",
+            "out_file_path",
+            "title",
+        ),
+        "critical_points": ("critical_points",),
+        "dft_model": ("dft_model",),
+        "atom_name": ("atom_name",),
+        "basin_integration": ("basin_integration_results", "net_charge"),
+        "multipoles": ("global_spherical_multipoles",),
+        "iqa_energy_components": ("iqa_energy_components",),
+        "total_time": ("total_time",),
+    }
+
     def __init__(self, path: Union[Path, str]):
 
         # calls File.__init__(), which subsequently calls PathObject.__init__()
@@ -128,55 +146,65 @@ class Int(ReadFile, HasData):
     def _path_relative_to_aimall(self, int_path: Path, other: Path) -> Path:
         return relpath(self.path.parent, Path.cwd()) / relpath(other, int_path.parent)
 
-    def _read_file(self):
-        """Read an .int file. The first time that the .int file is read successfully, a json file with the
-        important information is written in the same directory.
-        """
+    def _read_paths(self, contents: str):
+        """Reads the paths to the files used by AIMAll and the title from the top of the .int file."""
 
-        with open(self.path, "r") as f:
-            line = next(f)
-            aimall_version = Version(line.split()[2].strip(","))
+        f = io.StringIO(contents)
+        line = next(f)
+        aimall_version = Version(line.split()[2].strip(","))
 
-            if aimall_version.major == 19:
-                while "Current Directory" not in line:
-                    line = next(f)
+        if aimall_version.major == 19:
+            while "Current Directory" not in line:
+                line = next(f)
 
-                # TODO: document what this is doing and why
-                self.current_directory = Path(line.split()[-1])
-                next(f)  # blank line
+            # TODO: document what this is doing and why
+            self.current_directory = Path(line.split()[-1])
+            next(f)  # blank line
 
-                inp_file_path = self.current_directory / Path(next(f).split()[-1])
-                wfn_file_path = self.current_directory / Path(next(f).split()[-1])
-                out_file_path = self.current_directory / Path(next(f).split()[-1])
+            inp_file_path = self.current_directory / Path(next(f).split()[-1])
+            wfn_file_path = self.current_directory / Path(next(f).split()[-1])
+            out_file_path = self.current_directory / Path(next(f).split()[-1])
 
-            elif aimall_version.major == 16:
-                while "Inp File:" not in line:
-                    line = next(f)
+        elif aimall_version.major == 16:
+            while "Inp File:" not in line:
+                line = next(f)
 
-                inp_file_path = Path(line.split()[-1])
-                wfn_file_path = Path(next(f).split()[-1])
-                out_file_path = Path(next(f).split()[-1])
+            inp_file_path = Path(line.split()[-1])
+            wfn_file_path = Path(next(f).split()[-1])
+            out_file_path = Path(next(f).split()[-1])
 
-            # TODO: not sure if these are correct or if they are needed. Potentially remove.
-            self.inp_file_path = self._path_relative_to_aimall(
-                out_file_path, inp_file_path
-            )
-            self.wfn_file_path = self._path_relative_to_aimall(
-                out_file_path, wfn_file_path
-            )
-            self.out_file_path = self._path_relative_to_aimall(
-                out_file_path, out_file_path
-            )
+        # TODO: not sure if these are correct or if they are needed. Potentially remove.
+        self.inp_file_path = self._path_relative_to_aimall(out_file_path, inp_file_path)
+        self.wfn_file_path = self._path_relative_to_aimall(out_file_path, wfn_file_path)
+        self.out_file_path = self._path_relative_to_aimall(out_file_path, out_file_path)
 
-            next(f)  # blank line
-            self.title = next(f).split()[-1].strip()
+        next(f)  # blank line
+        self.title = next(f).split()[-1].strip()
 
-            line = next(f)
-            while "critical points" not in line:
-                line = next(f)
+    @staticmethod
+    def _read_net_charge(contents: str) -> float:
+        """Reads the net charge from the first line of the basin integration results."""
+        f = iter_lines_from(contents, "Results of the basin integration")
+        next(f)
+        return float(next(f).split()[5])
+
+    def _read_file(self):
+        """Read an .int file. Sections are found by their headers, so sections which are
+        not needed (see `ReadFile.project`) are skipped without being parsed and
+        the file is not parsed further than the last section that is needed.
+        """
+
+        with open(self.path, "r") as f:
+            contents = f.read()
 
+        if self._read_section("paths"):
+            self._read_paths(contents)
+
+        if self._read_section("critical_points"):
+            f = iter_lines_from(contents, "critical points")
+            next(f)
             line = next(f)
-            self.critical_points = []
+            critical_points = []
             while "Optional parameters" not in line:
                 if "CP" in line:
                     record = line.split()
@@ -186,71 +214,73 @@ class Int(ReadFile, HasData):
                     y = float(record[4])
                     z = float(record[5])
                     atoms = record[6:] if len(record) >= 7 else []
-                    self.critical_points.append(
-                        CriticalPoint(index, ty, x, y, z, atoms)
-                    )
+                    critical_points.append(CriticalPoint(index, ty, x, y, z, atoms))
                 line = next(f)
+            self.critical_points = critical_points
 
+        if self._read_section("dft_model"):
+            f = iter_lines_from(contents, "Optional parameters")
+            next(f)
             next(f)
             self.dft_model = next(f).split(":")[-1].strip()
 
-            line = next(f)
-            while "Integration is over atom" not in line:
-                line = next(f)
+        if self._read_section("atom_name"):
+            line = next(iter_lines_from(contents, "Integration is over atom"))
             self.atom_name = line.split()[-1].strip().capitalize()
 
-            line = next(f)
-            while "Results of the basin integration" not in line:
-                line = next(f)
-
-            self.basin_integration_results = {}
+        if self._read_section("basin_integration"):
+            f = iter_lines_from(contents, "Results of the basin integration")
+            next(f)
+            basin_integration_results = {}
             record = next(f).split()
-            self.basin_integration_results[record[0].strip()] = float(record[2])
+            basin_integration_results[record[0].strip()] = float(record[2])
             self.net_charge = float(record[5])
             line = next(f)
             while "Atomic Traceless Quadrupole" not in line:
                 if "=" in line:
                     record = line.split("=")
-                    self.basin_integration_results[record[0].strip()] = float(
+                    basin_integration_results[record[0].strip()] = float(
                         record[1].split()[0]
                     )
                 line = next(f)
+            self.basin_integration_results = basin_integration_results
 
-            while "Real Spherical Harmonic Moments" not in line:
-                line = next(f)
-
+        if self._read_section("multipoles"):
+            f = iter_lines_from(contents, "Real Spherical Harmonic Moments")
+            next(f)
             next(f)
             next(f)
             next(f)
 
-            self.global_spherical_multipoles = {}
+            global_spherical_multipoles = {}
             line = next(f)
             while "=" in line:
                 record = line.split("=")
                 multipole_name = "".join(
                     c for c in record[0].lower().strip() if c not in {"[", "]", ","}
                 )
-                self.global_spherical_multipoles[multipole_name] = float(record[1])
+                global_spherical_multipoles[multipole_name] = float(record[1])
                 line = next(f)
 
             # replace q00 so that it subtracts the nuclear charge
-            self.global_spherical_multipoles["q00"] = self.net_charge
-
-            while "IQA Energy Components" not in line:
-                line = next(f)
+            global_spherical_multipoles["q00"] = self._read_net_charge(contents)
+            self.global_spherical_multipoles = global_spherical_multipoles
 
+        if self._read_section("iqa_energy_components"):
+            f = iter_lines_from(contents, "IQA Energy Components")
+            next(f)
             next(f)
 
-            self.iqa_energy_components = {}
+            iqa_energy_components = {}
             line = next(f)
             while "=" in line:
                 name, _, value = line.rpartition("=")
-                self.iqa_energy_components[name.strip()] = float(value)
-                line = next(f)
-
-            while "Total time" not in line:
+                iqa_energy_components[name.strip()] = float(value)
                 line = next(f)
+            self.iqa_energy_components = iqa_energy_components
 
+        if self._read_section("total_time"):
+            line = next(iter_lines_from(contents, "Total time"))
             self.total_time = int(line.split()[3])
 
     @property
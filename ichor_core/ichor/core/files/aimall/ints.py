@@ -47,6 +47,17 @@ class IntDirectory(HasData, AnnotatedDirectory):
         """Checks if the given Path instance has _atomicfiles in its name."""
         return path.name.endswith("_atomicfiles")
 
+    def project(self, *sections: str) -> "IntDirectory":
+        """Only read in the given sections of the .int files, see `ReadFile.project`. The atom
+        name is always read in because it is used to find the .int file of an atom.
+
+        :param sections: Names of sections (or attributes) of `Int` to read in
+        :return: The instance itself, so that it can be chained
+        """
+        for int_file in self.ints:
+            int_file.project("atom_name", *sections)
+        return self
+
     def properties(self, C_dict: Dict[str, np.ndarray]) -> Dict[str, Dict[str, float]]:
         """
         Returns a dictionary of dictionaries containing atom names as keys an a dictionary
@@ -3,6 +3,10 @@ from ichor.core.files.dl_poly.dl_poly_control import DlPolyControl
 from ichor.core.files.dl_poly.dl_poly_fflux import DlPolyFFLUX
 from ichor.core.files.dl_poly.dl_poly_field import DlPolyField
 from ichor.core.files.dl_poly.dl_poly_history import DlPolyHistory
+from ichor.core.files.dl_poly.dl_poly_history_index import (
+    DlPolyHistoryFrames,
+    DlPolyHistoryIndex,
+)
 from ichor.core.files.dl_poly.dl_poly_iqa_energies import DlPolyIQAEnergies
 from ichor.core.files.dl_poly.dl_poly_iqa_forces import DlPolyIQAForces
 from ichor.core.files.dl_poly.fflux_directory import FFLUXDirectory
@@ -12,6 +16,8 @@ __all__ = [
     "DlPolyControl",
     "DlPolyField",
     "DlPolyHistory",
+    "DlPolyHistoryFrames",
+    "DlPolyHistoryIndex",
     "DlPolyIQAEnergies",
     "DlPolyIQAForces",
     "DlPolyFFLUX",
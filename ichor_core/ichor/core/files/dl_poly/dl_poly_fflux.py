@@ -1,10 +1,8 @@
 from pathlib import Path
-from typing import List, Union
+from typing import List, Sequence, Union
 
 import numpy as np
 
-import pandas as pd
-
 from ichor.core.files.file import FileContents, ReadFile
 
 
@@ -34,6 +32,8 @@ class DlPolyFFLUX(ReadFile):
 
     def _read_file(self):
 
+        import pandas as pd
+
         self.df = pd.read_csv(
             self.path,
             skiprows=2,
@@ -77,6 +77,27 @@ class DlPolyFFLUX(ReadFile):
     def ntimesteps(self):
         return len(self.total_energy)
 
+    def rows_of_timesteps(self, timesteps: Sequence[int]) -> np.ndarray:
+        """Returns the row indices of the given timesteps (the step column of the FFLUX file).
+        The rows are looked up in the (hashed) index of the dataframe, so this also works when
+        the HISTORY and FFLUX files do not contain the same timesteps.
+
+        :param timesteps: The timestep numbers, e.g. the `existing_timesteps` of a HISTORY file
+        :raises ValueError: If any of the timesteps are not in the FFLUX file
+        """
+
+        rows = self.df.index.get_indexer(np.asarray(timesteps))
+        missing = np.asarray(timesteps)[rows == -1]
+        if len(missing) > 0:
+            raise ValueError(
+                f"Timesteps {missing.tolist()} are not in the FFLUX file '{self.path}'."
+            )
+        return rows
+
+    def total_energy_at_timesteps(self, timesteps: Sequence[int]) -> np.ndarray:
+        """Returns the total energies (in Hartree) of the given timesteps, see `rows_of_timesteps`."""
+        return self.total_energy[self.rows_of_timesteps(timesteps)]
+
     @property
     def delta_between_timesteps(self) -> List[float]:
         """Calculates the delta energy (in kJ mol-1) between
@@ -1,9 +1,8 @@
 from pathlib import Path
 from typing import List, Union
 
-import numpy as np
 from ichor.core.atoms import Atom, Atoms
-from ichor.core.calculators import default_connectivity_calculator
+from ichor.core.calculators import internal_coordinate_indices
 from ichor.core.calculators.geometry_calculator import get_internal_feature_indices
 from ichor.core.common.constants import dlpoly_weights
 from ichor.core.files.file import WriteFile
@@ -44,45 +43,22 @@ class ConnectedAtoms(Atoms):
         self._angles = []
         self._dihedrals = []
 
-        bonds = np.array(self.connectivity(default_connectivity_calculator))
-        angles = np.matmul(bonds, bonds)
-        dihedrals = np.matmul(angles, bonds)
-
-        bond_list = []
-        angle_list = []
-        dihedral_list = []
-
-        # iterate over upper triangular matrix to avoid double counting
-        for i in range(bonds.shape[0]):
-            for j in range(i + 1, bonds.shape[1]):
-                if bonds[i, j] == 1:
-                    bond_list += [(i, j)]
-                elif angles[i, j] == 1:
-                    angle_list += [(i, j)]
-                elif dihedrals[i, j] == 1:
-                    dihedral_list += [(i, j)]
-
-        for i, j in bond_list:
+        bond_idx, angle_idx, dihedral_idx = internal_coordinate_indices(self)
+
+        for i, j in bond_idx.tolist():
             self[i].set_bond(self[j])
             self[j].set_bond(self[i])
             self._bonds.append((i, j))
 
-        for i, j in angle_list:
-            for k in list(set(self[i].bond_list) & set(self[j].bond_list)):
-                self[i].set_angle(self[j])
-                self[j].set_angle(self[i])
-                self._angles.append((i, k.i, j))
-
-        for i, j in dihedral_list:
-            iatoms = list(set(self[i].bond_list) & set(self[j].angle_list))
-            jatoms = list(set(self[j].bond_list) & set(self[i].angle_list))
-            for k in iatoms:
-                for l in jatoms:
-                    if k in self[l.i].bond_list:
-                        self[i].set_dihedral(self[j])
-                        self[j].set_dihedral(self[i])
-                        self._dihedrals.append((i, k.i, l.i, j))
-                        break
+        for i, k, j in angle_idx.tolist():
+            self[i].set_angle(self[j])
+            self[j].set_angle(self[i])
+            self._angles.append((i, k, j))
+
+        for i, k, l, j in dihedral_idx.tolist():
+            self[i].set_dihedral(self[j])
+            self[j].set_dihedral(self[i])
+            self._dihedrals.append((i, k, l, j))
 
     @property
     def bonds(self):
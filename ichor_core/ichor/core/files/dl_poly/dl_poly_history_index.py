@@ -0,0 +1,401 @@
+import mmap
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+from ichor.core.files.file import FileContents, FileReadError, ReadFile
+
+
+class DlPolyHistoryFrames:
+    """Timesteps (frames) read in from a DL POLY HISTORY file, stored as numpy arrays
+    instead of as `Atoms` instances.
+
+    :param atom_types: The atom types (names written in the HISTORY file) of the atoms
+    :param ntimestep: Array of shape nframes containing the timestep numbers written in the HISTORY file
+    :param timestep_length: Array of shape nframes containing the timestep length of every frame
+    :param time: Array of shape nframes containing the simulation time of every frame
+    :param cell: Array of shape nframes x 3 x 3 containing the unit cell vectors (as rows) of every frame
+    :param coordinates: Array of shape nframes x natoms x 3
+    :param velocities: Array of shape nframes x natoms x 3, None if velocities are not written in the HISTORY file
+    :param forces: Array of shape nframes x natoms x 3, None if forces are not written in the HISTORY file
+    """
+
+    def __init__(
+        self,
+        atom_types: List[str],
+        ntimestep: np.ndarray,
+        timestep_length: np.ndarray,
+        time: np.ndarray,
+        cell: np.ndarray,
+        coordinates: np.ndarray,
+        velocities: Optional[np.ndarray] = None,
+        forces: Optional[np.ndarray] = None,
+    ):
+        self.atom_types = atom_types
+        self.ntimestep = ntimestep
+        self.timestep_length = timestep_length
+        self.time = time
+        self.cell = cell
+        self.coordinates = coordinates
+        self.velocities = velocities
+        self.forces = forces
+
+    @property
+    def nframes(self) -> int:
+        return self.coordinates.shape[0]
+
+    @property
+    def natoms(self) -> int:
+        return self.coordinates.shape[1]
+
+    def __len__(self):
+        return self.nframes
+
+    def to_xyz_str(self, comment_start: int = 0, comment_step: int = 1) -> str:
+        """Formats the frames in the .xyz trajectory format (the same format as written by `Trajectory`).
+        A %-format template is made once for all atoms, so that each frame is formatted in one operation.
+
+        :param comment_start: The index written in the comment line (i = ...) of the first frame
+        :param comment_step: The difference between indices written in the comment lines of consecutive frames
+        """
+
+        atom_lines = "".join(
+            f"{ty.capitalize()} %16.12f %16.12f %16.12f\n" for ty in self.atom_types
+        )
+
+        return "".join(
+            f"{self.natoms}\ni = {comment_start + i * comment_step}\n"
+            + atom_lines % tuple(frame_coordinates.ravel())
+            for i, frame_coordinates in enumerate(self.coordinates)
+        )
+
+
+class DlPolyHistoryIndex(ReadFile):
+    """Random access reader for (possibly very large) DL POLY HISTORY files.
+
+    Reading the file only builds an index of the byte offsets at which every timestep record
+    starts. Records which contain binary data (sometimes written by FFLUX) or do not
+    contain the expected number of lines are skipped. Frames are only parsed when they are accessed,
+    either by indexing (an integer returns a `DlpolyTimestep`, a slice or a list of indices returns
+    `DlPolyHistoryFrames`) or by iterating over chunks of frames with `iter_frames`.
+
+    .. note::
+        As with `DlPolyHistory`, the index of a frame is not always the same as the timestep
+        number in the HISTORY file if some records are corrupted. Use the `existing_timesteps`
+        and `removed_timesteps` attributes to map between the two.
+
+    :param path: Path to the HISTORY file
+
+    :ivar title: The title line of the HISTORY file
+    :ivar trajectory_key: Whether coordinates, velocities and/or forces are written in the file
+    :ivar periodic_boundary: The periodic boundary key of the simulation
+    :ivar number_of_atoms: Number of atoms in each frame
+    :ivar ntimesteps: Number of timesteps written in the header of the HISTORY file
+    :ivar offsets: Array containing the byte offset of each valid record
+    :ivar existing_timesteps: The timestep numbers of the valid records
+    :ivar removed_timesteps: The timestep numbers which were skipped because they are corrupted
+    :ivar atom_types: The atom types of the atoms
+    """
+
+    _filetype = ""
+
+    def __init__(self, path: Union[Path, str] = Path("HISTORY")):
+
+        super().__init__(path)
+
+        self.title = FileContents
+        self.trajectory_key = FileContents
+        self.periodic_boundary = FileContents
+        self.number_of_atoms = FileContents
+        self.ntimesteps = FileContents
+        self.offsets = FileContents
+        self.existing_timesteps = FileContents
+        self.removed_timesteps = FileContents
+        self.atom_types = FileContents
+        self._record_sizes = FileContents
+        self._timestep_length = FileContents
+        self._time = FileContents
+
+    @classmethod
+    def check_path(cls, path: Path) -> bool:
+        return path.stem == "HISTORY"
+
+    @property
+    def lines_per_atom(self) -> int:
+        """The atom record line and then 1 line for each of coordinates, velocities and forces
+        depending on the trajectory key."""
+        return 2 + self.trajectory_key.value
+
+    @property
+    def lines_per_record(self) -> int:
+        """The timestep line, 3 unit cell lines and the lines for all atoms."""
+        return 4 + self.number_of_atoms * self.lines_per_atom
+
+    @property
+    def nframes(self) -> int:
+        return len(self.offsets)
+
+    def __len__(self):
+        return self.nframes
+
+    def _read_file(self):
+
+        # import here to prevent circular import, dl_poly_history uses this class
+        from ichor.core.files.dl_poly.dl_poly_history import (
+            DlpolyPeriodicBoundary,
+            DlpolyTrajectoryKey,
+        )
+
+        with open(self.path, "rb") as f:
+
+            self.title = f.readline().decode(errors="replace")
+            record = f.readline().split()
+            self.trajectory_key = DlpolyTrajectoryKey(int(record[0]))
+            self.periodic_boundary = DlpolyPeriodicBoundary(int(record[1]))
+            self.number_of_atoms = int(record[2])
+            self.ntimesteps = int(record[3])
+            header_end = f.tell()
+
+            file_size = f.seek(0, 2)
+            if file_size == header_end:
+                # no timesteps written yet, mmap cannot map empty files
+                self._set_index([], [], [], [], [])
+                self.atom_types = []
+                return
+
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+
+                # find the start of every record, the search is done in C so it is fast
+                # even for multi-GB files. Binary data can be written before the
+                # `timestep` keyword on the same line, so the record starts at the beginning of that line
+                # (and the record is then skipped because it contains binary).
+                starts = []
+                pos = mm.find(b"timestep", header_end)
+                while pos != -1:
+                    starts.append(mm.rfind(b"\n", header_end - 1, pos) + 1)
+                    pos = mm.find(b"timestep", pos + 8)
+                starts.append(file_size)
+
+                offsets, sizes, ntimestep, timestep_length, time = [], [], [], [], []
+                lines_per_record = self.lines_per_record
+
+                for start, end in zip(starts[:-1], starts[1:]):
+                    record = mm[start:end]
+                    # records which contain binary are not read in
+                    if b"\x00" in record:
+                        continue
+                    nlines = record.count(b"\n")
+                    # the last line in the file might not end with a newline
+                    if not record.endswith(b"\n"):
+                        nlines += 1
+                    if nlines != lines_per_record:
+                        continue
+                    # record = 'timestep' ntimestep number_of_atoms keytraj keypbc timestep_length time
+                    timestep_record = record[: record.find(b"\n")].split()
+                    try:
+                        this_ntimestep = int(timestep_record[1])
+                        this_timestep_length = float(timestep_record[5])
+                        this_time = float(timestep_record[6])
+                    except (IndexError, ValueError):
+                        continue
+
+                    offsets.append(start)
+                    sizes.append(end - start)
+                    ntimestep.append(this_ntimestep)
+                    timestep_length.append(this_timestep_length)
+                    time.append(this_time)
+
+                self._set_index(offsets, sizes, ntimestep, timestep_length, time)
+
+                if offsets:
+                    first_record = mm[offsets[0] : offsets[0] + sizes[0]]
+                    atom_lines = first_record.split(b"\n")[4 :: self.lines_per_atom][
+                        : self.number_of_atoms
+                    ]
+                    self.atom_types = [line.split()[0].decode() for line in atom_lines]
+                else:
+                    self.atom_types = []
+
+    def _set_index(self, offsets, sizes, ntimestep, timestep_length, time):
+
+        self.offsets = np.array(offsets, dtype=np.int64)
+        self._record_sizes = np.array(sizes, dtype=np.int64)
+        self._timestep_length = np.array(timestep_length, dtype=float)
+        self._time = np.array(time, dtype=float)
+        self.existing_timesteps = np.array(ntimestep, dtype=int)
+
+        # note that the initial geometry is also counted a timestep
+        # so setting the CONTROL timesteps to 500 for example will give 501 geometries in HISTORY file
+        self.removed_timesteps = np.setdiff1d(
+            np.arange(self.ntimesteps), self.existing_timesteps
+        )
+
+    def _read_records(self, indices: Sequence[int]) -> List[bytes]:
+        """Reads the raw bytes of the records at the given (frame) indices."""
+
+        records = []
+        with open(self.path, "rb") as f:
+            for i in indices:
+                f.seek(self.offsets[i])
+                records.append(f.read(self._record_sizes[i]))
+        return records
+
+    def _parse_records(
+        self, indices: Sequence[int], records: List[bytes]
+    ) -> DlPolyHistoryFrames:
+        """Parses the records into arrays. All numbers of one kind (e.g. coordinates) for all
+        records are joined and converted in a single numpy call."""
+
+        natoms = self.number_of_atoms
+        lines_per_atom = self.lines_per_atom
+        nframes = len(records)
+
+        cell_lines = []
+        # lines containing coordinates, velocities and forces
+        per_atom_lines = [[] for _ in range(lines_per_atom - 1)]
+
+        for record in records:
+            lines = record.split(b"\n")
+            cell_lines.extend(lines[1:4])
+            atom_lines = lines[4 : 4 + natoms * lines_per_atom]
+            for i, values in enumerate(per_atom_lines, start=1):
+                values.extend(atom_lines[i::lines_per_atom])
+
+        def to_array(lines: List[bytes], shape: tuple) -> np.ndarray:
+            values = b" ".join(lines).split()
+            if len(values) != np.prod(shape):
+                raise FileReadError(
+                    f"Could not parse frames from '{self.path}', expected {np.prod(shape)} values, found {len(values)}."
+                )
+            return np.array(values, dtype=float).reshape(shape)
+
+        arrays = [to_array(lines, (nframes, natoms, 3)) for lines in per_atom_lines]
+        # make sure that there is always a value for velocities and forces
+        arrays += [None] * (3 - len(arrays))
+
+        indices = np.asarray(indices, dtype=int)
+
+        return DlPolyHistoryFrames(
+            self.atom_types,
+            self.existing_timesteps[indices],
+            self._timestep_length[indices],
+            self._time[indices],
+            to_array(cell_lines, (nframes, 3, 3)),
+            *arrays,
+        )
+
+    def read_frames(self, indices: Sequence[int]) -> DlPolyHistoryFrames:
+        """Parses the frames at the given indices (indices of valid frames, not timestep numbers).
+
+        :param indices: The frame indices to read
+        :return: A `DlPolyHistoryFrames` instance containing the frames
+        """
+        indices = np.arange(self.nframes)[indices]
+        return self._parse_records(indices, self._read_records(indices))
+
+    def iter_frames(
+        self, chunk_nframes: int = 1000, every: int = 1
+    ) -> Iterator[DlPolyHistoryFrames]:
+        """Iterates over the frames in chunks, so that only one chunk is in memory at any time.
+
+        :param chunk_nframes: The (maximum) number of frames in each chunk
+        :param every: Only read every nth frame, defaults to 1
+        :return: Yields `DlPolyHistoryFrames` instances
+        """
+
+        indices = np.arange(0, self.nframes, every)
+        for i in range(0, len(indices), chunk_nframes):
+            yield self.read_frames(indices[i : i + chunk_nframes])
+
+    def write_to_trajectory(
+        self,
+        path: Union[str, Path] = "TRAJECTORY.xyz",
+        every: int = 1,
+        chunk_nframes: int = 1000,
+        indices: Optional[Sequence[int]] = None,
+    ):
+        """Writes frames to a trajectory .xyz file. The frames are read (by seeking to their offsets)
+        and written in chunks, so only one chunk of frames is in memory at any time.
+
+        :param path: Path of the .xyz file to write
+        :param every: Only write every nth frame, defaults to 1. Ignored if `indices` are given.
+        :param chunk_nframes: The number of frames that are formatted at a time
+        :param indices: The frame indices to write, e.g. a random sample of frames. The frames are
+            written in the given order and numbered from 0 in the comment lines. Defaults to every nth frame.
+        """
+
+        with open(path, "w") as f:
+            if indices is None:
+                for i, frames in enumerate(self.iter_frames(chunk_nframes, every)):
+                    f.write(
+                        frames.to_xyz_str(
+                            comment_start=i * chunk_nframes * every, comment_step=every
+                        )
+                    )
+            else:
+                for start in range(0, len(indices), chunk_nframes):
+                    frames = self.read_frames(indices[start : start + chunk_nframes])
+                    f.write(frames.to_xyz_str(comment_start=start))
+
+    @property
+    def coordinates(self) -> np.ndarray:
+        """Returns the coordinates of all (valid) frames as an array of shape nframes x natoms x 3"""
+        return self.read_frames(slice(None)).coordinates
+
+    def __getitem__(self, item):
+        """Indexing by an integer returns a `DlpolyTimestep` (an `Atoms` instance),
+        indexing by a slice or list/array of integers returns `DlPolyHistoryFrames`."""
+
+        if isinstance(item, (int, np.integer)):
+            return frame_to_timestep(self, self.read_frames([item]), 0)
+        elif isinstance(item, (slice, list, np.ndarray)):
+            return self.read_frames(item)
+
+        raise TypeError(
+            f"Cannot index type '{self.__class__.__name__}' with type '{type(item)}"
+        )
+
+    def __iter__(self):
+        """Iterates over the frames as `DlpolyTimestep` instances"""
+        for frames in self.iter_frames():
+            for i in range(len(frames)):
+                yield frame_to_timestep(self, frames, i)
+
+
+def frame_to_timestep(
+    history_index: DlPolyHistoryIndex, frames: DlPolyHistoryFrames, i: int
+) -> "ichor.core.files.dl_poly.dl_poly_history.DlpolyTimestep":  # noqa F821
+    """Converts frame `i` of `frames` to a `DlpolyTimestep` instance (an `Atoms` instance)
+    which contains `DlpolyTimestepAtom` instances.
+
+    :param history_index: The `DlPolyHistoryIndex` from which the frames were read
+    :param frames: The read in frames
+    :param i: The index of the frame in `frames`
+    """
+
+    from ichor.core.files.dl_poly.dl_poly_history import (
+        DlpolyTimestep,
+        DlpolyTimestepAtom,
+    )
+
+    timestep = DlpolyTimestep()
+    timestep.ntimestep = int(frames.ntimestep[i])
+    timestep.number_of_atoms = frames.natoms
+    timestep.trajectory_key = history_index.trajectory_key
+    timestep.periodic_boundary = history_index.periodic_boundary
+    timestep.timestep_length = float(frames.timestep_length[i])
+    timestep.timestep = float(frames.time[i])
+    timestep.unit_cell = frames.cell[i]
+
+    # lists of python floats are a lot faster to index than numpy arrays
+    for j, (atom_type, (x, y, z)) in enumerate(
+        zip(frames.atom_types, frames.coordinates[i].tolist())
+    ):
+        timestep_atom = DlpolyTimestepAtom(atom_type, x, y, z)
+        if frames.velocities is not None:
+            timestep_atom.velocity = frames.velocities[i, j]
+        if frames.forces is not None:
+            timestep_atom.force = frames.forces[i, j]
+        timestep.add(timestep_atom)
+
+    return timestep
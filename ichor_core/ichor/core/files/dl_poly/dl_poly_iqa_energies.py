@@ -3,62 +3,49 @@ from typing import Union
 
 import numpy as np
 
-from ichor.core.files.file import FileContents, ReadFile
+from ichor.core.files.dl_poly.dl_poly_iqa_file import DlPolyIQAFile
+from ichor.core.files.file import FileContents
 
 
-class DlPolyIQAEnergies(ReadFile):
+class DlPolyIQAEnergies(DlPolyIQAFile):
     """READS the IQA_ENERGIES file from FFLUX.
 
     :param path: Path to IQA_ENERGIES file
+    :param use_cache: Whether to memory map the energies from a binary cache which is written
+        next to the IQA_ENERGIES file, defaults to False
+    :param chunk_ntimesteps: The number of timesteps that are parsed at a time, defaults to 10000
 
     :ivar natoms: Number of atoms in system
     :ivar energies: Array of shape ntimesteps x natoms for read energies
     """
 
-    _filetype = ""
+    _nvalues = 1
 
-    def __init__(self, path: Union[Path, str] = Path("IQA_ENERGIES")):
+    def __init__(
+        self,
+        path: Union[Path, str] = Path("IQA_ENERGIES"),
+        use_cache: bool = False,
+        chunk_ntimesteps: int = 10_000,
+    ):
 
-        super().__init__(path)
+        super().__init__(path, use_cache=use_cache, chunk_ntimesteps=chunk_ntimesteps)
         self.energies = FileContents
 
     @classmethod
     def check_path(cls, path: Path) -> bool:
         return path.stem == "IQA_ENERGIES"
 
-    def _read_file(self):
-
-        energies = []
-
-        with open(self.path, "r") as f:
-
-            lines = [i.strip().split() for i in f.readlines()]
-            # lambda func that maps first argument as int and others as float
-            map_func = lambda x: [int(x[0]), *map(float, x[1:])]
-            # list of lists. Each inner list has index, energy
-            lines = list(map(map_func, lines))
-
-            max_atom_idx = max(i[0] for i in lines)
-            self.natoms = max_atom_idx
-
-            one_timestep_energies = []
-            counter = 0
-            for line in lines:
-                # note that atom index is 1-indexed
-                # also if using OpenMP, these are not going to be ordered correctly
-                # so need to reorder them every timestep
-                atom_index, iqa_energy = line
-                one_timestep_energies.append((atom_index, iqa_energy))
-                counter += 1
-
-                # once all of one timestep is read, then sort and add
-                if counter == self.natoms:
-                    one_timestep_energies = sorted(
-                        one_timestep_energies, key=lambda tup: tup[0]
-                    )
-                    energies.append([tu[1] for tu in one_timestep_energies])
-                    one_timestep_energies = []
-                    counter = 0
-
-            # save as matrix of ntimesteps x natoms
-            self.energies = np.array(energies)
+    def _process_timesteps(self, timesteps: np.ndarray) -> np.ndarray:
+        # note that atom index is 1-indexed
+        # also if using OpenMP, these are not going to be ordered correctly
+        # so need to reorder them every timestep
+        atom_indices = timesteps[:, :, 0].astype(int) - 1
+        energies = np.empty(timesteps.shape[:2])
+        energies[
+            np.arange(timesteps.shape[0])[:, np.newaxis], atom_indices
+        ] = timesteps[:, :, 1]
+        return energies
+
+    def _set_data(self, data: np.ndarray):
+        # save as matrix of ntimesteps x natoms
+        self.energies = data
@@ -0,0 +1,212 @@
+import os
+import warnings
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Iterator, Union
+
+import numpy as np
+
+from ichor.core.common.io import count_lines
+from ichor.core.files.file import FileContents, FileReadError, ReadFile
+
+
+class DlPolyIQAFile(ReadFile, ABC):
+    """Base class for files written out by FFLUX every timestep (such as IQA_FORCES and IQA_ENERGIES),
+    where every line contains an atom index (1-indexed) followed by the values for that atom. The lines
+    for all atoms in one timestep are followed by the lines for the next timestep.
+
+    The files are parsed in chunks of timesteps straight into numpy arrays, so files for long simulations
+    can be read quickly. For files which do not fit in memory, a binary cache (.npy file) can be written
+    next to the file, which is then memory mapped instead of read into memory (see `use_cache`).
+    The chunks can also be iterated over directly with `iter_chunks`.
+
+    :param path: Path to the file
+    :param use_cache: Whether to read the data from a memory mapped binary cache. The cache is
+        written (or rewritten if the file has been modified since) the first time the file is read, defaults to False
+    :param chunk_ntimesteps: The number of timesteps that are parsed at a time, defaults to 10000
+
+    :ivar natoms: Number of atoms in each timestep
+    """
+
+    _filetype = ""
+    # number of values per atom that come after the atom index, set in subclasses
+    _nvalues = None
+
+    def __init__(
+        self,
+        path: Union[Path, str],
+        use_cache: bool = False,
+        chunk_ntimesteps: int = 10_000,
+    ):
+
+        super().__init__(path)
+        self.use_cache = use_cache
+        self.chunk_ntimesteps = chunk_ntimesteps
+        self.natoms = FileContents
+
+    @abstractmethod
+    def _process_timesteps(self, timesteps: np.ndarray) -> np.ndarray:
+        """Converts an array of shape `ntimesteps x natoms x (1 + nvalues)`, where the first value
+        is the atom index, into the array that is stored for these timesteps."""
+        raise NotImplementedError(
+            f"'_process_timesteps' not implemented for '{self.__class__.__name__}'"
+        )
+
+    @abstractmethod
+    def _set_data(self, data: np.ndarray):
+        """Sets the (possibly memory mapped) array of all timesteps as an attribute of the instance."""
+        raise NotImplementedError(
+            f"'_set_data' not implemented for '{self.__class__.__name__}'"
+        )
+
+    @property
+    def cache_path(self) -> Path:
+        """The path to the binary cache, a hidden .npy file next to the file.
+        The file name starts with a . so that the cache is not mistaken for the file itself."""
+        return self.path.parent / f".{self.path.name}_cache.npy"
+
+    def _read_natoms(self) -> int:
+        """Gets the number of atoms from the first timestep. The ordering of atoms inside
+        a timestep might not be sorted (e.g. if OpenMP is used), so the number of atoms is the number
+        of lines until an atom index is repeated."""
+
+        seen = set()
+
+        with open(self.path, "r") as f:
+            for line in f:
+                split_line = line.split()
+                # skip any blank lines
+                if not split_line:
+                    continue
+                atom_index = int(split_line[0])
+                if atom_index in seen:
+                    break
+                seen.add(atom_index)
+
+        if not seen:
+            raise FileReadError(f"No timesteps found in '{self.path}'.")
+
+        return len(seen)
+
+    def _loadtxt_chunk(self, f, nrows: int) -> np.ndarray:
+        """Reads the next `nrows` lines of an open file into a `nrows x (1 + nvalues)` array."""
+
+        with warnings.catch_warnings():
+            # loadtxt warns when the end of the file has been reached
+            warnings.simplefilter("ignore", UserWarning)
+            try:
+                return np.loadtxt(f, max_rows=nrows, ndmin=2)
+            except ValueError as e:
+                raise FileReadError(f"Could not parse '{self.path}'.") from e
+
+    def iter_chunks(self, chunk_ntimesteps: int = None) -> Iterator[np.ndarray]:
+        """Parses the file in chunks of timesteps, without reading the whole file into memory.
+        An incomplete last timestep (e.g. if the simulation was stopped while the file was written)
+        is not returned.
+
+        :param chunk_ntimesteps: The number of timesteps in each chunk, defaults to `self.chunk_ntimesteps`
+        :return: Yields arrays for `chunk_ntimesteps` timesteps (the last chunk might be smaller)
+        """
+
+        chunk_ntimesteps = chunk_ntimesteps or self.chunk_ntimesteps
+        # do not use self.natoms because it will try to read the whole file
+        natoms = self._read_natoms()
+        ncols = 1 + self._nvalues
+
+        with open(self.path, "r") as f:
+            while True:
+                rows = self._loadtxt_chunk(f, chunk_ntimesteps * natoms)
+                if rows.shape[0] == 0:
+                    break
+                if rows.shape[1] != ncols:
+                    raise FileReadError(
+                        f"Expected {ncols} columns in '{self.path}', found {rows.shape[1]}."
+                    )
+                # remove an incomplete timestep at the end of the file
+                ntimesteps = rows.shape[0] // natoms
+                if ntimesteps == 0:
+                    break
+                rows = rows[: ntimesteps * natoms]
+                yield self._process_timesteps(rows.reshape(ntimesteps, natoms, ncols))
+
+    def _fill(self, out: np.ndarray) -> int:
+        """Fills a preallocated array (or memory mapped array) with all timesteps in the file.
+
+        :return: The number of timesteps that were filled in
+        """
+        ntimesteps = 0
+        for chunk in self.iter_chunks():
+            out[ntimesteps : ntimesteps + chunk.shape[0]] = chunk
+            ntimesteps += chunk.shape[0]
+        return ntimesteps
+
+    def _max_ntimesteps(self, natoms: int) -> int:
+        """Upper bound on the number of timesteps, used to preallocate arrays. This is
+        exact unless there are blank lines in the file."""
+        return count_lines(self.path) // natoms
+
+    def _data_shape(self, ntimesteps: int, natoms: int) -> tuple:
+        """Shape of the array containing `ntimesteps` timesteps"""
+        if self._nvalues == 1:
+            return (ntimesteps, natoms)
+        return (ntimesteps, natoms, self._nvalues)
+
+    def cache_is_valid(self) -> bool:
+        """Checks whether the binary cache exists and is newer than the file."""
+        return (
+            self.cache_path.exists()
+            and self.cache_path.stat().st_mtime >= self.path.stat().st_mtime
+        )
+
+    def write_cache(self) -> Path:
+        """Parses the file chunk by chunk into a binary .npy file that can later be memory mapped.
+        Only one chunk is kept in memory at any time.
+
+        :return: Path to the written cache
+        """
+
+        natoms = self._read_natoms()
+        max_ntimesteps = self._max_ntimesteps(natoms)
+        tmp_path = self.cache_path.with_name(self.cache_path.name + ".tmp")
+
+        out = np.lib.format.open_memmap(
+            tmp_path,
+            mode="w+",
+            dtype=np.float64,
+            shape=self._data_shape(max_ntimesteps, natoms),
+        )
+        ntimesteps = self._fill(out)
+        out.flush()
+
+        # the file contained blank lines or an incomplete timestep, so the array is too long
+        if ntimesteps != max_ntimesteps:
+            trimmed_path = tmp_path.with_name(tmp_path.name + ".trimmed")
+            # pass a file handle, otherwise np.save appends .npy to the file name
+            with open(trimmed_path, "wb") as f:
+                np.save(f, out[:ntimesteps])
+            del out
+            os.replace(trimmed_path, tmp_path)
+        else:
+            del out
+
+        # write to a temporary file first, so that an incomplete cache is never used
+        os.replace(tmp_path, self.cache_path)
+
+        return self.cache_path
+
+    def _read_file(self):
+
+        natoms = self._read_natoms()
+
+        if self.use_cache:
+            if not self.cache_is_valid():
+                self.write_cache()
+            data = np.load(self.cache_path, mmap_mode="r")
+        else:
+            max_ntimesteps = self._max_ntimesteps(natoms)
+            data = np.empty(self._data_shape(max_ntimesteps, natoms))
+            ntimesteps = self._fill(data)
+            data = data[:ntimesteps]
+
+        self.natoms = natoms
+        self._set_data(data)
@@ -3,63 +3,52 @@ from typing import Union
 
 import numpy as np
 
-from ichor.core.files.file import FileContents, ReadFile
+from ichor.core.files.dl_poly.dl_poly_iqa_file import DlPolyIQAFile
+from ichor.core.files.file import FileContents, FileState
 
 
-class DlPolyIQAForces(ReadFile):
+class DlPolyIQAForces(DlPolyIQAFile):
     """READS the IQA_FORCES file from FFLUX.
 
     :param path: Path to IQA_FORCES file
+    :param use_cache: Whether to memory map the forces from a binary cache which is written
+        next to the IQA_FORCES file. Use for simulations where the forces do not fit in memory, defaults to False
+    :param chunk_ntimesteps: The number of timesteps that are parsed at a time, defaults to 10000
 
     :ivar forces: The forces array of shape ntimesteps x natoms x 3.
         Initialized as FileContents prior to file reading.
     :ivar natoms: Number of atoms in each timestep
     """
 
-    _filetype = ""
+    _nvalues = 3
 
-    def __init__(self, path: Union[Path, str] = Path("IQA_FORCES")):
+    def __init__(
+        self,
+        path: Union[Path, str] = Path("IQA_FORCES"),
+        use_cache: bool = False,
+        chunk_ntimesteps: int = 10_000,
+    ):
 
-        super().__init__(path)
+        super().__init__(path, use_cache=use_cache, chunk_ntimesteps=chunk_ntimesteps)
         self.forces = FileContents
-        self.natoms = FileContents
 
     @classmethod
     def check_path(cls, path: Path) -> bool:
         return path.stem == "IQA_FORCES"
 
-    def _read_file(self):
+    def _process_timesteps(self, timesteps: np.ndarray) -> np.ndarray:
+        # note that atom index is 1-indexed
+        # the ordering of IQA_FORCES does not seem to be affected by OpenMP,
+        # but reorder in case it is because it is cheap to do
+        atom_indices = timesteps[:, :, 0].astype(int) - 1
+        forces = np.empty((timesteps.shape[0], timesteps.shape[1], 3))
+        forces[np.arange(timesteps.shape[0])[:, np.newaxis], atom_indices] = timesteps[
+            :, :, 1:
+        ]
+        return forces
 
-        forces = []
-
-        with open(self.path, "r") as f:
-
-            lines = [i.strip().split() for i in f.readlines()]
-            # lambda func that maps first argument as int and others as float
-            map_func = lambda x: [int(x[0]), *map(float, x[1:])]
-            # list of lists. Each inner list has index, cartesian forces
-            lines = list(map(map_func, lines))
-            max_atom_idx = max(i[0] for i in lines)
-            self.natoms = max_atom_idx
-
-            one_timestep_forces = []
-            counter = 0
-
-            for line in lines:
-
-                # note that atom index is 1-indexed
-                # seems like the ordering of IQA_FORCES is not affected by OpenMP
-                cartesian_forces = line[1:]
-                one_timestep_forces.append(cartesian_forces)
-                counter += 1
-
-                if counter == self.natoms:
-                    forces.append(one_timestep_forces)
-                    one_timestep_forces = []
-                    counter = 0
-
-            # save as array of shape ntimesteps x natoms x 3
-            self.forces = np.array(forces)
+    def _set_data(self, data: np.ndarray):
+        self.forces = data
 
     def check_forces_less_than_value(self, value=1e-3) -> np.ndarray:
         """Checks what timesteps have all forces less than value.
@@ -69,10 +58,43 @@ class DlPolyIQAForces(ReadFile):
         We can check for that because if the forces are consistently less than the `value`
         then either the simulation has crashed or a minimum is reached
 
+        The check is done chunk by chunk, so it works for files that do not fit in memory.
+
         :param value: Value for which all forces need to be less than
         :return: np.ndarray containing timestep indices for which condition is true
             If len(array) is 0, then the condition is not met for any timestep. Could be
             useful to check if a geometry is optimized or simulation crashed.
         """
 
-        return np.where(np.all(abs(self.forces) < value, axis=(1, 2)))[0]
+        indices = []
+        offset = 0
+
+        for forces in self.iter_forces():
+            indices.append(
+                np.where(np.all(abs(forces) < value, axis=(1, 2)))[0] + offset
+            )
+            offset += forces.shape[0]
+
+        if not indices:
+            return np.array([], dtype=int)
+
+        return np.concatenate(indices)
+
+    def iter_forces(self, chunk_ntimesteps: int = None):
+        """Iterates over the forces in chunks of timesteps. If the file has already been read
+        (or memory mapped from the cache), the chunks are slices of `self.forces`, otherwise the
+        file is parsed chunk by chunk without reading the whole file into memory.
+
+        :param chunk_ntimesteps: The number of timesteps in each chunk, defaults to `self.chunk_ntimesteps`
+        :return: Yields arrays of shape chunk_ntimesteps x natoms x 3
+        """
+
+        chunk_ntimesteps = chunk_ntimesteps or self.chunk_ntimesteps
+
+        # use the data that is already there (or the memory mapped cache)
+        if self.use_cache or self.state is FileState.Read:
+            forces = self.forces
+            for i in range(0, forces.shape[0], chunk_ntimesteps):
+                yield forces[i : i + chunk_ntimesteps]
+        else:
+            yield from self.iter_chunks(chunk_ntimesteps)
@@ -1,3 +1,5 @@
+from typing import Iterator
+
 import numpy as np
 from ichor.core.files.directory import AnnotatedDirectory
 from ichor.core.files.dl_poly import (
@@ -37,12 +39,22 @@ class FFLUXDirectory(AnnotatedDirectory):
         """Returns iqa forces array of shape ntimesteps x natoms x 3"""
         return self.iqa_forces_file.forces
 
+    def iter_iqa_forces(self, chunk_ntimesteps: int = 10_000) -> Iterator[np.ndarray]:
+        """Iterates over the iqa forces in chunks of timesteps, without reading the
+        whole IQA_FORCES file into memory. Useful for long simulations.
+
+        :param chunk_ntimesteps: The number of timesteps in each chunk
+        :return: Yields arrays of shape chunk_ntimesteps x natoms x 3
+        """
+        yield from self.iqa_forces_file.iter_forces(chunk_ntimesteps)
+
     @property
     def natoms(self) -> int:
         """Returns number of atoms"""
-        return self.history_file.natoms
+        return self.history_file.history_index.number_of_atoms
 
     @property
     def coordinates(self) -> np.ndarray:
-        """Returns coordinates as array of shape ntimesteps x natoms x 3"""
-        return self.history_file.coordinates
+        """Returns coordinates as array of shape ntimesteps x natoms x 3.
+        Timesteps containing binary data in the HISTORY file are not included."""
+        return self.history_file.frames().coordinates
@@ -2,7 +2,7 @@ from abc import ABC, abstractmethod
 from contextlib import contextmanager, suppress
 from enum import Enum
 from pathlib import Path
-from typing import Optional, Union
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple, Union
 
 from ichor.core.common.functools import buildermethod
 from ichor.core.common.io import move
@@ -139,6 +139,16 @@ class ReadFile(File, ABC):
 
     _filetype = ""
 
+    # Maps the name of each section of the file (in the order in which the sections are written)
+    # to the attributes which are read in from that section. Files which define sections can be
+    # read in partially, see `ReadFile.project`.
+    _sections: Dict[str, Tuple[str, ...]] = {}
+
+    # these are class attributes because not all subclasses call File.__init__
+    _projection: Optional[FrozenSet[str]] = None
+    _sections_read: FrozenSet[str] = frozenset()
+    _sections_reading: FrozenSet[str] = frozenset()
+
     def _initialise_contents(self):
         """Initialize contents of a file to default values. This is needed in the case
         a file does not exist on disk yet (so the file cannot be read from). This means
@@ -161,8 +171,8 @@ class ReadFile(File, ABC):
             self.state = FileState.Reading
             self._initialise_contents()
             if self.path.exists():
-                self._read_file(
-                    *args, **kwargs
+                self._read_sections(
+                    self._sections_to_read, *args, **kwargs
                 )  # self._read_file is different based on which type of file is being read (GJF, AIMALL, etc.)
                 # else:
                 #     raise FileNotFoundError(f"File with path path {self.path}
@@ -171,6 +181,78 @@ class ReadFile(File, ABC):
             else:
                 self.state = FileState.Unread
 
+    def project(self, *sections: str) -> "ReadFile":
+        """Only read in the given sections of the file, instead of the whole file. This is useful
+        when only a few values are needed from a lot of files, e.g. only the IQA energy and
+        integration error from .int files. The sections which are skipped are read in
+        the first time that one of their attributes is accessed. Calling without arguments
+        reads in the whole file again.
+
+        .. code-block:: python
+
+            int_file = Int("o1.int").project("iqa_energy_components", "basin_integration")
+            int_file.iqa  # only the IQA and basin integration sections are parsed
+            int_file.global_multipole_moments  # now the multipoles section is parsed
+
+        :param sections: Names of sections (see `_sections`) or names of attributes, in which case the section
+            containing the attribute is read in.
+        :raises ValueError: If a name is not a section or an attribute of a section
+        :return: The instance itself, so that it can be chained
+        """
+
+        projection = set()
+        for name in sections:
+            section = name if name in self._sections else self._section_of(name)
+            if section is None:
+                raise ValueError(
+                    f"'{self.__class__.__name__}' cannot read in '{name}', "
+                    f"sections which can be read in are: {list(self._sections)}."
+                )
+            projection.add(section)
+
+        self._projection = frozenset(projection) if sections else None
+        return self
+
+    @classmethod
+    def _section_of(cls, attribute: str) -> Optional[str]:
+        """Returns the name of the section from which the attribute is read in, or None
+        if the attribute is not read in from a section."""
+        for section, attributes in cls._sections.items():
+            if attribute in attributes:
+                return section
+        return None
+
+    @property
+    def _sections_to_read(self) -> FrozenSet[str]:
+        """The sections which have not been read in yet, but which are needed by the projection."""
+        sections = self._sections if self._projection is None else self._projection
+        return frozenset(sections) - self._sections_read
+
+    def _read_section(self, section: str) -> bool:
+        """Used in `_read_file` of files which define sections to check if a section has to be read in."""
+        return section in self._sections_reading
+
+    def _read_sections(self, sections: Iterable[str], *args, **kwargs):
+        """Calls `_read_file`, which only reads in the given sections (if the file defines sections)."""
+        self._sections_reading = frozenset(sections)
+        try:
+            self._read_file(*args, **kwargs)
+        finally:
+            self._sections_reading = frozenset()
+        self._sections_read = self._sections_read | frozenset(sections)
+
+    def _read_skipped_section(self, item: str):
+        """Reads in the section from which the attribute is read, if the section was
+        skipped because of the projection when the file was read."""
+        if self.state is FileState.Read:
+            section = self._section_of(item)
+            if section is not None and section not in self._sections_read:
+                self.state = FileState.Reading
+                try:
+                    self._read_sections((section,))
+                finally:
+                    self.state = FileState.Read
+
     @abstractmethod
     def _read_file(self, *args, **kwargs):
         """Abstract method detailing how to read contents of a file. Every type of file (gjf, int, etc.)
@@ -200,6 +282,7 @@ class ReadFile(File, ABC):
         with suppress(AttributeError):
             if object.__getattribute__(self, item) is FileContents:
                 self.read()
+                self._read_skipped_section(item)
 
         try:
             return object.__getattribute__(self, item)
@@ -1,6 +1,6 @@
 from ichor.core.files.gaussian.gaussian_output import GaussianOutput
-from ichor.core.files.gaussian.gjf import GJF
+from ichor.core.files.gaussian.gjf import GJF, GJFTemplate
 from ichor.core.files.gaussian.wfn import WFN
 from ichor.core.files.gaussian.wfx import WFX
 
-__all__ = ["GaussianOutput", "GJF", "WFN", "WFX"]
+__all__ = ["GaussianOutput", "GJF", "GJFTemplate", "WFN", "WFX"]
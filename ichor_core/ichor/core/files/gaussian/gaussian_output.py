@@ -1,10 +1,11 @@
 from pathlib import Path
-from typing import Union
+from typing import Iterator, Optional, Union
 
 import numpy as np
 
 from ichor.core.atoms import Atom, Atoms
 from ichor.core.common.constants import nuclear_charge2type
+from ichor.core.common.str import iter_lines_from
 from ichor.core.common.types.multipole_moments import (
     MolecularDipole,
     MolecularHexadecapole,
@@ -27,6 +28,19 @@ class GaussianOutput(ReadFile, HasAtoms, HasData):
 
     _filetype = [".gaussianoutput", ".gau"]
 
+    _sections = {
+        "charge": ("charge", "multiplicity"),
+        "atoms": ("atoms",),
+        "forces": ("global_forces",),
+        "multipoles": (
+            "molecular_dipole",
+            "molecular_quadrupole",
+            "traceless_molecular_quadrupole",
+            "molecular_octupole",
+            "molecular_hexadecapole",
+        ),
+    }
+
     def __init__(
         self,
         path: Union[Path, str],
@@ -74,118 +88,153 @@ class GaussianOutput(ReadFile, HasAtoms, HasData):
         return rot_force_dict
 
     def _read_file(self):
-        """Parse through a .wfn file to look for the relevant information.
+        """Parse through a .gaussianoutput file to look for the relevant information.
         This is automatically called if an attribute is being accessed, but the
-        FileState of the file is FileState.Unread"""
+        FileState of the file is FileState.Unread
 
-        atoms = Atoms()
-        forces = {}
+        Sections are found by their headers, so sections which are not needed
+        (see `ReadFile.project`) are skipped without being parsed. If a section is written
+        more than once (e.g. in an optimisation), the last one is read.
+        """
 
         with open(self.path, "r") as f:
-
-            for line in f:
-
-                if "Charge =" in line:
-
-                    self.charge, self.multiplicity = int(line.split()[2]), int(
-                        line.split()[-1]
-                    )
-                    line = next(f)
-
-                elif "Input orientation:" in line:
-
-                    line = next(f)
-                    line = next(f)
-                    line = next(f)
-                    line = next(f)
+            contents = f.read()
+
+        if self._read_section("charge"):
+            line = next(_iter_last_section(contents, "Charge ="), None)
+            if line is not None:
+                self.charge, self.multiplicity = int(line.split()[2]), int(
+                    line.split()[-1]
+                )
+
+        if self._read_section("atoms"):
+            atoms = Atoms()
+            f = _iter_last_section(contents, "Input orientation:")
+            if next(f, None) is not None:
+                line = next(f)
+                line = next(f)
+                line = next(f)
+                line = next(f)
+                line = next(f)
+
+                # we should be at the first line that has an atom here
+                # read until we reach another ------ line
+                while "--------------------" not in line:
+
+                    split = line.split()
+                    atomic_num = int(split[1])
+                    atom_type = nuclear_charge2type[atomic_num]
+                    coords = map(float, split[-3:])
+                    atoms.append(Atom(atom_type, *coords))
                     line = next(f)
 
-                    # we should be at the first line that has an atom here
-                    # read until we reach another ------ line
-                    while "--------------------" not in line:
-
-                        split = line.split()
-                        atomic_num = int(split[1])
-                        atom_type = nuclear_charge2type[atomic_num]
-                        coords = map(float, split[-3:])
-                        atoms.append(Atom(atom_type, *coords))
-                        line = next(f)
-
-                elif "Forces (Hartrees/Bohr)" in line:
-
-                    #  Number     Number              X              Y              Z
-                    line = next(f)
-                    # -----------------------------------------
-                    line = next(f)
-
-                    for atom_name in atoms.names:
-                        line = next(f).split()
-                        forces[atom_name] = np.array(
-                            [float(line[2]), float(line[3]), float(line[4])]
-                        )
-                elif "Dipole moment (field-independent basis, Debye)" in line:
-                    # dipoles are on one line
-                    dipole_line_split = next(f).split()
-                    # every 2nd value is a dipole component
-                    values = [
-                        float(dipole_line_split[i])
-                        for i in range(len(dipole_line_split))
-                        if i % 2 != 0
-                    ]
-                    self.molecular_dipole = MolecularDipole(*values[:3])
-                elif "Quadrupole moment (field-independent basis, Debye-Ang)" in line:
-                    quadrupole_lines_split = (
-                        (next(f) + next(f)).replace("\n", "   ").split()
+            self.atoms = atoms
+
+        if self._read_section("forces"):
+            forces = {}
+            f = _iter_last_section(contents, "Forces (Hartrees/Bohr)")
+            if next(f, None) is not None:
+                #  Number     Number              X              Y              Z
+                line = next(f)
+                # -----------------------------------------
+                line = next(f)
+
+                # the atom names are made in the same way as in `Atoms`, from the atom type and
+                # the center number, so that the forces can be read without reading the atoms
+                line = next(f)
+                while "--------------------" not in line:
+                    split = line.split()
+                    atom_name = f"{nuclear_charge2type[int(split[1])]}{split[0]}"
+                    forces[atom_name] = np.array(
+                        [float(split[2]), float(split[3]), float(split[4])]
                     )
-                    values = [
-                        float(quadrupole_lines_split[i])
-                        for i in range(len(quadrupole_lines_split))
-                        if i % 2 != 0
-                    ]
-                    self.molecular_quadrupole = MolecularQuadrupole(*values)
-
-                    # this is the line that says Traceless Quadrupole moment,
-                    # the problem is that it contains the same text
-                    # as the other quadrupole line
                     line = next(f)
 
-                    traceless_quadrupole_lines_split = (
-                        (next(f) + next(f)).replace("\n", "   ").split()
-                    )
-                    values = [
-                        float(traceless_quadrupole_lines_split[i])
-                        for i in range(len(traceless_quadrupole_lines_split))
-                        if i % 2 != 0
-                    ]
-                    self.traceless_molecular_quadrupole = TracelessMolecularQuadrupole(
-                        *values
-                    )
-                # leave as Octapole here because that is how Gaussian writes it
-                elif "Octapole moment (field-independent basis, Debye-Ang**2)" in line:
-                    octupole_lines_split = (
-                        (next(f) + next(f) + next(f)).replace("\n", "   ").split()
-                    )
-                    values = [
-                        float(octupole_lines_split[i])
-                        for i in range(len(octupole_lines_split))
-                        if i % 2 != 0
-                    ]
-                    self.molecular_octupole = MolecularOctupole(*values)
-                elif (
-                    "Hexadecapole moment (field-independent basis, Debye-Ang**3)"
-                    in line
-                ):
-                    hexadecapole_lines_split = (
-                        (next(f) + next(f) + next(f) + next(f))
-                        .replace("\n", "   ")
-                        .split()
-                    )
-                    values = [
-                        float(hexadecapole_lines_split[i])
-                        for i in range(len(hexadecapole_lines_split))
-                        if i % 2 != 0
-                    ]
-                    self.molecular_hexadecapole = MolecularHexadecapole(*values)
-
-        self.global_forces = forces
-        self.atoms = atoms
+            self.global_forces = forces
+
+        if self._read_section("multipoles"):
+            self._read_multipoles(contents)
+
+    def _read_multipoles(self, contents: str):
+        """Reads the molecular multipole moments, which are only written if they are requested."""
+
+        f = _iter_last_section(
+            contents, "Dipole moment (field-independent basis, Debye)"
+        )
+        if next(f, None) is not None:
+            # dipoles are on one line
+            dipole_line_split = next(f).split()
+            # every 2nd value is a dipole component
+            values = [
+                float(dipole_line_split[i])
+                for i in range(len(dipole_line_split))
+                if i % 2 != 0
+            ]
+            self.molecular_dipole = MolecularDipole(*values[:3])
+
+        # the traceless quadrupole line also contains the quadrupole line, so search before it
+        traceless_start = contents.rfind("Traceless Quadrupole moment")
+        f = _iter_last_section(
+            contents,
+            "Quadrupole moment (field-independent basis, Debye-Ang)",
+            traceless_start if traceless_start != -1 else None,
+        )
+        if next(f, None) is not None:
+            quadrupole_lines_split = (next(f) + next(f)).replace("\n", "   ").split()
+            values = [
+                float(quadrupole_lines_split[i])
+                for i in range(len(quadrupole_lines_split))
+                if i % 2 != 0
+            ]
+            self.molecular_quadrupole = MolecularQuadrupole(*values)
+
+        f = _iter_last_section(
+            contents, "Traceless Quadrupole moment (field-independent basis, Debye-Ang)"
+        )
+        if next(f, None) is not None:
+            traceless_quadrupole_lines_split = (
+                (next(f) + next(f)).replace("\n", "   ").split()
+            )
+            values = [
+                float(traceless_quadrupole_lines_split[i])
+                for i in range(len(traceless_quadrupole_lines_split))
+                if i % 2 != 0
+            ]
+            self.traceless_molecular_quadrupole = TracelessMolecularQuadrupole(*values)
+
+        # leave as Octapole here because that is how Gaussian writes it
+        f = _iter_last_section(
+            contents, "Octapole moment (field-independent basis, Debye-Ang**2)"
+        )
+        if next(f, None) is not None:
+            octupole_lines_split = (
+                (next(f) + next(f) + next(f)).replace("\n", "   ").split()
+            )
+            values = [
+                float(octupole_lines_split[i])
+                for i in range(len(octupole_lines_split))
+                if i % 2 != 0
+            ]
+            self.molecular_octupole = MolecularOctupole(*values)
+
+        f = _iter_last_section(
+            contents, "Hexadecapole moment (field-independent basis, Debye-Ang**3)"
+        )
+        if next(f, None) is not None:
+            hexadecapole_lines_split = (
+                (next(f) + next(f) + next(f) + next(f)).replace("\n", "   ").split()
+            )
+            values = [
+                float(hexadecapole_lines_split[i])
+                for i in range(len(hexadecapole_lines_split))
+                if i % 2 != 0
+            ]
+            self.molecular_hexadecapole = MolecularHexadecapole(*values)
+
+
+def _iter_last_section(
+    contents: str, marker: str, end: Optional[int] = None
+) -> Iterator[str]:
+    """Iterates over the lines of the file contents, starting from the last line
+    (before index end) which contains marker."""
+    return iter_lines_from(contents, marker, max(contents.rfind(marker, 0, end), 0))
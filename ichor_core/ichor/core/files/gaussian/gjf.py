@@ -322,3 +322,79 @@ class GJF(ReadFile, WriteFile, HasAtoms):
             write_str += "\n"
 
         return write_str
+
+
+class GJFTemplate:
+    """Renders the contents of many .gjf files which only differ in their geometry and path
+    (e.g. every point in a `PointsDirectory`). The link0, route card and charge/multiplicity lines
+    are made (and checked) once, and the coordinates of every geometry are formatted in one operation
+    using a template for its atom types. The rendered contents are the same as written by `GJF.write`.
+
+    :param kwargs: Key word arguments passed to `GJF`, such as method, basis_set, keywords, link0, etc.
+        The `path` and `atoms` are given separately for every file in `render`.
+    """
+
+    def __init__(self, **kwargs):
+
+        # the .chk file depends on the path of each file, so it is added in render
+        self._output_chk = kwargs.pop("output_chk", False)
+        # the defaults are set here, so they are the same as the ones set by GJF.write
+        self._gjf = GJF(Path("template.gjf"), **kwargs)
+        self._gjf._set_write_defaults_if_needed()
+        # the title default is the name of each file, so it is set in render if not given
+        self._title = kwargs.get("title")
+
+        self._link0 = "".join(f"%{link0}\n" for link0 in self._gjf.link0)
+        self._add_chk = self._output_chk and any("chk" in l0 for l0 in self._gjf.link0)
+        self._route = (
+            f"#{self._gjf.print_level.value} {self._gjf.method}/{self._gjf.basis_set} "
+            + f"{' '.join(self._gjf.keywords)}\n\n"
+        )
+        self._charge_line = f"{self._gjf.charge}   {self._gjf.spin_multiplicity}\n"
+        self._output_wfn = "output=wfn" in self._gjf.keywords
+        self._atoms_templates = {}
+        self._checked = False
+
+    def _atoms_template(self, atom_types: tuple) -> str:
+        """Template for the atoms section, which is only made once for every set of atom types."""
+        if atom_types not in self._atoms_templates:
+            self._atoms_templates[atom_types] = "".join(
+                f"{ty} %12.8f %12.8f %12.8f\n" for ty in atom_types
+            )
+        return self._atoms_templates[atom_types]
+
+    def render(self, path: Path, atom_types: List[str], coordinates) -> str:
+        """Renders the contents of a .gjf file.
+
+        :param path: The path of the .gjf file, used for the title and the .wfn file name
+        :param atom_types: The types of the atoms (e.g. O, H, H)
+        :param coordinates: Array-like of shape natoms x 3 with the coordinates of the atoms (in Angstroms)
+        """
+
+        path = Path(path)
+
+        # values are only checked once, so warnings are not repeated for every file
+        if not self._checked:
+            self._gjf.atoms = Atoms(
+                [Atom(ty, *xyz) for ty, xyz in zip(atom_types, coordinates)]
+            )
+            self._gjf._check_values_before_writing()
+            self._checked = True
+
+        write_str = self._link0
+        if self._add_chk:
+            write_str += f"%chk={path.with_suffix('.chk')}\n"
+        write_str += self._route
+        write_str += f"{self._title or path.stem}\n\n"
+        write_str += self._charge_line
+        write_str += self._atoms_template(tuple(atom_types)) % tuple(
+            c for xyz in coordinates for c in xyz
+        )
+        if self._output_wfn:
+            write_str += f"\n{path.with_suffix('.wfn')}"
+        # add newline character because Gaussian otherwise crashes
+        # if requesting using other keywords but not output=wfn
+        else:
+            write_str += "\n"
+
+        return write_str
@@ -4,7 +4,7 @@ from typing import Dict, Union
 from ichor.core.atoms import Atom, Atoms
 from ichor.core.common.float import from_scientific_double
 from ichor.core.common.itertools import chunker
-from ichor.core.common.str import split_by
+from ichor.core.common.str import find_line, iter_lines, iter_lines_from, split_by
 from ichor.core.common.units import AtomicDistance
 from ichor.core.files.file import FileContents, ReadFile, WriteFile
 from ichor.core.files.file_data import HasAtoms, HasData
@@ -56,6 +56,14 @@ class WFN(HasAtoms, HasData, ReadFile, WriteFile):
 
     _filetype = ".wfn"
 
+    _sections = {
+        "header": ("n_orbitals", "n_primitives", "n_nuclei", "method"),
+        "atoms": ("atoms",),
+        "basis": ("centre_assignments", "type_assignments", "primitive_exponents"),
+        "molecular_orbitals": ("molecular_orbitals",),
+        "energy": ("total_energy", "virial_ratio"),
+    }
+
     def __init__(
         self,
         path: Union[Path, str],
@@ -83,11 +91,21 @@ class WFN(HasAtoms, HasData, ReadFile, WriteFile):
     def _read_file(self):
         """Parse through a .wfn file to look for the relevant information.
         This is automatically called if an attribute is being accessed, but the
-        FileState of the file is FileState.Unread"""
-        atoms = Atoms()
+        FileState of the file is FileState.Unread
+
+        Sections are found by their headers, so sections which are not needed
+        (see `ReadFile.project`) are skipped without being parsed. This matters for
+        the molecular orbitals, which are most of the file.
+        """
+
         with open(self.path, "r") as f:
-            # title = next(f).strip() # title differs from program to program which writes wfn files
-            next(f)
+            contents = f.read()
+
+        # title = next(f).strip() # title differs from program to program which writes wfn files
+        f = iter_lines(contents)
+        next(f)
+
+        if self._read_section("header"):
             header = next(f).split()
             n_orbitals = int(header[1])
             n_primitives = int(header[4])
@@ -96,6 +114,15 @@ class WFN(HasAtoms, HasData, ReadFile, WriteFile):
             # what method was used in Gaussian calculation
             method = header[-1] if header[-1] != "NUCLEI" else FileContents
 
+            self.n_orbitals = self.n_orbitals or n_orbitals
+            self.n_primitives = self.n_primitives or n_primitives
+            self.n_nuclei = self.n_nuclei or n_nuclei
+            self.method = self.method or method
+        else:
+            next(f)
+
+        if self._read_section("atoms"):
+            atoms = Atoms()
             line = next(f)
             while not line.startswith(r"CENTRE ASSIGNMENTS"):
                 # have to split like this because
@@ -121,6 +148,12 @@ class WFN(HasAtoms, HasData, ReadFile, WriteFile):
                 )
                 line = next(f)
 
+            self.atoms = self.atoms or atoms
+
+        if self._read_section("basis"):
+            f = iter_lines_from(contents, "\nCENTRE ASSIGNMENTS")
+            line = next(f)
+
             centre_assignments = []
             while not line.startswith(r"TYPE ASSIGNMENTS"):
                 centre_assignments.extend(list(map(int, line.split()[2:])))
@@ -138,6 +171,19 @@ class WFN(HasAtoms, HasData, ReadFile, WriteFile):
                 )
                 line = next(f)
 
+            self.centre_assignments = self.centre_assignments or centre_assignments
+            self.type_assignments = self.type_assignments or type_assignments
+            self.primitive_exponents = self.primitive_exponents or primitive_exponents
+
+        if self._read_section("molecular_orbitals"):
+            # start searching after the exponents because "MO" could also be an atom type
+            mo_start = find_line(contents, "\nMO", max(contents.find("\nEXPONENTS"), 0))
+            # the molecular orbitals are most of the file, so split all of their lines at once
+            f = iter(
+                contents[mo_start:].splitlines(keepends=True) if mo_start != -1 else ()
+            )
+            line = next(f)
+
             molecular_orbitals = []
             while not line.startswith(r"END DATA"):
                 record = line.split()
@@ -159,24 +205,21 @@ class WFN(HasAtoms, HasData, ReadFile, WriteFile):
                     )
                 )
 
+            self.molecular_orbitals = self.molecular_orbitals or molecular_orbitals
+
+        if self._read_section("energy"):
+            # the energy is on the last line, so search from the end of the file
+            f = iter_lines_from(
+                contents, "END DATA", max(contents.rfind("END DATA"), 0)
+            )
+            next(f)
             record = next(f).split()
             # parse with -ve numbers because gaussian/orca have slightly different lines here
             total_energy = float(record[-4])
             virial_ratio = float(record[-1])
 
-        self.n_orbitals = self.n_orbitals or n_orbitals
-        self.n_primitives = self.n_primitives or n_primitives
-        self.n_nuclei = self.n_nuclei or n_nuclei
-        self.method = self.method or method
-
-        self.atoms = self.atoms or atoms
-        self.centre_assignments = self.centre_assignments or centre_assignments
-        self.type_assignments = self.type_assignments or type_assignments
-        self.primitive_exponents = self.primitive_exponents or primitive_exponents
-        self.molecular_orbitals = self.molecular_orbitals or molecular_orbitals
-
-        self.total_energy = self.total_energy or total_energy
-        self.virial_ratio = self.virial_ratio or virial_ratio
+            self.total_energy = self.total_energy or total_energy
+            self.virial_ratio = self.virial_ratio or virial_ratio
 
     def _write_file(self, path: Path):
         """Write method needs to be implemented because the correct functional needs to be added to the .wfn file,
@@ -3,22 +3,15 @@ from pathlib import Path
 from typing import Callable, Dict, List, Optional, Union
 
 import numpy as np
-import pandas as pd
 from ichor.core.atoms import ALF, Atoms, ListOfAtoms
 from ichor.core.calculators.alf import default_alf_calculator
 from ichor.core.calculators.features.alf_features_calculator import (
     calculate_alf_features,
+    calculate_alf_features_from_coordinates,
 )
 from ichor.core.common import constants
 from ichor.core.common.io import mkdir
 from ichor.core.common.itertools import chunker
-from ichor.core.database.json import get_data_for_point
-from ichor.core.database.sql import (
-    add_atom_names_to_database,
-    add_point_to_database,
-    create_database,
-    create_database_session,
-)
 from ichor.core.files import GJF
 
 from ichor.core.files.ase import XTB
@@ -412,19 +405,38 @@ class PointsDirectory(ListOfAtoms, Directory, HasData):
         )
 
     def write_to_sqlite3_database(
-        self, db_path: Union[str, Path] = None, echo=False, print_missing_data=True
+        self,
+        db_path: Union[str, Path] = None,
+        echo=False,
+        print_missing_data=True,
+        incremental=True,
+        ncores: int = 1,
     ) -> Path:
         """
         Write out important information from a PointsDirectory instance to an SQLite3 database.
 
+        If the database already exists and `incremental` is True, only points which are not in the
+        database, or whose files have changed since they were added, are read and added to the database
+        (see `ichor.core.database.sql.sync_points_to_database`). The rows of changed points are replaced.
+
         :param db_path: database to write to
-        :param echo: Whether to print out SQL queries from SQL Alchemy
         :param echo: Whether to print out SQL queries from SQL Alchemy, defaults to False
         :param print_missing_data: Whether to print out any missing data from each PointDirectory contained
             in self, defaults to False
+        :param incremental: Whether to only add new or changed points, defaults to True.
+            If False, every point is added to the database again.
+        :param ncores: The number of processes used to read the points, defaults to 1
         :return: The path to the written SQL database
         """
 
+        from ichor.core.database.sql import (
+            add_atom_names_to_database,
+            add_point_to_database,
+            create_database,
+            create_database_session,
+            sync_points_to_database,
+        )
+
         if not db_path:
             db_path = Path(f"{self.name_without_suffix}.sqlite")
         else:
@@ -433,16 +445,24 @@ class PointsDirectory(ListOfAtoms, Directory, HasData):
         # if db exists, then add new points to existing database.
         if db_path.exists():
             print("Database already exists. Adding new points to database...")
-            session = create_database_session(db_path)
-            for point in self:
-                add_point_to_database(
-                    session, point, echo=echo, print_missing_data=print_missing_data
-                )
+            # makes the tables which are not in the database yet
+            create_database(db_path, echo)
+            session = create_database_session(db_path, echo=echo)
         else:
             print("Making new database and adding points...")
             create_database(db_path, echo)
-            session = create_database_session(db_path)
+            session = create_database_session(db_path, echo=echo)
             add_atom_names_to_database(session, self.atom_names, echo=echo)
+
+        if incremental:
+            nadded, nunchanged, nfailed = sync_points_to_database(
+                session, self, ncores=ncores, print_missing_data=print_missing_data
+            )
+            print(
+                f"Added {nadded} new or changed points, {nunchanged} points were already in the database, "
+                f"{nfailed} points could not be added."
+            )
+        else:
             for point in self:
                 add_point_to_database(
                     session, point, echo=echo, print_missing_data=print_missing_data
@@ -453,7 +473,7 @@ class PointsDirectory(ListOfAtoms, Directory, HasData):
     def write_to_json_database(
         self,
         root_path: Union[str, Path] = None,
-        datafunction: Callable = get_data_for_point,
+        datafunction: Optional[Callable] = None,
         npoints_per_json=500,
         print_missing_data=True,
         indent: int = 2,
@@ -467,7 +487,8 @@ class PointsDirectory(ListOfAtoms, Directory, HasData):
             The reason for implementing like this is if using for multiple PointsDirectory-ies
             at once, so that data for each PointDirectory is written in a separate folder
         :param datafunction: A function used to get all data for a single point.
-            This data is going to get written to the json file.
+            This data is going to get written to the json file. If None, then
+            `ichor.core.database.json.get_data_for_point` is used, defaults to None
         :param npoints_per_json: Maximum number of geometries to write to one json file
             This is done so that the individual files do not become very large.
         :param print_missing_data: Whether to print out any missing data from each PointDirectory contained
@@ -477,6 +498,11 @@ class PointsDirectory(ListOfAtoms, Directory, HasData):
         :return: The path to the written json file
         """
 
+        if datafunction is None:
+            from ichor.core.database.json import get_data_for_point
+
+            datafunction = get_data_for_point
+
         # if no path is given use pointdirectory without suffix
         if not root_path:
             root_path = Path(self.name_without_suffix)
@@ -539,6 +565,8 @@ class PointsDirectory(ListOfAtoms, Directory, HasData):
             needs access to AIMALL information. Does not work for Trajectory instances.
         """
 
+        import pandas as pd
+
         if not atom_names:
             atom_names = self.atom_names
         elif isinstance(atom_names, str):
@@ -579,8 +607,10 @@ class PointsDirectory(ListOfAtoms, Directory, HasData):
     def features_with_wfn_energy_and_dE_df_to_csv(
         self,
         alf_list: List[ALF],
-        central_atom_idx: int,
+        central_atom_idx: Union[int, List[int]],
         str_to_append_to_fname: str = "_features_with_dE_df.csv",
+        method: str = "lstsq",
+        rcond: Optional[float] = None,
         **kwargs,
     ):
         """Writes out a csv file containing wfn energy and FORCEs calculated for every feature.
@@ -588,47 +618,67 @@ class PointsDirectory(ListOfAtoms, Directory, HasData):
         so for machine learning, the negative of these forces needs to be taken to
         add gradient information into GP models.
 
-        :param system_alf: A list of ALF instances containing alf info
+        The features, B matrices and feature forces of all points are calculated together,
+        see `form_b_matrices` and `feature_forces_from_b_matrices`.
+
+        :param alf_list: A list of ALF instances containing alf info
         :param central_atom_idx: The central atom which to center the alf on
-            and for which dE/df will be calculated
-        :type central_atom_idx: int
-        :param str_to_append_to_fname: _description_, defaults to "_features_with_properties.csv"
-        :type str_to_append_to_fname: str, optional
+            and for which dE/df will be calculated. A list of atoms can also be given,
+            in which case a file is written for every atom.
+        :param str_to_append_to_fname: The string appended to the atom names to make the
+            file names, defaults to "_features_with_dE_df.csv"
+        :param method: The method used to solve for the feature forces, "lstsq" or "cholesky",
+            see `feature_forces_from_b_matrices`. Defaults to "lstsq".
+        :param rcond: The rank cutoff used by the "lstsq" method, see `feature_forces_from_b_matrices`
+        :param kwargs: Key word arguments passed to `pd.DataFrame.to_csv`
         """
 
+        import pandas as pd
         from ichor.core.models.gaussian_energy_derivative_wrt_features import (
-            convert_to_feature_forces,
-            form_b_matrix,
+            feature_forces_from_b_matrices,
+            form_b_matrices,
         )
 
-        training_data = []
-        for point_dir in self:
+        atom_names = self[0].xyz.atoms.names
 
-            atoms = point_dir.xyz.atoms
-            features = atoms[central_atom_idx].features(
-                calculate_alf_features, alf_list
-            )
-            nfeatures = len(features)
-            wfn_energy = point_dir.wfn.total_energy
-            b_matrix = form_b_matrix(atoms, alf_list, central_atom_idx)
-            cart_forces = np.array(
+        if isinstance(central_atom_idx, int):
+            central_atom_idx = [central_atom_idx]
+
+        # coordinates in Angstroms, as in the .xyz files
+        coordinates = np.array([point_dir.xyz.atoms.coordinates for point_dir in self])
+        wfn_energies = np.array([point_dir.wfn.total_energy for point_dir in self])
+        cart_forces = np.array(
+            [
                 list(point_dir.gaussian_output.global_forces.values())
+                for point_dir in self
+            ]
+        )
+
+        for idx in central_atom_idx:
+
+            # features use Bohr for distances by default
+            features = calculate_alf_features_from_coordinates(
+                coordinates, alf_list[idx]
+            )
+            nfeatures = features.shape[-1]
+            # B matrices need to be calculated in Bohr because forces are per Bohr
+            b_matrices = form_b_matrices(
+                coordinates * constants.ang2bohr, alf_list, idx
             )
-            dE_df = convert_to_feature_forces(
-                cart_forces, b_matrix, alf_list, central_atom_idx
+            dE_df = feature_forces_from_b_matrices(
+                cart_forces, b_matrices, method=method, rcond=rcond
             )
-            training_data.append([*features, wfn_energy, *dE_df])
 
             input_headers = [f"f{i + 1}" for i in range(nfeatures)]
             output_headers = ["wfn_energy"] + [
                 f"-dEdf{i + 1}" for i in range(nfeatures)
             ]
 
-            fname = atoms[central_atom_idx].name + str_to_append_to_fname
+            fname = Path(atom_names[idx] + str_to_append_to_fname)
 
-        df = pd.DataFrame(
-            training_data,
-            columns=input_headers + output_headers,
-            dtype=np.float64,
-        )
-        df.to_csv(fname, index=False)
+            df = pd.DataFrame(
+                np.hstack([features, wfn_energies[:, np.newaxis], dE_df]),
+                columns=input_headers + output_headers,
+                dtype=np.float64,
+            )
+            df.to_csv(fname, index=False, **kwargs)
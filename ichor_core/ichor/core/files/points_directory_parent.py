@@ -126,7 +126,12 @@ class PointsDirectoryParent(list, Directory):
         return root_paths
 
     def write_to_sqlite3_database(
-        self, db_path: Union[str, Path] = None, echo=False, print_missing_data=True
+        self,
+        db_path: Union[str, Path] = None,
+        echo=False,
+        print_missing_data=True,
+        incremental=True,
+        ncores: int = 1,
     ) -> Path:
         """
         Write out important information from a PointsDirectory instance to an SQLite3 database.
@@ -136,6 +141,8 @@ class PointsDirectoryParent(list, Directory):
         :param echo: Whether to print out SQL queries from SQL Alchemy, defaults to False
         :param print_missing_data: Whether to print out any missing data from each PointDirectory contained
             in self, defaults to False
+        :param incremental: Whether to only add new or changed points, defaults to True
+        :param ncores: The number of processes used to read the points, defaults to 1
         :return: The path to the written SQL database
         """
 
@@ -152,5 +159,9 @@ class PointsDirectoryParent(list, Directory):
             # write all data to a single database by passing in the same name for every PointsDirectory
             # get the method and pass in the database path name
             pointsdir.write_to_sqlite3_database(
-                db_path, echo=echo, print_missing_data=print_missing_data
+                db_path,
+                echo=echo,
+                print_missing_data=print_missing_data,
+                incremental=incremental,
+                ncores=ncores,
             )
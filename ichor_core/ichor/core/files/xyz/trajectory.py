@@ -1,9 +1,8 @@
 import re
 from pathlib import Path
-from typing import Callable, Dict, Iterable, List, Union
+from typing import Callable, Dict, Iterable, List, Optional, Union
 
 import numpy as np
-import pandas as pd
 from ichor.core.atoms import Atom, Atoms, ListOfAtoms
 from ichor.core.atoms.alf import ALF
 from ichor.core.calculators import alf_features_to_coordinates
@@ -12,6 +11,7 @@ from ichor.core.common.int import count_digits
 from ichor.core.common.io import convert_to_path, mkdir
 from ichor.core.common.itertools import chunker
 from ichor.core.files.file import FileState, ReadFile, WriteFile
+from ichor.core.files.xyz.write_points import write_point_directories
 
 
 class Trajectory(ReadFile, WriteFile, ListOfAtoms):
@@ -153,13 +153,53 @@ class Trajectory(ReadFile, WriteFile, ListOfAtoms):
         else:
             raise ValueError(f"Cannot add an instance of {type(atoms)} to self.")
 
-    def rmsd(self, ref=None):
+    def rmsd(
+        self, ref: Optional[Union[int, Atoms]] = None, mass_weighted: bool = False
+    ) -> np.ndarray:
+        """Returns the RMSD between a reference geometry and every timestep, after aligning
+        every timestep onto the reference. The timesteps are not modified.
+
+        :param ref: The reference geometry, either an Atoms instance or the index of a timestep.
+            Defaults to the first timestep.
+        :param mass_weighted: Whether to weight the atoms by their masses, defaults to False
+        :return: Array of shape n_timesteps
+        """
+        from ichor.core.calculators.alignment import calculate_rmsd
+
         if ref is None:
             ref = self[0]
         elif isinstance(ref, int):
             ref = self[ref]
 
-        return [ref.rmsd(point) for point in self]
+        masses = ref.masses if mass_weighted else None
+        return calculate_rmsd(ref.coordinates, self.coordinates, masses)
+
+    def rmsd_matrix(
+        self,
+        mass_weighted: bool = False,
+        memory_budget: int = 2**26,
+        out: Optional[np.ndarray] = None,
+        nthreads: int = 8,
+    ) -> np.ndarray:
+        """Returns the RMSD between every pair of timesteps (after aligning them), e.g. for
+        clustering the timesteps. See `calculate_rmsd_matrix`.
+
+        :param mass_weighted: Whether to weight the atoms by their masses, defaults to False
+        :param memory_budget: The approximate number of bytes used for intermediate arrays, defaults to 64MB
+        :param out: The array (e.g. a `np.memmap`) in which to write the matrix, optional
+        :param nthreads: The number of threads used to calculate the matrix, defaults to 8
+        :return: Array of shape n_timesteps x n_timesteps
+        """
+        from ichor.core.calculators.alignment import calculate_rmsd_matrix
+
+        masses = self[0].masses if mass_weighted else None
+        return calculate_rmsd_matrix(
+            self.coordinates,
+            masses,
+            memory_budget=memory_budget,
+            out=out,
+            nthreads=nthreads,
+        )
 
     def to_dir(
         self,
@@ -167,8 +207,11 @@ class Trajectory(ReadFile, WriteFile, ListOfAtoms):
         every: int = 1,
         center: bool = False,
         parent_dir: Path = None,
+        nthreads: int = 8,
     ) -> Path:
-        """Writes out every nth timestep to a separate .xyz file to a given directory
+        """Writes out every nth timestep to a separate .xyz file to a given directory.
+        Each .xyz file is written inside its own PointDirectory-like directory, so that the
+        written directory is already in the layout of a `PointsDirectory`.
 
         :param system_name: The name of the system. This will be the name of the
             given directory, with a suffix added. Default suffix is PointsDirectory._suffix
@@ -177,10 +220,11 @@ class Trajectory(ReadFile, WriteFile, ListOfAtoms):
             a value eg. 5 is given, then it will only write out a .xyz file for every 5th timestep.
         :param center: Whether or not to subtract mean of coordinates from atomic coordinates, defaults to False
         :param parent_dir: A path to a parent directory where the inner directory will be created.
+        :param nthreads: The number of threads used to write the files, defaults to 8
 
         :returns: The Path object to the made directory
         """
-        from ichor.core.files import PointsDirectory, XYZ
+        from ichor.core.files import PointsDirectory
 
         default_root_suffix = PointsDirectory._suffix
 
@@ -194,18 +238,17 @@ class Trajectory(ReadFile, WriteFile, ListOfAtoms):
             root_path = Path(system_name).with_suffix(default_root_suffix)
 
         mkdir(root_path, empty=True)
-        for i, atoms_instance in enumerate(self):
 
-            if (i % every) == 0:
-                if center:
-                    atoms_instance.centre()
-                point_name = (
-                    f"{system_name}{str(i).zfill(max(4, count_digits(len(self))))}.xyz"
-                )
-                path = Path(point_name)
-                path = root_path / path
-                xyz_file = XYZ(path, atoms_instance)
-                xyz_file.write()
+        indices = range(0, len(self), every)
+        ndigits = max(4, count_digits(len(self)))
+        write_point_directories(
+            root_path,
+            [f"{system_name}{str(i).zfill(ndigits)}" for i in indices],
+            self.types_extended if len(self) > 0 else [],
+            self.coordinates[::every],
+            center=center,
+            nthreads=nthreads,
+        )
 
         return root_path
 
@@ -215,9 +258,10 @@ class Trajectory(ReadFile, WriteFile, ListOfAtoms):
         split_size: int = 1000,
         every: int = 1,
         center=False,
+        nthreads: int = 8,
     ) -> Path:
         """Writes out every nth timestep to a separate .xyz file. This method differs
-        from `to_dir` because it has a structure system_name_root / points_directory / xyz file.
+        from `to_dir` because it has a structure system_name_root / points_directory / point_directory / xyz file.
         I.e. there is an additional root directory which encapsulates all the PointsDirectory-like
         directories.
 
@@ -228,13 +272,13 @@ class Trajectory(ReadFile, WriteFile, ListOfAtoms):
         :param every: An integer value that indicates the nth step at
             which an xyz file should be written. Default is 1.
             If a value eg. 5 is given, then it will only write out a .xyz file for every 5th timestep.
+        :param nthreads: The number of threads used to write the files, defaults to 8
 
         :returns: The Path object to the made parent directory
         """
-        from ichor.core.files import PointsDirectory, PointsDirectoryParent, XYZ
+        from ichor.core.files import PointsDirectoryParent
 
         default_parent_suffix = PointsDirectoryParent._suffix
-        default_points_dir_suffix = PointsDirectory._suffix
 
         # capitalize system name
         system_name = system_name.upper()
@@ -244,44 +288,14 @@ class Trajectory(ReadFile, WriteFile, ListOfAtoms):
         # make root directory that will contain PointsDirectory-like dirs
         mkdir(root_path, empty=True)
 
-        # make chunk directory
-        chunk_idx = 0
-        # this is the PointsDirectory
-        inner_dir_name = f"{system_name}{chunk_idx}{default_points_dir_suffix}"
-        mkdir(root_path / inner_dir_name, empty=True)
-
-        # get only the every-th element of the trajectory
-        geometries_to_write = self[::every]
-        len_geoms_to_write = len(geometries_to_write)
-
-        total_geom_counter = 0
-        geom_counter = 0
-
-        # loop over geometries and write to respective dir
-        for i, atoms_instance in enumerate(geometries_to_write):
-
-            if center:
-                atoms_instance.centre()
-
-            point_name = f"{system_name}{str(i).zfill(max(4, count_digits(len_geoms_to_write)))}.xyz"
-            path = Path(point_name)
-            path = root_path / inner_dir_name / path
-            xyz_file = XYZ(path, atoms_instance)
-            xyz_file.write()
-
-            geom_counter += 1
-            total_geom_counter += 1
-            # if we have reached the split size, then make a new inner directory
-            # do not make a new directory if last point is reached
-            if geom_counter == split_size:
-
-                # reset counter and update chunk
-                geom_counter = 0
-                chunk_idx += 1
-                # make a new PointsDirectory-like directory
-                inner_dir_name = f"{system_name}{chunk_idx}{default_points_dir_suffix}"
-                if total_geom_counter != len_geoms_to_write:
-                    mkdir(root_path / inner_dir_name, empty=True)
+        self._write_split_points_directories(
+            system_name,
+            split_size,
+            nsplits_in_root=None,
+            every=every,
+            center=center,
+            nthreads=nthreads,
+        )
 
         return root_path
 
@@ -292,6 +306,7 @@ class Trajectory(ReadFile, WriteFile, ListOfAtoms):
         nsplits_in_root: int = 5,
         every: int = 1,
         center=False,
+        nthreads: int = 8,
     ):
         """Splits a trajectory into multiple parent directories, each of which
         can contain multiple PointsDirectory-like directories.
@@ -306,77 +321,72 @@ class Trajectory(ReadFile, WriteFile, ListOfAtoms):
         :param center: whether or not to subtract centroid of geometry before writing
             out xyz. Useful if geometries are far away from the origin
             which can result in Gaussian failing to write outputs properly, defaults to False
+        :param nthreads: The number of threads used to write the files, defaults to 8
         """
 
-        # TODO: simplify this so it uses to_dirs to prevent code duplication
-        from ichor.core.files import PointsDirectory, PointsDirectoryParent, XYZ
+        self._write_split_points_directories(
+            system_name.upper(),
+            split_size,
+            nsplits_in_root=nsplits_in_root,
+            every=every,
+            center=center,
+            nthreads=nthreads,
+        )
+
+    def _write_split_points_directories(
+        self,
+        system_name: str,
+        split_size: int,
+        nsplits_in_root: Optional[int],
+        every: int,
+        center: bool,
+        nthreads: int,
+    ):
+        """Writes every nth geometry to PointsDirectory-like directories containing `split_size` points each.
+        If `nsplits_in_root` is None, all PointsDirectory-like directories are written into one parent directory
+        (`system_name.pointsdirparent`), otherwise a new parent directory (`system_name{idx}.pointsdirparent`) is
+        made for every `nsplits_in_root` PointsDirectory-like directories.
+        """
+
+        from ichor.core.files import PointsDirectory, PointsDirectoryParent
 
         default_parent_suffix = PointsDirectoryParent._suffix
         default_points_dir_suffix = PointsDirectory._suffix
 
-        # capitalize system name
-        system_name = system_name.upper()
-
         # get only the every-th element of the trajectory
-        geometries_to_write = self[::every]
-        len_geoms_to_write = len(geometries_to_write)
-
-        # parent directory index
-        root_idx = 0
-        # inner directory index
-        chunk_idx = 0
-
-        # add index to parent directory, because there will be multiple
-        root_path = Path(f"{system_name}{root_idx}{default_parent_suffix}")
-        # make initial root directory
-        mkdir(root_path, empty=True)
-
-        # make initial chunk directory, this is the PointsDirectory
-        inner_dir_name = f"{system_name}{chunk_idx}{default_points_dir_suffix}"
-        mkdir(root_path / inner_dir_name, empty=True)
-
-        geoms_in_split_counter = 0
-        nsplits_counter = 0
-
-        # loop over geometries and write to respective dir
-        for total_geom_counter, atoms_instance in enumerate(geometries_to_write):
-
-            if center:
-                atoms_instance.centre()
-
-            point_name = f"{system_name}{str(total_geom_counter).zfill(max(4, count_digits(len_geoms_to_write)))}.xyz"
-            path = Path(point_name)
-            path = root_path / inner_dir_name / path
-            xyz_file = XYZ(path, atoms_instance)
-            xyz_file.write()
-
-            geoms_in_split_counter += 1
-            # if we have reached the split size, then make a new inner directory
-            # do not make a new directory if last point is reached
-            if geoms_in_split_counter == split_size:
-
-                nsplits_counter += 1
-                # reset counter and update chunk
-                geoms_in_split_counter = 0
-                chunk_idx += 1
-
-                # make a new parent directory if the number of splits is reached
-                if nsplits_counter == nsplits_in_root:
-
-                    nsplits_counter = 0
-                    root_idx += 1
-                    root_path = root_path.with_name(
-                        f"{system_name}{root_idx}{default_parent_suffix}"
-                    )
-                    # subtract 1 from geometries because otherwise will make an extra directory at the end
-                    if total_geom_counter != len_geoms_to_write - 1:
-                        mkdir(root_path, empty=True)
-
-                inner_dir_name = f"{system_name}{chunk_idx}{default_points_dir_suffix}"
-                # do not make a new directory on the last iteration
-                # need to subtract 1 because otherwise they will be equal
-                if total_geom_counter != len_geoms_to_write - 1:
-                    mkdir(root_path / inner_dir_name, empty=True)
+        coordinates = self.coordinates[::every]
+        atom_types = self.types_extended if len(self) > 0 else []
+        ndigits = max(4, count_digits(len(coordinates)))
+
+        for chunk_idx, start in enumerate(range(0, len(coordinates), split_size)):
+
+            if nsplits_in_root is None:
+                root_path = Path(system_name).with_suffix(default_parent_suffix)
+            else:
+                # add index to parent directory, because there will be multiple
+                root_idx = chunk_idx // nsplits_in_root
+                root_path = Path(f"{system_name}{root_idx}{default_parent_suffix}")
+                if chunk_idx % nsplits_in_root == 0:
+                    mkdir(root_path, empty=True)
+
+            # this is the PointsDirectory
+            inner_dir = (
+                root_path / f"{system_name}{chunk_idx}{default_points_dir_suffix}"
+            )
+            mkdir(inner_dir, empty=True)
+
+            chunk_coordinates = coordinates[start : start + split_size]
+            write_point_directories(
+                inner_dir,
+                [
+                    f"{system_name}{str(i).zfill(ndigits)}"
+                    for i in range(start, start + len(chunk_coordinates))
+                ],
+                atom_types,
+                chunk_coordinates,
+                center=center,
+                nthreads=nthreads,
+            )
 
     @convert_to_path
     def split_traj(
@@ -458,6 +468,8 @@ class Trajectory(ReadFile, WriteFile, ListOfAtoms):
             that is in the file containing the features.
         """
 
+        import pandas as pd
+
         f = Path(f)
         if f.suffix == ".xlsx":
             features_array = pd.read_excel(
@@ -0,0 +1,113 @@
+import os
+from pathlib import Path
+from typing import List, Sequence, Union
+
+import numpy as np
+from ichor.core.common.itertools import chunker
+
+
+def format_xyz_frames(
+    atom_types: Sequence[str], coordinates: np.ndarray, fmtstr: str = "12.8f"
+) -> List[str]:
+    """Formats many geometries in the .xyz format written by `XYZ` (the comment line is left empty).
+    A %-format template is made once for all atoms, so each geometry is formatted in one operation
+    instead of formatting every coordinate of every atom separately.
+
+    :param atom_types: The types of the atoms (e.g. O, H, H), which are the same for all geometries
+    :param coordinates: Array of shape ngeometries x natoms x 3
+    :param fmtstr: The format of the coordinates, defaults to the format used by `XYZ`
+    :return: A list containing the contents of an .xyz file for every geometry
+    """
+
+    template = f"{len(atom_types)}\n\n" + "".join(
+        f"{ty} %{fmtstr} %{fmtstr} %{fmtstr}\n" for ty in atom_types
+    )
+    # python floats are a lot faster to format than numpy floats
+    return [
+        template % tuple(geometry)
+        for geometry in np.asarray(coordinates).reshape(len(coordinates), -1).tolist()
+    ]
+
+
+def _write_point_directories(root_path: Path, point_names, atom_types, coordinates):
+    """Writes one chunk of geometries, each to its own PointDirectory-like directory."""
+
+    from ichor.core.files.point_directory import PointDirectory
+
+    for point_name, xyz_str in zip(
+        point_names, format_xyz_frames(atom_types, coordinates)
+    ):
+        point_dir = root_path / f"{point_name}{PointDirectory._suffix}"
+        os.makedirs(point_dir, exist_ok=True)
+        with open(point_dir / f"{point_name}.xyz", "w") as f:
+            f.write(xyz_str)
+
+
+def write_point_directories(
+    root_path: Union[str, Path],
+    point_names: Sequence[str],
+    atom_types: Sequence[str],
+    coordinates: np.ndarray,
+    center: bool = False,
+    nthreads: int = 8,
+    chunk_size: int = 500,
+) -> List[Path]:
+    """Writes every geometry to an .xyz file inside its own PointDirectory-like directory, i.e.
+    `root_path/point_name.pointdir/point_name.xyz`. This is the layout that `PointsDirectory` makes when it
+    is parsed, so the files do not need to be moved afterwards.
+
+    Writing many small files is mostly waiting on the filesystem (especially on network filesystems), so
+    chunks of geometries are formatted and written by a pool of threads.
+
+    :param root_path: The directory in which to make the PointDirectory-like directories. It must exist.
+    :param point_names: The name of every point, e.g. WATER0001
+    :param atom_types: The types of the atoms, which are the same for all geometries
+    :param coordinates: Array of shape ngeometries x natoms x 3
+    :param center: Whether to subtract the centroid of each geometry from its coordinates, defaults to False
+    :param nthreads: The number of threads used to write files, defaults to 8
+    :param chunk_size: The number of geometries that each thread writes at a time, defaults to 500
+    :return: A list of the paths to the written .xyz files
+    """
+
+    import concurrent.futures
+
+    from ichor.core.files.point_directory import PointDirectory
+
+    root_path = Path(root_path)
+    coordinates = np.asarray(coordinates)
+
+    if len(point_names) != len(coordinates):
+        raise ValueError(
+            f"The number of point names ({len(point_names)}) does not match the number of geometries ({len(coordinates)})."
+        )
+
+    if center and len(coordinates) > 0:
+        coordinates = coordinates - np.mean(coordinates, axis=1, keepdims=True)
+
+    chunks = zip(
+        chunker(point_names, chunk_size),
+        (
+            coordinates[i : i + chunk_size]
+            for i in range(0, len(coordinates), chunk_size)
+        ),
+    )
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=nthreads) as executor:
+        futures = [
+            executor.submit(
+                _write_point_directories,
+                root_path,
+                names_chunk,
+                atom_types,
+                coordinates_chunk,
+            )
+            for names_chunk, coordinates_chunk in chunks
+        ]
+        # raise any errors that happened in the threads
+        for future in futures:
+            future.result()
+
+    return [
+        root_path / f"{point_name}{PointDirectory._suffix}" / f"{point_name}.xyz"
+        for point_name in point_names
+    ]
@@ -489,3 +489,89 @@ def fflux_derivs_da_df_matrix(jatm_idx, iatm_idx, atoms_instance, system_alf):
         feat_idx += 1
 
     return n_features_times_3_tmp_matrix
+
+
+# the maximum number of elements of the n_test x n_train x n_features arrays used in
+# fflux_predict_values_and_gradients
+_max_chunk_elements = 2**24
+
+
+def fflux_thetas(model_inst, n_features: int):
+    """Returns the thetas of every feature (in the order of the features) and a mask of the periodic
+    (phi) features, as used by FFLUX. Models with an RBF kernel only (see `fflux_predict_value_rbf_only`)
+    have no periodic features.
+
+    :param model_inst: A model instance with either an RBF kernel or a product of an RBF and a periodic kernel
+    :param n_features: The number of features of the model
+    """
+
+    kernels = model_inst.kernel
+
+    periodic = np.zeros(n_features, dtype=bool)
+
+    if not hasattr(kernels, "k1"):
+        return np.array(kernels._thetas, dtype=float), periodic
+
+    # make sure thetas are ordered correctly (cannot concat rbf thetas
+    # to periodic thetas because it leads to wrong indexing)
+    # first five thetas are for rbf dimensions (because non cyclic),
+    # then 6th (5th index) is a phi dimension, then two rbf, then periodic and so on
+    periodic[[i for i in range(n_features) if ((i + 1) % 3) == 0 and i != 2]] = True
+    thetas = np.empty(n_features)
+    thetas[~periodic] = kernels.k1._thetas
+    thetas[periodic] = kernels.k2._thetas
+
+    return thetas, periodic
+
+
+def fflux_predict_values_and_gradients(model_inst, test_x_features: np.ndarray):
+    """Predicts the values and the derivatives of the predictions with respect to the features for
+    many test points at once. This gives the same results as `fflux_predict_value` (or
+    `fflux_predict_value_rbf_only` for models with an RBF kernel only) for every test point.
+
+    The test points are processed in chunks so that the n_test x n_train x n_features arrays stay small.
+
+    :param model_inst: A model instance (e.g. an iqa model)
+    :param test_x_features: Array of shape n_test x n_features containing the features of the test points
+    :return: A tuple of the predictions (shape n_test) and the derivatives dQ/df (shape n_test x n_features)
+    """
+
+    test_x_features = np.atleast_2d(test_x_features)
+    x_train_array = model_inst.x
+    weights = model_inst.weights.flatten()
+
+    n_train, n_features = x_train_array.shape
+    n_test = test_x_features.shape[0]
+
+    thetas, periodic = fflux_thetas(model_inst, n_features)
+
+    values = np.empty(n_test)
+    gradients = np.empty((n_test, n_features))
+
+    chunk_size = max(1, _max_chunk_elements // (n_train * n_features))
+
+    for start in range(0, n_test, chunk_size):
+
+        # shape n_test x n_train x n_features
+        fdiff = (
+            x_train_array[np.newaxis]
+            - test_x_features[start : start + chunk_size, np.newaxis]
+        )
+
+        # 4.0 because we use 1/(2*l^2), for every kernel.
+        # For the periodic kernel, there is no 2 in the definition
+        # gpytorch only divided by lambda (which is equal to l^2)
+        expo_terms = np.where(periodic, 4.0 * np.sin(fdiff / 2.0) ** 2, fdiff**2)
+        weighted_expo = weights * np.exp(-(expo_terms @ thetas))
+
+        # derivatives of the exponent with respect to the test features
+        dexpo_df = 2.0 * thetas * np.where(periodic, np.sin(fdiff), fdiff)
+
+        values[start : start + chunk_size] = weighted_expo.sum(-1)
+        gradients[start : start + chunk_size] = np.einsum(
+            "nt,ntf->nf", weighted_expo, dexpo_df
+        )
+
+    values += model_inst.mean.value(np.zeros((1, 1))).item()
+
+    return values, gradients
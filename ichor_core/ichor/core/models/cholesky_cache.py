@@ -0,0 +1,180 @@
+import hashlib
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+
+# the maximum number of elements of the train x test covariance matrix chunks used in variance
+_max_chunk_elements = 2**24
+
+
+class CholeskyCache:
+    """Mixin for models with a `kernel`, training inputs `x` and a `path`, which caches the
+    covariance matrix of the training points and its Cholesky decomposition.
+
+    The cache is keyed by a fingerprint of the training inputs and the kernel hyperparameters,
+    so it is recomputed if any of these change. If `persist_cholesky` is True, the Cholesky
+    decomposition is also written to a .cholesky.npz file next to the model file and
+    is read from there (if the fingerprint matches) instead of decomposing the matrix again.
+    """
+
+    _cholesky_suffix = ".cholesky.npz"
+    persist_cholesky: bool = False
+
+    @property
+    def cholesky_path(self) -> Path:
+        """The file in which the Cholesky decomposition is stored if `persist_cholesky` is True."""
+        return Path(self.path).with_suffix(self._cholesky_suffix)
+
+    def _covariance_fingerprint(self) -> str:
+        """Returns a hash of everything that the covariance matrix of the training points depends on."""
+
+        fingerprint = hashlib.sha1()
+        fingerprint.update(np.ascontiguousarray(self.x, dtype=float).tobytes())
+        fingerprint.update(self._kernel_fingerprint())
+
+        return fingerprint.hexdigest()
+
+    def _kernel_fingerprint(self) -> bytes:
+        """Returns the kernel hyperparameters (and anything else added to the covariance matrix) as bytes."""
+
+        fingerprint = np.ascontiguousarray(
+            self.kernel.lengthscale, dtype=float
+        ).tobytes()
+        for dimensions in ("rbf_dimensions", "periodic_dimensions"):
+            dims = getattr(self.kernel, dimensions, None)
+            if dims is not None:
+                fingerprint += np.asarray(dims, dtype=np.int64).tobytes()
+
+        return fingerprint
+
+    def _training_covariance(self) -> np.ndarray:
+        """Calculates the covariance matrix of the training points, which is cached by `R`."""
+        return self.kernel.R(self.x)
+
+    def _covariance_cache(self) -> Dict[str, np.ndarray]:
+        """Returns the cached arrays, which are cleared if the fingerprint has changed."""
+
+        fingerprint = self._covariance_fingerprint()
+        cache = self.__dict__.get("_cholesky_cache")
+
+        if cache is None or cache["fingerprint"] != fingerprint:
+            cache = self.__dict__["_cholesky_cache"] = {"fingerprint": fingerprint}
+
+        return cache
+
+    def clear_cholesky_cache(self, remove_file: bool = False):
+        """Clears the cached covariance matrix and Cholesky decomposition.
+
+        :param remove_file: Also removes the stored Cholesky decomposition if it exists, defaults to False
+        """
+        self.__dict__.pop("_cholesky_cache", None)
+        if remove_file and self.cholesky_path.exists():
+            self.cholesky_path.unlink()
+
+    def _read_cholesky(self, fingerprint: str) -> Optional[np.ndarray]:
+
+        if not self.cholesky_path.exists():
+            return None
+
+        with np.load(self.cholesky_path) as stored:
+            if str(stored["fingerprint"]) != fingerprint:
+                return None
+            return stored["lower_cholesky"]
+
+    def _write_cholesky(self, fingerprint: str, lower_cholesky: np.ndarray):
+        # write to a temporary file first, so that an incomplete file is never read
+        tmp_path = self.cholesky_path.with_name(self.cholesky_path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(f, fingerprint=fingerprint, lower_cholesky=lower_cholesky)
+        tmp_path.replace(self.cholesky_path)
+
+    @property
+    def R(self) -> np.ndarray:
+        """Returns the covariance matrix of the training points, which is cached."""
+        cache = self._covariance_cache()
+        if "R" not in cache:
+            cache["R"] = self._training_covariance()
+        return cache["R"]
+
+    @property
+    def lower_cholesky(self) -> np.ndarray:
+        """Decomposes the covariance matrix into L and L^T. Returns the lower triangular matrix L.
+        The decomposition is only calculated once (or read from the .cholesky.npz file)."""
+
+        cache = self._covariance_cache()
+
+        if "lower_cholesky" not in cache:
+
+            lower_cholesky = None
+            if self.persist_cholesky:
+                lower_cholesky = self._read_cholesky(cache["fingerprint"])
+
+            if lower_cholesky is None:
+                lower_cholesky = np.linalg.cholesky(self.R)
+                if self.persist_cholesky:
+                    self._write_cholesky(cache["fingerprint"], lower_cholesky)
+
+            cache["lower_cholesky"] = lower_cholesky
+
+        return cache["lower_cholesky"]
+
+    @property
+    def invR(self) -> np.ndarray:
+        """Returns the inverse of the covariance matrix R, calculated from the Cholesky decomposition."""
+
+        from scipy.linalg import cho_solve
+
+        cache = self._covariance_cache()
+        if "invR" not in cache:
+            cache["invR"] = cho_solve(
+                (self.lower_cholesky, True),
+                np.eye(self.lower_cholesky.shape[0]),
+                check_finite=False,
+            )
+        return cache["invR"]
+
+    @property
+    def logdet(self):
+        """Returns the log determinant of the covariance matrix from the Cholesky decomposition."""
+        return 2.0 * np.log(np.diag(self.lower_cholesky)).sum()
+
+    def variance(
+        self, x_test: np.ndarray, chunk_size: Optional[int] = None
+    ) -> np.ndarray:
+        """Return the variance for the test data points.
+
+        Only the diagonal of v.T @ v is needed, so the triangular solves are done
+        for chunks of test points and v.T @ v is never formed.
+
+        :param x_test: an array containing the test set point features, of shape npoints x nfeatures or nfeatures
+        :param chunk_size: The number of test points for which the covariance is calculated at once,
+            by default it is chosen to keep the memory use of each chunk bounded
+        """
+
+        from scipy.linalg import solve_triangular
+
+        if x_test.ndim == 1:
+            x_test = x_test[np.newaxis, ...]
+
+        lower_cholesky = self.lower_cholesky
+        npoints, ndimensions = x_test.shape[-2:]
+        ncovariances = lower_cholesky.shape[0] * (ndimensions + 1)
+
+        if chunk_size is None:
+            chunk_size = max(1, _max_chunk_elements // ncovariances)
+
+        variances = []
+
+        for start in range(0, npoints, chunk_size):
+            train_test_covar = self.r(x_test[start : start + chunk_size])
+            # temporary matrix, see Rasmussen Williams page 19 algo. 2.1
+            v = solve_triangular(
+                lower_cholesky, train_test_covar, lower=True, check_finite=False
+            )
+            # the diagonal of v.T @ v
+            variances.append(1.0 - np.einsum("ij,ij->j", v, v))
+
+        # TODO: need to multiply by tau^2 in order to get "true" variance which can be used for error estimations.
+        # here it can only be used to compare points to figure out which point has the largest variance.
+        return np.concatenate(variances)
@@ -1,7 +1,8 @@
 import random
 from pathlib import Path
-from typing import List, Tuple, Union
+from typing import Callable, List, Set, Tuple, Union
 
+import numpy as np
 import pandas as pd
 
 # these work with csv files written out by ichor
@@ -21,9 +22,51 @@ def get_atom_name_and_alf_from_csv(csv_path: Path) -> Tuple[str, List[str]]:
     return atom_name, alf_list
 
 
+def _csv_files(input_dir: Path) -> List[Path]:
+    """Returns the csv files in a directory, sorted by name."""
+    return sorted(f for f in input_dir.iterdir() if f.suffix == ".csv")
+
+
+def read_point_names(csv_path: Union[str, Path]) -> pd.Series:
+    """Reads only the `point_name` column of a processed csv file.
+
+    :param csv_path: The csv file path
+    :return: A pandas Series containing the point names
+    """
+    return pd.read_csv(csv_path, header=0, usecols=["point_name"])["point_name"]
+
+
+def _map_over_csvs(func: Callable, arguments: List[tuple], ncores: int) -> list:
+    """Calls `func` with every tuple of arguments in a pool of `ncores` processes, or in this process
+    if `ncores` is 1. The function needs to be defined at module level so that it can be pickled."""
+
+    import concurrent.futures
+
+    if ncores > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=ncores) as executor:
+            return list(executor.map(func, *zip(*arguments)))
+
+    return [func(*args) for args in arguments]
+
+
+def _write_point_names_subset(
+    csv_path: Path, output_path: Path, point_names: Set[str], chunksize: int
+):
+    """Writes the rows of a csv file which contain the given point names, reading `chunksize` rows at a time."""
+
+    with open(output_path, "w") as f:
+        for ichunk, df in enumerate(
+            pd.read_csv(csv_path, header=0, index_col=0, chunksize=chunksize)
+        ):
+            df = df[df["point_name"].isin(point_names)]
+            df.to_csv(f, index=True, header=(ichunk == 0))
+
+
 def write_csvs_intersection(
     input_dir: Union[str, Path] = "processed_csvs",
     output_dir: Union[str, Path] = "processed_csvs_intersection",
+    ncores: int = 1,
+    chunksize: int = 100_000,
 ):
     """Not all processed atom csvs might contain the same points. This is because
     one atom might in a point might be filtered because of integration error but another
@@ -32,22 +75,29 @@ def write_csvs_intersection(
     intersection of all point names across the csvs and then only writes out the
     rows from each csv that are in the intersection.
 
+    Only the `point_name` column is read to find the intersection, after which the
+    csvs are filtered `chunksize` rows at a time, so the csvs are never fully in memory.
+
     :param input_dir: The path to the directory containing processed csvs files, defaults to "processed_csvs"
     :param output_dir: The path to the directory containing output csvs, defaults to "processed_csvs_all_atoms"
+    :param ncores: The number of processes used to read and write the csvs, defaults to 1
+    :param chunksize: The number of rows of a csv that are read at a time, defaults to 100_000
     """
 
     input_dir = Path(input_dir)
     output_dir = Path(output_dir)
     output_dir.mkdir(exist_ok=True)
 
-    # read in all csvs
-    all_dfs = [
-        pd.read_csv(csv_file, header=0, index_col=0) for csv_file in input_dir.iterdir()
-    ]
+    csv_files = _csv_files(input_dir)
 
     # get a list of sets
     # the point names in the dfs should already be unique
-    unique_points_in_all_csvs_list = [set(df["point_name"]) for df in all_dfs]
+    unique_points_in_all_csvs_list = [
+        set(point_names)
+        for point_names in _map_over_csvs(
+            read_point_names, [(csv_file,) for csv_file in csv_files], ncores
+        )
+    ]
     # get intersection of the list of sets
     intersection_of_point_names_in_all_csvs = set.intersection(
         *unique_points_in_all_csvs_list
@@ -56,20 +106,62 @@ def write_csvs_intersection(
         "Number of intersection points:", len(intersection_of_point_names_in_all_csvs)
     )
 
-    # read the files again because we need to get some info from them
-    for csv_file in input_dir.iterdir():
+    arguments = []
+    for csv_file in csv_files:
 
         atom_name, alf_list = get_atom_name_and_alf_from_csv(csv_file)
 
-        df = pd.read_csv(csv_file, header=0, index_col=0)
-
-        # get rows where we know all atoms of a point are present in the csvs
-        df = df[df["point_name"].isin(intersection_of_point_names_in_all_csvs)]
-
         # write output file
         output_file_name = f"{atom_name}_processed_data_all_atoms_alf_{alf_list[0]}_{alf_list[1]}_{alf_list[2]}.csv"
-        output_path = output_dir / output_file_name
-        df.to_csv(output_path, index=True, header=True)
+        arguments.append(
+            (
+                csv_file,
+                output_dir / output_file_name,
+                intersection_of_point_names_in_all_csvs,
+                chunksize,
+            )
+        )
+
+    # get rows where we know all atoms of a point are present in the csvs
+    _map_over_csvs(_write_point_names_subset, arguments, ncores)
+
+
+def _write_sets_from_labels(
+    csv_path: Path,
+    output_paths: List[Path],
+    row_labels: np.ndarray,
+    chunksize: int,
+):
+    """Writes the train and test sets of one csv file in one pass over the file.
+
+    :param csv_path: The csv file containing all points
+    :param output_paths: The paths of the sets. The last path is the test set, the
+        other paths are the training sets (in increasing size).
+    :param row_labels: The set of every row of the csv. A row labelled `i` is in the training sets
+        `i, i+1, ...`, a row labelled -1 is in the test set and a row labelled -2 is not written.
+    :param chunksize: The number of rows of the csv that are read at a time
+    """
+
+    *train_paths, test_path = output_paths
+    files = [open(output_path, "w") for output_path in output_paths]
+
+    try:
+        start = 0
+        for ichunk, df in enumerate(
+            pd.read_csv(csv_path, header=0, index_col=0, chunksize=chunksize)
+        ):
+            chunk_labels = row_labels[start : start + len(df)]
+            start += len(df)
+
+            write_header = ichunk == 0
+            for itrain, f in enumerate(files[:-1]):
+                df[(chunk_labels >= 0) & (chunk_labels <= itrain)].to_csv(
+                    f, header=write_header
+                )
+            df[chunk_labels == -1].to_csv(files[-1], header=write_header)
+    finally:
+        for f in files:
+            f.close()
 
 
 def write_multiple_train_sets_and_one_test_set(
@@ -79,6 +171,8 @@ def write_multiple_train_sets_and_one_test_set(
     ntest: int,
     processed_csvs_dir: Union[str, Path] = "processed_csvs",
     set_path=Path("sets"),
+    ncores: int = 1,
+    chunksize: int = 100_000,
 ):
     """
     .. warning::
@@ -93,12 +187,18 @@ def write_multiple_train_sets_and_one_test_set(
     an increasing number of training points, where bigger training sets contain the smaller training sets
     in them already. The test set contains points that are outside of the training sets.
 
+    The random points are chosen once for all csvs, after which every csv is read `chunksize` rows
+    at a time and all training sets and the test set are written in one pass over the csv. The rows
+    in the sets are in the same order as in the csvs.
+
     :param ntrain_initial: smallest possible training set size
     :param ntrain_increment: how much to increase the training set size by
     :param nincrements: how many times to increase the training set size
     :param ntest: number of test set points
     :param processed_csvs_dir: Location of processed csvs containing sample set, defaults to "processed_csvs"
     :param set_path: The output directory which will contain the train/test sets, defaults to Path("sets")
+    :param ncores: The number of processes used to write the sets of the csvs, defaults to 1
+    :param chunksize: The number of rows of a csv that are read at a time, defaults to 100_000
     :raises ValueError: if the training+test set size is above the sample set size
     """
 
@@ -106,85 +206,54 @@ def write_multiple_train_sets_and_one_test_set(
     set_path = Path(set_path)
     set_path.mkdir(exist_ok=True)
 
+    csv_files = _csv_files(processed_csvs_dir)
+
     # check that the highest number of training points plus the test points is not above the npoints
-    npoints = len(
-        pd.read_csv(next(processed_csvs_dir.iterdir()), header=0, index_col=0)
-    )
+    npoints = len(read_point_names(csv_files[0]))
 
     if (ntrain_initial + nincrements * ntrain_increment) + ntest > npoints:
         raise ValueError(
             "The number of points in less than the requested test+train set sizes."
         )
 
-    # get random indices for training set between 0 and npoints
-    # these will be the same for all datasets
-    test_point_indices = random.sample(range(0, npoints), ntest)
-    all_possible_training_set_indices = set(
-        [i for i in range(0, npoints) if i not in test_point_indices]
-    )
-
-    # function to make training sets of different sizes
-    def make_dataset(csv_path, atom_name, alf, point_indices, ty):
+    # get random indices for the test set and the training sets between 0 and npoints
+    # these will be the same for all datasets. The first ntest random points are the test set,
+    # the next ntrain_initial points are the first training set, and the next ntrain_increment points
+    # are added to every following training set
+    random_indices = random.sample(range(0, npoints), npoints)
 
-        if ty == "test":
-            inner_dir_path = Path(set_path / f"test_{len(point_indices)}")
-            inner_csv_path = (
-                inner_dir_path
-                / f"{atom_name}_test_data_alf_{alf[0]}_{alf[1]}_{alf[2]}.csv"
-            )
-        elif ty == "train":
-            inner_dir_path = Path(set_path / f"train_{len(point_indices)}")
-            inner_csv_path = (
-                inner_dir_path
-                / f"{atom_name}_training_data_alf_{alf[0]}_{alf[1]}_{alf[2]}.csv"
-            )
-        else:
-            raise ValueError("ty can either be 'test' or 'train'.")
-
-        full_df = pd.read_csv(csv_path, index_col=0, header=0)
-        df_to_write = full_df.iloc[point_indices]
+    # the set of every row, rows which are not in any set are labelled -2
+    row_labels = np.full(npoints, -2, dtype=int)
+    row_labels[random_indices[:ntest]] = -1
+    start = ntest
+    for incr in range(nincrements + 1):
+        size = ntrain_initial if incr == 0 else ntrain_increment
+        row_labels[random_indices[start : start + size]] = incr
+        start += size
 
+    train_dirs = [
+        set_path / f"train_{ntrain_initial + incr * ntrain_increment}"
+        for incr in range(nincrements + 1)
+    ]
+    test_dir = set_path / f"test_{ntest}"
+    for inner_dir_path in train_dirs + [test_dir]:
         inner_dir_path.mkdir(exist_ok=True)
-        df_to_write.to_csv(inner_csv_path)
 
-    # make test sets
-    for csv_file in Path(processed_csvs_dir).iterdir():
+    arguments = []
+    for csv_file in csv_files:
 
         atom_name, alf = get_atom_name_and_alf_from_csv(csv_file)
 
-        make_dataset(csv_file, atom_name, alf, test_point_indices, "test")
-
-    # get initial training set size
-    training_indices = random.sample(all_possible_training_set_indices, ntrain_initial)
-
-    # remove the initial indices from the possible training set indices
-    all_possible_training_set_indices = set(all_possible_training_set_indices) - set(
-        training_indices
-    )
-
-    # loop over number of increments
-    # first loop will not add any points
-    # add one so that last increment is included
-    for incr in range(nincrements + 1):
-
-        # get random indices to add to training set
-        random_points_indices_to_add = random.sample(
-            all_possible_training_set_indices, ntrain_increment
+        output_paths = [
+            train_dir / f"{atom_name}_training_data_alf_{alf[0]}_{alf[1]}_{alf[2]}.csv"
+            for train_dir in train_dirs
+        ]
+        output_paths.append(
+            test_dir / f"{atom_name}_test_data_alf_{alf[0]}_{alf[1]}_{alf[2]}.csv"
         )
+        arguments.append((csv_file, output_paths, row_labels, chunksize))
 
-        # don't add anything on first loop
-        if not incr == 0:
-            training_indices += random_points_indices_to_add
-            # remove the chosen random indices, so they cannot be chosen again
-            all_possible_training_set_indices = set(
-                all_possible_training_set_indices
-            ) - set(random_points_indices_to_add)
-
-        for csv_file in Path(processed_csvs_dir).iterdir():
-
-            atom_name, alf = get_atom_name_and_alf_from_csv(csv_file)
-
-            make_dataset(csv_file, atom_name, alf, training_indices, "train")
+    _map_over_csvs(_write_sets_from_labels, arguments, ncores)
 
 
 def write_random_train_test_sets(
@@ -192,6 +261,8 @@ def write_random_train_test_sets(
     ntest: int,
     processed_csvs_dir: Union[str, Path] = "processed_csvs",
     set_path=Path("sets"),
+    ncores: int = 1,
+    chunksize: int = 100_000,
 ):
     """Writes out a random training and test set
 
@@ -199,9 +270,11 @@ def write_random_train_test_sets(
     :param ntest: Number of test points
     :param processed_csvs_dir: Directory with sample set csv files, defaults to "processed_csvs"
     :param set_path: Directory where train/test csvs are going to be written, defaults to Path("sets")
+    :param ncores: The number of processes used to write the sets of the csvs, defaults to 1
+    :param chunksize: The number of rows of a csv that are read at a time, defaults to 100_000
     """
 
     # just call the same function but do not increment training set size
     write_multiple_train_sets_and_one_test_set(
-        ntrain, 0, 0, ntest, processed_csvs_dir, set_path
+        ntrain, 0, 0, ntest, processed_csvs_dir, set_path, ncores, chunksize
     )
@@ -1,14 +1,200 @@
-from typing import List
+from typing import List, Optional
 
 import numpy as np
 from ichor.core.atoms import ALF, Atoms
-from ichor.core.models.calculate_fflux_derivatives import fflux_derivs_da_df_matrix
 
 # TODO: Add method that converts back to Cartesian coordinates.
 # Note that the rows will be A_0, A_x, A_xy, non_alf atoms. So need to revert back to original rows
 # so that it can be compared to Gaussian.
 
 
+def _cross_product_matrices(vectors: np.ndarray) -> np.ndarray:
+    """Returns the matrices [u]x of shape (..., 3, 3), such that [u]x @ w = u x w"""
+
+    matrices = np.zeros(vectors.shape + (3,))
+    matrices[..., 0, 1] = -vectors[..., 2]
+    matrices[..., 0, 2] = vectors[..., 1]
+    matrices[..., 1, 0] = vectors[..., 2]
+    matrices[..., 1, 2] = -vectors[..., 0]
+    matrices[..., 2, 0] = -vectors[..., 1]
+    matrices[..., 2, 1] = vectors[..., 0]
+    return matrices
+
+
+def form_b_matrices(
+    coordinates: np.ndarray,
+    system_alf: List["ALF"],  # noqa F821
+    central_atom_idx: int,
+) -> np.ndarray:
+    r"""
+    Returns the Wilson B matrices of one central atom for many geometries at once,
+    an array of shape ``n_geometries`` x ``n_features`` x ``n_atomsx3``. These are the same B matrices
+    as the ones calculated by `form_b_matrix`, see there for the ordering of the rows and columns.
+
+    All derivatives are calculated with array operations over all geometries. The features of the
+    non-ALF atoms only depend on the coordinates of the atom itself, the ALF atoms (through the C matrix)
+    and the central atom. The features do not change when all atoms are translated, so the derivatives with
+    respect to the central atom are the negative of the sum of the derivatives with respect to the other atoms.
+
+    :param coordinates: Array of shape n_geometries x n_atoms x 3 containing the coordinates **in Bohr**
+        (because forces are calculated per Bohr in FFLUX). A single geometry of shape n_atoms x 3 is also accepted.
+    :param system_alf: The system alf as a list of `ALF` instances (0-indexed)
+    :param central_atom_idx: The index of the atom for which the features (and the B matrices) are calculated
+    :return: Array of shape n_geometries x n_features x 3n_atoms (or n_features x 3n_atoms if a single
+        geometry is given)
+    """
+
+    coordinates = np.asarray(coordinates, dtype=float)
+    single_geometry = coordinates.ndim == 2
+    if single_geometry:
+        coordinates = coordinates[np.newaxis]
+
+    ngeometries, natoms, _ = coordinates.shape
+    origin_idx, x_axis_idx, xy_plane_idx = system_alf[central_atom_idx][:3]
+
+    nfeatures = 1 if natoms == 2 else 3 * natoms - 6
+    # derivatives of the features with respect to the coordinates of every atom
+    b_matrices = np.zeros((ngeometries, nfeatures, natoms, 3))
+
+    # vectors from the central atom to every atom
+    vectors = coordinates - coordinates[:, origin_idx, np.newaxis, :]
+
+    # x-axis distance
+    a = vectors[:, x_axis_idx]
+    a_norm = np.linalg.norm(a, axis=-1, keepdims=True)
+    e1 = a / a_norm
+    b_matrices[:, 0, x_axis_idx] = e1
+
+    if natoms > 2:
+
+        # xy-plane distance
+        b = vectors[:, xy_plane_idx]
+        b_norm = np.linalg.norm(b, axis=-1, keepdims=True)
+        b_unit = b / b_norm
+        b_matrices[:, 1, xy_plane_idx] = b_unit
+
+        # valence angle between the x-axis and xy-plane atoms
+        cos_chi = np.einsum("nk,nk->n", e1, b_unit)[:, np.newaxis]
+        sin_chi = np.sqrt(1.0 - cos_chi**2)
+        b_matrices[:, 2, x_axis_idx] = (cos_chi * e1 - b_unit) / (a_norm * sin_chi)
+        b_matrices[:, 2, xy_plane_idx] = (cos_chi * b_unit - e1) / (b_norm * sin_chi)
+
+    if natoms > 3:
+
+        identity = np.eye(3)
+        a_dot_a = a_norm[:, 0] ** 2
+        a_dot_b = np.einsum("nk,nk->n", a, b)
+
+        # the C matrix rows e1, e2, e3 (see `calculate_c_matrix`) and their Jacobians
+        # with respect to the x-axis vector a and the xy-plane vector b, shapes n_geometries x 3 x 3
+        de1_da = (identity - np.einsum("ni,nj->nij", e1, e1)) / a_norm[..., np.newaxis]
+
+        sigma = -a_dot_b / a_dot_a
+        y = sigma[:, np.newaxis] * a + b
+        y_norm = np.linalg.norm(y, axis=-1, keepdims=True)
+        e2 = y / y_norm
+        de2_dy = (identity - np.einsum("ni,nj->nij", e2, e2)) / y_norm[..., np.newaxis]
+        dsigma_da = (
+            -b / a_dot_a[:, np.newaxis]
+            + 2.0 * (a_dot_b / a_dot_a**2)[:, np.newaxis] * a
+        )
+        dy_da = sigma[:, np.newaxis, np.newaxis] * identity + np.einsum(
+            "ni,nj->nij", a, dsigma_da
+        )
+        dy_db = (
+            identity
+            - np.einsum("ni,nj->nij", a, a) / a_dot_a[:, np.newaxis, np.newaxis]
+        )
+        de2_da = de2_dy @ dy_da
+        de2_db = de2_dy @ dy_db
+
+        e3 = np.cross(e1, e2)
+        e1_cross = _cross_product_matrices(e1)
+        e2_cross = _cross_product_matrices(e2)
+        de3_da = -e2_cross @ de1_da + e1_cross @ de2_da
+        de3_db = e1_cross @ de2_db
+
+        # the C matrix and its derivatives, shapes n_geometries x 3 (rows) x 3 and n_geometries x 3 x 3 x 3
+        c_matrices = np.stack([e1, e2, e3], axis=1)
+        dc_da = np.stack([de1_da, de2_da, de3_da], axis=1)
+        dc_db = np.stack([np.zeros_like(de1_da), de2_db, de3_db], axis=1)
+
+        # the rest of the atoms (in the order in which they are in the geometry)
+        rest = [
+            i for i in range(natoms) if i not in (origin_idx, x_axis_idx, xy_plane_idx)
+        ]
+        # shapes n_geometries x n_rest x 3
+        r_vect = vectors[:, rest]
+        r_norm = np.linalg.norm(r_vect, axis=-1, keepdims=True)
+        zeta = np.einsum("nij,naj->nai", c_matrices, r_vect)
+
+        # derivatives of zeta with respect to the atom itself, a and b
+        # shapes n_geometries x n_rest x 3 (zeta component) x 3 (coordinate)
+        dzeta_dr = np.broadcast_to(c_matrices[:, np.newaxis], r_vect.shape + (3,))
+        dzeta_da = np.einsum("nijk,naj->naik", dc_da, r_vect)
+        dzeta_db = np.einsum("nijk,naj->naik", dc_db, r_vect)
+
+        # distance
+        dr_dr = r_vect / r_norm
+
+        # polar angle theta = arccos(zeta3 / r)
+        u = zeta[..., 2:3] / r_norm
+        dtheta_factor = -1.0 / (r_norm * np.sqrt(1.0 - u**2))
+        dtheta_dr = dtheta_factor * (dzeta_dr[..., 2, :] - u * dr_dr)
+        dtheta_da = dtheta_factor * dzeta_da[..., 2, :]
+        dtheta_db = dtheta_factor * dzeta_db[..., 2, :]
+
+        # azimuthal angle phi = arctan2(zeta2, zeta1)
+        zeta1 = zeta[..., 0:1]
+        zeta2 = zeta[..., 1:2]
+        dphi_factor = 1.0 / (zeta1**2 + zeta2**2)
+
+        def dphi(dzeta):
+            return dphi_factor * (zeta1 * dzeta[..., 1, :] - zeta2 * dzeta[..., 0, :])
+
+        rest_rows = 3 + 3 * np.arange(len(rest))
+        b_matrices[:, rest_rows, rest] = dr_dr
+        b_matrices[:, rest_rows + 1, rest] = dtheta_dr
+        b_matrices[:, rest_rows + 1, x_axis_idx] = dtheta_da
+        b_matrices[:, rest_rows + 1, xy_plane_idx] = dtheta_db
+        b_matrices[:, rest_rows + 2, rest] = dphi(dzeta_dr)
+        b_matrices[:, rest_rows + 2, x_axis_idx] = dphi(dzeta_da)
+        b_matrices[:, rest_rows + 2, xy_plane_idx] = dphi(dzeta_db)
+
+    # translational invariance of the features
+    b_matrices[:, :, origin_idx] = -b_matrices.sum(axis=2)
+
+    b_matrices = b_matrices.reshape(ngeometries, nfeatures, 3 * natoms)
+
+    if single_geometry:
+        return b_matrices[0]
+
+    return b_matrices
+
+
+def form_all_b_matrices(
+    coordinates: np.ndarray,
+    system_alf: List["ALF"],  # noqa F821
+) -> np.ndarray:
+    """Returns the Wilson B matrices of every atom (as the central atom) for many geometries at once,
+    see `form_b_matrices`.
+
+    :param coordinates: Array of shape n_geometries x n_atoms x 3 containing the coordinates **in Bohr**
+    :param system_alf: The system alf as a list of `ALF` instances (0-indexed)
+    :return: Array of shape n_atoms x n_geometries x n_features x 3n_atoms, where the first index
+        is the index of the central atom
+    """
+
+    coordinates = np.asarray(coordinates, dtype=float)
+
+    return np.stack(
+        [
+            form_b_matrices(coordinates, system_alf, central_atom_idx)
+            for central_atom_idx in range(coordinates.shape[-2])
+        ]
+    )
+
+
 def form_b_matrix(
     atoms: Atoms, system_alf: List["ALF"], central_atom_idx  # noqa F821
 ) -> np.ndarray:
@@ -78,63 +264,8 @@ def form_b_matrix(
 
     # make sure the coords are in Bohr because forces are calculated per Bohr
     atoms = atoms.to_bohr()
-    natoms = len(atoms)
-
-    # loop over all atoms in the system and calculate n_features x 3 submatrix
-    # matrix contains derivatives of Global cartesian coordinates for one atom wrt all features.
-
-    if natoms == 2:
-        b_matrix = np.zeros((1, 6))
-        for j in range(2):
-            da_df = fflux_derivs_da_df_matrix(
-                central_atom_idx, system_alf[central_atom_idx][j], atoms, system_alf
-            )
-            # fill in the three columns corresponding to df_i / dx_j for the specific atom
-            # this way ensures that the original ordering of the atoms is preserved in the B matrix
-            b_matrix[
-                :,
-                [
-                    3 * system_alf[central_atom_idx][j],
-                    3 * system_alf[central_atom_idx][j] + 1,
-                    3 * system_alf[central_atom_idx][j] + 2,
-                ],
-            ] = da_df
-
-    elif natoms > 2:
-        # first three atoms that are central, x-axis, xy-plane
-        nfeatures = 3 * natoms - 6
-        b_matrix = np.zeros((nfeatures, 3 * natoms))
-        for j in range(3):
-            da_df = fflux_derivs_da_df_matrix(
-                central_atom_idx, system_alf[central_atom_idx][j], atoms, system_alf
-            )
-            # fill in the three columns corresponding to df_i / dx_j for the specific atom
-            # this way ensures that the original ordering of the atoms is preserved in the B matrix
-            b_matrix[
-                :,
-                [
-                    3 * system_alf[central_atom_idx][j],
-                    3 * system_alf[central_atom_idx][j] + 1,
-                    3 * system_alf[central_atom_idx][j] + 2,
-                ],
-            ] = da_df
-
-        non_local_atoms = [
-            t for t in range(natoms) if t not in system_alf[central_atom_idx]
-        ]
-
-        for non_local_atm in non_local_atoms:
-            da_df = fflux_derivs_da_df_matrix(
-                central_atom_idx, non_local_atm, atoms, system_alf
-            )
-            # fill in the three columns corresponding to df_i / dx_j for the specific atom
-            # this way ensures that the original ordering of the atoms is preserved in the B matrix
-            b_matrix[
-                :, [3 * non_local_atm, 3 * non_local_atm + 1, 3 * non_local_atm + 2]
-            ] = da_df
 
-    # return B matrix
-    return b_matrix
+    return form_b_matrices(atoms.coordinates, system_alf, central_atom_idx)
 
 
 def b_matrix_true_finite_differences(atoms, system_alf, central_atom_idx=0, h=1e-6):
@@ -246,14 +377,11 @@ def convert_to_feature_forces(global_cartesian_forces: np.ndarray, b_matrix):
     https://doi.org/10.1063/1.462844
     """
 
-    g_matrix = form_g_matrix(b_matrix)
-    # can use np.linalg.pinv here as well
-    g_inv = form_g_inverse(g_matrix)
-
     # note that if the forces are passed in, will get the
     # feature forces, which are the -ve of the gradient
     # the gradient is what is used for models
-    feature_forces = g_inv @ b_matrix @ global_cartesian_forces.flatten()
+    # the inverse of G is not formed, see `feature_forces_from_b_matrices`
+    feature_forces = feature_forces_from_b_matrices(global_cartesian_forces, b_matrix)
 
     return feature_forces
 
@@ -281,3 +409,75 @@ def convert_to_cartesian_forces(
     dE_dCart = np.matmul(b_matrix.T, dE_df_array).reshape(-1, 3)
 
     return dE_dCart
+
+
+def feature_forces_from_b_matrices(
+    global_cartesian_forces: np.ndarray,
+    b_matrices: np.ndarray,
+    method: str = "lstsq",
+    rcond: Optional[float] = None,
+) -> np.ndarray:
+    """Converts the global Cartesian forces of many geometries to feature forces (-dE/df) at once,
+    see `convert_to_feature_forces`. The feature forces x are the solution of G x = B F, where G = B B^T,
+    which is solved without forming the inverse of G.
+
+    :param global_cartesian_forces: Array of shape (..., n_atoms, 3) (or (..., 3n_atoms)) containing
+        the global Cartesian forces, e.g. n_geometries x n_atoms x 3
+    :param b_matrices: Array of Wilson B matrices of shape (..., n_features, 3n_atoms), see `form_b_matrices`
+    :param method: "lstsq" solves the least-squares problem B^T x = F (to which G x = B F are the
+        normal equations) with the singular value decompositions of the B matrices, which is
+        the most stable. "cholesky" solves G x = B F with the Cholesky decompositions of G,
+        which is faster but requires G to be positive definite. Defaults to "lstsq".
+    :param rcond: Only for "lstsq", singular values smaller than rcond times the largest singular value
+        are treated as zero (the rank cutoff). Defaults to machine precision times the largest dimension
+        of the B matrices, as in `np.linalg.lstsq`.
+    :return: Array of shape (..., n_features) containing the feature forces
+    """
+
+    b_matrices = np.asarray(b_matrices, dtype=float)
+    nfeatures, ncoordinates = b_matrices.shape[-2:]
+    forces = np.asarray(global_cartesian_forces, dtype=float).reshape(
+        *b_matrices.shape[:-2], ncoordinates
+    )
+
+    if method == "lstsq":
+        # B^T = U S V^T, so x = V S^-1 U^T F for the singular values above the cutoff
+        u, s, vt = np.linalg.svd(np.swapaxes(b_matrices, -1, -2), full_matrices=False)
+        if rcond is None:
+            rcond = np.finfo(float).eps * max(nfeatures, ncoordinates)
+        cutoff = rcond * s[..., :1]
+        s_inv = np.divide(1.0, s, out=np.zeros_like(s), where=s > cutoff)
+        projected = np.einsum("...ji,...j->...i", u, forces) * s_inv
+        return np.einsum("...ij,...i->...j", vt, projected)
+
+    elif method == "cholesky":
+        g_matrices = b_matrices @ np.swapaxes(b_matrices, -1, -2)
+        lower = np.linalg.cholesky(g_matrices)
+        rhs = np.einsum("...ij,...j->...i", b_matrices, forces)[..., np.newaxis]
+        # G = L L^T, so x = L^-T L^-1 B F, the triangular systems of all geometries are solved at once
+        return np.linalg.solve(np.swapaxes(lower, -1, -2), np.linalg.solve(lower, rhs))[
+            ..., 0
+        ]
+
+    raise ValueError(
+        f"The method {method} is not supported, use one of 'lstsq' or 'cholesky'."
+    )
+
+
+def cartesian_forces_from_b_matrices(
+    dE_df_array: np.ndarray, b_matrices: np.ndarray
+) -> np.ndarray:
+    """Converts the 'feature' forces of many geometries back to global Cartesian forces,
+    see `convert_to_cartesian_forces`.
+
+    :param dE_df_array: Array of shape (..., n_features) containing the 'feature' forces
+    :param b_matrices: Array of Wilson B matrices of shape (..., n_features, 3n_atoms)
+    :return: Array of shape (..., n_atoms, 3) containing the Cartesian forces
+    """
+
+    b_matrices = np.asarray(b_matrices, dtype=float)
+    dE_df_array = np.asarray(dE_df_array, dtype=float).reshape(b_matrices.shape[:-1])
+
+    return np.einsum("...ij,...i->...j", b_matrices, dE_df_array).reshape(
+        *b_matrices.shape[:-2], -1, 3
+    )
@@ -25,14 +25,13 @@ class Distance:
                 The squared distance matrix of shape (`x1.shape[0]`, `x2.shape[0]`)
         """
 
-        result = (
-            -2 * np.dot(x1, x2.T)
-            + np.sum(x2**2, axis=1)
-            + np.sum(x1**2, axis=1)[:, np.newaxis]
-        )
-        result = result.clip(
-            0
-        )  # small negative values may occur when using quadratic expansion, so clip to 0 if that happens
+        # the operations are done in place to avoid making temporary arrays of the size of the result
+        result = np.dot(x1, x2.T)
+        result *= -2.0
+        result += np.sum(x2**2, axis=1)
+        result += np.sum(x1**2, axis=1)[:, np.newaxis]
+        # small negative values may occur when using quadratic expansion, so clip to 0 if that happens
+        np.maximum(result, 0.0, out=result)
 
         return result
 
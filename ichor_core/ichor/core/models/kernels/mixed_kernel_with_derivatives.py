@@ -1,8 +1,12 @@
 import math
+from typing import Optional, Tuple
 
 import numpy as np
 from ichor.core.models.kernels.kernel import Kernel
 
+# the maximum number of elements of the chunk_size x n2 x ndimensions arrays used in matvec
+_max_chunk_elements = 2**24
+
 
 class MixedKernelWithDerivatives(Kernel):
     r"""
@@ -89,11 +93,79 @@ class MixedKernelWithDerivatives(Kernel):
     def lengthscales(self):
         return self.lengthscale
 
+    def _kernel_terms(
+        self, x1: np.ndarray, x2: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Calculates the terms from which all blocks of the covariance matrix are made.
+        All of them only depend on the differences between the points, so the n1 x n2 x d
+        differences are only calculated once.
+
+        The blocks of the covariance matrix are (for points i and j and dimensions a and b)
+
+        - cov(y_i, y_j) = k_ij
+        - cov(y_i, w_jb) = g_ijb * k_ij
+        - cov(w_ia, y_j) = -g_ija * k_ij
+        - cov(w_ia, w_jb) = (delta_ab * h_ija - g_ija * g_ijb) * k_ij
+
+        :param x1: np.ndarray of shape (..., n1, ndimensions)
+        :param x2: np.ndarray of shape (..., n2, ndimensions)
+        :return: A tuple of the kernel values k of shape (..., n1, n2), and the
+            g and h terms, both of shape (..., n1, n2, ndimensions)
+        """
+
+        lengthscale = self.lengthscale[0]
+        period_length = self.period_length[0]
+
+        # shape of n1 x n2 x d
+        diffs = x1[..., :, np.newaxis, :] - x2[..., np.newaxis, :, :]
+        d = diffs.shape[-1]
+
+        rbf_dims = np.zeros(d, dtype=bool)
+        rbf_dims[self.rbf_dimensions] = True
+        periodic_dims = np.zeros(d, dtype=bool)
+        periodic_dims[self.periodic_dimensions] = True
+
+        # rbf part of the exponent
+        rbf_diffs = diffs[..., rbf_dims]
+        exponent = (rbf_diffs**2 / lengthscale[rbf_dims]).sum(-1) * (-0.5)
+
+        # periodic part of the exponent
+        periodic_diffs = diffs[..., periodic_dims]
+        periodic_length = period_length[periodic_dims]
+        periodic_lengthscale = lengthscale[periodic_dims]
+        exponent += (
+            np.sin(periodic_diffs * (math.pi / periodic_length)) ** 2
+            / periodic_lengthscale
+        ).sum(-1) * (-2.0)
+
+        k = np.exp(exponent)
+
+        # first derivative terms
+        g = np.empty_like(diffs)
+        g[..., rbf_dims] = rbf_diffs / lengthscale[rbf_dims]
+        periodic_angle = periodic_diffs * ((2.0 * math.pi) / periodic_length)
+        g[..., periodic_dims] = np.sin(periodic_angle) * (
+            2.0 * math.pi / (periodic_lengthscale * periodic_length)
+        )
+
+        # diagonal second derivative terms
+        h = np.empty_like(diffs)
+        h[..., rbf_dims] = 1.0 / lengthscale[rbf_dims]
+        h[..., periodic_dims] = np.cos(periodic_angle) * (
+            (4.0 * math.pi**2) / (periodic_length**2 * periodic_lengthscale)
+        )
+
+        return k, g, h
+
     def k(self, x1: np.ndarray, x2: np.ndarray) -> np.ndarray:
         """
         Calculates mixed covariance matrix(RBF and periodic)
          with derivatives from two sets of points
 
+        The value, gradient and Hessian blocks are written directly into the
+        interleaved ordering of the weights (see below), so no masks or permutations
+        of the full matrix are needed.
+
         Args:
             :param: `x1` np.ndarray of shape m x ndimensions:
                 First matrix of n points
@@ -104,205 +176,83 @@ class MixedKernelWithDerivatives(Kernel):
             :type: `np.ndarray`
                 The covariance matrix of shape (m*(ndim+1), n*(ndim+1))
         """
-        # Get lengthscale
-        lengthscale = self.lengthscale
 
         batch_shape = x1.shape[:-2]
         n1, d = x1.shape[-2:]
         n2 = x2.shape[-2]
 
-        # this is the full matrix
-        K = np.zeros((*batch_shape, n1 * (d + 1), n2 * (d + 1)), dtype=x1.dtype)
-
-        # shape of n1 x n2 x d
-        diffs = x1.reshape(*batch_shape, n1, 1, d) - x2.reshape(*batch_shape, 1, n2, d)
-
-        # rbf part of matrix
-        # shape is n1 x n2 x nrbfdims
-        rbf_part = diffs[..., self.rbf_dimensions] ** 2
-        rbf_part = rbf_part / np.expand_dims(lengthscale[..., self.rbf_dimensions], -2)
-        # sum over nrbfdims
-        rbf_part = rbf_part.sum(-1) * (-0.5)
-
-        # # shape is n1 x n2 x nperiodic
-        periodic_part = diffs[..., self.periodic_dimensions] * (
-            np.expand_dims(
-                math.pi / self.period_length[..., self.periodic_dimensions], -2
-            )
-        )
-        periodic_part = np.sin(periodic_part) ** (2.0)
-        periodic_part = np.divide(
-            periodic_part,
-            np.expand_dims(lengthscale[..., self.periodic_dimensions], -2),
-        ).sum(-1) * (-2.0)
-
-        # # 1) Kernel block
-        # # directly use the already implemented RBF and PeriodicKernel methods
-        K[..., :n1, :n2] = np.exp(rbf_part + periodic_part)
-
-        # Form all possible rank-1 products for the gradient and Hessian blocks
-        # rbf dx_i^n first
-
-        periodic_dims_zeros_ones_tensor = np.array(
-            [[1 if i in self.periodic_dimensions else 0 for i in range(d)]],
-            dtype=x1.dtype,
-        )
-        rbf_dims_zeros_ones_tensor = np.array(
-            [[1 if i in self.rbf_dimensions else 0 for i in range(d)]], dtype=x1.dtype
-        )
-        # possibly transform this kron back into a n1 x n2 x d matrix
-        periodic_mask_dx_i_n = np.kron(
-            periodic_dims_zeros_ones_tensor,
-            np.ones((*batch_shape, n1, n2), dtype=x1.dtype),
-        )
-        rbf_mask_dx_i_n = np.kron(
-            rbf_dims_zeros_ones_tensor, np.ones((*batch_shape, n1, n2), dtype=x1.dtype)
-        )
-
-        # outer1 here is the rbf part, but name as the final variable, and use inplace operations to save memory
-        # divide each dimension by the lengthscale
-        outer1 = diffs / np.expand_dims(self.lengthscale, -2)
-        # get n1 x n2 x d tensor
-        outer1 = np.swapaxes(outer1, -1, -2)
+        k, g, h = self._kernel_terms(x1, x2)
 
-        # get n1 x n2 * d tensor
-        outer1 = outer1.reshape(*batch_shape, n1, n2 * d)
-        # multiply by mask so that periodic dimensions are 0
-        outer1 *= rbf_mask_dx_i_n
-
-        outer_topright_periodic = diffs * (
-            ((2 * math.pi) / np.expand_dims(self.period_length, -2))
-        )
-        outer_topright_periodic = np.sin(outer_topright_periodic) * (
-            2
-            * math.pi
-            / (
-                np.expand_dims(self.lengthscale, -2)
-                * np.expand_dims(self.period_length, -2)
-            )
-        )
-        outer_topright_periodic = np.swapaxes(outer_topright_periodic, -1, -2)
-        outer_topright_periodic = outer_topright_periodic.reshape(
-            *batch_shape, n1, n2 * d
-        )
-        outer_topright_periodic = outer_topright_periodic * periodic_mask_dx_i_n
-
-        outer1 += outer_topright_periodic
-
-        K[..., :n1, n2:] = outer1 * np.tile(K[..., :n1, :n2], d)
-
-        # todo: implemt this as n1 x n2 x d directly and to work on the distance matrix, that will save some space
-        periodic_mask_dx_j_m = np.kron(
-            periodic_dims_zeros_ones_tensor,
-            np.ones((*batch_shape, n2, n1), dtype=x1.dtype),
-        ).swapaxes(-2, -1)
-        rbf_mask_dx_j_m = np.kron(
-            rbf_dims_zeros_ones_tensor, np.ones((*batch_shape, n2, n1), dtype=x1.dtype)
-        ).swapaxes(-2, -1)
-
-        # save some memory by naming outer_bottomleft_rbf as outer2
-        # and use inplace operations
-        outer2 = diffs / np.expand_dims(self.lengthscale, -2)  # n1 x n2 x d
-        outer2 = np.swapaxes(outer2, -1, -2)  # n1 x d x n2
-        outer2 = outer2.swapaxes(-3, -1)  # n2 x d x n1
-        outer2 = outer2.reshape(*batch_shape, n2, n1 * d)  # n2 x n1 * d
-        outer2 = outer2.swapaxes(-1, -2)  # n1 * d x n2
-        outer2 *= rbf_mask_dx_j_m  # n1 * d x n2
-
-        outer_bottomleft_periodic = diffs * (
-            ((2 * math.pi) / np.expand_dims(self.period_length, -2))
-        )  # n1 x n2 x d
-        outer_bottomleft_periodic = np.sin(outer_bottomleft_periodic) * (
-            2
-            * math.pi
-            / (
-                np.expand_dims(self.lengthscale, -2)
-                * np.expand_dims(self.period_length, -2)
-            )
-        )
-        outer_bottomleft_periodic = np.swapaxes(
-            outer_bottomleft_periodic, -1, -2
-        )  # n1 x d x n2
-        outer_bottomleft_periodic = outer_bottomleft_periodic.swapaxes(
-            -3, -1
-        )  # n2 x d x n1
-        outer_bottomleft_periodic = outer_bottomleft_periodic.reshape(
-            *batch_shape, n2, n1 * d
-        )
-        outer_bottomleft_periodic = outer_bottomleft_periodic.swapaxes(-2, -1)
-        outer_bottomleft_periodic = outer_bottomleft_periodic * periodic_mask_dx_j_m
-
-        outer2 += outer_bottomleft_periodic
-
-        K[..., n1:, :n2] = -outer2 * np.tile(K[..., :n1, :n2], (d, 1))
-
-        # make mask arrays for dxjm_dxin part of matrix.
-        rbf_mask_dxjm_dxin = np.tile(rbf_mask_dx_i_n, (d, 1)) * np.tile(
-            rbf_mask_dx_j_m, d
-        )
-        periodic_mask_dxjm_dxin = np.tile(periodic_mask_dx_i_n, (d, 1)) * np.tile(
-            periodic_mask_dx_j_m, d
-        )
-
-        # make mask for elements where both rbf and periodic derivatives are needed
-        mask_i_P_j_R = (
-            np.tile(rbf_mask_dx_i_n, (d, 1)) * np.tile(periodic_mask_dx_j_m, (1, d))
-        ) + (np.tile(periodic_mask_dx_i_n, (d, 1)) * np.tile(rbf_mask_dx_j_m, (1, d)))
-
-        outer3 = np.tile(outer1, (d, 1)) * np.tile(-outer2, (1, d))
+        # the ordering is cov(y1, y1) cov(y1, w11) cov(y1, w12) cov(y1, w13) ... cov(y1, wij)
+        # where i is the training index and j is the deriv dimension for each row
+        # this matches the ordering of the weights
+        K = np.empty((*batch_shape, n1, d + 1, n2, d + 1), dtype=x1.dtype)
+
+        # 1) Kernel block
+        K[..., 0, :, 0] = k
+        # 2) and 3) gradient blocks
+        gk = g * k[..., np.newaxis]
+        K[..., 0, :, 1:] = gk
+        K[..., 1:, :, 0] = -np.moveaxis(gk, -1, -2)
+        # 4) Hessian block
+        np.einsum("...ija,...ijb->...iajb", -gk, g, out=K[..., 1:, :, 1:])
+        h *= k[..., np.newaxis]
+        for a in range(d):
+            K[..., 1 + a, :, 1 + a] += h[..., a]
+
+        K = K.reshape(*batch_shape, n1 * (d + 1), n2 * (d + 1))
 
-        # # 4) Hessian block kronecker for rbf part
-        kp_rbf = np.kron(
-            np.eye(d, dtype=x1.dtype) / self.lengthscale,
-            np.ones((n1, n2), dtype=x1.dtype),
-        )
+        # Symmetrize for stability
+        if n1 == n2 and np.equal(x1, x2).all():
+            K = 0.5 * (K.swapaxes(-1, -2) + K)
 
-        # # 4) Hessian block for periodic part
-        kp_periodic = np.kron(
-            np.eye(d, dtype=x1.dtype) / self.period_length,
-            np.ones((n1, n2), dtype=x1.dtype),
-        )
+        return K
 
-        periodic_kp_outer3 = diffs * (
-            (2.0 * math.pi) / np.expand_dims(self.period_length, -2)
-        )
-        periodic_kp_outer3 = (
-            (4.0 * math.pi**2)
-            / (
-                np.expand_dims(self.period_length, -2)
-                * np.expand_dims(self.lengthscale, -2)
-            )
-        ) * np.cos(periodic_kp_outer3)
-        periodic_kp_outer3 = np.swapaxes(periodic_kp_outer3, -1, -2)
-        periodic_kp_outer3 = kp_periodic * np.tile(
-            periodic_kp_outer3.reshape(*batch_shape, n1, n2 * d), (d, 1)
-        )
+    def matvec(
+        self,
+        x1: np.ndarray,
+        x2: np.ndarray,
+        v: np.ndarray,
+        chunk_size: Optional[int] = None,
+    ) -> np.ndarray:
+        """Calculates the product of the covariance matrix with a vector, k(x1, x2) @ v,
+        without forming the covariance matrix. The points in x1 are processed in chunks,
+        so only arrays of shape chunk_size x n2 x ndimensions are in memory at once.
+
+        This is used to make predictions, where k(x_test, x_train) @ weights is needed.
+
+        :param x1: np.ndarray of shape n1 x ndimensions
+        :param x2: np.ndarray of shape n2 x ndimensions
+        :param v: np.ndarray of shape n2*(ndim+1) or n2*(ndim+1) x ncolumns,
+            in the same ordering as the columns of the covariance matrix (and the weights)
+        :param chunk_size: The number of points in x1 to process at once. By default it is
+            chosen so that each of the intermediate arrays is at most ~128MB.
+        :return: np.ndarray of shape n1*(ndim+1) or n1*(ndim+1) x ncolumns
+        """
 
-        # from matplotlib import pyplot as plt
-        # plt.matshow(mask_i_P_j_R.detach().numpy())
-        # plt.show()
+        n1, d = x1.shape
+        n2 = x2.shape[0]
 
-        mixed_part3 = outer3 * mask_i_P_j_R
-        mixed_part3 += (kp_rbf + outer3) * rbf_mask_dxjm_dxin
-        mixed_part3 += (periodic_kp_outer3 + outer3) * periodic_mask_dxjm_dxin
+        v_2d = v.reshape(n2, d + 1, -1)
+        v_values = v_2d[:, 0]
+        v_derivatives = v_2d[:, 1:]
 
-        K[..., n1:, n2:] = mixed_part3 * np.tile(K[..., :n1, :n2], (d, d))
+        if chunk_size is None:
+            chunk_size = max(1, _max_chunk_elements // (n2 * d))
 
-        # Symmetrize for stability
-        if n1 == n2 and np.equal(x1, x2).all():
-            K = 0.5 * (K.swapaxes(-1, -2) + K)
+        result = np.empty((n1, d + 1, v_2d.shape[-1]), dtype=x1.dtype)
 
-        # Apply a perfect shuffle permutation to match the weights ordering
-        # this orderes as cov(y1, y1) cov(y1, w11) cov(y1, w12) cov(y1, w13) ... cov(y1, wij)
-        # where i is the training index and j is the deriv dimension for each row
-        # without this permutation the ordering is
-        # cov(y1, y1) cov(y1, y2) ... cov(y1, yn) cov(y1, w11) cov(y1, w21) ... cov(y1, wn1) ...
-        # cov(y1, w12) cov(y1, w22) cov(y1, w32) ... .... cov(y1, wND) where N is ntrain and D is dim
-        pi1 = np.arange(n1 * (d + 1)).reshape(d + 1, n1).T.reshape((n1 * (d + 1)))
-        pi2 = np.arange(n2 * (d + 1)).reshape(d + 1, n2).T.reshape((n2 * (d + 1)))
-        K = K[..., pi1, :][..., :, pi2]
+        for start in range(0, n1, chunk_size):
+            stop = min(start + chunk_size, n1)
+            k, g, h = self._kernel_terms(x1[start:stop], x2)
+            # values and gradient weights projected onto the first derivatives
+            s = v_values[np.newaxis] + np.einsum("ija,jac->ijc", g, v_derivatives)
+            result[start:stop, 0] = np.einsum("ij,ijc->ic", k, s)
+            result[start:stop, 1:] = np.einsum(
+                "ij,ija,jac->iac", k, h, v_derivatives
+            ) - np.einsum("ij,ija,ijc->iac", k, g, s)
 
-        return K
+        return result.reshape(n1 * (d + 1), *v.shape[1:])
 
     def write_str(self) -> str:
 
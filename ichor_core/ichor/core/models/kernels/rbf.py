@@ -56,7 +56,8 @@ class RBF(Kernel):
         tmp_x2 = x2[:, self.active_dims] / true_lengthscales
 
         dist = Distance.squared_euclidean_distance(tmp_x1, tmp_x2)
-        return np.exp(-0.5 * dist)
+        dist *= -0.5
+        return np.exp(dist, out=dist)
 
     def write_str(self) -> str:
 
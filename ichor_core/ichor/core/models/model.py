@@ -7,6 +7,7 @@ from ichor.core.common.io import mkdir
 from ichor.core.common.str import get_digits
 from ichor.core.common.types import Version
 from ichor.core.files.file import FileContents, ReadFile, WriteFile
+from ichor.core.models.cholesky_cache import _max_chunk_elements, CholeskyCache
 from ichor.core.models.kernels import (
     ConstantKernel,
     Kernel,
@@ -40,12 +41,15 @@ def _get_default_output_unit(property: str) -> str:
         return "unknown"
 
 
-class Model(ReadFile, WriteFile):
+class Model(CholeskyCache, ReadFile, WriteFile):
     """A model file that is returned back from our machine learning program FEREBUS.
 
     .. note::
         Another program can be used for the machine learning as
         long as it outputs files of the same format as the FEREBUS outputs.
+
+    The covariance matrix of the training points and its Cholesky decomposition are
+    only calculated once, see `CholeskyCache`.
     """
 
     _filetype = ".model"
@@ -340,32 +344,20 @@ class Model(ReadFile, WriteFile):
 
         return self.kernel.r(self.x, x_test)
 
-    @property
-    def R(self) -> np.ndarray:
+    def _kernel_fingerprint(self) -> bytes:
+        # the kernels can be composite, so the written out kernels contain all hyperparameters
+        return f"{self.kernel.write_str()}jitter {self.jitter}".encode()
+
+    def _training_covariance(self) -> np.ndarray:
         """Returns the covariance matrix and adds a jitter
         to the diagonal for numerical stability. This jitter is a very
         small number on the order of 1e-6 to 1e-10."""
         return self.kernel.R(self.x) + (self.jitter * np.identity(self.ntrain))
 
-    @property
-    def invR(self) -> np.ndarray:
-        """Returns the inverse of the covariance matrix R"""
-        return np.linalg.inv(self.R)
-
-    @property
-    def lower_cholesky(self) -> np.ndarray:
-        """Decomposes the covariance matrix into L and L^T. Returns the lower triangular matrix L."""
-        return np.linalg.cholesky(self.R)
-
     @property
     def _y_minus_mean(self):
         return self.y - self.mean.value(self.x).reshape((-1, 1))
 
-    @property
-    def logdet(self):
-        sign, logdet = np.linalg.slogdet(self.R)
-        return sign * logdet
-
     def compute_weights(self) -> np.ndarray:
         """Computes the training weights from the data given"""
         return np.linalg.solve(self.lower_cholesky, self._y_minus_mean)
@@ -378,26 +370,32 @@ class Model(ReadFile, WriteFile):
             - 0.5 * self.ntrain * np.log(2 * np.pi)
         )
 
-    def predict(self, x_test: np.ndarray) -> np.ndarray:
-        """Returns an array containing the test point predictions."""
+    def predict(
+        self, x_test: np.ndarray, chunk_size: Optional[int] = None
+    ) -> np.ndarray:
+        """Returns an array containing the test point predictions.
+
+        :param x_test: an array containing the test set point features, of shape npoints x nfeatures or nfeatures
+        :param chunk_size: The number of test points for which the covariance is calculated at once,
+            by default it is chosen to keep the memory use of each chunk bounded
+        """
 
         # make into a 2d array in case a 1d is passed in
         if x_test.ndim == 1:
             x_test = x_test[np.newaxis, ...]
 
-        return (
-            self.mean.value(x_test) + np.dot(self.r(x_test).T, self.weights)[:, -1]
-        ).flatten()
+        if chunk_size is None:
+            chunk_size = max(1, _max_chunk_elements // self.ntrain)
 
-    def variance(self, x_test: np.ndarray) -> np.ndarray:
-        """Return the variance for the test data points."""
-        train_test_covar = self.r(x_test)
-        # temporary matrix, see Rasmussen Williams page 19 algo. 2.1
-        v = np.linalg.solve(self.lower_cholesky, train_test_covar)
+        weights = self.weights[:, -1]
 
-        # TODO: need to multiply by tau^2 in order to get "true" variance which can be used for error estimations.
-        # here it can only be used to compare points to figure out which point has the largest variance.
-        return 1.0 - np.diag(np.matmul(v.T, v)).flatten()
+        return np.concatenate(
+            [
+                self.mean.value(x_test[start : start + chunk_size])
+                + np.dot(self.r(x_test[start : start + chunk_size]).T, weights)
+                for start in range(0, len(x_test), chunk_size)
+            ]
+        ).flatten()
 
     def _write_file(self, path: Path) -> None:
         if not path.parent.exists():
@@ -5,22 +5,23 @@ import numpy as np
 from ichor.core.atoms import ALF
 from ichor.core.common.str import get_digits
 from ichor.core.files.file import FileContents, ReadFile
+from ichor.core.models.cholesky_cache import CholeskyCache
 from ichor.core.models.kernels import Kernel, MixedKernelWithDerivatives
 
 
-class ModelWithGradients(ReadFile):
+class ModelWithGradients(CholeskyCache, ReadFile):
     """Reads in a model file with derivative information
     which contains both the RBF and periodic kernels.
     """
 
     _filetype = ".model"
 
-    def __init__(
-        self,
-        path: Path,
-    ):
+    def __init__(self, path: Path, persist_cholesky: bool = False):
         super(ReadFile, self).__init__(path)
 
+        # whether to store the Cholesky decomposition of the covariance matrix next to the model file
+        self.persist_cholesky = persist_cholesky
+
         self.program = FileContents
         self.system_name: str = FileContents
         self.atom_name: str = FileContents
@@ -238,34 +239,20 @@ class ModelWithGradients(ReadFile):
 
         return self.kernel.r(self.x, x_test)
 
-    @property
-    def R(self) -> np.ndarray:
-        """Returns the covariance matrix and adds a jitter
-        to the diagonal for numerical stability. This jitter is a very
-        small number on the order of 1e-6 to 1e-10."""
-        return self.kernel.R(self.x)
-
-    @property
-    def invR(self) -> np.ndarray:
-        """Returns the inverse of the covariance matrix R"""
-        return np.linalg.inv(self.R)
-
-    @property
-    def lower_cholesky(self) -> np.ndarray:
-        """Decomposes the covariance matrix into L and L^T. Returns the lower triangular matrix L."""
-        return np.linalg.cholesky(self.R)
-
-    @property
-    def logdet(self):
-        sign, logdet = np.linalg.slogdet(self.R)
-        return sign * logdet
-
-    def predict(self, x_test: np.ndarray) -> np.ndarray:
+    def predict(
+        self, x_test: np.ndarray, chunk_size: Optional[int] = None
+    ) -> np.ndarray:
         """Returns an array containing the test point predictions.
 
+        The covariance matrix between the training and test points is not formed,
+        the kernel calculates r(x_test).T @ weights directly in chunks of test points,
+        see `MixedKernelWithDerivatives.matvec`.
+
         param x_test: an array containing the test set point features
             It should either be a 2D array with shape npoints x nfeatures
             Or a 1D array of shape nfeatures which are the features for a single point
+        param chunk_size: The number of test points for which the covariance is calculated at once,
+            by default it is chosen to keep the memory use of each chunk bounded
         """
 
         # make into a 2d array in case a 1d is passed in
@@ -277,22 +264,15 @@ class ModelWithGradients(ReadFile):
         # check that the number of features is what we have read in the model
         assert ndimensions == self.nfeats
 
+        # r(x_test).T is the covariance matrix between the test and training points
+        predictions = self.kernel.matvec(
+            x_test, self.x, self.weights, chunk_size=chunk_size
+        )
+
         # reshape the predictions from an npoints * (D+1) vector into a
         # matrix of shape npoints x (D+1)
         # then add the mean.T (which is of shape 1 x ndimensions+1)
-        return self.mean.T + (self.r(x_test).T @ self.weights).reshape(
-            npoints, ndimensions + 1
-        )
-
-    def variance(self, x_test: np.ndarray) -> np.ndarray:
-        """Return the variance for the test data points."""
-        train_test_covar = self.r(x_test)
-        # temporary matrix, see Rasmussen Williams page 19 algo. 2.1
-        v = np.linalg.solve(self.lower_cholesky, train_test_covar)
-
-        # TODO: need to multiply by tau^2 in order to get "true" variance which can be used for error estimations.
-        # here it can only be used to compare points to figure out which point has the largest variance.
-        return 1.0 - np.diag(np.matmul(v.T, v)).flatten()
+        return self.mean.T + predictions.reshape(npoints, ndimensions + 1)
 
     def __repr__(self):
         return f"{self.__class__.__name__}(system={self.system_name}, atom={self.atom_name}, type={self.prop})"
@@ -5,10 +5,11 @@ import numpy as np
 from ichor.core.atoms import ALF
 from ichor.core.common.str import get_digits
 from ichor.core.files.file import FileContents, ReadFile
+from ichor.core.models.cholesky_cache import CholeskyCache
 from ichor.core.models.kernels import Kernel, RBFKernelWithDerivatives
 
 
-class ModelWithGradientsRBF(ReadFile):
+class ModelWithGradientsRBF(CholeskyCache, ReadFile):
     """Reads in a model file with derivative information
     which only contains RBF dimensions and no periodic kernel.
     This is especially useful if modelling 1D case where there is only the RBF kernel.
@@ -16,12 +17,12 @@ class ModelWithGradientsRBF(ReadFile):
 
     _filetype = ".model"
 
-    def __init__(
-        self,
-        path: Path,
-    ):
+    def __init__(self, path: Path, persist_cholesky: bool = False):
         super(ReadFile, self).__init__(path)
 
+        # whether to store the Cholesky decomposition of the covariance matrix next to the model file
+        self.persist_cholesky = persist_cholesky
+
         self.program = FileContents
         self.system_name: str = FileContents
         self.atom_name: str = FileContents
@@ -228,28 +229,6 @@ class ModelWithGradientsRBF(ReadFile):
 
         return self.kernel.r(self.x, x_test)
 
-    @property
-    def R(self) -> np.ndarray:
-        """Returns the covariance matrix and adds a jitter
-        to the diagonal for numerical stability. This jitter is a very
-        small number on the order of 1e-6 to 1e-10."""
-        return self.kernel.R(self.x)
-
-    @property
-    def invR(self) -> np.ndarray:
-        """Returns the inverse of the covariance matrix R"""
-        return np.linalg.inv(self.R)
-
-    @property
-    def lower_cholesky(self) -> np.ndarray:
-        """Decomposes the covariance matrix into L and L^T. Returns the lower triangular matrix L."""
-        return np.linalg.cholesky(self.R)
-
-    @property
-    def logdet(self):
-        sign, logdet = np.linalg.slogdet(self.R)
-        return sign * logdet
-
     def predict(self, x_test: np.ndarray) -> np.ndarray:
         """Returns an array containing the test point predictions.
 
@@ -274,15 +253,5 @@ class ModelWithGradientsRBF(ReadFile):
             npoints, ndimensions + 1
         )
 
-    def variance(self, x_test: np.ndarray) -> np.ndarray:
-        """Return the variance for the test data points."""
-        train_test_covar = self.r(x_test)
-        # temporary matrix, see Rasmussen Williams page 19 algo. 2.1
-        v = np.linalg.solve(self.lower_cholesky, train_test_covar)
-
-        # TODO: need to multiply by tau^2 in order to get "true" variance which can be used for error estimations.
-        # here it can only be used to compare points to figure out which point has the largest variance.
-        return 1.0 - np.diag(np.matmul(v.T, v)).flatten()
-
     def __repr__(self):
         return f"{self.__class__.__name__}(system={self.system_name}, atom={self.atom_name}, type={self.prop})"
@@ -4,8 +4,8 @@ from pathlib import Path
 from typing import Dict, List, Union
 
 import numpy as np
-import pandas as pd
 from ichor.core.atoms import ALF, Atoms, ListOfAtoms
+from ichor.core.calculators import calculate_alf_features
 from ichor.core.common.sorting import ignore_alpha
 from ichor.core.common.types.itypes import F
 from ichor.core.files.directory import Directory
@@ -106,9 +106,12 @@ class Models(Directory, list):
         return self[0].system
 
     @x_to_features
-    def predict(self, x_test) -> pd.DataFrame:
+    def predict(self, x_test) -> "pandas.DataFrame":  # noqa F821
         # todo: update docs
         """Returns dictionary of DataFrame({"atom": {"property": [values]}})"""
+
+        import pandas as pd
+
         return pd.DataFrame(
             {
                 atom: {model.type: model.predict(features) for model in self[atom]}
@@ -117,7 +120,10 @@ class Models(Directory, list):
         )
 
     @x_to_features
-    def variance(self, x_test) -> pd.DataFrame:
+    def variance(self, x_test) -> "pandas.DataFrame":  # noqa F821
+
+        import pandas as pd
+
         return pd.DataFrame(
             {
                 atom: {model.type: model.variance(features) for model in self[atom]}
@@ -148,27 +154,34 @@ class Models(Directory, list):
             return test_x
         raise TypeError(f"Cannot predict values from type '{type(test_x)}'")
 
+    @property
+    def alf_dict(self) -> Dict[str, ALF]:
+        """Returns the alf taken straight from each model file as a dictionary
+        e.g. {'O1': ALF(0, 1, 2), 'H2': ALF(1, 0, 2), 'H3': ALF(2, 0, 1)}"""
+        return {model.atom: model.alf for model in self}
+
     def _features_from_atoms(self, atoms: Atoms) -> Dict[str, np.ndarray]:
         """Returns a dictionary containing atom name as key and atom features for values."""
+        alf_dict = self.alf_dict
         return {
-            atom.name: atom.alf_features(alf=self.ialf_dict[atom]) for atom in atoms
+            atom.name: atom.features(calculate_alf_features, alf_dict)
+            for atom in atoms
+            if atom.name in alf_dict
         }
 
     def _features_from_list_of_atoms(
         self, x_test: ListOfAtoms
     ) -> Dict[str, np.ndarray]:
-        return {
-            atom: x_test[atom].alf_features(alf=self.alf)
-            for atom in self.atom_names
-            if atom in x_test.atom_names
-        }
+        """Calculates the features of every atom once for all geometries (see `ListOfAtoms.features_by_atom`),
+        so that the features can be used for all properties of the atom."""
+        return x_test.features_by_atom(
+            calculate_alf_features,
+            self.alf_dict,
+            atom_names=[atom for atom in self.atom_names if atom in x_test.atom_names],
+        )
 
     def _features_from_geometry_file(self, x_test: HasAtoms) -> Dict[str, np.ndarray]:
-        return {
-            atom: x_test.atoms[atom].alf_features(alf=self.alf)
-            for atom in self.atom_names
-            if atom in x_test.atom_names
-        }
+        return self._features_from_atoms(x_test.atoms)
 
     def _features_from_array(self, x_test: np.ndarray):
         if x_test.ndim == 2:
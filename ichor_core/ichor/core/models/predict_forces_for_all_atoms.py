@@ -1,11 +1,112 @@
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple, Union
 
 import numpy as np
-from ichor.core.atoms import ALF, Atoms
+from ichor.core.atoms import ALF, Atoms, ListOfAtoms
+from ichor.core.calculators.features import calculate_alf_features_from_coordinates
+from ichor.core.common.units import AtomicDistance
 from ichor.core.models.calculate_fflux_derivatives import (
-    fflux_derivs,
     fflux_derivs_rbf_only_one_dimensional,
+    fflux_predict_values_and_gradients,
 )
+from ichor.core.models.gaussian_energy_derivative_wrt_features import form_b_matrices
+
+
+def _iqa_models_in_atom_order(
+    models: "ichor.core.models.Models", atom_names: List[str]  # noqa F821
+) -> list:
+    """Returns the iqa models in the same order as the atoms"""
+
+    iqa_models = {model.atom_name: model for model in models if model.prop == "iqa"}
+
+    missing = [atom_name for atom_name in atom_names if atom_name not in iqa_models]
+    if missing:
+        raise ValueError(f"There are no iqa models for atoms {missing}.")
+
+    return [iqa_models[atom_name] for atom_name in atom_names]
+
+
+def predict_fflux_energies_and_forces(
+    coordinates: np.ndarray,
+    atom_names: List[str],
+    models: "ichor.core.models.Models",  # noqa F821
+    system_alf: List[ALF],  # noqa F821
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Predicts the total iqa energies and the Cartesian forces that FFLUX predicts
+    (which are written to IQA_FORCES file) for many geometries at once.
+
+    For every atom model, the features, the B matrices (derivatives of the features with respect
+    to all Cartesian coordinates, see `form_b_matrices`) and the derivatives of the predictions with respect
+    to the features are calculated once for all geometries. The force on every atom is then the
+    negative of the sum of the derivatives of all atom predictions with respect to its coordinates.
+
+    :param coordinates: Array of shape n_geometries x n_atoms x 3 containing the coordinates **in Bohr**
+    :param atom_names: The names of the atoms, in the same order as the atoms in `coordinates`.
+        These are used to get the iqa model of every atom.
+    :param models: A models instance which wraps around a directory containing model files.
+    :param system_alf: The system alf as a list of `ALF` instances (0-indexed)
+    :return: A tuple of the total predicted iqa energies (shape n_geometries)
+        and the forces (shape n_geometries x n_atoms x 3)
+    """
+
+    coordinates = np.asarray(coordinates, dtype=float)
+    ngeometries, natoms, _ = coordinates.shape
+
+    models_list = _iqa_models_in_atom_order(models, atom_names)
+
+    energies = np.zeros(ngeometries)
+    forces = np.zeros((ngeometries, 3 * natoms))
+
+    for atm_idx, model in enumerate(models_list):
+
+        # the coordinates are already in Bohr, so no unit conversion is done for the distances
+        features = calculate_alf_features_from_coordinates(
+            coordinates, system_alf[atm_idx], distance_unit=AtomicDistance.Angstroms
+        )
+        values, dQ_df = fflux_predict_values_and_gradients(model, features)
+        b_matrices = form_b_matrices(coordinates, system_alf, atm_idx)
+
+        energies += values
+        # dQ/dx = dQ/df df/dx for all atoms at once
+        forces -= np.einsum("nf,nfx->nx", dQ_df, b_matrices)
+
+    return energies, forces.reshape(ngeometries, natoms, 3)
+
+
+def predict_fflux_forces_for_many_geometries(
+    geometries: Union[Atoms, ListOfAtoms, List[Atoms]],
+    models: "ichor.core.models.Models",  # noqa F821
+    system_alf: List[ALF],  # noqa F821
+    atom_names: Optional[List[str]] = None,
+) -> np.ndarray:
+    """Predicts the Cartesian forces that FFLUX predicts for many geometries at once
+    (e.g. a whole trajectory), see `predict_fflux_energies_and_forces`.
+
+    :param geometries: A Trajectory (or any other list of Atoms instances) or a single Atoms instance.
+        Note that the ordering of the atoms matters, i.e. the index of the atoms
+        must match the index of the model files.
+    :param models: A models instance which wraps around a directory containing model files.
+    :param system_alf: The system alf as a list of `ALF` instances (0-indexed)
+    :param atom_names: The names of the atoms, by default taken from the first geometry
+    :return: A np.ndarray of shape n_geometries x n_atoms x 3 (or n_atoms x 3 if one Atoms instance is given)
+    """
+
+    single_geometry = isinstance(geometries, Atoms)
+    if single_geometry:
+        geometries = [geometries]
+
+    if atom_names is None:
+        atom_names = geometries[0].atom_names
+
+    # make sure the coords are in Bohr because forces are calculated per Bohr
+    coordinates = np.array([atoms.to_bohr().coordinates for atoms in geometries])
+    _, forces = predict_fflux_energies_and_forces(
+        coordinates, atom_names, models, system_alf
+    )
+
+    if single_geometry:
+        return forces[0]
+
+    return forces
 
 
 def predict_fflux_forces_for_all_atoms(
@@ -14,6 +115,8 @@ def predict_fflux_forces_for_all_atoms(
     system_alf: List[ALF],  # noqa F821
 ) -> np.ndarray:
     """Predicts the Cartesian forces that FFLUX predicts (which are written to IQA_FORCES file).
+    The forces are calculated with `predict_fflux_energies_and_forces`, use
+    `predict_fflux_forces_for_many_geometries` to predict forces for a whole trajectory at once.
 
     .. note::
         The atoms instance is converted to Bohr internally because the forces are per Bohr in FFLUX.
@@ -29,46 +132,7 @@ def predict_fflux_forces_for_all_atoms(
     :return: A np.ndarray of shape n_atoms x 3 containing the x,y,z force for every atom
     """
 
-    atomic_forces_list = []
-
-    # make sure the coords are in Bohr because forces are calculated per Bohr
-    atoms = atoms.to_bohr()
-    atom_names = atoms.atom_names
-    natoms = len(atoms)
-
-    # make sure the ordering of the models is the same as the sequence of atoms
-    models_list = []
-    for atom_name in atom_names:
-        for model in models:
-            if model.atom_name == atom_name and model.prop == "iqa":
-                models_list.append(model)
-
-    for atm_idx in range(natoms):
-
-        # forces exerted on atom atoms[atom_idx]
-        local_forces = np.zeros(3)
-        non_local_atoms = [t for t in range(natoms) if t not in system_alf[atm_idx]]
-
-        # first three atoms that are central, x-axis, xy-plane
-        for j in range(3):
-            force = fflux_derivs(
-                atm_idx,
-                system_alf[atm_idx][j],
-                atoms,
-                system_alf,
-                models_list[system_alf[atm_idx][j]],
-            )
-            local_forces = local_forces - force
-        # rest of atoms in molecule
-        for non_local_atm in non_local_atoms:
-            force = fflux_derivs(
-                atm_idx, non_local_atm, atoms, system_alf, models_list[non_local_atm]
-            )
-            local_forces = local_forces - force
-
-        atomic_forces_list.append(local_forces)
-
-    return np.array(atomic_forces_list)
+    return predict_fflux_forces_for_many_geometries(atoms, models, system_alf)
 
 
 def predict_fflux_forces_for_all_atoms_dict(
@@ -1,6 +1,7 @@
+import os
 from enum import Enum
 from pathlib import Path
-from typing import Union
+from typing import Iterator, List, Optional, Tuple, Union
 
 import numpy as np
 from ichor.core.common.str import get_characters
@@ -230,16 +231,16 @@ def write_mdin(
     ).write()
 
 
-def mdcrd_to_xyz(
-    mdcrd: Union[str, Path],  # contains geometry
-    prmtop: Union[str, Path],  # contains atom names
-    mdin: Union[str, Path],  # contains temperature information
-    system_name: str,
-    every: int = 1,
-):
+def read_prmtop_atom_names(prmtop: Union[str, Path]) -> List[str]:
+    """Reads the atom names from an AMBER topology file and converts them to atom types,
+    e.g. C1 is converted to C.
+
+    :param prmtop: The AMBER topology file (.prmtop)
+    :return: A list of atom types for every atom in the system
+    """
+
     atom_names = []
 
-    # read in atom names
     with open(prmtop, "r") as f:
         for line in f:
             if "ATOM_NAME" in line:
@@ -249,6 +250,245 @@ def mdcrd_to_xyz(
                     atom_names += [get_characters(a).capitalize() for a in line.split()]
                     line = next(f)
 
+    return atom_names
+
+
+# mdcrd files are written in fortran format 10F8.3
+_MDCRD_VALUES_PER_LINE = 10
+_MDCRD_FIELD_WIDTH = 8
+
+
+def _line_bytes(line: bytes) -> int:
+    """The number of bytes of a line including its newline. The last line of a file
+    might not end with a newline, in which case the newline is counted as if it was there."""
+    return len(line) if line.endswith(b"\n") else len(line) + 1
+
+
+def _ends_with_newline(path: Union[str, Path]) -> bool:
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+def _readinto_frames(f, frames: np.ndarray):
+    """Reads the bytes of frames into an array. If the file does not end with a newline,
+    the read of the last frame is one byte short, so the missing newline is added."""
+    nread = f.readinto(frames)
+    if nread == frames.size - 1:
+        frames.reshape(-1)[-1] = ord("\n")
+
+
+class MdcrdLayout:
+    """The byte layout of the frames in an ASCII AMBER trajectory (mdcrd) file. Every frame
+    has the same number of bytes because the coordinates are written in a fixed width format,
+    so the position of every frame is known without reading the frames before it.
+
+    :param header_bytes: The number of bytes of the title line
+    :param frame_bytes: The number of bytes of one frame (including the box line if there is one)
+    :param coordinate_columns: The positions (in the bytes of a frame) of the characters of the coordinates
+    :param line_end_columns: The positions (in the bytes of a frame) of the newline characters
+    :param nframes: The number of complete frames in the file
+    :param box: Whether every frame ends with a line containing the box dimensions
+    """
+
+    def __init__(
+        self,
+        header_bytes: int,
+        frame_bytes: int,
+        coordinate_columns: np.ndarray,
+        line_end_columns: np.ndarray,
+        nframes: int,
+        box: bool,
+    ):
+        self.header_bytes = header_bytes
+        self.frame_bytes = frame_bytes
+        self.coordinate_columns = coordinate_columns
+        self.line_end_columns = line_end_columns
+        self.nframes = nframes
+        self.box = box
+
+    @classmethod
+    def from_file(
+        cls, mdcrd: Union[str, Path], natoms: int, box: Optional[bool] = None
+    ) -> "MdcrdLayout":
+        """Works out the layout of the frames from the title line and the first frame of the file.
+
+        :param mdcrd: The mdcrd file
+        :param natoms: The number of atoms in the system
+        :param box: Whether the frames contain a box line (written when periodic boundary conditions are used).
+            If None, this is worked out from the line after the first frame.
+        """
+
+        nvalues = 3 * natoms
+        nlines = -(-nvalues // _MDCRD_VALUES_PER_LINE)
+        values_per_line = [
+            min(_MDCRD_VALUES_PER_LINE, nvalues - i * _MDCRD_VALUES_PER_LINE)
+            for i in range(nlines)
+        ]
+
+        with open(mdcrd, "rb") as f:
+            header_bytes = len(f.readline())
+            lines = [f.readline() for _ in range(nlines + 1)]
+
+        # the box line contains the 3 box lengths, the first line of the next
+        # frame contains 3 values only if there is 1 atom
+        next_line = lines[-1].rstrip(b"\r\n")
+        if box is None:
+            box = len(next_line) == 3 * _MDCRD_FIELD_WIDTH and nvalues > 3
+
+        coordinate_columns = []
+        line_end_columns = []
+        line_start = 0
+        for line, nline_values in zip(lines, values_per_line):
+            if len(line.rstrip(b"\r\n")) != nline_values * _MDCRD_FIELD_WIDTH:
+                raise ValueError(
+                    f"The first frame of '{mdcrd}' is not written in the 10F8.3 format for {natoms} atoms."
+                )
+            coordinate_columns.append(
+                line_start + np.arange(nline_values * _MDCRD_FIELD_WIDTH)
+            )
+            line_start += _line_bytes(line)
+            line_end_columns.append(line_start - 1)
+
+        if box:
+            line_start += _line_bytes(lines[-1])
+            line_end_columns.append(line_start - 1)
+
+        frame_bytes = line_start
+        file_size = os.path.getsize(mdcrd)
+        # the last frame is complete even if the file does not end with a newline
+        if file_size > header_bytes and not _ends_with_newline(mdcrd):
+            file_size += 1
+        nframes = (file_size - header_bytes) // frame_bytes if frame_bytes else 0
+
+        return cls(
+            header_bytes,
+            frame_bytes,
+            np.concatenate(coordinate_columns) if coordinate_columns else np.array([]),
+            np.array(line_end_columns, dtype=int),
+            nframes,
+            box,
+        )
+
+
+def _iter_mdcrd_frames(
+    mdcrd: Union[str, Path],
+    layout: MdcrdLayout,
+    every: int = 1,
+    chunk_nframes: int = 1000,
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Iterates over the raw bytes of the frames of an mdcrd file in chunks of frames. The chunks
+    are read into one preallocated buffer, so the returned array is overwritten by the next chunk.
+
+    If every frame is needed, a chunk is read in one go. Otherwise only the frames which are needed
+    are read, each from its own position in the file.
+
+    :raises ValueError: If the frames in the file are not all the same size (not written with 10F8.3 format)
+    :return: An iterator of (frame indices, bytes of shape nframes x frame_bytes)
+    """
+
+    frame_indices = np.arange(0, layout.nframes, every)
+    buffer = np.empty(
+        (min(chunk_nframes, len(frame_indices)), layout.frame_bytes), dtype=np.uint8
+    )
+    # every value is written as %8.3f, so the decimal point is always in the same place
+    decimal_point_columns = layout.coordinate_columns[4::_MDCRD_FIELD_WIDTH]
+
+    with open(mdcrd, "rb") as f:
+        for start in range(0, len(frame_indices), chunk_nframes):
+            chunk_indices = frame_indices[start : start + chunk_nframes]
+            chunk = buffer[: len(chunk_indices)]
+
+            if every == 1:
+                f.seek(layout.header_bytes + chunk_indices[0] * layout.frame_bytes)
+                _readinto_frames(f, chunk)
+            else:
+                for frame, frame_index in zip(chunk, chunk_indices):
+                    f.seek(layout.header_bytes + frame_index * layout.frame_bytes)
+                    _readinto_frames(f, frame)
+
+            # if a line is shorter or longer than expected, the newlines are in the wrong place
+            if not (
+                np.all(chunk[:, layout.line_end_columns] == ord("\n"))
+                and np.all(chunk[:, decimal_point_columns] == ord("."))
+            ):
+                raise ValueError(
+                    f"The frames in '{mdcrd}' do not all have the same layout. "
+                    f"Check that the file is an ASCII mdcrd file written in the 10F8.3 format."
+                )
+
+            yield chunk_indices, chunk
+
+
+def iter_mdcrd_coordinates(
+    mdcrd: Union[str, Path],
+    natoms: int,
+    every: int = 1,
+    box: Optional[bool] = None,
+    chunk_nframes: int = 1000,
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Iterates over the coordinates in an ASCII AMBER trajectory (mdcrd) file in chunks of frames.
+
+    Every frame has the same size, so the frames which are needed are read directly from their positions
+    in the file and frames which are skipped because of `every` are never read. The coordinates of a whole
+    chunk of frames are converted to floats at once.
+
+    :param mdcrd: The mdcrd file
+    :param natoms: The number of atoms in the system
+    :param every: Only read every nth frame, defaults to 1
+    :param box: Whether the frames contain a box line, if None it is worked out from the file
+    :param chunk_nframes: The number of frames to parse at once, defaults to 1000
+    :raises ValueError: If the frames in the file are not all the same size (not written with 10F8.3 format)
+    :return: An iterator of (frame indices, coordinates of shape nframes x natoms x 3)
+    """
+
+    layout = MdcrdLayout.from_file(mdcrd, natoms, box)
+    if layout.nframes == 0 or natoms == 0:
+        return
+
+    for frame_indices, frames in _iter_mdcrd_frames(
+        mdcrd, layout, every, chunk_nframes
+    ):
+        coordinates = (
+            np.ascontiguousarray(frames[:, layout.coordinate_columns])
+            .view(f"S{_MDCRD_FIELD_WIDTH}")
+            .astype(float)
+        )
+
+        yield frame_indices, coordinates.reshape(len(frame_indices), natoms, 3)
+
+
+def mdcrd_to_xyz(
+    mdcrd: Union[str, Path],  # contains geometry
+    prmtop: Union[str, Path],  # contains atom names
+    mdin: Union[str, Path],  # contains temperature information
+    system_name: str,
+    every: int = 1,
+    box: Optional[bool] = None,
+    chunk_nframes: int = 1000,
+) -> Path:
+    """Converts an ASCII AMBER trajectory (mdcrd) file to an .xyz trajectory. The mdcrd file
+    is streamed in chunks of frames, so files which are larger than memory can be converted.
+
+    The coordinates are written with 16.8f format. Because every coordinate in the mdcrd file is written
+    with 8.3f format, the 16.8f string is the 8.3f string padded with spaces and zeros, so the .xyz frames
+    are made by copying the characters of the coordinates into a template instead of formatting floats.
+
+    :param mdcrd: The mdcrd file containing the geometries
+    :param prmtop: The topology file containing the atom names
+    :param mdin: The input file of the simulation containing the temperature, which is added
+        to the name of the .xyz file
+    :param system_name: The name of the system, used in the name of the .xyz file
+    :param every: Only write every nth frame, defaults to 1
+    :param box: Whether the frames contain a box line (written when periodic boundary conditions are used),
+        if None it is worked out from the file
+    :param chunk_nframes: The number of frames to read and write at once, defaults to 1000
+    :return: The path to the written .xyz file
+    """
+
+    atom_names = read_prmtop_atom_names(prmtop)
+    natoms = len(atom_names)
+
     mdin_inst = AmberMDIn(mdin)
 
     temperature = ""
@@ -257,21 +497,35 @@ def mdcrd_to_xyz(
 
     output_f_name = Path(f"{system_name}-amber{temperature}K.xyz")
 
-    natoms = len(atom_names)
-    with open(mdcrd, "r") as f:
-        _ = next(f)
-        traj = np.array([])
-        i = 0
-        with open(output_f_name, "w") as o:
-            for line in f:
-                traj = np.hstack((traj, np.array(line.split(), dtype=float)))
-                if len(traj) == natoms * 3:
-                    if i % every == 0:
-                        traj = traj.reshape(natoms, 3)
-                        o.write(f"{natoms}\n{i}\n")
-                        for atom_name, atom in zip(atom_names, traj):
-                            o.write(
-                                f"{atom_name} {atom[0]:16.8f} {atom[1]:16.8f} {atom[2]:16.8f}\n"
-                            )
-                    i += 1
-                    traj = np.array([])
+    # the characters of the 8.3f coordinates go in the place of the ?s
+    placeholder = "?" * _MDCRD_FIELD_WIDTH
+    atoms_template = "".join(
+        f"{atom_name}    {placeholder}00000    {placeholder}00000    {placeholder}00000\n"
+        for atom_name in atom_names
+    )
+    atoms_template = np.frombuffer(atoms_template.encode(), dtype=np.uint8)
+    placeholder_columns = np.flatnonzero(atoms_template == ord("?"))
+
+    with open(output_f_name, "wb") as o:
+        if natoms == 0:
+            return output_f_name
+
+        layout = MdcrdLayout.from_file(mdcrd, natoms, box)
+        xyz_frames = np.empty(
+            (min(chunk_nframes, layout.nframes), len(atoms_template)), dtype=np.uint8
+        )
+        xyz_frames[:] = atoms_template
+
+        for frame_indices, frames in _iter_mdcrd_frames(
+            mdcrd, layout, every, chunk_nframes
+        ):
+            chunk = xyz_frames[: len(frame_indices)]
+            chunk[:, placeholder_columns] = frames[:, layout.coordinate_columns]
+            o.write(
+                b"".join(
+                    b"%d\n%d\n%b" % (natoms, frame_index, xyz_frame)
+                    for frame_index, xyz_frame in zip(frame_indices.tolist(), chunk)
+                )
+            )
+
+    return output_f_name
@@ -16,6 +16,17 @@ from ichor.core.multipoles.hexadecapole import (
     rotate_hexadecapole,
     unpack_cartesian_hexadecapole,
 )
+from ichor.core.multipoles.molecular_multipoles import (
+    cartesian_tensor_traceless_part,
+    cartesian_to_spherical_multipole,
+    displace_multipole_moments,
+    get_atomic_multipoles_array,
+    get_gaussian_and_aimall_molecular_multipoles,
+    recover_molecular_multipole,
+    rotate_spherical_multipole,
+    spherical_to_cartesian_multipoles,
+    symmetrise_cartesian_tensor,
+)
 from ichor.core.multipoles.octupole import (
     get_gaussian_and_aimall_molecular_octupole,
     octupole_cartesian_to_spherical,
@@ -65,4 +76,13 @@ __all__ = [
     "get_gaussian_and_aimall_molecular_quadrupole",
     "get_gaussian_and_aimall_molecular_octupole",
     "get_gaussian_and_aimall_molecular_hexadecapole",
+    "cartesian_tensor_traceless_part",
+    "cartesian_to_spherical_multipole",
+    "displace_multipole_moments",
+    "get_atomic_multipoles_array",
+    "get_gaussian_and_aimall_molecular_multipoles",
+    "recover_molecular_multipole",
+    "rotate_spherical_multipole",
+    "spherical_to_cartesian_multipoles",
+    "symmetrise_cartesian_tensor",
 ]
@@ -2,7 +2,6 @@ from typing import List, Tuple, Union
 
 import numpy as np
 
-from ichor.core.common.constants import coulombbohr_to_debye
 from ichor.core.multipoles.primed_functions import mu_prime
 
 # links to papers relating to dipole moment origin change
@@ -161,36 +160,22 @@ def recover_molecular_dipole(
     :returns: A numpy array containing the recovered molecular dipole moment.
     """
 
-    # must convert to Bohr
-    atoms = [a.to_bohr() for a in atoms]
+    from ichor.core.multipoles.molecular_multipoles import (
+        get_atomic_multipoles_array,
+        recover_molecular_multipole,
+    )
 
-    molecular_dipole = np.zeros(3)
-
-    for atom in atoms:
-
-        # get necessary data for calculations
-        atom_coords = atom.coordinates
-        global_multipoles = ints_dir[atom.name].global_multipole_moments
-
-        # get the values for a particular atom
-        q00 = global_multipoles["q00"]
-        q10 = global_multipoles["q10"]
-        q11c = global_multipoles["q11c"]
-        q11s = global_multipoles["q11s"]
-
-        # get packed representation of all moments we need
-        dipole_packed_cartesian = dipole_spherical_to_cartesian(q10, q11c, q11s)
-        displaced_atomic_dipole = displace_dipole_cartesian(
-            atom_coords, q00, dipole_packed_cartesian
-        )
-
-        molecular_dipole += displaced_atomic_dipole
-
-    if convert_to_debye:
-        molecular_dipole *= coulombbohr_to_debye
+    coordinates, multipoles = get_atomic_multipoles_array(atoms, ints_dir, rank=1)
+    molecular_dipole = recover_molecular_multipole(
+        coordinates,
+        multipoles,
+        1,
+        convert_units=convert_to_debye,
+        convert_to_cartesian=not convert_to_spherical,
+    )
 
     if convert_to_spherical:
-        molecular_dipole = dipole_cartesian_to_spherical(*molecular_dipole)
+        return tuple(molecular_dipole)
 
     return molecular_dipole
 
@@ -743,87 +743,31 @@ def recover_molecular_hexadecapole(
     convert_to_cartesian=True,
     include_prefactor=True,
 ):
+    """Recovers the hexadecapole moment for a collection of atoms.
+
+    :param atoms: The atoms over which to sum the atomic multipole moments
+    :param ints_dir: an IntDirectory file instance, which wraps around an AIMAll output directory
+    :param convert_to_debye_angstrom_cubed: Whether to convert from atomic units to Debye Angstrom^3, defaults to True
+    :param convert_to_cartesian: Whether to return the Cartesian hexadecapole moment or spherical, defaults to True
+    :param include_prefactor: Whether to include the (8/35) prefactor, defaults to True
+    :return: The recovered hexadecapole moment with origin (0,0,0)
+    """
 
-    from ichor.core.multipoles.dipole import dipole_spherical_to_cartesian
-    from ichor.core.multipoles.octupole import octupole_spherical_to_cartesian
-    from ichor.core.multipoles.quadrupole import quadrupole_spherical_to_cartesian
-
-    atoms = [a.to_bohr() for a in atoms]
-
-    prefactor = 8 / 35
-
-    molecular_hexadecapole_displaced = np.zeros((3, 3, 3, 3))
-
-    for atom in atoms:
-
-        # get necessary data for calculations
-        atom_coords = atom.coordinates
-        global_multipoles = ints_dir[atom.name].global_multipole_moments
-
-        # get the values for a particular atom
-        q00 = global_multipoles["q00"]
-        q10 = global_multipoles["q10"]
-        q11c = global_multipoles["q11c"]
-        q11s = global_multipoles["q11s"]
-        q20 = global_multipoles["q20"]
-        q21c = global_multipoles["q21c"]
-        q21s = global_multipoles["q21s"]
-        q22c = global_multipoles["q22c"]
-        q22s = global_multipoles["q22s"]
-        q30 = global_multipoles["q30"]
-        q31c = global_multipoles["q31c"]
-        q31s = global_multipoles["q31s"]
-        q32c = global_multipoles["q32c"]
-        q32s = global_multipoles["q32s"]
-        q33c = global_multipoles["q33c"]
-        q33s = global_multipoles["q33s"]
-        q40 = global_multipoles["q40"]
-        q41c = global_multipoles["q41c"]
-        q41s = global_multipoles["q41s"]
-        q42c = global_multipoles["q42c"]
-        q42s = global_multipoles["q42s"]
-        q43c = global_multipoles["q43c"]
-        q43s = global_multipoles["q43s"]
-        q44c = global_multipoles["q44c"]
-        q44s = global_multipoles["q44s"]
-
-        # get packed representation of all moments we need
-        dipole_packed = dipole_spherical_to_cartesian(q10, q11c, q11s)
-        quadrupole_packed = quadrupole_spherical_to_cartesian(
-            q20, q21c, q21s, q22c, q22s
-        )
-        octupole_packed = octupole_spherical_to_cartesian(
-            q30, q31c, q31s, q32c, q32s, q33c, q33s
-        )
-        hexadecapole_packed = hexadecapole_spherical_to_cartesian(
-            q40, q41c, q41s, q42c, q42s, q43c, q43s, q44c, q44s
-        )
-
-        displaced_hexadecapole_cart = displace_hexadecapole_cartesian(
-            atom_coords,
-            q00,
-            dipole_packed,
-            quadrupole_packed,
-            octupole_packed,
-            hexadecapole_packed,
-        )
-
-        molecular_hexadecapole_displaced += displaced_hexadecapole_cart
-
-    if include_prefactor:
-        molecular_hexadecapole_displaced *= prefactor
+    from ichor.core.multipoles.molecular_multipoles import (
+        get_atomic_multipoles_array,
+        recover_molecular_multipole,
+    )
 
-    if convert_to_debye_angstrom_cubed:
-        molecular_hexadecapole_displaced *= (
-            constants.coulombbohrcubed_to_debyeangstromcubed
-        )
+    coordinates, multipoles = get_atomic_multipoles_array(atoms, ints_dir, rank=4)
 
-    if convert_to_cartesian:
-        return molecular_hexadecapole_displaced
-    else:
-        return np.array(
-            hexadecapole_cartesian_to_spherical(molecular_hexadecapole_displaced)
-        )
+    return recover_molecular_multipole(
+        coordinates,
+        multipoles,
+        4,
+        convert_units=convert_to_debye_angstrom_cubed,
+        include_prefactor=include_prefactor,
+        convert_to_cartesian=convert_to_cartesian,
+    )
 
 
 def get_gaussian_and_aimall_molecular_hexadecapole(
@@ -0,0 +1,493 @@
+import itertools
+import math
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from ichor.core.common import constants
+
+# The displaced moments are calculated for the traceless Cartesian moments (as given by AIMAll), see
+# Anthony Stone Theory of Intermolecular Forces p20-23. The traceless moment of rank n is
+# (2n-1)!!/n! times the traceless part of the primitive (Gaussian/ORCA) moment of rank n,
+# and moving the origin of a primitive moment only adds outer products of lower rank moments and
+# the displacement vector. The traces of the lower rank moments are removed when taking the traceless part,
+# so only the traceless lower rank moments are needed. This gives the same results as the
+# element-wise expressions in the dipole, quadrupole, octupole and hexadecapole modules.
+
+MAX_MULTIPOLE_RANK = 4
+
+# n! / (2n-1)!!, converts a traceless moment to the traceless part of the primitive moment
+# these are also the prefactors used to compare AIMAll to Gaussian
+_primitive_factors = [1.0, 1.0, 2 / 3, 2 / 5, 8 / 35]
+
+# convert from atomic units to the units used by Gaussian
+_atomic_units_to_gaussian_units = [
+    1.0,
+    constants.coulombbohr_to_debye,
+    constants.coulombbhrsquared_to_debyeangstrom,
+    constants.coulombbohrcubed_to_debyeangstromsquared,
+    constants.coulombbohrcubed_to_debyeangstromcubed,
+]
+
+_spherical_labels = [
+    constants.spherical_monopole_labels,
+    constants.spherical_dipole_labels,
+    constants.spherical_quadrupole_labels,
+    constants.spherical_octupole_labels,
+    constants.spherical_hexadecapole_labels,
+]
+
+_tensor_indices = "ijkl"
+
+
+def _check_rank(rank: int):
+    if not 0 <= rank <= MAX_MULTIPOLE_RANK:
+        raise ValueError(
+            f"The rank of the multipole moment must be between 0 and {MAX_MULTIPOLE_RANK}, not {rank}."
+        )
+
+
+def symmetrise_cartesian_tensor(tensor: np.ndarray, rank: int) -> np.ndarray:
+    """Averages a Cartesian tensor over all permutations of its indices.
+
+    :param tensor: An array of shape (..., 3, ...) where the last `rank` axes are the tensor indices
+    :param rank: The rank of the tensor
+    :return: The symmetric tensor with the same shape
+    """
+
+    if rank < 2:
+        return tensor
+
+    nbatch = tensor.ndim - rank
+    batch_axes = tuple(range(nbatch))
+    permutations = list(itertools.permutations(range(nbatch, tensor.ndim)))
+
+    return sum(
+        np.transpose(tensor, batch_axes + permutation) for permutation in permutations
+    ) / len(permutations)
+
+
+def cartesian_tensor_traceless_part(tensor: np.ndarray, rank: int) -> np.ndarray:
+    """Removes the traces from symmetric Cartesian tensors of rank up to 4, e.g. to
+    convert the (non-traceless) moments from Gaussian to traceless moments.
+
+    Equation 157 from  https://doi.org/10.1016/S1380-7323(02)80033-4 for the hexadecapole,
+    see also `hexadecapole_nontraceless_to_traceless`.
+
+    :param tensor: An array of shape (..., 3, ...) where the last `rank` axes are the tensor indices
+    :param rank: The rank of the tensor
+    :return: The traceless tensor with the same shape
+    """
+
+    _check_rank(rank)
+    delta = np.eye(3)
+
+    if rank < 2:
+        return tensor
+
+    elif rank == 2:
+        trace = np.einsum("...ii->...", tensor)
+        return tensor - np.einsum("...,ij->...ij", trace, delta) / 3
+
+    elif rank == 3:
+        trace = np.einsum("...imm->...i", tensor)
+        return (
+            tensor
+            - (
+                np.einsum("...k,ij->...ijk", trace, delta)
+                + np.einsum("...j,ik->...ijk", trace, delta)
+                + np.einsum("...i,jk->...ijk", trace, delta)
+            )
+            / 5
+        )
+
+    trace = np.einsum("...ijmm->...ij", tensor)
+    double_trace = np.einsum("...mm->...", trace)
+    delta_delta = (
+        np.einsum("ij,kl->ijkl", delta, delta)
+        + np.einsum("ik,jl->ijkl", delta, delta)
+        + np.einsum("il,jk->ijkl", delta, delta)
+    )
+    return (
+        tensor
+        - (
+            np.einsum("...kl,ij->...ijkl", trace, delta)
+            + np.einsum("...jl,ik->...ijkl", trace, delta)
+            + np.einsum("...jk,il->...ijkl", trace, delta)
+            + np.einsum("...il,jk->...ijkl", trace, delta)
+            + np.einsum("...ik,jl->...ijkl", trace, delta)
+            + np.einsum("...ij,kl->...ijkl", trace, delta)
+        )
+        / 7
+        + np.einsum("...,ijkl->...ijkl", double_trace, delta_delta) / 35
+    )
+
+
+def spherical_to_cartesian_multipoles(
+    spherical_multipoles: np.ndarray, rank: int
+) -> List[np.ndarray]:
+    """Converts spherical multipole moments to the packed Cartesian moments of every rank up to `rank`.
+
+    :param spherical_multipoles: An array of shape (..., n) containing the spherical multipole moments
+        in the order of `ichor.core.common.constants.multipole_names` (q00, q10, q11c, ...),
+        at least up to the given rank
+    :param rank: The highest rank of the returned moments
+    :return: A list of arrays of shapes (...), (..., 3), (..., 3, 3), etc.
+    """
+
+    from ichor.core.multipoles.dipole import dipole_spherical_to_cartesian
+    from ichor.core.multipoles.hexadecapole import hexadecapole_spherical_to_cartesian
+    from ichor.core.multipoles.octupole import octupole_spherical_to_cartesian
+    from ichor.core.multipoles.quadrupole import quadrupole_spherical_to_cartesian
+
+    _check_rank(rank)
+
+    spherical_to_cartesian = [
+        None,
+        dipole_spherical_to_cartesian,
+        quadrupole_spherical_to_cartesian,
+        octupole_spherical_to_cartesian,
+        hexadecapole_spherical_to_cartesian,
+    ]
+
+    spherical_multipoles = np.asarray(spherical_multipoles, dtype=float)
+    cartesian_multipoles = [spherical_multipoles[..., 0]]
+
+    start = 1
+    for r in range(1, rank + 1):
+        nlabels = len(_spherical_labels[r])
+        components = np.moveaxis(
+            spherical_multipoles[..., start : start + nlabels], -1, 0
+        )
+        # the conversion functions return arrays where the tensor indices are first
+        cartesian = np.asarray(spherical_to_cartesian[r](*components))
+        cartesian_multipoles.append(np.moveaxis(cartesian, range(r), range(-r, 0)))
+        start += nlabels
+
+    return cartesian_multipoles
+
+
+def _displaced_primitive_moment(
+    displacement_vectors: np.ndarray,
+    cartesian_multipoles: List[np.ndarray],
+    rank: int,
+    sum_over_atoms: bool,
+) -> np.ndarray:
+    """Returns the (not symmetrised) sum of the outer products of the moments with the displacement vectors,
+    i.e. the primitive moment of rank `rank` as seen from the new origin, with the traces of the moments missing.
+
+    :param displacement_vectors: Array of shape (..., natoms, 3)
+    :param cartesian_multipoles: List of the Cartesian traceless moments of shapes (..., natoms),
+        (..., natoms, 3), etc. up to `rank`
+    :param sum_over_atoms: Whether to sum over the atoms axis
+    """
+
+    output = "..." + ("" if sum_over_atoms else "a") + _tensor_indices[:rank]
+
+    moment = 0.0
+    for k in range(rank + 1):
+        moment_indices = _tensor_indices[:k]
+        displacement_indices = _tensor_indices[k:rank]
+        operands = [cartesian_multipoles[k] * _primitive_factors[k]] + [
+            displacement_vectors
+        ] * len(displacement_indices)
+        subscripts = ",".join(
+            ["...a" + moment_indices] + ["...a" + i for i in displacement_indices]
+        )
+        moment = moment + math.comb(rank, k) * np.einsum(
+            f"{subscripts}->{output}", *operands
+        )
+
+    return moment
+
+
+def displace_multipole_moments(
+    displacement_vectors: np.ndarray,
+    cartesian_multipoles: List[np.ndarray],
+    rank: int,
+    sum_over_atoms: bool = False,
+) -> np.ndarray:
+    """Moves the origin of Cartesian traceless multipole moments of many atoms (and geometries) at once.
+    This is the array equivalent of `displace_dipole_cartesian`, `displace_quadrupole_cartesian`, etc.
+
+    :param displacement_vectors: Array of shape (..., natoms, 3) with the displacement vectors
+        (e.g. the atom coordinates when moving the origin of atomic moments to (0, 0, 0))
+    :param cartesian_multipoles: List of the Cartesian traceless moments of every rank up to `rank`,
+        of shapes (..., natoms), (..., natoms, 3), (..., natoms, 3, 3), etc.,
+        see `spherical_to_cartesian_multipoles`
+    :param rank: The rank of the displaced moment, 1 for dipole, 2 for quadrupole, etc.
+    :param sum_over_atoms: Whether to sum the displaced moments of the atoms, defaults to False
+    :return: The displaced moments, of shape (..., natoms) + (3,) * rank,
+        or (...,) + (3,) * rank if `sum_over_atoms` is True
+    """
+
+    _check_rank(rank)
+
+    if len(cartesian_multipoles) <= rank:
+        raise ValueError(
+            f"The moments up to rank {rank} are needed, but only {len(cartesian_multipoles)} were given."
+        )
+
+    moment = _displaced_primitive_moment(
+        np.asarray(displacement_vectors, dtype=float),
+        cartesian_multipoles,
+        rank,
+        sum_over_atoms,
+    )
+    moment = cartesian_tensor_traceless_part(
+        symmetrise_cartesian_tensor(moment, rank), rank
+    )
+
+    return moment / _primitive_factors[rank]
+
+
+def cartesian_to_spherical_multipole(cartesian: np.ndarray, rank: int) -> np.ndarray:
+    """Converts packed Cartesian traceless moments of shape (..., 3, ...) to spherical moments of shape (..., n)."""
+
+    from ichor.core.multipoles.dipole import dipole_cartesian_to_spherical
+    from ichor.core.multipoles.hexadecapole import hexadecapole_cartesian_to_spherical
+    from ichor.core.multipoles.octupole import octupole_cartesian_to_spherical
+    from ichor.core.multipoles.quadrupole import quadrupole_cartesian_to_spherical
+
+    _check_rank(rank)
+
+    if rank == 0:
+        return cartesian[..., np.newaxis]
+
+    cartesian_to_spherical = [
+        None,
+        dipole_cartesian_to_spherical,
+        quadrupole_cartesian_to_spherical,
+        octupole_cartesian_to_spherical,
+        hexadecapole_cartesian_to_spherical,
+    ]
+
+    # the conversion functions index the tensor with the first axes
+    return np.stack(
+        cartesian_to_spherical[rank](
+            np.moveaxis(cartesian, range(-rank, 0), range(rank))
+        ),
+        axis=-1,
+    )
+
+
+def rotate_spherical_multipole(
+    spherical_multipole: np.ndarray, C: np.ndarray, rank: int
+) -> np.ndarray:
+    """Rotates the spherical multipole moments of one rank with rotation matrices, e.g. to convert
+    global multipole moments to the atomic local frame with the ALF C matrices. This gives the same results
+    as `rotate_dipole`, `rotate_quadrupole`, etc., but for any number of moments at once.
+
+    :param spherical_multipole: An array of shape (..., n) containing the spherical components of
+        the moments of rank `rank`, e.g. q10, q11c, q11s for the dipole
+    :param C: The rotation matrices of shape (..., 3, 3)
+    :param rank: The rank of the moments
+    :return: The rotated spherical moments of shape (..., n)
+    """
+
+    from ichor.core.multipoles.dipole import dipole_spherical_to_cartesian
+    from ichor.core.multipoles.hexadecapole import hexadecapole_spherical_to_cartesian
+    from ichor.core.multipoles.octupole import octupole_spherical_to_cartesian
+    from ichor.core.multipoles.quadrupole import quadrupole_spherical_to_cartesian
+
+    _check_rank(rank)
+
+    spherical_multipole = np.asarray(spherical_multipole, dtype=float)
+    if rank == 0:
+        return spherical_multipole
+
+    spherical_to_cartesian = [
+        None,
+        dipole_spherical_to_cartesian,
+        quadrupole_spherical_to_cartesian,
+        octupole_spherical_to_cartesian,
+        hexadecapole_spherical_to_cartesian,
+    ]
+
+    # the conversion functions return arrays where the tensor indices are first
+    cartesian = np.asarray(
+        spherical_to_cartesian[rank](*np.moveaxis(spherical_multipole, -1, 0))
+    )
+    cartesian = np.moveaxis(cartesian, range(rank), range(-rank, 0))
+
+    # every index of the tensor is rotated, e.g. "...ia,...jb,...ab->...ij" for the quadrupole
+    rotated_indices = _tensor_indices[:rank]
+    indices = "abcd"[:rank]
+    subscripts = (
+        ",".join(f"...{i}{a}" for i, a in zip(rotated_indices, indices))
+        + f",...{indices}->...{rotated_indices}"
+    )
+    rotated = np.einsum(subscripts, *([C] * rank), cartesian)
+
+    return cartesian_to_spherical_multipole(rotated, rank)
+
+
+def recover_molecular_multipole(
+    coordinates: np.ndarray,
+    spherical_multipoles: np.ndarray,
+    rank: int,
+    convert_units: bool = True,
+    include_prefactor: bool = True,
+    convert_to_cartesian: bool = True,
+) -> np.ndarray:
+    """Recovers the molecular multipole moment of rank `rank` (with origin (0,0,0)) from the atomic
+    multipole moments for any number of geometries at once.
+
+    :param coordinates: Atomic coordinates in Bohr, of shape (..., natoms, 3), e.g. (npoints, natoms, 3)
+    :param spherical_multipoles: The global spherical multipole moments of the atoms in atomic units
+        of shape (..., natoms, n), in the order of `ichor.core.common.constants.multipole_names`.
+        Note that the AIMAll q00 needs to include the nuclear charge (ichor adds it when parsing .int files).
+    :param rank: 1 for dipole, 2 for quadrupole, 3 for octupole, 4 for hexadecapole
+    :param convert_units: Whether to convert from atomic units to the units of Gaussian
+        (Debye, Debye Angstrom, Debye Angstrom^2, Debye Angstrom^3), defaults to True
+    :param include_prefactor: Whether to include the prefactor (1, 2/3, 2/5, 8/35) which is needed to compare
+        the moments to Gaussian/ORCA moments, defaults to True
+    :param convert_to_cartesian: Whether to return the Cartesian moment of shape (...,) + (3,) * rank,
+        or the spherical moment of shape (..., n), defaults to True
+    :return: The recovered molecular multipole moments
+    """
+
+    cartesian_multipoles = spherical_to_cartesian_multipoles(spherical_multipoles, rank)
+    molecular_multipole = displace_multipole_moments(
+        coordinates, cartesian_multipoles, rank, sum_over_atoms=True
+    )
+
+    if not convert_to_cartesian:
+        molecular_multipole = cartesian_to_spherical_multipole(
+            molecular_multipole, rank
+        )
+
+    if include_prefactor:
+        molecular_multipole = molecular_multipole * _primitive_factors[rank]
+
+    if convert_units:
+        molecular_multipole = (
+            molecular_multipole * _atomic_units_to_gaussian_units[rank]
+        )
+
+    return molecular_multipole
+
+
+def get_atomic_multipoles_array(
+    atoms: "ichor.core.atoms.Atoms",  # noqa F821
+    ints_dir: "ichor.core.files.IntDirectory",  # noqa F821
+    rank: int = MAX_MULTIPOLE_RANK,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Returns the coordinates (in Bohr) and the global spherical multipole moments of a collection of atoms
+    as arrays, which can be passed to `recover_molecular_multipole`.
+
+    :param atoms: The atoms (or a subset of the atoms) of the geometry
+    :param ints_dir: an IntDirectory file instance, which wraps around an AIMAll output directory
+    :param rank: The highest rank of the moments, defaults to 4
+    :return: A tuple of the coordinates of shape (natoms, 3) and the multipoles of shape (natoms, n)
+    """
+
+    _check_rank(rank)
+    labels = [label for r in range(rank + 1) for label in _spherical_labels[r]]
+
+    coordinates = np.array([atom.to_bohr().coordinates for atom in atoms])
+    multipoles = np.array(
+        [
+            [ints_dir[atom.name].global_multipole_moments[label] for label in labels]
+            for atom in atoms
+        ]
+    )
+
+    return coordinates, multipoles
+
+
+def _gaussian_molecular_multipole(
+    gaussian_output: "ichor.core.files.GaussianOutput",  # noqa F821
+    rank: int,
+) -> np.ndarray:
+    """Returns the packed (traceless for rank > 1) Cartesian molecular moment from a Gaussian output."""
+
+    from ichor.core.multipoles.hexadecapole import (
+        hexadecapole_element_conversion,
+        pack_cartesian_hexadecapole,
+    )
+    from ichor.core.multipoles.octupole import (
+        octupole_element_conversion,
+        pack_cartesian_octupole,
+    )
+    from ichor.core.multipoles.quadrupole import (
+        pack_cartesian_quadrupole,
+        quadrupole_element_conversion,
+    )
+
+    if rank == 1:
+        return np.array(gaussian_output.molecular_dipole)
+
+    gaussian_moments = {
+        2: (
+            "molecular_quadrupole",
+            quadrupole_element_conversion,
+            pack_cartesian_quadrupole,
+        ),
+        3: ("molecular_octupole", octupole_element_conversion, pack_cartesian_octupole),
+        4: (
+            "molecular_hexadecapole",
+            hexadecapole_element_conversion,
+            pack_cartesian_hexadecapole,
+        ),
+    }
+    attribute, element_conversion, pack = gaussian_moments[rank]
+
+    # Gaussian uses a different ordering of the elements
+    converted = element_conversion(np.array(getattr(gaussian_output, attribute)), 0)
+
+    return pack(*converted)
+
+
+def get_gaussian_and_aimall_molecular_multipoles(
+    points: List["ichor.core.files.PointDirectory"],  # noqa F821
+    rank: int,
+    atom_names: Optional[List[str]] = None,
+) -> Dict[str, np.ndarray]:
+    """Gets the Gaussian molecular multipole moments (converted to traceless) and the molecular
+    moments recovered from the AIMAll atomic moments for many points at once, e.g. for a whole PointsDirectory.
+    The recovered moments of all points are calculated together, see `recover_molecular_multipole`.
+    The moments are in the units of Gaussian (Debye Angstrom^(rank-1)) and are directly comparable.
+
+    :param points: A list of PointDirectory instances (e.g. a PointsDirectory), which contain
+        Gaussian outputs with molecular multipole moments and AIMAll .int files for the same geometry
+    :param rank: 1 for dipole, 2 for quadrupole, 3 for octupole, 4 for hexadecapole
+    :param atom_names: Optional list of atom names, which represent a subset of
+        the atoms. The atomic multipole moments for this subset of atoms will be summed
+    :return: A dictionary with the "gaussian" and "aimall" moments, arrays of shape (npoints,) + (3,) * rank
+    """
+
+    _check_rank(rank)
+
+    gaussian_moments = []
+    all_coordinates = []
+    all_multipoles = []
+
+    for point in points:
+
+        atoms = point.gaussian_output.atoms
+
+        if atom_names:
+            # ensure that the passed in atom names are a subset of the all of the atom names
+            if not set(atom_names).issubset(set(atoms.names)):
+                raise ValueError(
+                    f"The passed atom names : {atom_names} must be a subset of all the atom names {atoms.names}."
+                )
+
+            atoms = [i for i in atoms if i.name in atom_names]
+
+        gaussian_moments.append(
+            _gaussian_molecular_multipole(point.gaussian_output, rank)
+        )
+        coordinates, multipoles = get_atomic_multipoles_array(atoms, point.ints, rank)
+        all_coordinates.append(coordinates)
+        all_multipoles.append(multipoles)
+
+    # Gaussian moments are not traceless, but AIMAll moments are
+    gaussian_moments = cartesian_tensor_traceless_part(np.array(gaussian_moments), rank)
+
+    return {
+        "gaussian": gaussian_moments,
+        "aimall": recover_molecular_multipole(
+            np.array(all_coordinates), np.array(all_multipoles), rank
+        ),
+    }
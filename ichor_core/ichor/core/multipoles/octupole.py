@@ -321,69 +321,24 @@ def recover_molecular_octupole(
     :return: The recovered octupole moment with origin (0,0,0)
     """
 
-    from ichor.core.multipoles.dipole import dipole_spherical_to_cartesian
-    from ichor.core.multipoles.quadrupole import quadrupole_spherical_to_cartesian
-
-    atoms = [a.to_bohr() for a in atoms]
+    from ichor.core.multipoles.molecular_multipoles import (
+        get_atomic_multipoles_array,
+        recover_molecular_multipole,
+    )
 
     # from anthony stone theory of intermolecular forces p21-22
     # note that aimall * (2/5) = Gaussian (if both are in atomic units)
     # Gaussian is not in atomic units by default
-    prefactor = 2 / 5
-
-    molecular_octupole_displaced = np.zeros((3, 3, 3))
-
-    for atom in atoms:
-
-        # get necessary data for calculations
-        atom_coords = atom.coordinates
-        global_multipoles = ints_dir[atom.name].global_multipole_moments
-
-        # get the values for a particular atom
-        q00 = global_multipoles["q00"]
-        q10 = global_multipoles["q10"]
-        q11c = global_multipoles["q11c"]
-        q11s = global_multipoles["q11s"]
-        q20 = global_multipoles["q20"]
-        q21c = global_multipoles["q21c"]
-        q21s = global_multipoles["q21s"]
-        q22c = global_multipoles["q22c"]
-        q22s = global_multipoles["q22s"]
-        q30 = global_multipoles["q30"]
-        q31c = global_multipoles["q31c"]
-        q31s = global_multipoles["q31s"]
-        q32c = global_multipoles["q32c"]
-        q32s = global_multipoles["q32s"]
-        q33c = global_multipoles["q33c"]
-        q33s = global_multipoles["q33s"]
-
-        # get packed representation of all moments we need
-        dipole_packed = dipole_spherical_to_cartesian(q10, q11c, q11s)
-        quadrupole_packed = quadrupole_spherical_to_cartesian(
-            q20, q21c, q21s, q22c, q22s
-        )
-        octupole_packed = octupole_spherical_to_cartesian(
-            q30, q31c, q31s, q32c, q32s, q33c, q33s
-        )
-
-        displaced_octupole_cart = displace_octupole_cartesian(
-            atom_coords, q00, dipole_packed, quadrupole_packed, octupole_packed
-        )
-
-        molecular_octupole_displaced += displaced_octupole_cart
-
-    if include_prefactor:
-        molecular_octupole_displaced *= prefactor
-
-    if convert_to_debye_angstrom_squared:
-        molecular_octupole_displaced *= (
-            constants.coulombbohrcubed_to_debyeangstromsquared
-        )
-
-    if convert_to_cartesian:
-        return molecular_octupole_displaced
-    else:
-        return np.array(octupole_cartesian_to_spherical(molecular_octupole_displaced))
+    coordinates, multipoles = get_atomic_multipoles_array(atoms, ints_dir, rank=3)
+
+    return recover_molecular_multipole(
+        coordinates,
+        multipoles,
+        3,
+        convert_units=convert_to_debye_angstrom_squared,
+        include_prefactor=include_prefactor,
+        convert_to_cartesian=convert_to_cartesian,
+    )
 
 
 def get_gaussian_and_aimall_molecular_octupole(
@@ -219,49 +219,23 @@ def recover_molecular_quadrupole(
     :returns: A numpy array containing the molecular quadrupole moment.
     """
 
-    from ichor.core.multipoles.dipole import dipole_spherical_to_cartesian
-
-    atoms = [a.to_bohr() for a in atoms]
-
-    # Cartesian representation
-    molecular_quadrupole = np.zeros((3, 3))
-
-    for atom in atoms:
-
-        # get necessary data for calculations
-        atom_coords = atom.coordinates
-        global_multipoles = ints_dir[atom.name].global_multipole_moments
-
-        # get the values for a particular atom
-        q00 = global_multipoles["q00"]
-        q10 = global_multipoles["q10"]
-        q11c = global_multipoles["q11c"]
-        q11s = global_multipoles["q11s"]
-        q20 = global_multipoles["q20"]
-        q21c = global_multipoles["q21c"]
-        q21s = global_multipoles["q21s"]
-        q22c = global_multipoles["q22c"]
-        q22s = global_multipoles["q22s"]
-
-        dipole_packed = dipole_spherical_to_cartesian(q10, q11c, q11s)
-        quadrupole_packed = quadrupole_spherical_to_cartesian(
-            q20, q21c, q21s, q22c, q22s
-        )
-
-        displaced_atomic_quadrupole_cartesian = displace_quadrupole_cartesian(
-            atom_coords, q00, dipole_packed, quadrupole_packed
-        )
-
-        molecular_quadrupole += displaced_atomic_quadrupole_cartesian
-
-    if convert_to_debye_angstrom:
-        molecular_quadrupole *= constants.coulombbhrsquared_to_debyeangstrom
+    from ichor.core.multipoles.molecular_multipoles import (
+        get_atomic_multipoles_array,
+        recover_molecular_multipole,
+    )
 
-    if include_prefactor:
-        molecular_quadrupole = (2 / 3) * molecular_quadrupole
+    coordinates, multipoles = get_atomic_multipoles_array(atoms, ints_dir, rank=2)
+    molecular_quadrupole = recover_molecular_multipole(
+        coordinates,
+        multipoles,
+        2,
+        convert_units=convert_to_debye_angstrom,
+        include_prefactor=include_prefactor,
+        convert_to_cartesian=convert_to_cartesian,
+    )
 
     if not convert_to_cartesian:
-        return quadrupole_cartesian_to_spherical(molecular_quadrupole)
+        return tuple(molecular_quadrupole)
 
     return molecular_quadrupole
 
@@ -1,6 +1,19 @@
-from ichor.core.processing.check_functions import check_gaussian_and_aimall
+from ichor.core.processing.check_functions import (
+    check_gaussian_and_aimall,
+    check_point_directory_files,
+    check_points_directory,
+    read_missing_data_report,
+    write_missing_data_report,
+)
 from ichor.core.processing.point_directory_processing import (
     fflux_point_directory_processing,
 )
 
-__all__ = ["fflux_point_directory_processing", "check_gaussian_and_aimall"]
+__all__ = [
+    "fflux_point_directory_processing",
+    "check_gaussian_and_aimall",
+    "check_point_directory_files",
+    "check_points_directory",
+    "write_missing_data_report",
+    "read_missing_data_report",
+]
@@ -1,4 +1,10 @@
 # functions to check files / directories are present
+import csv
+import json
+import os
+from pathlib import Path
+from typing import List, Optional, Union
+
 from ichor.core.files import PointDirectory
 
 
@@ -21,7 +27,9 @@ def check_gaussian_and_aimall(pd_instance: PointDirectory):
     if not pd_instance.wfn:
         print(f"{abs_path}: WFN file is missing.")
     else:
-        wfn_instance = pd_instance.wfn
+        # the energy is written at the end of the .wfn file, so if it can be
+        # read in, the file is complete (the rest of the file is not parsed)
+        wfn_instance = pd_instance.wfn.project("energy")
         try:
             wfn_instance.read()
         except StopIteration:
@@ -42,3 +50,241 @@ def check_gaussian_and_aimall(pd_instance: PointDirectory):
             print(
                 f"{abs_path}: There is a .sh file found, likely that AIMAll has crashed."
             )
+
+
+# number of bytes read from the end of a file to find the marker written when a program finished
+_TAIL_NBYTES = 4096
+
+# columns of the missing data report, the problems of a point are joined by "; " in a csv report
+MISSING_DATA_REPORT_COLUMNS = [
+    "point",
+    "name",
+    "gjf",
+    "wfn",
+    "needs_gaussian",
+    "needs_aimall",
+    "problems",
+]
+
+
+def _file_tail(path: str, nbytes: int = _TAIL_NBYTES) -> bytes:
+    """Returns the last `nbytes` bytes of a file."""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        f.seek(max(0, f.tell() - nbytes))
+        return f.read()
+
+
+def _output_file_problem(path: Optional[str], marker: bytes) -> Optional[str]:
+    """Returns a description of the problem with an output file of a program, or None if the file is complete."""
+    if path is None:
+        return "missing"
+    if os.path.getsize(path) == 0:
+        return "empty"
+    if marker not in _file_tail(path):
+        return "incomplete"
+
+
+def check_point_directory_files(point_path: Union[str, Path]) -> dict:
+    """Checks that the Gaussian and AIMAll outputs of a point exist and are complete, without parsing the files.
+    Only the end of the output files is read to find the line that is written once a program has finished:
+    "Normal termination" for the Gaussian output, "TOTAL ENERGY" for the .wfn file and "Total time"
+    for every .int file. Leftover .sh files in the point directory and .mog files in the `_atomicfiles`
+    directory mean that AIMAll crashed.
+
+    :param point_path: Path to a PointDirectory
+    :return: A dictionary with keys `MISSING_DATA_REPORT_COLUMNS`. `gjf` and `wfn` are the paths to the files
+        (or None if they are missing), `needs_gaussian` and `needs_aimall` are True if Gaussian or AIMAll
+        need to be ran again, and `problems` is a list of the problems found.
+    """
+
+    point_path = Path(point_path).absolute()
+    name = point_path.with_suffix("").name
+
+    files = {}
+    atomicfiles = None
+    leftover_sh_files = []
+    with os.scandir(point_path) as it:
+        for entry in it:
+            if entry.is_dir() and entry.name.endswith("_atomicfiles"):
+                atomicfiles = entry.path
+            elif entry.name.endswith(".sh"):
+                leftover_sh_files.append(entry.name)
+            else:
+                files.setdefault(Path(entry.name).suffix, entry.path)
+
+    problems = []
+
+    gjf = files.get(".gjf")
+    if gjf is None:
+        problems.append("gjf missing")
+
+    gaussian_output = files.get(".gaussianoutput", files.get(".gau"))
+    gaussian_output_problem = _output_file_problem(
+        gaussian_output, b"Normal termination"
+    )
+    if gaussian_output_problem:
+        problems.append(f"gaussian output {gaussian_output_problem}")
+
+    wfn = files.get(".wfn")
+    wfn_problem = _output_file_problem(wfn, b"TOTAL ENERGY")
+    if wfn_problem:
+        problems.append(f"wfn {wfn_problem}")
+
+    aimall_crashed = False
+    if leftover_sh_files:
+        problems.append("AIMAll crashed, .sh file found")
+        aimall_crashed = True
+
+    if atomicfiles is None:
+        problems.append("atomicfiles missing")
+        aimall_crashed = True
+    else:
+        ints = []
+        with os.scandir(atomicfiles) as it:
+            for entry in it:
+                if entry.name.endswith((".mog", ".mog2")):
+                    aimall_crashed = True
+                elif entry.name.endswith(".int"):
+                    ints.append(entry)
+        if aimall_crashed and not leftover_sh_files:
+            problems.append("AIMAll crashed, .mog file found")
+
+        # the number of atoms is on the first line of the .xyz file
+        xyz = files.get(".xyz")
+        if xyz is not None:
+            with open(xyz, "r") as f:
+                natoms = f.readline().strip()
+            natoms = int(natoms) if natoms.isdigit() else None
+            if natoms is None:
+                problems.append("number of atoms could not be read from xyz file")
+            elif len(ints) != natoms:
+                problems.append(
+                    f"{len(ints)} int files found, but there are {natoms} atoms"
+                )
+                aimall_crashed = True
+
+        incomplete_ints = sorted(
+            Path(entry.name).stem.capitalize()
+            for entry in ints
+            if _output_file_problem(entry.path, b"Total time")
+        )
+        if incomplete_ints:
+            problems.append(f"incomplete int files for {', '.join(incomplete_ints)}")
+            aimall_crashed = True
+
+    needs_gaussian = bool(gaussian_output_problem or wfn_problem)
+
+    return {
+        "point": str(point_path),
+        "name": name,
+        "gjf": gjf,
+        "wfn": wfn,
+        "needs_gaussian": needs_gaussian,
+        # AIMAll needs to be ran again after Gaussian is ran again
+        "needs_aimall": needs_gaussian or aimall_crashed,
+        "problems": problems,
+    }
+
+
+def _find_point_directories(path: Path) -> List[Path]:
+    """Returns the paths of the point directories in a PointsDirectory or in the
+    PointsDirectory-ies contained in a PointsDirectoryParent."""
+
+    from ichor.core.files import PointDirectory, PointsDirectory
+
+    point_paths = []
+    with os.scandir(path) as it:
+        for entry in it:
+            if not entry.is_dir():
+                continue
+            if entry.name.endswith(PointDirectory._suffix):
+                point_paths.append(Path(entry.path))
+            elif entry.name.endswith(PointsDirectory._suffix):
+                point_paths.extend(_find_point_directories(Path(entry.path)))
+
+    return sorted(point_paths)
+
+
+def check_points_directory(
+    points_dir_path: Union[str, Path], only_problems: bool = True, nthreads: int = 8
+) -> List[dict]:
+    """Checks the Gaussian and AIMAll outputs of all points in a PointsDirectory (or PointsDirectoryParent)
+    with a pool of threads, see `check_point_directory_files`. The PointsDirectory is not parsed
+    and the output files are not read in, so the check is fast enough to run on a login node.
+
+    :param points_dir_path: Path to a PointsDirectory or PointsDirectoryParent
+    :param only_problems: Whether to only return the points which have problems, defaults to True
+    :param nthreads: The number of threads used to check the points, defaults to 8
+    :return: A list of dictionaries, one for each point, which can be written with `write_missing_data_report`
+    """
+    import concurrent.futures
+
+    point_paths = _find_point_directories(Path(points_dir_path))
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=nthreads) as executor:
+        report = list(executor.map(check_point_directory_files, point_paths))
+
+    if only_problems:
+        report = [point_report for point_report in report if point_report["problems"]]
+
+    return report
+
+
+def write_missing_data_report(report: List[dict], path: Union[str, Path]) -> Path:
+    """Writes a report made by `check_points_directory` to a .json or .csv file.
+
+    :param report: A list of dictionaries, one for each point
+    :param path: Path to the .json or .csv file
+    :return: The path to the written report
+    """
+
+    path = Path(path)
+
+    if path.suffix == ".json":
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+    elif path.suffix == ".csv":
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=MISSING_DATA_REPORT_COLUMNS)
+            writer.writeheader()
+            for point_report in report:
+                writer.writerow(
+                    {**point_report, "problems": "; ".join(point_report["problems"])}
+                )
+    else:
+        raise ValueError(
+            f"The report can be written to a .json or .csv file, not '{path.suffix}'."
+        )
+
+    return path
+
+
+def read_missing_data_report(path: Union[str, Path]) -> List[dict]:
+    """Reads a report written by `write_missing_data_report`.
+
+    :param path: Path to the .json or .csv report
+    :return: A list of dictionaries, one for each point
+    """
+
+    path = Path(path)
+
+    if path.suffix == ".json":
+        with open(path, "r") as f:
+            return json.load(f)
+
+    if path.suffix == ".csv":
+        report = []
+        with open(path, "r", newline="") as f:
+            for row in csv.DictReader(f):
+                row["gjf"] = row["gjf"] or None
+                row["wfn"] = row["wfn"] or None
+                row["needs_gaussian"] = row["needs_gaussian"] == "True"
+                row["needs_aimall"] = row["needs_aimall"] == "True"
+                row["problems"] = row["problems"].split("; ") if row["problems"] else []
+                report.append(row)
+        return report
+
+    raise ValueError(
+        f"The report can be read from a .json or .csv file, not '{path.suffix}'."
+    )
@@ -0,0 +1,51 @@
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pytest
+from ichor.core.atoms import Atom, Atoms
+from ichor.core.files import Trajectory
+
+
+@pytest.fixture
+def ammonia() -> Atoms:
+    """An ammonia geometry, the system of the example models."""
+    return Atoms(
+        [
+            Atom("N", 0.0, 0.0, 0.0),
+            Atom("H", 0.94, 0.0, -0.38),
+            Atom("H", -0.47, 0.814, -0.38),
+            Atom("H", -0.47, -0.814, -0.38),
+        ]
+    )
+
+
+@pytest.fixture
+def perturbed_geometries(tmp_path):
+    """Returns a function which makes a trajectory of copies of a geometry, where every atom is
+    displaced by normally distributed random noise (like the timesteps of a MD simulation).
+
+    The function takes the geometry, the number of geometries, the standard deviation of the
+    displacements in Angstroms (default 0.03), the seed of the random number generator (default 0)
+    and the path of the trajectory (default a .xyz file in a temporary directory).
+    """
+
+    def _perturbed_geometries(
+        atoms: Atoms,
+        n: int,
+        scale: float = 0.03,
+        seed: int = 0,
+        path: Optional[Path] = None,
+    ) -> Trajectory:
+        rng = np.random.default_rng(seed)
+        trajectory = Trajectory(path or tmp_path / "perturbed_geometries.xyz")
+        for _ in range(n):
+            coordinates = atoms.coordinates + scale * rng.normal(
+                size=atoms.coordinates.shape
+            )
+            trajectory.add(
+                Atoms([Atom(atom.type, *xyz) for atom, xyz in zip(atoms, coordinates)])
+            )
+        return trajectory
+
+    return _perturbed_geometries
@@ -0,0 +1,112 @@
+import numpy as np
+import pytest
+from ichor.core.active_learning import (
+    combine_scores,
+    expected_improvement,
+    sample_pool_features,
+    score_sample_pool,
+    select_diverse_points,
+    select_points,
+    write_selected_points,
+)
+from ichor.core.calculators import calculate_alf_features, calculate_rmsd
+from ichor.core.files import PointsDirectory
+from ichor.core.models import Models
+
+from tests.path import get_cwd
+
+example_dir = get_cwd(__file__) / ".." / ".." / ".." / "example_files"
+
+
+def test_scores_match_models(ammonia, perturbed_geometries):
+
+    models = Models(example_dir / "models")
+    sample_pool = perturbed_geometries(ammonia, 20, scale=0.05)
+
+    features = sample_pool_features(sample_pool, models)
+    assert set(features) == {"N1", "H2", "H3", "H4"}
+
+    for i in (0, 7):
+        for model in models:
+            np.testing.assert_allclose(
+                features[model.atom_name][i],
+                calculate_alf_features(sample_pool[i][model.atom_name], model.alf),
+            )
+
+    scores = score_sample_pool(models, features, chunk_size=6)
+    for model in models:
+        x_test = features[model.atom_name]
+        # variance from the explicit Cholesky decomposition with jitter
+        lower_cholesky = np.linalg.cholesky(
+            model.kernel.R(model.x) + model.jitter * np.eye(model.ntrain)
+        )
+        v = np.linalg.solve(lower_cholesky, model.r(x_test))
+        np.testing.assert_allclose(
+            scores[model.atom_name]["iqa"],
+            1.0 - np.diag(v.T @ v),
+            rtol=1e-6,
+            atol=1e-10,
+        )
+
+        y = model.y.flatten()
+        u = np.linalg.solve(lower_cholesky, y - model.mean.value(model.x))
+        nearest_y = y[np.argmax(model.r(x_test), axis=0)]
+        np.testing.assert_allclose(
+            expected_improvement(model, x_test, chunk_size=7),
+            (model.predict(x_test) - nearest_y) ** 2
+            + np.dot(u, u) / len(y) * (1.0 - np.diag(v.T @ v)),
+            rtol=1e-6,
+        )
+
+
+def test_combine_and_select():
+
+    scores = {
+        "O1": {"iqa": np.array([1.0, 3.0, 2.0, 0.0])},
+        "H2": {"iqa": np.array([4.0, 0.0, 2.0, 0.0])},
+    }
+    np.testing.assert_allclose(combine_scores(scores), [1 / 3 + 1, 1, 2 / 3 + 0.5, 0])
+    np.testing.assert_allclose(combine_scores(scores, "max"), [1, 1, 2 / 3, 0])
+
+    combined = np.array([5.0, 1.0, 4.0, 3.0, 2.0])
+    np.testing.assert_array_equal(select_diverse_points(combined, 3), [0, 2, 3])
+
+    # the second best point is a copy of the best point, so it is skipped
+    coordinates = np.random.default_rng(1).normal(size=(5, 4, 3))
+    coordinates[2] = coordinates[0]
+    selected = select_diverse_points(combined, 3, coordinates, min_rmsd=0.1)
+    np.testing.assert_array_equal(selected, [0, 3, 4])
+    assert calculate_rmsd(coordinates[0], coordinates[selected[1:]]).min() > 0.1
+
+
+def test_select_and_write_points(tmp_path, ammonia, perturbed_geometries):
+
+    models = Models(example_dir / "models")
+    sample_pool = perturbed_geometries(ammonia, 50, scale=0.05, seed=2)
+
+    selected, scores = select_points(
+        sample_pool, models, 5, acquisition="expected_improvement", min_rmsd=0.01
+    )
+    assert len(selected) == 5
+    assert len(set(selected)) == 5
+    assert scores.shape == (50,)
+    assert np.all(np.diff(scores[selected]) <= 0.0)
+
+    points_dir = write_selected_points(
+        sample_pool, selected, "ammonia", parent_dir=tmp_path
+    )
+    assert points_dir == tmp_path / "AMMONIA_SELECTED.pointsdir"
+
+    points = PointsDirectory(points_dir)
+    assert len(points) == 5
+    names = [point.path.stem for point in points]
+    for i in selected:
+        point = points[names.index(f"AMMONIA{i:04d}")]
+        np.testing.assert_allclose(
+            point.atoms.coordinates, sample_pool[int(i)].coordinates, atol=1e-7
+        )
+
+    # an existing PointsDirectory is not overwritten
+    with pytest.raises(FileExistsError):
+        write_selected_points(sample_pool, selected, "ammonia", parent_dir=tmp_path)
+    assert len(PointsDirectory(points_dir)) == 5
@@ -0,0 +1,69 @@
+import shutil
+
+import numpy as np
+import pandas as pd
+from ichor.core.analysis.dlpoly.dlpoly_analysis import (
+    collect_dlpoly_energies,
+    get_dlpoly_energies,
+    read_fflux,
+    read_last_fflux_record,
+)
+from ichor.core.files import WFN
+from ichor.core.models import Models
+
+from tests.path import get_cwd
+
+example_dir = get_cwd(__file__) / ".." / ".." / ".." / "example_files"
+wfn_path = (
+    example_dir
+    / "example_points_directory"
+    / "WATER_MONOMER.pointsdir"
+    / "WATER_MONOMER0000.pointdir"
+    / "WATER_MONOMER0000.wfn"
+)
+
+
+def _write_fflux(path, energies):
+    with open(path, "w") as f:
+        f.write("FFLUX\n# step E_IQA E_vdW E_coul E_kin\n")
+        for t, energy in enumerate(energies):
+            f.write(
+                f"{t:>10d} {energy:>20.10f} {0.1 * t:>12.6f} {0.2 * t:>12.6f} {0.0:>12.6f}\n"
+            )
+
+
+def _make_dlpoly_directories(parent, nenergies=(5, 8, 3)):
+    for i, n in enumerate(nenergies):
+        d = parent / f"ntrain_{i}"
+        shutil.copytree(example_dir / "models", d / "model_krig")
+        _write_fflux(d / "FFLUX", -56.0 - 0.001 * np.arange(n) - i)
+        if i == 0:
+            shutil.copy(wfn_path, d / wfn_path.name)
+
+
+def test_read_last_fflux_record(tmp_path):
+    _write_fflux(tmp_path / "FFLUX", -56.0 - 0.001 * np.arange(10))
+    fflux = read_fflux(tmp_path / "FFLUX")
+
+    last_record = read_last_fflux_record(tmp_path / "FFLUX")
+
+    assert last_record["timestep"] == fflux["timestep"][-1]
+    for key in ("e_iqa", "e_vdw", "e_coul"):
+        assert last_record[key] == fflux[key][-1]
+
+
+def test_collect_dlpoly_energies(tmp_path):
+    _make_dlpoly_directories(tmp_path)
+
+    df = collect_dlpoly_energies(tmp_path, ncores=2)
+
+    assert list(df["directory"]) == ["ntrain_0", "ntrain_1", "ntrain_2"]
+    assert (df["ntrain"] == Models(example_dir / "models").ntrain).all()
+    np.testing.assert_allclose(df["fflux"], [-56.004, -57.007, -58.002])
+    assert df["gaussian"][0] == WFN(wfn_path).total_energy
+    assert df["gaussian"][1:].isna().all()
+
+    output = tmp_path / "dlpoly-energies.parquet"
+    get_dlpoly_energies(-56.0, tmp_path, output, ncores=1)
+    written = pd.read_parquet(output)
+    np.testing.assert_allclose(written["fflux_diff / Ha"], [0.004, 1.007, 2.002])
@@ -0,0 +1,96 @@
+import numpy as np
+from ichor.core.analysis.predictions import get_predicted, get_true
+from ichor.core.atoms import Atom, Atoms
+from ichor.core.calculators import (
+    calculate_alf_cahn_ingold_prelog,
+    calculate_alf_features,
+    calculate_c_matrix,
+)
+from ichor.core.common.str import get_characters
+from ichor.core.database.query_database import (
+    get_alf_from_first_db_geometry,
+    get_database_info_from_db_type,
+    rotate_multipole_moments,
+)
+from ichor.core.files import PointsDirectory
+from ichor.core.models import Models
+
+from tests.path import get_cwd
+
+example_dir = get_cwd(__file__) / ".." / ".." / ".." / "example_files"
+points_directory_path = (
+    example_dir / "example_points_directory" / "WATER_MONOMER.pointsdir"
+)
+sqlite_db_path = example_dir / "urea_example_points_directory_sqlite.db"
+
+multipole_types = ["q10", "q11s", "q21c", "q22s", "q30", "q32c", "q41s", "q44c"]
+
+
+def test_get_predicted(ammonia, perturbed_geometries):
+
+    models = Models(example_dir / "models")
+    trajectory = perturbed_geometries(ammonia, 5)
+
+    predicted = get_predicted(models, trajectory)
+    alf = models.alf_dict
+
+    for model in models:
+        expected = [
+            model.predict(calculate_alf_features(geometry[model.atom], alf))[0]
+            for geometry in trajectory
+        ]
+        np.testing.assert_allclose(predicted[model.atom][model.type], expected)
+
+
+def test_get_true_points_directory():
+
+    points_directory = PointsDirectory(points_directory_path)
+    types = ["iqa", "q00"] + multipole_types
+
+    true = get_true(points_directory, ["O1", "H2", "H3"], types)
+
+    for i, point in enumerate(points_directory):
+        alf = point.atoms.alf_dict(calculate_alf_cahn_ingold_prelog)
+        for atom in ["O1", "H2", "H3"]:
+            int_file = point.ints[atom]
+            local_multipoles = int_file.local_spherical_multipoles(
+                calculate_c_matrix(point.atoms[atom], alf)
+            )
+            assert true[atom]["iqa"][i] == int_file.iqa
+            assert true[atom]["q00"][i] == int_file.q00
+            for type_ in multipole_types:
+                np.testing.assert_allclose(
+                    true[atom][type_][i], local_multipoles[type_], atol=1e-12
+                )
+
+
+def test_get_true_sqlite():
+
+    point_ids, atom_names, full_df = get_database_info_from_db_type(
+        sqlite_db_path, "sqlite"
+    )
+    alf = dict(
+        zip(atom_names, get_alf_from_first_db_geometry(sqlite_db_path, "sqlite"))
+    )
+    types = ["iqa"] + multipole_types
+
+    true = get_true(sqlite_db_path, atom_names, types, alf=alf)
+
+    for i, point_id in enumerate(sorted(point_ids)):
+        point_df = full_df.loc[full_df["id"] == point_id]
+        atoms = Atoms(
+            [
+                Atom(get_characters(row.atom_name), row.x, row.y, row.z)
+                for row in point_df.itertuples()
+            ]
+        )
+        for atom in atom_names:
+            row = point_df.loc[point_df["atom_name"] == atom]
+            local_multipoles = rotate_multipole_moments(
+                row, calculate_c_matrix(atoms[atom], alf)
+            )
+            assert true[atom]["iqa"][i] == row["iqa"].item()
+            for type_ in multipole_types:
+                np.testing.assert_allclose(
+                    true[atom][type_][i], local_multipoles[type_], atol=1e-12
+                )
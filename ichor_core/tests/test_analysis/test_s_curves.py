@@ -0,0 +1,188 @@
+import numpy as np
+import pandas as pd
+import pytest
+from ichor.core.analysis.s_curves import (
+    calculate_s_curves,
+    iter_s_curves,
+    percentile_grid,
+    s_curve_errors,
+    write_s_curves,
+)
+from ichor.core.common.constants import ha_to_kj_mol
+
+
+def _true_predicted(npoints=1000, atoms=("O1", "H2", "H3"), types=("iqa", "q00")):
+    rng = np.random.default_rng(0)
+    true = pd.DataFrame(
+        {atom: {type_: rng.normal(size=npoints) for type_ in types} for atom in atoms}
+    )
+    predicted = pd.DataFrame(
+        {
+            atom: {
+                type_: true[atom][type_] + 0.01 * rng.normal(size=npoints)
+                for type_ in types
+            }
+            for atom in atoms
+        }
+    )
+    return true, predicted
+
+
+@pytest.mark.parametrize("npoints", [1, 7, 1000, 1001])
+def test_s_curve_errors(npoints):
+
+    errors = np.random.default_rng(npoints).normal(size=npoints)
+    # the percentiles of all points, as used in the S-curves with all sorted errors
+    all_percentiles = np.linspace(100 / npoints, 100, npoints)
+
+    np.testing.assert_array_equal(
+        s_curve_errors(errors, all_percentiles), np.sort(np.abs(errors))
+    )
+
+    percentiles = percentile_grid(50)
+    expected = np.array(
+        [np.sort(np.abs(errors))[all_percentiles >= p - 1e-9][0] for p in percentiles]
+    )
+    np.testing.assert_array_equal(s_curve_errors(errors, percentiles), expected)
+
+
+def test_iter_s_curves():
+
+    true, predicted = _true_predicted()
+    s_curves = list(iter_s_curves(true, predicted, percentile_grid(100)))
+
+    assert [(c.type_, c.atom) for c in s_curves] == [
+        ("iqa", "O1"),
+        ("iqa", "H2"),
+        ("iqa", "H3"),
+        ("iqa", "Total"),
+        ("q00", "O1"),
+        ("q00", "H2"),
+        ("q00", "H3"),
+        ("q00", "Total"),
+    ]
+
+    iqa_errors = np.abs(true["O1"]["iqa"] - predicted["O1"]["iqa"]) * ha_to_kj_mol
+    assert s_curves[0].npoints == 1000
+    assert s_curves[0].errors.shape == (100,)
+    np.testing.assert_allclose(s_curves[0].errors[-1], iqa_errors.max())
+    np.testing.assert_allclose(s_curves[0].mae, iqa_errors.mean())
+    np.testing.assert_allclose(s_curves[0].rmse, np.sqrt(np.mean(iqa_errors**2)))
+
+    total_errors = sum(
+        np.abs(true[atom]["q00"] - predicted[atom]["q00"]) for atom in true.columns
+    )
+    np.testing.assert_allclose(s_curves[-1].mae, total_errors.mean())
+
+
+@pytest.mark.parametrize("suffix", [".xlsx", ".csv", ".parquet", ".png"])
+def test_write_s_curves(tmp_path, suffix):
+
+    true, predicted = _true_predicted()
+    output = tmp_path / f"s_curves{suffix}"
+
+    summary = write_s_curves(true, predicted, output, percentiles=percentile_grid(20))
+    assert output.exists()
+
+    s_curves = list(iter_s_curves(true, predicted, percentile_grid(20)))
+    assert list(summary["atom"]) == [c.atom for c in s_curves]
+    np.testing.assert_allclose(summary["rmse"], [c.rmse for c in s_curves])
+
+    if suffix in (".csv", ".parquet"):
+        if suffix == ".csv":
+            df = pd.read_csv(output)
+            written_summary = pd.read_csv(tmp_path / "s_curves_summary.csv")
+        else:
+            df = pd.read_parquet(output)
+            written_summary = pd.read_parquet(tmp_path / "s_curves_summary.parquet")
+        assert len(df) == len(s_curves) * 20
+        np.testing.assert_allclose(
+            df.loc[(df["property"] == "iqa") & (df["atom"] == "H2"), "error"],
+            s_curves[1].errors,
+        )
+        pd.testing.assert_frame_equal(written_summary, summary)
+
+
+def test_write_s_curves_kwargs(tmp_path):
+
+    true, predicted = _true_predicted()
+
+    # the excel chart settings are not passed to the plot
+    write_s_curves(
+        true,
+        predicted,
+        tmp_path / "s_curves.png",
+        percentiles=percentile_grid(20),
+        excel_style=2,
+        dpi=50,
+    )
+    assert (tmp_path / "s_curves.png").exists()
+
+    with pytest.raises(TypeError):
+        write_s_curves(true, predicted, tmp_path / "s_curves.xlsx", excel_styl=2)
+
+
+def _sheet_names(path) -> list:
+    import re
+    import zipfile
+
+    with zipfile.ZipFile(path) as f:
+        return re.findall(r'<sheet name="([^"]+)"', f.read("xl/workbook.xml").decode())
+
+
+def test_calculate_s_curves_excel_layout(tmp_path, monkeypatch):
+
+    import ichor.core.analysis.s_curves.s_curves as s_curves_module
+
+    true, predicted = _true_predicted(50)
+    monkeypatch.setattr(s_curves_module, "Models", lambda path: path)
+    monkeypatch.setattr(
+        s_curves_module, "get_true_predicted", lambda *args: (true, predicted)
+    )
+
+    # every point is written by default, with a sheet for every atom and property
+    calculate_s_curves("models", "validation", tmp_path / "s_curves.xlsx")
+    assert _sheet_names(tmp_path / "s_curves.xlsx") == [
+        "O1_iqa",
+        "H2_iqa",
+        "H3_iqa",
+        "Total_iqa",
+        "O1_q00",
+        "H2_q00",
+        "H3_q00",
+        "Total_q00",
+    ]
+
+    calculate_s_curves(
+        "models",
+        "validation",
+        tmp_path / "percentile_s_curves.xlsx",
+        percentile_s_curves=True,
+        percentiles=percentile_grid(20),
+    )
+    assert _sheet_names(tmp_path / "percentile_s_curves.xlsx") == ["iqa", "q00"]
+
+
+def test_plot_s_curves_keeps_backend(tmp_path):
+
+    import matplotlib
+
+    # plotting must not switch the backend of the caller, e.g. of a notebook
+    backend = matplotlib.get_backend()
+    matplotlib.use("svg")
+    try:
+        true, predicted = _true_predicted()
+        write_s_curves(
+            true, predicted, tmp_path / "s_curves.png", percentiles=percentile_grid(20)
+        )
+        assert (tmp_path / "s_curves.png").exists()
+        assert matplotlib.get_backend() == "svg"
+    finally:
+        matplotlib.use(backend)
+
+
+def test_write_s_curves_unknown_format(tmp_path):
+
+    true, predicted = _true_predicted()
+    with pytest.raises(ValueError):
+        write_s_curves(true, predicted, tmp_path / "s_curves.txt")
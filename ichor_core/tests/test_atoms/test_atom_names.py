@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+from ichor.core.atoms import Atom, Atoms
+from ichor.core.files import Trajectory
+
+
+def _water() -> Atoms:
+    return Atoms(
+        [
+            Atom("O", 0.0, 0.0, 0.0),
+            Atom("H", 0.96, 0.0, 0.0),
+            Atom("H", -0.24, 0.93, 0.0),
+        ]
+    )
+
+
+def test_index_by_name():
+
+    atoms = _water()
+    assert atoms["O1"] is atoms[0]
+    assert atoms["h3"] is atoms[2]
+    assert atoms.index_of("H2") == 1
+    with pytest.raises(KeyError):
+        atoms["C4"]
+
+
+def test_index_by_name_after_modification():
+
+    atoms = _water()
+    # make the map from names to positions
+    assert atoms["H3"] is atoms[2]
+
+    atoms.append(Atom("C", 1.0, 1.0, 1.0))
+    assert atoms["C4"] is atoms[3]
+
+    del atoms["H2"]
+    assert atoms.atom_names == ["O1", "H3", "C4"]
+    assert atoms["C4"] is atoms[2]
+
+    atoms.reverse()
+    assert atoms["O1"] is atoms[2]
+
+    atoms[0].index = 10
+    assert atoms["C10"] is atoms[0]
+    with pytest.raises(KeyError):
+        atoms["C4"]
+
+
+def test_subtract_atoms():
+
+    atoms = _water()
+    atoms - Atoms(
+        [Atom("H", 0.0, 0.0, 0.0, index=2), Atom("H", 0.0, 0.0, 0.0, index=3)]
+    )
+    assert atoms.atom_names == ["O1"]
+    assert atoms["O1"] is atoms[0]
+
+
+def test_atom_view():
+
+    trajectory = Trajectory("atom_view_test.xyz")
+    for shift in range(5):
+        atoms = _water()
+        atoms.translate(np.array([shift, 0.0, 0.0]))
+        trajectory.append(atoms)
+
+    atom_view = trajectory["H2"]
+    assert len(atom_view) == 5
+    # the atoms in the view are the atoms of the trajectory, not copies
+    assert all(atom is timestep[1] for atom, timestep in zip(atom_view, trajectory))
+    assert np.allclose(atom_view.coordinates, trajectory.coordinates[:, 1])
+    assert atom_view[1:3] == [trajectory[1][1], trajectory[2][1]]
+
+    # the view looks up the atoms in the trajectory, so it sees timesteps added later
+    trajectory.append(_water())
+    assert len(atom_view) == 6
+    assert atom_view[-1] is trajectory[-1][1]
+    assert atom_view.coordinates.shape == (6, 3)
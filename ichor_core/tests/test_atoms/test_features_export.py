@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+from ichor.core.calculators import calculate_alf_features, default_alf_calculator
+from ichor.core.files import GJF
+
+from tests.path import get_cwd
+
+example_dir = get_cwd(__file__) / ".." / ".." / ".." / "example_files"
+paracetamol = GJF(example_dir / "example_gjfs" / "paracetamol_standard.gjf").atoms
+
+
+def test_features_by_atom(perturbed_geometries):
+
+    trajectory = perturbed_geometries(paracetamol, 5, scale=0.02)
+    alf = trajectory.alf(default_alf_calculator)
+
+    features = trajectory.features_by_atom(calculate_alf_features, alf)
+    assert list(features) == trajectory.atom_names
+
+    for atom_name, atom_features in features.items():
+        np.testing.assert_allclose(
+            atom_features,
+            trajectory[atom_name].features(calculate_alf_features, alf),
+            rtol=1e-12,
+            atol=1e-12,
+        )
+
+
+@pytest.mark.parametrize("ncores", [1, 2])
+def test_features_to_csv(tmp_path, monkeypatch, ncores, perturbed_geometries):
+
+    trajectory = perturbed_geometries(paracetamol, 5, scale=0.02)
+    alf = trajectory.alf(default_alf_calculator)
+    expected = trajectory["C3"].features(calculate_alf_features, alf)
+
+    monkeypatch.chdir(tmp_path)
+    paths = {}
+    for file_format in ["csv", "npz", "parquet"]:
+        paths[file_format] = trajectory.features_to_csv(
+            calculate_alf_features,
+            alf,
+            fname="traj",
+            atom_names=["O8", "C3"],
+            file_format=file_format,
+            ncores=ncores,
+        )
+
+    assert [p.name for p in paths["csv"]] == [
+        "traj_O8_features.csv",
+        "traj_C3_features.csv",
+    ]
+
+    df = pd.read_csv(paths["csv"][1])
+    assert list(df.columns) == trajectory.get_headings()
+    np.testing.assert_allclose(df.to_numpy(), expected, rtol=1e-12)
+
+    npz = np.load(paths["npz"][1])
+    assert list(npz["headings"]) == trajectory.get_headings()
+    np.testing.assert_allclose(npz["features"], expected, rtol=1e-12)
+
+    df = pd.read_parquet(paths["parquet"][1])
+    assert list(df.columns) == trajectory.get_headings()
+    np.testing.assert_allclose(df.to_numpy(), expected, rtol=1e-12)
+
+    with pytest.raises(ValueError):
+        trajectory.features_to_csv(calculate_alf_features, alf, file_format="xlsx")
@@ -0,0 +1,124 @@
+import numpy as np
+import pytest
+from ichor.core.atoms import Atom, Atoms
+from ichor.core.calculators import (
+    align_coordinates,
+    calculate_rmsd,
+    calculate_rmsd_matrix,
+    kabsch_rotations,
+)
+from ichor.core.files import Trajectory
+
+
+def _random_rotations(n: int, rng) -> np.ndarray:
+    Q, _ = np.linalg.qr(rng.normal(size=(n, 3, 3)))
+    # make the rotations proper rotations
+    Q[:, :, 0] *= np.sign(np.linalg.det(Q))[:, np.newaxis]
+    return Q
+
+
+@pytest.fixture
+def frames():
+    rng = np.random.default_rng(0)
+    reference = rng.normal(size=(7, 3))
+    rotations = _random_rotations(12, rng)
+    noise = 0.05 * rng.normal(size=(12, 7, 3))
+    translations = rng.normal(size=(12, 1, 3))
+    coordinates = (reference + noise) @ rotations.transpose(0, 2, 1) + translations
+    return reference, coordinates
+
+
+def test_kabsch_rotations_are_proper(frames):
+
+    reference, coordinates = frames
+    R = kabsch_rotations(reference, coordinates)
+
+    np.testing.assert_allclose(
+        R @ R.transpose(0, 2, 1), np.broadcast_to(np.eye(3), R.shape), atol=1e-12
+    )
+    np.testing.assert_allclose(np.linalg.det(R), 1.0)
+
+    # a mirror image can not be aligned by a rotation
+    mirror = reference * [-1.0, 1.0, 1.0]
+    assert np.linalg.det(kabsch_rotations(reference, mirror)[0]) == pytest.approx(1.0)
+    assert calculate_rmsd(reference, mirror)[0] > 0.1
+
+
+@pytest.mark.parametrize("masses", [None, np.arange(1.0, 8.0)])
+def test_rmsd_matches_aligned_coordinates(frames, masses):
+
+    reference, coordinates = frames
+    aligned = align_coordinates(reference, coordinates, masses)
+
+    weights = np.ones(7) if masses is None else masses
+    expected = np.sqrt(
+        np.sum(weights * np.sum((aligned - reference) ** 2, axis=-1), axis=-1)
+        / weights.sum()
+    )
+
+    np.testing.assert_allclose(calculate_rmsd(reference, coordinates, masses), expected)
+    # the geometries are the reference plus noise, so they are aligned close to the reference
+    assert np.all(expected < 0.2)
+
+
+def test_rmsd_matrix(frames):
+
+    _, coordinates = frames
+    # a small budget so that the matrix is calculated in many blocks
+    matrix = calculate_rmsd_matrix(coordinates, memory_budget=1000)
+
+    np.testing.assert_allclose(matrix, matrix.T)
+    np.testing.assert_array_equal(np.diag(matrix), 0.0)
+    for i, geometry in enumerate(coordinates):
+        np.testing.assert_allclose(
+            matrix[i], calculate_rmsd(geometry, coordinates), atol=1e-7
+        )
+
+    out = np.empty((len(coordinates), len(coordinates)), dtype=np.float32)
+    calculate_rmsd_matrix(coordinates, out=out)
+    np.testing.assert_allclose(out, matrix, atol=1e-6)
+
+
+def test_trajectory_rmsd_does_not_modify(frames, tmp_path):
+
+    reference, coordinates = frames
+    trajectory = Trajectory(tmp_path / "traj.xyz")
+    for geometry in coordinates:
+        trajectory.append(Atoms([Atom("C", *xyz) for xyz in geometry]))
+    before = trajectory.coordinates.copy()
+
+    rmsd = trajectory.rmsd(3)
+    assert rmsd[3] == pytest.approx(0.0, abs=1e-6)
+    assert trajectory[0].rmsd(trajectory[3]) == pytest.approx(rmsd[0])
+    np.testing.assert_allclose(trajectory.rmsd_matrix()[3], rmsd, atol=1e-7)
+    np.testing.assert_array_equal(trajectory.coordinates, before)
+
+
+def _svd_rmsd(reference: np.ndarray, coordinates: np.ndarray) -> np.ndarray:
+    """RMSD after aligning every geometry with a plain Kabsch SVD."""
+    aligned = align_coordinates(reference, coordinates)
+    return np.sqrt(np.mean(np.sum((aligned - reference) ** 2, axis=-1), axis=-1))
+
+
+@pytest.mark.parametrize("natoms", [2, 3, 5])
+@pytest.mark.parametrize("bend", [0.0, 1e-3])
+def test_rmsd_linear_geometries(natoms, bend):
+
+    # diatomics and (nearly) linear molecules, where the largest eigenvalue is a double root
+    rng = np.random.default_rng(natoms)
+    coordinates = np.zeros((40, natoms, 3))
+    coordinates[:, :, 0] = np.cumsum(rng.uniform(1.0, 2.0, size=(40, natoms)), axis=1)
+    coordinates[:, :, 1] = bend * rng.normal(size=(40, natoms))
+    coordinates = coordinates @ _random_rotations(40, rng).transpose(
+        0, 2, 1
+    ) + rng.normal(size=(40, 1, 3))
+
+    expected = np.array([_svd_rmsd(geometry, coordinates) for geometry in coordinates])
+    np.fill_diagonal(expected, 0.0)
+
+    np.testing.assert_allclose(
+        calculate_rmsd(coordinates[0], coordinates), expected[0], atol=1e-10
+    )
+    np.testing.assert_allclose(
+        calculate_rmsd_matrix(coordinates, memory_budget=1000), expected, atol=1e-10
+    )
@@ -0,0 +1,64 @@
+import numpy as np
+from ichor.core.calculators import (
+    calculate_angle,
+    calculate_bond,
+    calculate_dihedral,
+    calculate_internal_features,
+    get_internal_feature_indices,
+    internal_feature_names,
+)
+from ichor.core.files import GJF
+
+from tests.path import get_cwd
+
+example_dir = get_cwd(__file__) / ".." / ".." / ".." / ".." / "example_files"
+paracetamol = GJF(example_dir / "example_gjfs" / "paracetamol_standard.gjf").atoms
+
+
+def test_internal_feature_indices():
+
+    bonds, angles, dihedrals = get_internal_feature_indices(paracetamol)
+    assert (len(bonds), len(angles), len(dihedrals)) == (20, 31, 34)
+
+    bond_names, angle_names, dihedral_names = internal_feature_names(paracetamol)
+    names = paracetamol.atom_names
+    assert bond_names == [f"{names[i - 1]}-{names[j - 1]}" for i, j in bonds]
+    assert angle_names[0] == "-".join(names[i - 1] for i in angles[0])
+    assert dihedral_names[-1] == "-".join(names[i - 1] for i in dihedrals[-1])
+
+
+def test_internal_features_trajectory(perturbed_geometries):
+
+    trajectory = perturbed_geometries(paracetamol, 5, scale=0.02)
+    bonds, angles, dihedrals = get_internal_feature_indices(paracetamol)
+
+    bond_values, angle_values, dihedral_values = calculate_internal_features(trajectory)
+    assert bond_values.shape == (5, len(bonds))
+    assert angle_values.shape == (5, len(angles))
+    assert dihedral_values.shape == (5, len(dihedrals))
+
+    # the same as calculating the internal coordinates one at a time
+    for atoms, timestep_bonds, timestep_angles, timestep_dihedrals in zip(
+        trajectory, bond_values, angle_values, dihedral_values
+    ):
+        np.testing.assert_allclose(
+            timestep_bonds, [calculate_bond(atoms, i - 1, j - 1) for i, j in bonds]
+        )
+        np.testing.assert_allclose(
+            timestep_angles,
+            [calculate_angle(atoms, i - 1, j - 1, k - 1) for i, j, k in angles],
+        )
+        np.testing.assert_allclose(
+            timestep_dihedrals,
+            [
+                calculate_dihedral(atoms, i - 1, j - 1, k - 1, l - 1)
+                for i, j, k, l in dihedrals
+            ],
+        )
+
+    # a single geometry gives 1d arrays
+    single = calculate_internal_features(trajectory[2])
+    for values, single_values in zip(
+        (bond_values, angle_values, dihedral_values), single
+    ):
+        np.testing.assert_allclose(values[2], single_values)
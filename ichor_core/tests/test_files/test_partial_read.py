@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+from ichor.core.files import GaussianOutput, Int, WFN
+from ichor.core.files.file import FileContents
+
+from tests.path import get_cwd
+
+example_dir = (
+    get_cwd(__file__)
+    / ".."
+    / ".."
+    / ".."
+    / "example_files"
+    / "example_points_directory"
+    / "WATER_MONOMER.pointsdir"
+    / "WATER_MONOMER0000.pointdir"
+)
+
+
+def test_int_projection():
+
+    int_path = example_dir / "WATER_MONOMER0000_atomicfiles" / "o1.int"
+    full = Int(int_path)
+    full.read()
+
+    int_file = Int(int_path).project("iqa_energy_components", "basin_integration")
+    int_file.read()
+
+    # only the projected sections have been read in
+    assert object.__getattribute__(int_file, "critical_points") is FileContents
+    assert object.__getattribute__(int_file, "global_spherical_multipoles") is (
+        FileContents
+    )
+    assert int_file.iqa == full.iqa
+    assert int_file.integration_error == full.integration_error
+    assert int_file.net_charge == full.net_charge
+
+    # skipped sections are read in when they are accessed
+    assert int_file.global_multipole_moments == full.global_multipole_moments
+    assert int_file.atom_name == full.atom_name
+    assert int_file.title == full.title
+    assert len(int_file.critical_points) == len(full.critical_points)
+
+
+def test_wfn_projection():
+
+    wfn_path = example_dir / "WATER_MONOMER0000.wfn"
+    full = WFN(wfn_path)
+    full.read()
+
+    wfn = WFN(wfn_path).project("total_energy")
+    assert wfn.total_energy == full.total_energy
+    assert wfn.virial_ratio == full.virial_ratio
+    assert object.__getattribute__(wfn, "molecular_orbitals") is FileContents
+
+    assert wfn.atoms.names == full.atoms.names
+    assert np.allclose(wfn.atoms.coordinates, full.atoms.coordinates)
+    assert wfn.n_primitives == full.n_primitives
+    assert [mo.primitives for mo in wfn.molecular_orbitals] == [
+        mo.primitives for mo in full.molecular_orbitals
+    ]
+
+
+def test_gaussian_output_projection():
+
+    gau_path = example_dir / "WATER_MONOMER0000.gaussianoutput"
+    full = GaussianOutput(gau_path)
+    full.read()
+
+    gau = GaussianOutput(gau_path).project("forces")
+    assert gau.global_forces.keys() == full.global_forces.keys()
+    for atom_name, force in gau.global_forces.items():
+        assert np.allclose(force, full.global_forces[atom_name])
+    assert object.__getattribute__(gau, "atoms") is FileContents
+
+    assert gau.atoms.names == full.atoms.names
+    assert gau.charge == full.charge
+    assert gau.molecular_dipole == full.molecular_dipole
+
+
+def test_unknown_section():
+
+    with pytest.raises(ValueError):
+        WFN(example_dir / "WATER_MONOMER0000.wfn").project("not_a_section")
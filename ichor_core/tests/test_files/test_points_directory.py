@@ -755,3 +755,60 @@ def _test_points_directory(
 def test_water_monomer_point_directory1():
 
     _test_points_directory(example_dir)
+
+
+def test_features_with_wfn_energy_and_dE_df_to_csv(tmp_path, monkeypatch):
+
+    import pandas as pd
+    from ichor.core.calculators import calculate_alf_features, default_alf_calculator
+    from ichor.core.models.gaussian_energy_derivative_wrt_features import (
+        convert_to_feature_forces,
+        form_b_matrix,
+    )
+
+    points_dir = PointsDirectory(example_dir)
+    alf_list = points_dir[0].xyz.atoms.alf(default_alf_calculator)
+
+    monkeypatch.chdir(tmp_path)
+    points_dir.features_with_wfn_energy_and_dE_df_to_csv(alf_list, [0, 1, 2])
+    fnames = [
+        "O1_features_with_dE_df.csv",
+        "H2_features_with_dE_df.csv",
+        "H3_features_with_dE_df.csv",
+    ]
+
+    for central_atom_idx, fname in enumerate(fnames):
+        df = pd.read_csv(fname)
+        assert list(df.columns) == [
+            "f1",
+            "f2",
+            "f3",
+            "wfn_energy",
+            "-dEdf1",
+            "-dEdf2",
+            "-dEdf3",
+        ]
+
+        # the same as calculating everything one point at a time
+        for point_dir, row in zip(points_dir, df.to_numpy()):
+            atoms = point_dir.xyz.atoms
+            cart_forces = np.array(
+                list(point_dir.gaussian_output.global_forces.values())
+            )
+            features = atoms[central_atom_idx].features(
+                calculate_alf_features, alf_list
+            )
+            dE_df = convert_to_feature_forces(
+                cart_forces, form_b_matrix(atoms, alf_list, central_atom_idx)
+            )
+            np.testing.assert_allclose(
+                row, [*features, point_dir.wfn.total_energy, *dE_df], rtol=1e-8
+            )
+
+    # a single central atom, the other key word arguments are passed to to_csv
+    points_dir.features_with_wfn_energy_and_dE_df_to_csv(
+        alf_list, 1, str_to_append_to_fname="_forces.csv", float_format="%.3f"
+    )
+    np.testing.assert_allclose(
+        pd.read_csv("H2_forces.csv"), pd.read_csv(fnames[1]), atol=1e-3
+    )
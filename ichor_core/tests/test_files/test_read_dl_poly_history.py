@@ -0,0 +1,129 @@
+import numpy as np
+from ichor.core.analysis.trajectory_analysis import TrajectoryAnalysis
+from ichor.core.files import DlPolyHistory, DlPolyHistoryIndex, Trajectory
+
+NFRAMES = 6
+ATOM_TYPES = ["O", "H", "H"]
+
+
+def _write_history(path, coordinates, corrupted_timesteps=()):
+    """Writes a HISTORY file containing coordinates, velocities and forces (trajectory key 2).
+    The velocities and forces are 2 and 3 times the coordinates."""
+
+    nframes, natoms, _ = coordinates.shape
+    with open(path, "w") as f:
+        f.write(f"{'test':<72s}\n")
+        f.write(f"{2:>10d}{1:>10d}{natoms:>10d}{nframes:>21d}{0:>21d}\n")
+        for t in range(nframes):
+            # FFLUX sometimes writes binary to the HISTORY file
+            if t in corrupted_timesteps:
+                f.write("\x00\x00\x00")
+            f.write(f"timestep{t:>20d}{natoms:>10d}{2:>10d}{1:>10d}")
+            f.write(f"{0.0005:>20.6f}{t * 0.0005:>20.6f}\n")
+            for cell_vector in np.eye(3) * 20.0:
+                f.write("".join(f"{v:>20.10f}" for v in cell_vector) + "\n")
+            for a in range(natoms):
+                f.write(f"{ATOM_TYPES[a]:<8s}{a + 1:>10d}{1.0:>12.6f}{0.0:>12.6f}\n")
+                for factor in range(1, 4):
+                    f.write(
+                        "".join(f"{v * factor:>20.10E}" for v in coordinates[t, a])
+                        + "\n"
+                    )
+
+
+def test_history_index(tmp_path):
+    coordinates = np.random.default_rng(0).normal(size=(NFRAMES, 3, 3))
+    path = tmp_path / "HISTORY"
+    _write_history(path, coordinates, corrupted_timesteps=(3,))
+
+    history_index = DlPolyHistoryIndex(path)
+
+    assert len(history_index) == NFRAMES - 1
+    np.testing.assert_array_equal(history_index.existing_timesteps, [0, 1, 2, 4, 5])
+    np.testing.assert_array_equal(history_index.removed_timesteps, [3])
+    assert history_index.atom_types == ATOM_TYPES
+
+    frames = history_index[1:4]
+    assert frames.coordinates.shape == (3, 3, 3)
+    np.testing.assert_array_equal(frames.ntimestep, [1, 2, 4])
+    np.testing.assert_allclose(frames.coordinates, coordinates[[1, 2, 4]])
+    np.testing.assert_allclose(frames.velocities, 2 * coordinates[[1, 2, 4]])
+    np.testing.assert_allclose(frames.forces, 3 * coordinates[[1, 2, 4]])
+    np.testing.assert_allclose(frames.cell, np.tile(np.eye(3) * 20.0, (3, 1, 1)))
+
+    chunks = list(history_index.iter_frames(chunk_nframes=2))
+    assert [len(c) for c in chunks] == [2, 2, 1]
+    np.testing.assert_allclose(
+        np.concatenate([c.coordinates for c in chunks]), coordinates[[0, 1, 2, 4, 5]]
+    )
+
+
+def test_history_timesteps_and_trajectory(tmp_path):
+    coordinates = np.random.default_rng(1).normal(size=(NFRAMES, 3, 3))
+    path = tmp_path / "HISTORY"
+    _write_history(path, coordinates, corrupted_timesteps=(0,))
+
+    history = DlPolyHistory(path)
+
+    assert len(history) == NFRAMES - 1
+    assert history.removed_timesteps == [0]
+    assert history[0].ntimestep == 1
+    np.testing.assert_allclose(history.coordinates, coordinates[1:])
+    np.testing.assert_allclose(history[0][1].force, 3 * coordinates[1, 1])
+
+    xyz_path = tmp_path / "TRAJECTORY.xyz"
+    DlPolyHistory(path).write_to_trajectory(xyz_path)
+    trajectory = Trajectory(xyz_path)
+    np.testing.assert_allclose(trajectory.coordinates, coordinates[1:], atol=1e-10)
+
+
+def test_random_geometries_from_fflux_simulation(tmp_path, monkeypatch):
+    from ichor.core.analysis.dlpoly.true_vs_predicted import (
+        get_random_geometries_from_fflux_simulation,
+    )
+
+    coordinates = np.random.default_rng(2).normal(size=(NFRAMES, 3, 3))
+    path = tmp_path / "HISTORY"
+    _write_history(path, coordinates, corrupted_timesteps=(2,))
+
+    energies = -76.0 - 0.001 * np.arange(NFRAMES)
+    with open(tmp_path / "FFLUX", "w") as f:
+        f.write("FFLUX\n# step E_IQA E_vdW E_coul E_kin\n")
+        for t, energy in enumerate(energies):
+            f.write(
+                f"{t:>10d} {energy:>20.10f} {0.0:>12.6f} {0.0:>12.6f} {0.0:>12.6f}\n"
+            )
+
+    monkeypatch.chdir(tmp_path)
+    trajectory = get_random_geometries_from_fflux_simulation(
+        path, k=3, fflux_file=tmp_path / "FFLUX", seed=0
+    )
+
+    indices = np.loadtxt("3_random_indices_from_trajectory.txt", dtype=int)
+    timesteps = np.array([0, 1, 3, 4, 5])[indices]
+    assert len(trajectory) == 3
+    np.testing.assert_allclose(
+        trajectory.coordinates, coordinates[timesteps], atol=1e-10
+    )
+    np.testing.assert_allclose(
+        np.load("3_total_predicted_energies_from_simulation_hartree.npy"),
+        energies[timesteps],
+    )
+
+
+def test_trajectory_analysis_distances(tmp_path):
+    coordinates = np.random.default_rng(2).normal(size=(NFRAMES, 3, 3))
+    path = tmp_path / "HISTORY"
+    _write_history(path, coordinates)
+
+    distances = TrajectoryAnalysis(path).distances_vectors
+    assert distances.shape == (NFRAMES, 3)
+    np.testing.assert_allclose(
+        distances[:, 0], np.linalg.norm(coordinates[:, 0] - coordinates[:, 1], axis=-1)
+    )
+
+    # a HISTORY file which does not contain any frames yet
+    _write_history(path, coordinates[:0])
+    trajectory_analysis = TrajectoryAnalysis(path)
+    assert trajectory_analysis._natoms == 3
+    assert trajectory_analysis.distances_vectors.shape == (0, 3)
@@ -0,0 +1,103 @@
+import numpy as np
+from ichor.core.analysis.dlpoly.mae_forces import calculate_mae_forces
+from ichor.core.files import DlPolyIQAEnergies, DlPolyIQAForces
+
+NTIMESTEPS = 7
+NATOMS = 4
+
+
+def _write_iqa_forces(path, forces, incomplete_last_timestep=False):
+    with open(path, "w") as f:
+        for timestep in forces:
+            for i, atom_forces in enumerate(timestep, start=1):
+                f.write(f"{i:>6d} {' '.join(f'{x:.12E}' for x in atom_forces)}\n")
+        if incomplete_last_timestep:
+            f.write(f"{1:>6d} 1.0 2.0 3.0\n")
+
+
+def _write_iqa_energies(path, energies, order):
+    with open(path, "w") as f:
+        for timestep in energies:
+            # FFLUX does not write energies in order when OpenMP is used
+            for i in order:
+                f.write(f"{i + 1:>6d} {timestep[i]:.12E}\n")
+
+
+def test_read_iqa_forces(tmp_path):
+    forces = np.random.default_rng(0).normal(size=(NTIMESTEPS, NATOMS, 3))
+    path = tmp_path / "IQA_FORCES"
+    _write_iqa_forces(path, forces, incomplete_last_timestep=True)
+
+    iqa_forces = DlPolyIQAForces(path, chunk_ntimesteps=3)
+
+    assert iqa_forces.natoms == NATOMS
+    assert iqa_forces.forces.shape == (NTIMESTEPS, NATOMS, 3)
+    np.testing.assert_allclose(iqa_forces.forces, forces)
+
+
+def test_iqa_forces_streaming_and_cache(tmp_path):
+    forces = np.random.default_rng(1).normal(size=(NTIMESTEPS, NATOMS, 3))
+    forces[2] *= 1e-5
+    forces[5] *= 1e-5
+    path = tmp_path / "IQA_FORCES"
+    _write_iqa_forces(path, forces)
+
+    iqa_forces = DlPolyIQAForces(path, chunk_ntimesteps=2)
+    chunks = list(iqa_forces.iter_forces())
+    assert [c.shape[0] for c in chunks] == [2, 2, 2, 1]
+    np.testing.assert_allclose(np.concatenate(chunks), forces)
+    np.testing.assert_array_equal(iqa_forces.check_forces_less_than_value(), [2, 5])
+
+    cached = DlPolyIQAForces(path, use_cache=True, chunk_ntimesteps=2)
+    assert isinstance(cached.forces, np.memmap)
+    assert cached.cache_path.exists()
+    np.testing.assert_allclose(cached.forces, forces)
+    np.testing.assert_array_equal(cached.check_forces_less_than_value(), [2, 5])
+    # the cache is not picked up as an IQA_FORCES file
+    assert not DlPolyIQAForces.check_path(cached.cache_path)
+
+    np.testing.assert_allclose(
+        calculate_mae_forces(cached.forces, np.zeros_like(forces), chunk_ntimesteps=3),
+        np.mean(np.abs(forces), axis=0),
+    )
+
+
+def test_read_iqa_energies_unordered(tmp_path):
+    energies = np.random.default_rng(2).normal(size=(NTIMESTEPS, NATOMS))
+    path = tmp_path / "IQA_ENERGIES"
+    _write_iqa_energies(path, energies, order=[2, 0, 3, 1])
+
+    iqa_energies = DlPolyIQAEnergies(path, chunk_ntimesteps=3)
+
+    assert iqa_energies.natoms == NATOMS
+    np.testing.assert_allclose(iqa_energies.energies, energies)
+    np.testing.assert_allclose(
+        DlPolyIQAEnergies(path, use_cache=True).energies, energies
+    )
+
+
+def test_iqa_forces_cache_with_blank_lines(tmp_path):
+    forces = np.random.default_rng(3).normal(size=(NTIMESTEPS, NATOMS, 3))
+    path = tmp_path / "IQA_FORCES"
+    _write_iqa_forces(path, forces, incomplete_last_timestep=True)
+    # blank lines between timesteps make the preallocated cache too long
+    with open(path, "a") as f:
+        f.write("\n" * (2 * NATOMS))
+
+    cached = DlPolyIQAForces(path, use_cache=True, chunk_ntimesteps=3)
+    assert cached.forces.shape == (NTIMESTEPS, NATOMS, 3)
+    np.testing.assert_allclose(cached.forces, forces)
+
+    # the trimmed cache is reloaded and no temporary files are left behind
+    reloaded = DlPolyIQAForces(path, use_cache=True)
+    assert reloaded.cache_is_valid()
+    assert np.load(reloaded.cache_path, mmap_mode="r").shape == (
+        NTIMESTEPS,
+        NATOMS,
+        3,
+    )
+    np.testing.assert_allclose(reloaded.forces, forces)
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        cached.cache_path.name,
+        "IQA_FORCES",
+    ]
@@ -0,0 +1,158 @@
+import os
+import shutil
+import sqlite3
+
+import pytest
+from ichor.core.files import PointsDirectory
+
+from tests.path import get_cwd
+
+example_dir = (
+    get_cwd(__file__)
+    / ".."
+    / ".."
+    / ".."
+    / "example_files"
+    / "example_points_directory"
+    / "WATER_MONOMER.pointsdir"
+)
+
+ROWS_QUERY = (
+    "SELECT points.name, points.wfn_energy, dataset.x, dataset.iqa, dataset.q00 "
+    "FROM dataset JOIN points ON points.id = dataset.point_id ORDER BY points.name, dataset.atom_id"
+)
+
+
+def _count(db_path, table: str) -> int:
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+def _rows(db_path) -> list:
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute(ROWS_QUERY).fetchall()
+
+
+@pytest.fixture
+def points_dir(tmp_path, monkeypatch):
+    shutil.copytree(example_dir, tmp_path / "WATER_MONOMER.pointsdir")
+    monkeypatch.chdir(tmp_path)
+    return PointsDirectory(tmp_path / "WATER_MONOMER.pointsdir")
+
+
+@pytest.mark.parametrize("ncores", [1, 2])
+def test_incremental_sync(points_dir, ncores):
+
+    db_path = points_dir.write_to_sqlite3_database(
+        "water", print_missing_data=False, ncores=ncores
+    )
+    rows = _rows(db_path)
+    assert len(rows) == 12
+    assert _count(db_path, "point_fingerprints") == 4
+
+    # nothing changed, so the database is the same
+    points_dir.write_to_sqlite3_database(
+        "water", print_missing_data=False, ncores=ncores
+    )
+    assert _rows(db_path) == rows
+
+    # a changed point is replaced
+    wfn = next((points_dir[2].path).glob("*.wfn"))
+    stat = wfn.stat()
+    os.utime(wfn, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    points_dir.write_to_sqlite3_database(
+        "water", print_missing_data=False, ncores=ncores
+    )
+    assert _count(db_path, "points") == 4
+    assert _count(db_path, "point_fingerprints") == 4
+    assert _rows(db_path) == rows
+
+
+def test_sync_database_without_fingerprints(points_dir):
+
+    db_path = points_dir.write_to_sqlite3_database(
+        "water", print_missing_data=False, incremental=False
+    )
+    rows = _rows(db_path)
+
+    # the points are added again if the database is not synced incrementally
+    points_dir.write_to_sqlite3_database(
+        "water", print_missing_data=False, incremental=False
+    )
+    assert _count(db_path, "points") == 8
+
+    # the duplicated points without fingerprints are replaced
+    points_dir.write_to_sqlite3_database("water", print_missing_data=False)
+    assert _count(db_path, "points") == 4
+    assert _rows(db_path) == rows
+
+
+def test_sync_counts_unreadable_points(points_dir, tmp_path):
+
+    from ichor.core.database.sql import (
+        add_atom_names_to_database,
+        create_database,
+        create_database_session,
+        sync_points_to_database,
+    )
+
+    db_path = tmp_path / "water.sqlite"
+    create_database(db_path)
+    session = create_database_session(db_path)
+    add_atom_names_to_database(session, points_dir.atom_names)
+
+    # a .sh file is left behind when AIMAll crashed, so the point is not added
+    sh_file = points_dir[1].path / "AIMAll.sh"
+    sh_file.touch()
+    assert sync_points_to_database(session, points_dir, print_missing_data=False) == (
+        3,
+        0,
+        1,
+    )
+    # the point that could not be added is read again, it is not counted as unchanged
+    assert sync_points_to_database(session, points_dir, print_missing_data=False) == (
+        0,
+        3,
+        1,
+    )
+
+    sh_file.unlink()
+    assert sync_points_to_database(session, points_dir, print_missing_data=False) == (
+        1,
+        3,
+        0,
+    )
+    assert _count(db_path, "points") == 4
+
+
+def test_sync_moved_points_directory(points_dir, tmp_path):
+
+    db_path = points_dir.write_to_sqlite3_database(
+        tmp_path / "water", print_missing_data=False
+    )
+    rows = _rows(db_path)
+
+    # the points of a moved PointsDirectory are not added again
+    moved_dir = tmp_path / "moved"
+    moved_dir.mkdir()
+    shutil.copytree(points_dir.path, moved_dir / points_dir.path.name)
+    PointsDirectory(moved_dir / points_dir.path.name).write_to_sqlite3_database(
+        tmp_path / "water", print_missing_data=False
+    )
+    assert _count(db_path, "points") == 4
+    assert _rows(db_path) == rows
+
+
+def test_sync_removes_unreadable_points(points_dir, tmp_path):
+
+    db_path = points_dir.write_to_sqlite3_database(
+        tmp_path / "water", print_missing_data=False
+    )
+    assert _count(db_path, "points") == 4
+
+    # the point in the database can no longer be read, so its rows are removed
+    (points_dir[1].path / "AIMAll.sh").touch()
+    points_dir.write_to_sqlite3_database(tmp_path / "water", print_missing_data=False)
+    assert _count(db_path, "points") == 3
+    assert _count(db_path, "dataset") == 9
+    assert _count(db_path, "point_fingerprints") == 3
@@ -0,0 +1,56 @@
+import numpy as np
+from ichor.core.atoms import Atom, Atoms
+from ichor.core.files import PointsDirectory, PointsDirectoryParent, Trajectory, XYZ
+
+
+def _make_trajectory(path, ngeometries: int) -> Trajectory:
+    coordinates = np.random.default_rng(0).normal(size=(ngeometries, 3, 3))
+    trajectory = Trajectory(path)
+    for geometry in coordinates:
+        trajectory.append(
+            Atoms([Atom(ty, x, y, z) for ty, (x, y, z) in zip("OHH", geometry)])
+        )
+    return trajectory
+
+
+def test_to_dir(tmp_path, monkeypatch):
+
+    trajectory = _make_trajectory(tmp_path / "water.xyz", 10)
+
+    monkeypatch.chdir(tmp_path)
+    root_path = trajectory.to_dir("water", every=3, nthreads=2)
+
+    # the PointDirectory-like directories are written directly
+    point_dirs = sorted(p.name for p in root_path.iterdir())
+    assert point_dirs == [f"WATER000{i}.pointdir" for i in (0, 3, 6, 9)]
+
+    # the .xyz files are the same as the ones written by XYZ
+    reference = XYZ(tmp_path / "WATER0003.xyz", trajectory[3])
+    reference.write()
+    written = root_path / "WATER0003.pointdir" / "WATER0003.xyz"
+    assert written.read_text() == reference.path.read_text()
+
+    points = PointsDirectory(root_path)
+    np.testing.assert_allclose(
+        points.coordinates, trajectory.coordinates[::3], atol=1e-7
+    )
+
+
+def test_to_dirs(tmp_path, monkeypatch):
+
+    trajectory = _make_trajectory(tmp_path / "water.xyz", 7)
+
+    monkeypatch.chdir(tmp_path)
+    root_path = trajectory.to_dirs("water", split_size=3, center=True, nthreads=2)
+
+    parent = PointsDirectoryParent(root_path)
+    assert [len(points_dir) for points_dir in parent] == [3, 3, 1]
+
+    centered = trajectory.coordinates - trajectory.coordinates.mean(
+        axis=1, keepdims=True
+    )
+    np.testing.assert_allclose(
+        np.concatenate([points_dir.coordinates for points_dir in parent]),
+        centered,
+        atol=1e-7,
+    )
@@ -1,5 +1,10 @@
 from ichor.core.atoms import Atom, Atoms
 from ichor.core.files import GJF
+from ichor.core.files.gaussian import GJFTemplate
+
+from tests.path import get_cwd
+
+example_dir = get_cwd(__file__) / ".." / ".." / ".." / "example_files"
 
 # TODO: the wfn path that is written to file is relative, so cannot have
 # that part in the gjfs (as tmp directory path is random)
@@ -168,3 +173,33 @@ def test_method(tmp_path):
     gjf_file.write()
 
     _test_write_gjf(gjf_file, gjf_file_contents)
+
+
+def test_gjf_template(tmp_path):
+
+    d = tmp_path / "gjf"
+    d.mkdir()
+
+    geometries = [
+        [("O", 0.0, 0.0, 0.1), ("H", 0.9, 0.1, -0.2), ("H", -0.3, 0.8, 0.4)],
+        [("O", 0.1, -0.1, 0.0), ("H", 1.0, 0.2, -0.1), ("H", -0.2, 0.9, 0.3)],
+    ]
+    kwargs = dict(method="pbe1pbe", basis_set="aug-cc-pvtz", link0=["Mem=1GB"])
+
+    gjf_template = GJFTemplate(**kwargs)
+
+    for i, geometry in enumerate(geometries):
+
+        gjf_file = GJF(
+            d / f"WATER{i}.gjf",
+            atoms=Atoms([Atom(*atom) for atom in geometry]),
+            **dict(kwargs, link0=list(kwargs["link0"])),
+        )
+        gjf_file.write()
+
+        atom_types = [atom[0] for atom in geometry]
+        coordinates = [atom[1:] for atom in geometry]
+
+        _test_write_gjf(
+            gjf_file, gjf_template.render(gjf_file.path, atom_types, coordinates)
+        )
@@ -0,0 +1,36 @@
+import subprocess
+import sys
+
+import pytest
+
+# optional dependencies which should only be imported inside the functions that need them
+HEAVY_MODULES = ["pandas", "matplotlib", "sqlalchemy", "xlsxwriter", "ase"]
+
+
+def _modules_imported_by(statement: str):
+    """Runs an import statement in a new interpreter (so that modules imported
+    by other tests are not counted) and returns the heavy modules that were imported."""
+
+    code = (
+        f"import sys\n{statement}\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout.strip()
+
+    return [m for m in out.split(",") if m]
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "import ichor.core",
+        "from ichor.core.files import PointsDirectory",
+        "from ichor.core.files import Trajectory, XYZ",
+        "import ichor.core.analysis",
+    ],
+)
+def test_import_does_not_load_heavy_dependencies(statement: str):
+
+    assert _modules_imported_by(statement) == []
@@ -0,0 +1,109 @@
+import numpy as np
+from ichor.core.calculators import calculate_alf_atom_sequence, calculate_alf_features
+from ichor.core.models.calculate_fflux_derivatives import (
+    fflux_derivs,
+    fflux_predict_value,
+    fflux_predict_values_and_gradients,
+)
+from ichor.core.models.models import Models
+from ichor.core.models.predict_forces_for_all_atoms import (
+    predict_fflux_energies_and_forces,
+    predict_fflux_forces_for_all_atoms,
+    predict_fflux_forces_for_many_geometries,
+)
+
+from tests.path import get_cwd
+
+example_dir = get_cwd(__file__) / ".." / ".." / ".." / "example_files"
+
+
+def _pair_by_pair_forces(atoms, models, system_alf):
+    """The forces calculated from every pair of atoms, as they were calculated previously"""
+
+    atoms = atoms.to_bohr()
+    models_list = [
+        model
+        for atom_name in atoms.atom_names
+        for model in models
+        if model.atom_name == atom_name and model.prop == "iqa"
+    ]
+    natoms = len(atoms)
+
+    forces = np.zeros((natoms, 3))
+    for atm_idx in range(natoms):
+        for j in range(natoms):
+            forces[atm_idx] -= fflux_derivs(
+                atm_idx, j, atoms, system_alf, models_list[j]
+            )
+
+    return forces
+
+
+def test_predict_values_and_gradients(ammonia):
+
+    models = Models(example_dir / "models")
+    system_alf = ammonia.alf(calculate_alf_atom_sequence)
+    features = ammonia.features_dict(calculate_alf_features, system_alf)
+
+    for model in models:
+        if model.prop != "iqa":
+            continue
+        atom_features = features[model.atom_name]
+        values, gradients = fflux_predict_values_and_gradients(
+            model, np.stack([atom_features, atom_features + 0.01])
+        )
+        assert gradients.shape == (2, len(atom_features))
+        for i, x in enumerate([atom_features, atom_features + 0.01]):
+            value, gradient = fflux_predict_value(model, x)
+            np.testing.assert_allclose(values[i], value, atol=1e-10)
+            np.testing.assert_allclose(gradients[i], gradient, atol=1e-10)
+
+
+def test_fflux_forces_match_pair_by_pair_forces(ammonia, perturbed_geometries):
+
+    models = Models(example_dir / "models")
+    system_alf = ammonia.alf(calculate_alf_atom_sequence)
+
+    for atoms in [ammonia] + perturbed_geometries(ammonia, 2):
+        np.testing.assert_allclose(
+            predict_fflux_forces_for_all_atoms(atoms, models, system_alf),
+            _pair_by_pair_forces(atoms, models, system_alf),
+            atol=1e-10,
+        )
+
+
+def test_fflux_forces_many_geometries(ammonia, perturbed_geometries):
+
+    models = Models(example_dir / "models")
+    system_alf = ammonia.alf(calculate_alf_atom_sequence)
+    geometries = perturbed_geometries(ammonia, 5, seed=1)
+
+    forces = predict_fflux_forces_for_many_geometries(geometries, models, system_alf)
+    assert forces.shape == (5, 4, 3)
+    for atoms, atoms_forces in zip(geometries, forces):
+        np.testing.assert_allclose(
+            atoms_forces,
+            predict_fflux_forces_for_all_atoms(atoms, models, system_alf),
+            atol=1e-12,
+        )
+
+    # the forces are the negative derivatives of the total predicted energy
+    coordinates = ammonia.to_bohr().coordinates
+    energies, forces = predict_fflux_energies_and_forces(
+        coordinates[np.newaxis], ammonia.atom_names, models, system_alf
+    )
+    eps = 1e-5
+    for atom_idx, dim in [(0, 2), (1, 0), (3, 1)]:
+        step = np.zeros_like(coordinates)
+        step[atom_idx, dim] = eps
+        displaced, _ = predict_fflux_energies_and_forces(
+            np.stack([coordinates + step, coordinates - step]),
+            ammonia.atom_names,
+            models,
+            system_alf,
+        )
+        np.testing.assert_allclose(
+            -(displaced[0] - displaced[1]) / (2 * eps),
+            forces[0, atom_idx, dim],
+            atol=1e-6,
+        )
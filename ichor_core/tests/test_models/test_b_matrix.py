@@ -0,0 +1,130 @@
+import numpy as np
+import pytest
+from ichor.core.atoms import Atoms
+from ichor.core.calculators import default_alf_calculator
+from ichor.core.files import GJF
+from ichor.core.models.calculate_fflux_derivatives import fflux_derivs_da_df_matrix
+from ichor.core.models.gaussian_energy_derivative_wrt_features import (
+    b_matrix_true_finite_differences,
+    cartesian_forces_from_b_matrices,
+    convert_to_cartesian_forces,
+    convert_to_feature_forces,
+    feature_forces_from_b_matrices,
+    form_all_b_matrices,
+    form_b_matrices,
+    form_b_matrix,
+    form_g_inverse,
+    form_g_matrix,
+)
+
+from tests.path import get_cwd
+
+example_dir = get_cwd(__file__) / ".." / ".." / ".." / "example_files"
+paracetamol = GJF(example_dir / "example_gjfs" / "paracetamol_standard.gjf").atoms
+
+
+def _atom_by_atom_b_matrix(atoms, system_alf, central_atom_idx):
+    """The B matrix assembled from the columns of every atom, as it was calculated previously"""
+
+    atoms = atoms.to_bohr()
+    natoms = len(atoms)
+    nfeatures = 1 if natoms == 2 else 3 * natoms - 6
+    b_matrix = np.zeros((nfeatures, 3 * natoms))
+    for i in range(natoms):
+        b_matrix[:, 3 * i : 3 * i + 3] = fflux_derivs_da_df_matrix(
+            central_atom_idx, i, atoms, system_alf
+        )
+    return b_matrix
+
+
+@pytest.mark.parametrize("central_atom_idx", [0, 7, 15])
+def test_b_matrices_paracetamol(central_atom_idx):
+
+    system_alf = paracetamol.alf(default_alf_calculator)
+
+    np.testing.assert_allclose(
+        form_b_matrix(paracetamol, system_alf, central_atom_idx),
+        _atom_by_atom_b_matrix(paracetamol, system_alf, central_atom_idx),
+        atol=1e-10,
+    )
+
+
+@pytest.mark.parametrize("natoms", [2, 3, 5])
+def test_b_matrices_finite_differences(natoms):
+
+    atoms = Atoms(paracetamol[:natoms])
+    system_alf = atoms.alf(default_alf_calculator)
+
+    for central_atom_idx in range(natoms):
+        analytical, finite_differences = b_matrix_true_finite_differences(
+            atoms, system_alf, central_atom_idx
+        )
+        np.testing.assert_allclose(analytical, finite_differences, atol=1e-6)
+
+
+def test_b_matrices_many_geometries(perturbed_geometries):
+
+    system_alf = paracetamol.alf(default_alf_calculator)
+    trajectory = perturbed_geometries(paracetamol, 3, scale=0.05)
+
+    coordinates = np.array([atoms.to_bohr().coordinates for atoms in trajectory])
+    all_b_matrices = form_all_b_matrices(coordinates, system_alf)
+    natoms = len(paracetamol)
+    assert all_b_matrices.shape == (natoms, 3, 3 * natoms - 6, 3 * natoms)
+
+    for central_atom_idx in (0, 9):
+        b_matrices = form_b_matrices(coordinates, system_alf, central_atom_idx)
+        np.testing.assert_array_equal(b_matrices, all_b_matrices[central_atom_idx])
+        for atoms, b_matrix in zip(trajectory, b_matrices):
+            np.testing.assert_allclose(
+                b_matrix,
+                form_b_matrix(atoms, system_alf, central_atom_idx),
+                atol=1e-12,
+            )
+
+
+def test_feature_forces_many_geometries():
+
+    rng = np.random.default_rng(1)
+    atoms = paracetamol.to_bohr()
+    system_alf = atoms.alf(default_alf_calculator)
+    coordinates = atoms.coordinates + 0.02 * rng.normal(size=(4, len(atoms), 3))
+    forces = rng.normal(size=coordinates.shape)
+
+    b_matrices = form_b_matrices(coordinates, system_alf, 2)
+    expected = np.array(
+        [
+            form_g_inverse(form_g_matrix(b)) @ b @ f.flatten()
+            for b, f in zip(b_matrices, forces)
+        ]
+    )
+
+    for method in ("lstsq", "cholesky"):
+        np.testing.assert_allclose(
+            feature_forces_from_b_matrices(forces, b_matrices, method=method),
+            expected,
+            rtol=1e-8,
+            atol=1e-10,
+        )
+    np.testing.assert_allclose(
+        convert_to_feature_forces(forces[0], b_matrices[0]), expected[0], atol=1e-10
+    )
+
+    # converting back gives the part of the forces that changes the features,
+    # converting that again gives the same feature forces
+    cartesian = cartesian_forces_from_b_matrices(expected, b_matrices)
+    assert cartesian.shape == coordinates.shape
+    np.testing.assert_allclose(
+        cartesian[1], convert_to_cartesian_forces(expected[1], b_matrices[1])
+    )
+    np.testing.assert_allclose(
+        feature_forces_from_b_matrices(cartesian, b_matrices), expected, atol=1e-8
+    )
+
+    # a rank cutoff larger than the ratio of all singular values removes everything
+    np.testing.assert_array_equal(
+        feature_forces_from_b_matrices(forces, b_matrices, rcond=2.0), 0.0
+    )
+
+    with pytest.raises(ValueError):
+        feature_forces_from_b_matrices(forces, b_matrices, method="inverse")
@@ -0,0 +1,99 @@
+import numpy as np
+from ichor.core.models import Model, ModelWithGradients
+
+from tests.path import get_cwd
+from tests.test_models.test_mixed_kernel_with_derivatives import _write_model, ndims
+
+
+def _model(path, persist_cholesky=False) -> ModelWithGradients:
+    rng = np.random.default_rng(3)
+    # points far enough apart for the covariance matrix to be well conditioned
+    x_train = 3.0 * rng.normal(size=(4, ndims))
+    _write_model(path, x_train, rng.normal(size=4 * (ndims + 1)))
+    return ModelWithGradients(path, persist_cholesky=persist_cholesky)
+
+
+def test_cholesky_cache(tmp_path):
+
+    model = _model(tmp_path / "WATER_iqa_O1.model")
+    R = model.kernel.R(model.x)
+
+    lower_cholesky = model.lower_cholesky
+    np.testing.assert_allclose(lower_cholesky, np.linalg.cholesky(R))
+    # the decomposition is only calculated once
+    assert model.lower_cholesky is lower_cholesky
+    assert model.R is model.R
+
+    np.testing.assert_allclose(model.invR @ R, np.eye(len(R)), atol=1e-8)
+    np.testing.assert_allclose(model.logdet, np.linalg.slogdet(R)[1])
+
+    # changing the training data invalidates the cache
+    model.x = model.x + 0.1
+    assert model.lower_cholesky is not lower_cholesky
+    np.testing.assert_allclose(
+        model.lower_cholesky, np.linalg.cholesky(model.kernel.R(model.x))
+    )
+
+    assert not model.cholesky_path.exists()
+
+
+def test_cholesky_persistence(tmp_path):
+
+    model = _model(tmp_path / "WATER_iqa_O1.model", persist_cholesky=True)
+    lower_cholesky = model.lower_cholesky
+    assert model.cholesky_path == tmp_path / "WATER_iqa_O1.cholesky.npz"
+    assert model.cholesky_path.exists()
+
+    # a new instance reads the decomposition from the file
+    new_model = ModelWithGradients(model.path, persist_cholesky=True)
+    np.testing.assert_array_equal(new_model.lower_cholesky, lower_cholesky)
+
+    # a stored decomposition for different training data is not used
+    new_model.clear_cholesky_cache()
+    new_model.x = new_model.x + 0.1
+    np.testing.assert_allclose(
+        new_model.lower_cholesky, np.linalg.cholesky(new_model.kernel.R(new_model.x))
+    )
+
+    new_model.clear_cholesky_cache(remove_file=True)
+    assert not new_model.cholesky_path.exists()
+
+
+def test_variance(tmp_path):
+
+    model = _model(tmp_path / "WATER_iqa_O1.model")
+    x_test = np.random.default_rng(4).normal(size=(5, ndims))
+
+    v = np.linalg.solve(model.lower_cholesky, model.r(x_test))
+    expected = 1.0 - np.diag(v.T @ v)
+
+    np.testing.assert_allclose(model.variance(x_test), expected, atol=1e-10)
+    np.testing.assert_allclose(
+        model.variance(x_test, chunk_size=2), expected, atol=1e-10
+    )
+    assert model.variance(x_test[0]).shape == (ndims + 1,)
+
+
+def test_model_cholesky_cache():
+
+    model = Model(
+        get_cwd(__file__)
+        / ".."
+        / ".."
+        / ".."
+        / "example_files"
+        / "models"
+        / "AMMONIA_iqa_H2.model"
+    )
+    R = model.kernel.R(model.x) + model.jitter * np.eye(model.ntrain)
+
+    lower_cholesky = model.lower_cholesky
+    np.testing.assert_allclose(lower_cholesky, np.linalg.cholesky(R))
+    assert model.lower_cholesky is lower_cholesky
+
+    # the jitter is part of the covariance matrix, so changing it invalidates the cache
+    model.jitter = 10 * model.jitter
+    assert model.lower_cholesky is not lower_cholesky
+    np.testing.assert_allclose(
+        model.R, model.kernel.R(model.x) + model.jitter * np.eye(model.ntrain)
+    )
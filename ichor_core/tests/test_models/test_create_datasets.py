@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import pytest
+from ichor.core.models.create_datasets import (
+    write_csvs_intersection,
+    write_multiple_train_sets_and_one_test_set,
+)
+
+ATOMS = {"O1": "1_2_3", "H2": "2_1_3", "H3": "3_1_2"}
+
+
+def _write_processed_csvs(path, npoints, missing=None):
+    """Writes csvs in the same format as the processed csvs, `missing` is a dictionary of atom names
+    and point indices which are not in the csv of that atom."""
+
+    missing = missing or {}
+    path.mkdir()
+    rng = np.random.default_rng(0)
+    for atom_name, alf in ATOMS.items():
+        df = pd.DataFrame(
+            rng.normal(size=(npoints, 4)), columns=["f1", "f2", "f3", "q00"]
+        )
+        df.insert(0, "point_name", [f"WATER{i:04d}" for i in range(npoints)])
+        df = df.drop(missing.get(atom_name, [])).reset_index(drop=True)
+        df.to_csv(path / f"{atom_name}_processed_data_alf_{alf}.csv")
+
+
+@pytest.mark.parametrize("ncores", [1, 2])
+def test_write_csvs_intersection(tmp_path, ncores):
+
+    _write_processed_csvs(
+        tmp_path / "processed_csvs", 50, missing={"O1": [3, 10], "H3": [10, 42]}
+    )
+    write_csvs_intersection(
+        tmp_path / "processed_csvs",
+        tmp_path / "intersection",
+        ncores=ncores,
+        chunksize=7,
+    )
+
+    for atom_name, alf in ATOMS.items():
+        df = pd.read_csv(
+            tmp_path
+            / "intersection"
+            / f"{atom_name}_processed_data_all_atoms_alf_{alf}.csv",
+            index_col=0,
+        )
+        expected = pd.read_csv(
+            tmp_path / "processed_csvs" / f"{atom_name}_processed_data_alf_{alf}.csv",
+            index_col=0,
+        )
+        expected = expected[
+            ~expected["point_name"].isin(["WATER0003", "WATER0010", "WATER0042"])
+        ]
+        pd.testing.assert_frame_equal(df, expected)
+
+
+@pytest.mark.parametrize("ncores", [1, 2])
+def test_write_multiple_train_sets_and_one_test_set(tmp_path, ncores):
+
+    _write_processed_csvs(tmp_path / "processed_csvs", 100)
+    write_multiple_train_sets_and_one_test_set(
+        10,
+        5,
+        2,
+        20,
+        tmp_path / "processed_csvs",
+        tmp_path / "sets",
+        ncores=ncores,
+        chunksize=13,
+    )
+
+    point_names = {}
+    for set_name in ["train_10", "train_15", "train_20", "test_20"]:
+        set_dir = tmp_path / "sets" / set_name
+        dfs = [pd.read_csv(f, index_col=0) for f in sorted(set_dir.iterdir())]
+        assert len(dfs) == 3
+        # every atom has the same points
+        for df in dfs:
+            assert len(df) == int(set_name.split("_")[1])
+            assert list(df["point_name"]) == list(dfs[0]["point_name"])
+        point_names[set_name] = set(dfs[0]["point_name"])
+
+    assert point_names["train_10"] < point_names["train_15"] < point_names["train_20"]
+    assert not point_names["train_20"] & point_names["test_20"]
+
+    with pytest.raises(ValueError):
+        write_multiple_train_sets_and_one_test_set(
+            50, 10, 2, 40, tmp_path / "processed_csvs", tmp_path / "sets"
+        )
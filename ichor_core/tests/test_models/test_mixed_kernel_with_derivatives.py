@@ -0,0 +1,121 @@
+import numpy as np
+from ichor.core.models import ModelWithGradients
+from ichor.core.models.kernels import MixedKernelWithDerivatives
+
+ndims = 6
+# same ordering of the dimensions as the ALF features, every third feature after the first three is periodic
+rbf_dimensions = np.array([0, 1, 2, 3, 4])
+periodic_dimensions = np.array([5])
+
+
+def _kernel() -> MixedKernelWithDerivatives:
+    return MixedKernelWithDerivatives(
+        "k",
+        np.array([0.3, 0.5, 0.2, 0.4, 0.6]),
+        np.array([0.7]),
+        rbf_dimensions,
+        periodic_dimensions,
+    )
+
+
+def test_kernel_derivative_blocks():
+
+    kernel = _kernel()
+    rng = np.random.default_rng(0)
+    x1 = rng.normal(size=(4, ndims))
+    x2 = rng.normal(size=(3, ndims))
+
+    K = kernel.k(x1, x2).reshape(4, ndims + 1, 3, ndims + 1)
+
+    def value(a, b):
+        return kernel.k(a[np.newaxis], b[np.newaxis])[0, 0]
+
+    # the gradient blocks are the derivatives of the kernel with respect to the second and first points
+    eps = 1e-6
+    for i in range(4):
+        for j in range(3):
+            for a in range(ndims):
+                step = np.zeros(ndims)
+                step[a] = eps
+                d_x2 = (value(x1[i], x2[j] + step) - value(x1[i], x2[j] - step)) / (
+                    2 * eps
+                )
+                d_x1 = (value(x1[i] + step, x2[j]) - value(x1[i] - step, x2[j])) / (
+                    2 * eps
+                )
+                np.testing.assert_allclose(K[i, 0, j, 1 + a], d_x2, atol=1e-7)
+                np.testing.assert_allclose(K[i, 1 + a, j, 0], d_x1, atol=1e-7)
+
+    # the covariance matrix of a set of points with itself is symmetric
+    R = kernel.R(x1)
+    np.testing.assert_allclose(R, R.T)
+    np.testing.assert_allclose(
+        np.diag(R.reshape(4, ndims + 1, 4, ndims + 1)[:, 0, :, 0]), 1.0
+    )
+
+
+def test_kernel_matvec():
+
+    kernel = _kernel()
+    rng = np.random.default_rng(1)
+    x1 = rng.normal(size=(11, ndims))
+    x2 = rng.normal(size=(7, ndims))
+    v = rng.normal(size=(7 * (ndims + 1), 2))
+
+    expected = kernel.k(x1, x2) @ v
+
+    for chunk_size in (None, 1, 4, 11):
+        np.testing.assert_allclose(
+            kernel.matvec(x1, x2, v, chunk_size=chunk_size), expected, atol=1e-12
+        )
+
+    np.testing.assert_allclose(
+        kernel.matvec(x1, x2, v[:, 0]), expected[:, 0], atol=1e-12
+    )
+
+
+def _write_model(path, x, weights):
+
+    with open(path, "w") as f:
+        f.write("# program ferebus\n")
+        f.write("task noises 1e-8 1e-8\n\n")
+        f.write("[system]\nname WATER\natom O1\nproperty iqa\nALF 1 2 3\n\n")
+        f.write("[dimensions]\nnumber_of_atoms 3\n")
+        f.write(f"number_of_features {ndims}\nnumber_of_training_points {len(x)}\n\n")
+        f.write("[mean]\ntype constant\nvalue -75.5\n\n")
+        f.write(
+            "[kernel.k1]\ntype rbf\nnumber_of_dimensions 5\nactive_dimensions 1 2 3 4 5\n"
+        )
+        f.write("thetas 0.3 0.5 0.2 0.4 0.6\n\n")
+        f.write(
+            "[kernel.k2]\ntype periodic\nnumber_of_dimensions 1\nactive_dimensions 6\n"
+        )
+        f.write("thetas 0.7\n\n")
+        f.write("[training_data.x]\n")
+        for row in x:
+            f.write(" ".join(map(str, row)) + "\n")
+        f.write("\n[training_data.y]\n")
+        for _ in x:
+            f.write(" ".join(["0.0"] * (ndims + 1)) + "\n")
+        f.write("\n[weights]\n")
+        for w in weights:
+            f.write(f"{w}\n")
+
+
+def test_model_with_gradients_predict(tmp_path):
+
+    rng = np.random.default_rng(2)
+    x_train = rng.normal(size=(5, ndims))
+    weights = rng.normal(size=5 * (ndims + 1))
+    _write_model(tmp_path / "WATER_iqa_O1.model", x_train, weights)
+
+    model = ModelWithGradients(tmp_path / "WATER_iqa_O1.model")
+    x_test = rng.normal(size=(8, ndims))
+
+    expected = model.mean.T + (model.r(x_test).T @ model.weights).reshape(8, ndims + 1)
+
+    np.testing.assert_allclose(model.predict(x_test), expected, atol=1e-12)
+    np.testing.assert_allclose(
+        model.predict(x_test, chunk_size=3), expected, atol=1e-12
+    )
+    np.testing.assert_allclose(model.predict(x_test[0]), expected[:1], atol=1e-12)
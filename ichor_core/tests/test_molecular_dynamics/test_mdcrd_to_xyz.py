@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+from ichor.core.files import Trajectory
+from ichor.core.molecular_dynamics.amber import iter_mdcrd_coordinates, mdcrd_to_xyz
+
+ATOM_NAMES = ["O1", "H2", "H3", "C4", "H5"]
+
+
+def _write_mdcrd(path, coordinates, box=False):
+    """Writes coordinates in the 10F8.3 format used by AMBER."""
+
+    with open(path, "w") as f:
+        f.write("TITLE\n")
+        for geometry in coordinates:
+            values = geometry.flatten()
+            for i in range(0, len(values), 10):
+                f.write("".join(f"{v:8.3f}" for v in values[i : i + 10]) + "\n")
+            if box:
+                f.write(f"{30.0:8.3f}{31.0:8.3f}{32.0:8.3f}\n")
+
+
+def _write_prmtop(path):
+    with open(path, "w") as f:
+        f.write("%FLAG ATOM_NAME\n%FORMAT(20a4)\n")
+        f.write("".join(f"{name:<4}" for name in ATOM_NAMES) + "\n")
+        f.write("%FLAG CHARGE\n")
+
+
+def _coordinates(nframes):
+    coordinates = np.random.default_rng(0).uniform(-99, 99, size=(nframes, 5, 3))
+    return np.round(coordinates, 3)
+
+
+@pytest.mark.parametrize("box", [False, True])
+def test_iter_mdcrd_coordinates(tmp_path, box):
+
+    coordinates = _coordinates(11)
+    _write_mdcrd(tmp_path / "md.mdcrd", coordinates, box=box)
+
+    chunks = list(
+        iter_mdcrd_coordinates(tmp_path / "md.mdcrd", 5, every=2, chunk_nframes=4)
+    )
+    assert [len(indices) for indices, _ in chunks] == [4, 2]
+
+    indices = np.concatenate([indices for indices, _ in chunks])
+    np.testing.assert_array_equal(indices, np.arange(0, 11, 2))
+    np.testing.assert_allclose(
+        np.concatenate([chunk for _, chunk in chunks]), coordinates[::2]
+    )
+
+
+def test_mdcrd_to_xyz(tmp_path, monkeypatch):
+
+    coordinates = _coordinates(7)
+    _write_mdcrd(tmp_path / "md.mdcrd", coordinates, box=True)
+    _write_prmtop(tmp_path / "md.prmtop")
+
+    monkeypatch.chdir(tmp_path)
+    xyz_path = mdcrd_to_xyz(
+        "md.mdcrd", "md.prmtop", "missing.in", "water", every=3, chunk_nframes=2
+    )
+    assert xyz_path.name == "water-amberK.xyz"
+
+    lines = xyz_path.read_text().splitlines()
+    x, y, z = coordinates[0, 0]
+    assert lines[:3] == ["5", "0", f"O {x:16.8f} {y:16.8f} {z:16.8f}"]
+    assert [lines[i] for i in range(1, len(lines), 7)] == ["0", "3", "6"]
+
+    trajectory = Trajectory(xyz_path)
+    assert trajectory[0].types_extended == ["O", "H", "H", "C", "H"]
+    np.testing.assert_allclose(trajectory.coordinates, coordinates[::3])
+
+
+@pytest.mark.parametrize("natoms", [4, 6])
+def test_mdcrd_wrong_natoms(tmp_path, natoms):
+
+    _write_mdcrd(tmp_path / "md.mdcrd", _coordinates(4))
+
+    with pytest.raises(ValueError):
+        list(iter_mdcrd_coordinates(tmp_path / "md.mdcrd", natoms))
+
+
+@pytest.mark.parametrize("box", [False, True])
+@pytest.mark.parametrize("nframes", [1, 5])
+def test_mdcrd_without_trailing_newline(tmp_path, box, nframes):
+
+    coordinates = _coordinates(nframes)
+    path = tmp_path / "md.mdcrd"
+    _write_mdcrd(path, coordinates, box=box)
+    path.write_bytes(path.read_bytes().rstrip(b"\n"))
+
+    for every in (1, 2):
+        chunks = list(iter_mdcrd_coordinates(path, 5, every=every, chunk_nframes=2))
+        np.testing.assert_array_equal(
+            np.concatenate([indices for indices, _ in chunks]),
+            np.arange(0, nframes, every),
+        )
+        np.testing.assert_allclose(
+            np.concatenate([chunk for _, chunk in chunks]), coordinates[::every]
+        )
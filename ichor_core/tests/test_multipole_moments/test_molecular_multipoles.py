@@ -0,0 +1,152 @@
+import numpy as np
+import pytest
+from ichor.core.common.constants import multipole_names
+from ichor.core.files import GaussianOutput, IntDirectory, PointDirectory
+from ichor.core.multipoles import (
+    cartesian_to_spherical_multipole,
+    displace_multipole_moments,
+    get_atomic_multipoles_array,
+    get_gaussian_and_aimall_molecular_multipoles,
+    recover_molecular_multipole,
+    rotate_dipole,
+    rotate_hexadecapole,
+    rotate_octupole,
+    rotate_quadrupole,
+    rotate_spherical_multipole,
+    spherical_to_cartesian_multipoles,
+)
+from ichor.core.multipoles.dipole import (
+    displace_dipole_cartesian,
+    get_gaussian_and_aimall_molecular_dipole,
+)
+from ichor.core.multipoles.hexadecapole import (
+    displace_hexadecapole_cartesian,
+    get_gaussian_and_aimall_molecular_hexadecapole,
+)
+from ichor.core.multipoles.octupole import (
+    displace_octupole_cartesian,
+    get_gaussian_and_aimall_molecular_octupole,
+)
+from ichor.core.multipoles.quadrupole import (
+    displace_quadrupole_cartesian,
+    get_gaussian_and_aimall_molecular_quadrupole,
+)
+
+from tests.path import get_cwd
+
+example_dir = get_cwd(__file__) / ".." / ".." / ".." / "example_files"
+point_path = example_dir / "example_point_directory" / "WD0000.pointdir"
+
+element_wise_displace = {
+    1: displace_dipole_cartesian,
+    2: displace_quadrupole_cartesian,
+    3: displace_octupole_cartesian,
+    4: displace_hexadecapole_cartesian,
+}
+
+element_wise_rotate = {
+    1: rotate_dipole,
+    2: rotate_quadrupole,
+    3: rotate_octupole,
+    4: rotate_hexadecapole,
+}
+
+gaussian_and_aimall = {
+    1: get_gaussian_and_aimall_molecular_dipole,
+    2: get_gaussian_and_aimall_molecular_quadrupole,
+    3: get_gaussian_and_aimall_molecular_octupole,
+    4: get_gaussian_and_aimall_molecular_hexadecapole,
+}
+
+
+@pytest.mark.parametrize("rank", [1, 2, 3, 4])
+def test_displace_multipole_moments(rank):
+
+    rng = np.random.default_rng(rank)
+    displacements = rng.normal(size=(2, 3, 3))
+    spherical = rng.normal(size=(2, 3, len(multipole_names)))
+    cartesian = spherical_to_cartesian_multipoles(spherical, rank)
+
+    displaced = displace_multipole_moments(displacements, cartesian, rank)
+    assert displaced.shape == (2, 3) + (3,) * rank
+
+    for i in range(2):
+        for j in range(3):
+            expected = element_wise_displace[rank](
+                displacements[i, j], *[moment[i, j] for moment in cartesian[: rank + 1]]
+            )
+            np.testing.assert_allclose(displaced[i, j], expected, atol=1e-12)
+
+
+@pytest.mark.parametrize("rank", [1, 2, 3, 4])
+def test_rotate_spherical_multipole(rank):
+
+    rng = np.random.default_rng(rank)
+    # random rotation matrices from the QR decomposition of random matrices
+    C = np.linalg.qr(rng.normal(size=(5, 3, 3)))[0]
+    spherical = rng.normal(size=(5, 2 * rank + 1))
+
+    rotated = rotate_spherical_multipole(spherical, C, rank)
+    assert rotated.shape == spherical.shape
+
+    for i in range(5):
+        expected = element_wise_rotate[rank](*spherical[i], C[i])
+        np.testing.assert_allclose(rotated[i], expected, atol=1e-12)
+
+
+@pytest.mark.parametrize("rank", [1, 2, 3, 4])
+def test_recover_molecular_multipole_many_geometries(rank):
+
+    point = PointDirectory(point_path)
+    coordinates, multipoles = get_atomic_multipoles_array(point.atoms, point.ints)
+    single = recover_molecular_multipole(coordinates, multipoles, rank)
+
+    # a batch of rigidly translated geometries, the charge is not 0
+    # so the moments change with the origin
+    shifts = np.array([[0.0, 0.0, 0.0], [1.0, -0.5, 2.0]])
+    batch = recover_molecular_multipole(
+        coordinates + shifts[:, np.newaxis], np.stack([multipoles] * 2), rank
+    )
+    assert batch.shape == (2,) + (3,) * rank
+    np.testing.assert_allclose(batch[0], single)
+    assert not np.allclose(batch[1], batch[0])
+
+    # reference for the shifted geometry from the element-wise displacement of every atom
+    cartesian = spherical_to_cartesian_multipoles(multipoles, rank)
+    expected = sum(
+        element_wise_displace[rank](
+            coordinates[i] + shifts[1], *[moment[i] for moment in cartesian[: rank + 1]]
+        )
+        for i in range(len(coordinates))
+    )
+    shifted = recover_molecular_multipole(
+        coordinates + shifts[:, np.newaxis],
+        np.stack([multipoles] * 2),
+        rank,
+        convert_units=False,
+        include_prefactor=False,
+    )
+    np.testing.assert_allclose(shifted[1], expected, atol=1e-10)
+
+    spherical = recover_molecular_multipole(
+        coordinates, multipoles, rank, convert_to_cartesian=False
+    )
+    np.testing.assert_allclose(
+        spherical, cartesian_to_spherical_multipole(single, rank)
+    )
+
+
+@pytest.mark.parametrize("rank", [1, 2, 3, 4])
+def test_gaussian_and_aimall_molecular_multipoles(rank):
+
+    point = PointDirectory(point_path)
+    moments = get_gaussian_and_aimall_molecular_multipoles([point, point], rank)
+
+    gaussian, aimall = gaussian_and_aimall[rank](
+        GaussianOutput(point_path / "WD0000.gau"),
+        IntDirectory(point_path / "WD0000_atomicfiles"),
+    )
+
+    for i in range(2):
+        np.testing.assert_allclose(moments["gaussian"][i], gaussian, atol=1e-10)
+        np.testing.assert_allclose(moments["aimall"][i], aimall, atol=1e-10)
@@ -0,0 +1,89 @@
+import shutil
+
+import pytest
+from ichor.core.processing import (
+    check_points_directory,
+    read_missing_data_report,
+    write_missing_data_report,
+)
+
+from tests.path import get_cwd
+
+example_dir = (
+    get_cwd(__file__)
+    / ".."
+    / ".."
+    / ".."
+    / "example_files"
+    / "example_points_directory"
+    / "WATER_MONOMER.pointsdir"
+)
+
+
+@pytest.fixture
+def points_dir(tmp_path):
+    points_dir = tmp_path / "WATER_MONOMER.pointsdir"
+    shutil.copytree(example_dir, points_dir)
+    return points_dir
+
+
+def test_complete_points(points_dir):
+
+    report = check_points_directory(points_dir, only_problems=False)
+    assert [point_report["name"] for point_report in report] == [
+        f"WATER_MONOMER000{i}" for i in range(4)
+    ]
+    assert all(not point_report["problems"] for point_report in report)
+    assert check_points_directory(points_dir) == []
+
+
+def test_points_with_problems(points_dir):
+
+    # Gaussian did not finish
+    gaussian_output = (
+        points_dir / "WATER_MONOMER0000.pointdir" / "WATER_MONOMER0000.gaussianoutput"
+    )
+    gaussian_output.write_text(gaussian_output.read_text()[:-200])
+    # AIMAll crashed
+    (points_dir / "WATER_MONOMER0001.pointdir" / "WATER_MONOMER0001.sh").touch()
+    # an .int file is missing and another .int file is incomplete
+    atomicfiles = (
+        points_dir / "WATER_MONOMER0002.pointdir" / "WATER_MONOMER0002_atomicfiles"
+    )
+    (atomicfiles / "h3.int").unlink()
+    (atomicfiles / "o1.int").write_text("")
+    # the wfn file is missing
+    (points_dir / "WATER_MONOMER0003.pointdir" / "WATER_MONOMER0003.wfn").unlink()
+
+    report = {
+        point_report["name"]: point_report
+        for point_report in check_points_directory(points_dir, nthreads=2)
+    }
+
+    assert report["WATER_MONOMER0000"]["problems"] == ["gaussian output incomplete"]
+    assert report["WATER_MONOMER0001"]["problems"] == ["AIMAll crashed, .sh file found"]
+    assert report["WATER_MONOMER0002"]["problems"] == [
+        "2 int files found, but there are 3 atoms",
+        "incomplete int files for O1",
+    ]
+    assert report["WATER_MONOMER0003"]["problems"] == ["wfn missing"]
+    assert report["WATER_MONOMER0003"]["wfn"] is None
+
+    assert [
+        (point_report["needs_gaussian"], point_report["needs_aimall"])
+        for point_report in report.values()
+    ] == [(True, True), (False, True), (False, True), (True, True)]
+
+
+@pytest.mark.parametrize("suffix", [".json", ".csv"])
+def test_report_round_trip(points_dir, tmp_path, suffix):
+
+    (points_dir / "WATER_MONOMER0001.pointdir" / "WATER_MONOMER0001.sh").touch()
+    (points_dir / "WATER_MONOMER0003.pointdir" / "WATER_MONOMER0003.wfn").unlink()
+    report = check_points_directory(points_dir)
+
+    report_path = write_missing_data_report(report, tmp_path / f"report{suffix}")
+    assert read_missing_data_report(report_path) == report
+
+    with pytest.raises(ValueError):
+        write_missing_data_report(report, tmp_path / "report.txt")
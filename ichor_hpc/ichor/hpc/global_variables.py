@@ -60,44 +60,58 @@ def initialize_config(config_path):
 
 
 ICHOR_CONFIG_PATH: Path = Path.home() / "ichor_config.yaml"
-# check that config file exists
 
-if not __building_docs__:
+
+def _init_ichor_config() -> dict:
+    """Reads the ichor config file from the home directory.
+
+    :raises MissingIchorConfig: If the ichor_config.yaml file is not in the home directory.
+    """
+
+    if __building_docs__:
+        return None
+
+    # check that config file exists
     if not ICHOR_CONFIG_PATH.exists():
         raise MissingIchorConfig(
             "The ichor_config.yaml file is not found in the home directory. Please add it in order to use ichor.hpc"
         )
 
-if not __building_docs__:
-    ICHOR_CONFIG: dict = initialize_config(ICHOR_CONFIG_PATH)
-else:
-    ICHOR_CONFIG = None
-
-# the MACHINE will be a key from the top layer of the config file
-# if it not found, it will be None
-MACHINE: str = init_machine(platform.node(), ICHOR_CONFIG)
-if not __building_docs__:
-    if not MACHINE:
-        warnings.warn(
-            "The current machine is not defined in the ichor_config.yaml file."
-        )
+    return initialize_config(ICHOR_CONFIG_PATH)
+
+
+def _init_current_machine() -> str:
+    """Gets the current machine, which is a key from the top layer of the config file.
+    If it not found, it will be None."""
+
+    machine = init_machine(platform.node(), _get_lazy_global("ICHOR_CONFIG"))
+    # do not raise error that machine is not defined here, because it could be running on local
+    if not __building_docs__:
+        if not machine:
+            warnings.warn(
+                "The current machine is not defined in the ichor_config.yaml file."
+            )
+
+    return machine
+
+
+def _init_parallel_environment() -> ParallelEnvironment:
+    """Makes parallel environment variables to run jobs on multiple cores, for the
+    current machine which ichor is launched on."""
+
+    parallel_environment = ParallelEnvironment()
+
+    if __building_docs__:
+        return parallel_environment
 
-# do not raise error that machine is not defined here, because it could be running on local
-# if not __building_docs__:
-# if not MACHINE:
-#         raise ValueError("The current machine is not defined in the config file.")
-
-# make parallel environment variables to run jobs on multiple cores
-PARALLEL_ENVIRONMENT = ParallelEnvironment()
-# if you do not specify parallel environments in config, then error out with KeyError
-# make the possible parallel environments for the current machine which ichor is launched on
-if not __building_docs__:
-    if MACHINE:
+    machine = _get_lazy_global("MACHINE")
+    # if you do not specify parallel environments in config, then only warn
+    if machine:
         try:
-            for p_env_name, values in ICHOR_CONFIG[MACHINE]["hpc"][
+            for p_env_name, values in _get_lazy_global("ICHOR_CONFIG")[machine]["hpc"][
                 "parallel_environments"
             ].items():
-                PARALLEL_ENVIRONMENT[p_env_name] = values
+                parallel_environment[p_env_name] = values
         # if parallel_environment is not found, but machine is defined
         except KeyError:
             warnings.warn(
@@ -108,13 +122,48 @@ if not __building_docs__:
             warnings.warn(
                 "The current machine is not defined in the ichor_config.yaml file."
             )
-    else:
-        warnings.warn(
-            "The current machine is not defined in the ichor_config.yaml file."
-        )
-        # raise KeyError(
-        #     "The parallel environments are not defined for the current machine."
-        # )
+
+    return parallel_environment
+
+
+# global variables which read files, look at the machine or start up loggers
+# these are only initialised the first time they are accessed (see `__getattr__` below), so
+# that importing ichor.hpc (for example in a job running on a compute node) is cheap and
+# does not fail if the ichor config is not present
+_LAZY_GLOBAL_VARIABLES = {
+    "ICHOR_CONFIG": _init_ichor_config,
+    "MACHINE": _init_current_machine,
+    "PARALLEL_ENVIRONMENT": _init_parallel_environment,
+    # batch system on current machine
+    "BATCH_SYSTEM": init_batch_system,
+    # set up loggers
+    "LOGGER": lambda: setup_logger("ICHOR", "ichor.log"),
+    # set up current python environment
+    "CURRENT_PYTHON_ENVIRONMENT_PATH": get_current_python_environment_path,
+}
+
+
+def __getattr__(name: str):
+    """Module level ``__getattr__`` (PEP 562), only called if ``name`` is not already
+    a global of this module. Initialises the lazy global variable and stores it in the module
+    globals, so that the initialisation is only done once."""
+
+    if name not in _LAZY_GLOBAL_VARIABLES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = _LAZY_GLOBAL_VARIABLES[name]()
+    globals()[name] = value
+
+    return value
+
+
+def _get_lazy_global(name: str):
+    """Returns a lazy global variable, initialising it if it has not been accessed yet."""
+
+    if name in globals():
+        return globals()[name]
+    return __getattr__(name)
+
 
 # default file structure to be used for file handling
 FILE_STRUCTURE = FileTree()
@@ -226,16 +275,11 @@ FILE_STRUCTURE.add(
 FILE_STRUCTURE.add("GJF", "dlpoly_gjf", parent="dlpoly", type_=FileType.Directory)
 FILE_STRUCTURE.add("AMBER", "amber", type_=FileType.Directory)
 
-# batch system on current machine
-BATCH_SYSTEM = init_batch_system()
-
-# set up loggers
-LOGGER = setup_logger("ICHOR", "ichor.log")
-
 # set up script names that are implemented
 SCRIPT_NAMES = ScriptNames(
     {
         "check_for_missing_data": "check_for_missing_data.sh",
+        "add_method_to_wfns": "add_method_to_wfns.sh",
         "pd_to_database": "pd_to_database.sh",
         "calculate_features": "calculate_features.sh",
         "center_trajectory": "center_trajectory.sh",
@@ -293,7 +337,3 @@ SCRIPT_NAMES = ScriptNames(
     },
     parent=FILE_STRUCTURE["scripts"],
 )
-
-
-# set up current python environment
-CURRENT_PYTHON_ENVIRONMENT_PATH = get_current_python_environment_path()
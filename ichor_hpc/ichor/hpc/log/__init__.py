@@ -4,8 +4,6 @@ for points)."""
 
 import logging
 
-from concurrent_log_handler import ConcurrentRotatingFileHandler
-
 
 def setup_logger(
     name,
@@ -15,6 +13,9 @@ def setup_logger(
         "%(asctime)s - %(levelname)s - %(message)s", "%d-%m-%Y %H:%M:%S"
     ),
 ):
+    # only imported when a logger is set up, as it is not needed to import ichor.hpc
+    from concurrent_log_handler import ConcurrentRotatingFileHandler
+
     handler = ConcurrentRotatingFileHandler(
         log_file
     )  # <= Has broken ICHOR before when submitted, use with caution
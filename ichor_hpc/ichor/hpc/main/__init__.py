@@ -1,5 +1,6 @@
 from ichor.hpc.main.aimall import submit_points_directory_to_aimall
 from ichor.hpc.main.check_for_missing_files import (
+    resubmit_points_from_report,
     submit_check_points_directory_for_missing_files,
 )
 from ichor.hpc.main.database import submit_make_csvs_from_database
@@ -22,6 +23,7 @@ __all__ = [
     "submit_make_csvs_from_database",
     "submit_points_directory_to_orca",
     "submit_check_points_directory_for_missing_files",
+    "resubmit_points_from_report",
     "write_pyferebus_input_script",
     "write_extract_models_script",
 ]
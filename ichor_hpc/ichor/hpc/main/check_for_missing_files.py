@@ -1,7 +1,10 @@
 from pathlib import Path
-from typing import Union
+from typing import List, Optional, Tuple, Union
+from warnings import warn
 
+import ichor.hpc.global_variables
 from ichor.core.useful_functions import single_or_many_points_directories
+from ichor.hpc.batch_system import JobID
 from ichor.hpc.global_variables import SCRIPT_NAMES
 from ichor.hpc.useful_functions.submit_free_flow_python_on_compute import (
     submit_free_flow_python_command_on_compute,
@@ -43,3 +46,123 @@ def submit_check_points_directory_for_missing_files(points_dir_path: Union[str,
     return submit_free_flow_python_command_on_compute(
         text_list, SCRIPT_NAMES["check_for_missing_data"], ncores=1
     )
+
+
+def submit_add_method_to_wfns(
+    points: List[Path], method: str = "B3LYP", hold: JobID = None
+) -> Optional[JobID]:
+    """Submits a job that writes the method to the .wfn files of points (see `add_method_and_get_wfn_paths`),
+    which is needed when the .wfn files are written by a Gaussian job that has not finished yet.
+
+    :param points: Paths to the PointDirectory-like directories
+    :param method: Functional written to the .wfn files for AIMAll, defaults to "B3LYP"
+    :param hold: The JobID of the Gaussian job which writes the .wfn files, defaults to None
+    """
+
+    points = [str(Path(point).absolute()) for point in points]
+
+    text_list = []
+    text_list.append("from ichor.core.files import PointDirectory")
+    text_list.append("from ichor.hpc.main.aimall import add_method_and_get_wfn_paths")
+    text_list.append(
+        f"add_method_and_get_wfn_paths([PointDirectory(p) for p in {points}], '{method}')"
+    )
+    text_list.append("print('Finished adding method to wfns.')")
+
+    return submit_free_flow_python_command_on_compute(
+        text_list, SCRIPT_NAMES["add_method_to_wfns"], ncores=1, hold=hold
+    )
+
+
+def resubmit_points_from_report(
+    report: Union[str, Path, List[dict]],
+    method: str = "B3LYP",
+    ncores: int = 2,
+    hold: JobID = None,
+    **kwargs,
+) -> Tuple[Optional[JobID], Optional[JobID], Optional[JobID]]:
+    """Resubmits the points in a missing data report (see `ichor.core.processing.check_points_directory`)
+    which need Gaussian or AIMAll to be ran again. The existing .gjf files of the points are submitted
+    to Gaussian, and the .wfn files of points for which only AIMAll failed are submitted to AIMAll.
+    The .wfn files written by the Gaussian job are submitted to AIMAll in a job which holds for the Gaussian
+    job (and for a job which writes the method to the new .wfn files), so every point in the report gets .int files.
+    Points which need Gaussian to be ran again, but do not have a .gjf file, are skipped with a warning.
+
+    :param report: A report, or path to a .json or .csv report, written by `write_missing_data_report`
+    :param method: Functional written to the .wfn files for AIMAll, defaults to "B3LYP"
+    :param ncores: Number of cores to run Gaussian and AIMAll with, defaults to 2
+    :param hold: An optional JobID for which the jobs hold, defaults to None
+    :param kwargs: Key word arguments passed to `submit_wfns`
+    :return: The JobIDs of the Gaussian job, the AIMAll job of the points which only need AIMAll and
+        the AIMAll job which holds for the Gaussian job, or None for jobs that were not submitted
+    """
+
+    from ichor.core.files import PointDirectory
+    from ichor.core.processing import read_missing_data_report
+    from ichor.hpc.main.aimall import add_method_and_get_wfn_paths, submit_wfns
+    from ichor.hpc.main.gaussian import submit_gjfs
+
+    if not isinstance(report, list):
+        report = read_missing_data_report(report)
+
+    gaussian_reports = []
+    for point_report in report:
+        if not point_report["needs_gaussian"]:
+            continue
+        # without a .gjf file, neither Gaussian nor AIMAll can be ran again for the point
+        if not point_report["gjf"]:
+            warn(
+                f"Point {point_report['point']} needs Gaussian to be ran again, but does not have a .gjf file."
+            )
+            ichor.hpc.global_variables.LOGGER.info(
+                f".gjf file not found for {point_report['point']}. Point skipped."
+            )
+            continue
+        gaussian_reports.append(point_report)
+
+    gjfs = [Path(point_report["gjf"]) for point_report in gaussian_reports]
+    aimall_points = [
+        PointDirectory(point_report["point"])
+        for point_report in report
+        if point_report["needs_aimall"] and not point_report["needs_gaussian"]
+    ]
+
+    gaussian_job_id, aimall_job_id, gaussian_aimall_job_id = None, None, None
+
+    if gjfs:
+        gaussian_job_id = submit_gjfs(
+            gjfs,
+            force_calculate_wfn=True,
+            script_name=SCRIPT_NAMES["gaussian"],
+            ncores=ncores,
+            hold=hold,
+        )
+
+        # the .wfn files do not exist yet, so AIMAll is submitted to run once Gaussian has written them
+        method_job_id = submit_add_method_to_wfns(
+            [point_report["point"] for point_report in gaussian_reports],
+            method,
+            hold=gaussian_job_id,
+        )
+        wfns = [gjf.with_suffix(".wfn") for gjf in gjfs]
+        gaussian_aimall_job_id = submit_wfns(
+            wfns,
+            script_name=SCRIPT_NAMES["aimall"],
+            ncores=ncores,
+            force_calculate_ints=True,
+            hold=method_job_id,
+            **kwargs,
+        )
+
+    if aimall_points:
+        wfns = add_method_and_get_wfn_paths(aimall_points, method)
+        aimall_job_id = submit_wfns(
+            wfns,
+            script_name=SCRIPT_NAMES["aimall"],
+            ncores=ncores,
+            force_calculate_ints=True,
+            hold=hold,
+            **kwargs,
+        )
+
+    return gaussian_job_id, aimall_job_id, gaussian_aimall_job_id
@@ -40,6 +40,8 @@ def submit_make_database(
     # this is used to be able to call the respective methods from PointsDirectory
     # so that the same code below is used with the respective methods
     str_database_method = AVAILABLE_DATABASE_FORMATS[database_format]
+    # the points are read in parallel when writing to a sqlite database
+    str_method_kwargs = f", ncores={ncores}" if database_format == "sqlite" else ""
 
     # if turning many PointsDirectories into db on compute node
     if is_parent_directory_to_many_points_directories:
@@ -53,7 +55,7 @@ def submit_make_database(
         # need to write each pointdirectory to a separate json directory
         text_list.append(f"pd_parent = Path('{str(points_dir_path.absolute())}')")
         text_list.append(
-            f"PointsDirectoryParent(pd_parent).{str_database_method}('{db_name}')"
+            f"PointsDirectoryParent(pd_parent).{str_database_method}('{db_name}'{str_method_kwargs})"
         )
 
         return submit_free_flow_python_command_on_compute(
@@ -69,7 +71,7 @@ def submit_make_database(
         text_list.append("from ichor.core.files import PointsDirectory")
         text_list.append("from pathlib import Path")
         text_list.append(f"pd = PointsDirectory('{str(points_dir_path.absolute())}')")
-        text_list.append(f"pd.{str_database_method}('{db_name}')")
+        text_list.append(f"pd.{str_database_method}('{db_name}'{str_method_kwargs})")
 
         return submit_free_flow_python_command_on_compute(
             text_list, SCRIPT_NAMES["pd_to_database"], ncores=ncores
@@ -1,11 +1,13 @@
 import shutil
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import List, Optional, Tuple, Union
 
 import ichor.hpc.global_variables
 from ichor.core.common.io import mkdir
 
 from ichor.core.files import GJF, PointsDirectory, Trajectory, WFN
+from ichor.core.files.file import FileWriteError
+from ichor.core.files.gaussian import GJFTemplate
 from ichor.hpc.batch_system import JobID
 from ichor.hpc.submission_commands import GaussianCommand
 from ichor.hpc.submission_script import SubmissionScript
@@ -104,52 +106,118 @@ def submit_points_directory_to_gaussian(
     )
 
 
+def _read_xyz_geometry(xyz_path: Path) -> Tuple[List[str], List[Tuple[float]]]:
+    """Reads the atom types and coordinates from a .xyz file containing one geometry,
+    without making `Atom` instances."""
+
+    atom_types = []
+    coordinates = []
+
+    with open(xyz_path, "r") as f:
+        natoms = int(next(f))
+        _ = next(f)  # comment line
+        for _ in range(natoms):
+            atom_type, x, y, z, *_ = next(f).split()
+            atom_types.append(atom_type.capitalize())
+            coordinates.append((float(x), float(y), float(z)))
+
+    return atom_types, coordinates
+
+
+def _write_gjf_if_changed(
+    gjf_template: GJFTemplate, gjf_path: Path, xyz_path: Path
+) -> bool:
+    """Renders a .gjf file and only writes it if its contents are different from the
+    .gjf file that is already on disk.
+
+    :return: Whether the file was written
+    """
+
+    try:
+        atom_types, coordinates = _read_xyz_geometry(xyz_path)
+        contents = gjf_template.render(gjf_path, atom_types, coordinates)
+    except Exception as e:
+        raise FileWriteError(
+            f"Exception occurred while writing file '{gjf_path.absolute()}'. File was not been written/modified."
+        ) from e
+
+    if gjf_path.exists() and gjf_path.read_bytes() == contents.encode():
+        return False
+
+    with open(gjf_path, "w") as f:
+        f.write(contents)
+
+    return True
+
+
 def write_gjfs(
-    points_directory: PointsDirectory, overwrite_existing: bool, **kwargs
+    points_directory: PointsDirectory,
+    overwrite_existing: bool,
+    nthreads: int = 8,
+    **kwargs,
 ) -> List[Path]:
     """Writes out .gjf files in every PointDirectory which is contained
     in a PointsDirectory. Each PointDirectory should always have a `.xyz` file in it,
     which contains only one molecular geometry. This `.xyz` file can be used to write out the `.gjf`
     file in the PointDirectory (if it does not exist already).
 
+    All .gjf files are rendered from one `GJFTemplate` and written by a pool of threads.
+    When overwriting, .gjf files which already have the same contents (same link0, route card,
+    title, geometry, etc.) are not written again, so that resubmitting a PointsDirectory
+    only writes the .gjf files which have changed.
+
     :param points: A PointsDirectory instance which wraps around a
         whole directory containing points (such as TRAINING_SET).
+    :param overwrite_existing: Whether to overwrite .gjf files which already exist
+    :param nthreads: The number of threads used to write the .gjf files, defaults to 8
+    :param kwargs: Key word arguments passed to `GJF` (method, basis_set, keywords, link0, etc.)
     :return: A list of Path objects which point to `.gjf` files in each
         PointDirectory that is contained in the PointsDirectory.
     """
 
+    import concurrent.futures
+
+    gjf_template = GJFTemplate(**kwargs)
+
     gjfs = []
+    to_write = []
 
     for point_directory in points_directory:
 
         # remove the .pointdirectory suffix
-        gjf_fle_name = point_directory.path.with_suffix("").name + GJF.get_filetype()
+        gjf_path = point_directory.path / (
+            point_directory.path.with_suffix("").name + GJF.get_filetype()
+        )
 
-        # if overwriting, then delete current gjfs if they exist
         if overwrite_existing:
             # the gjf file object might not exist, so check for that first
-            if point_directory.gjf:
-                # if the object exists, then delete it
+            # a gjf with a different name is deleted, a gjf with the same name
+            # is only overwritten if its contents change
+            if point_directory.gjf and point_directory.gjf.path != gjf_path:
                 point_directory.gjf.path.unlink()
-
-            point_directory.gjf = GJF(
-                Path(point_directory.path / gjf_fle_name),
-                **kwargs,
-            )
-            point_directory.gjf.atoms = point_directory.xyz.atoms
-            point_directory.gjf.write()
+            to_write.append((gjf_path, point_directory.xyz.path))
 
         # if gjf does not exist
         elif not point_directory.gjf:
+            to_write.append((gjf_path, point_directory.xyz.path))
+
+        # keep the existing gjf
+        else:
+            gjf_path = point_directory.gjf.path
 
-            point_directory.gjf = GJF(
-                Path(point_directory.path / gjf_fle_name),
-                **kwargs,
+        gjfs.append(gjf_path)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=nthreads) as executor:
+        written = list(
+            executor.map(
+                lambda paths: _write_gjf_if_changed(gjf_template, *paths), to_write
             )
-            point_directory.gjf.atoms = point_directory.xyz.atoms
-            point_directory.gjf.write()
+        )
 
-        gjfs.append(point_directory.gjf.path)
+    ichor.hpc.global_variables.LOGGER.info(
+        f"Wrote {sum(written)} .gjf file(s) in {points_directory.path}, "
+        f"{len(written) - sum(written)} .gjf file(s) were unchanged."
+    )
 
     return gjfs
 
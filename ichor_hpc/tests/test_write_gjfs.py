@@ -0,0 +1,39 @@
+import os
+import shutil
+from pathlib import Path
+
+from ichor.core.files import PointsDirectory
+from ichor.hpc.main.gaussian import write_gjfs
+
+example_dir = Path(__file__).parent / ".." / ".." / "example_files"
+
+
+def test_write_gjfs_skips_unchanged(tmp_path, monkeypatch):
+
+    shutil.copytree(
+        example_dir / "example_points_directory" / "WATER_MONOMER.pointsdir",
+        tmp_path / "WATER_MONOMER.pointsdir",
+    )
+    # the log file is written in the current directory
+    monkeypatch.chdir(tmp_path)
+    points_directory = PointsDirectory(tmp_path / "WATER_MONOMER.pointsdir")
+
+    gjfs = write_gjfs(points_directory, True, keywords=["nosymm"])
+    assert len(gjfs) == len(points_directory)
+    contents = [gjf.read_text() for gjf in gjfs]
+    assert all("#p b3lyp/6-31+g(d,p) nosymm\n" in c for c in contents)
+
+    # move the modification times back, so that any rewrite is noticed
+    for gjf in gjfs:
+        os.utime(gjf, ns=(0, 0))
+
+    # the same gjfs are not written again
+    assert write_gjfs(points_directory, True, keywords=["nosymm"]) == gjfs
+    assert [gjf.stat().st_mtime_ns for gjf in gjfs] == [0] * len(gjfs)
+    assert [gjf.read_text() for gjf in gjfs] == contents
+
+    # a different keyword changes every gjf, so they are all written again
+    write_gjfs(points_directory, True, keywords=["nosymm", "opt"])
+    for gjf, previous_contents in zip(gjfs, contents):
+        assert gjf.stat().st_mtime_ns != 0
+        assert gjf.read_text() == previous_contents.replace("nosymm", "nosymm opt")